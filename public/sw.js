@@ -13,9 +13,11 @@ const STATIC_CACHE = 'hearo-static-v1';
 
 // 캐시할 프리렌더링 파일 패턴
 const PRERENDER_PATTERNS = [
-  /\/assets\/prerendered\/tts\/.*\.wav$/,
+  /\/assets\/prerendered\/tts\/.*\.(wav|ogg|m4a)$/,
+  /\/assets\/prerendered\/premix\/.*\.wav$/,
+  /\/assets\/prerendered\/sprites\/.*\.(wav|ogg|m4a)$/,
   /\/assets\/prerendered\/stories\/.*\.txt$/,
-  /\/assets\/prerendered\/npc\/.*\.(jpg|png|webp)$/,
+  /\/assets\/prerendered\/npc\/.*\.(jpg|png|webp|avif)$/,
   /\/images\/worldviews\/.*\.(jpg|png|webp)$/,
 ];
 
@@ -254,7 +256,206 @@ self.addEventListener('message', (event) => {
     );
   }
 
+  if (type === 'PRECACHE_WORLDVIEW') {
+    event.waitUntil(precacheWorldview(payload.worldview, payload.prefs));
+  }
+
   if (type === 'CLEAR_PRERENDER_CACHE') {
     event.waitUntil(caches.delete(PRERENDER_CACHE));
   }
 });
+
+/**
+ * 세계관 매니페스트 기반 사전 캐싱 (scripts/build_asset_manifest.py 생성)
+ *
+ * 매니페스트 항목의 역할/포맷을 보고 클라이언트가 실제로 쓰는 파일만 받는다.
+ * - 오디오: 클라이언트가 재생 가능한 인코딩 중 선호 순서 첫 번째 (prefs.audio)
+ * - 이미지: 선호 포맷(prefs.image)에서 요청 너비(prefs.imageWidth) 이상인 가장 작은 변환본
+ * - 원본(WAV 마스터, PNG/JPG)과 빌드 입력은 받지 않음 (필요하면 재생 시 네트워크에서)
+ * 이전에 캐싱한 목록과 해시를 비교해 바뀐 파일만 다시 받고, 빠진 파일은 캐시에서 지운다.
+ * 마지막으로 받은 릴리스에서 오는 번들 델타 팩이 전부 받을 파일이면 팩 하나로 받는다.
+ */
+const MANIFEST_BASE = '/assets/prerendered/manifest/';
+const MANIFEST_META_PREFIX = '/__prerender-manifest__/';
+const BUNDLE_BASE = '/assets/prerendered/bundles/';
+
+// 델타 팩에서 꺼낸 파일의 Content-Type
+const CONTENT_TYPES = {
+  wav: 'audio/wav',
+  ogg: 'audio/ogg',
+  m4a: 'audio/mp4',
+  txt: 'text/plain; charset=utf-8',
+  json: 'application/json',
+  jpg: 'image/jpeg',
+  png: 'image/png',
+  webp: 'image/webp',
+  avif: 'image/avif',
+};
+
+async function fetchBundleIndex() {
+  try {
+    const response = await fetch(`${BUNDLE_BASE}index.json`, { cache: 'no-cache' });
+    return response.ok ? await response.json() : null;
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * 매니페스트에서 사전 캐싱할 파일 선택 (URL -> 항목)
+ */
+function selectPrecacheFiles(files, prefs) {
+  const audioFormats = prefs.audio || [];
+  const imageFormats = prefs.image || [];
+  const imageWidth = prefs.imageWidth || 0;
+  const selected = {};
+  const best = {};
+
+  for (const [url, entry] of Object.entries(files)) {
+    if (entry.role === 'data') {
+      selected[url] = entry;
+      continue;
+    }
+    if (entry.role !== 'variant') continue;
+
+    const formatRank = (entry.kind === 'audio' ? audioFormats : imageFormats).indexOf(entry.format);
+    if (formatRank < 0) continue;
+    // 이미지: 요청 너비 이상이면 작을수록, 모자라면 클수록 우선
+    let widthRank = 0;
+    if (entry.kind === 'image') {
+      widthRank = entry.width >= imageWidth ? entry.width : 1e6 - entry.width;
+    }
+    const rank = formatRank * 1e7 + widthRank;
+    if (!best[entry.clip] || rank < best[entry.clip].rank) {
+      best[entry.clip] = { url, entry, rank };
+    }
+  }
+
+  for (const { url, entry } of Object.values(best)) {
+    selected[url] = entry;
+  }
+  return selected;
+}
+
+/**
+ * 받을 파일이 전부 들어 있는 번들 델타 팩으로 캐싱 (scripts/build_asset_bundles.py 생성)
+ *
+ * 팩에 받지 않을 파일이 섞여 있거나 델타가 없으면 아무것도 하지 않음 - 캐싱한 URL 목록 반환
+ */
+async function cacheFromBundlePack(worldview, previousRelease, index, manifest, pending, cache) {
+  const release = index?.releases?.[index.latest];
+  if (!previousRelease || release?.groups?.[worldview] !== manifest.hash) return [];
+  if (!(release.deltas?.[worldview] || []).includes(previousRelease)) return [];
+
+  try {
+    const deltaPath = `${BUNDLE_BASE}deltas/${worldview}/${previousRelease}-${index.latest}`;
+    const deltaResponse = await fetch(`${deltaPath}.json`);
+    if (!deltaResponse.ok) return [];
+    const delta = await deltaResponse.json();
+    const updates = { ...delta.added, ...delta.changed };
+    const packed = Object.entries(updates);
+    const allWanted = packed.every(([url, entry]) => pending[url]?.sha256 === entry.sha256);
+    if (!packed.length || !allWanted) return [];
+
+    const packResponse = await fetch(`${deltaPath}.bin`);
+    if (!packResponse.ok) return [];
+    const pack = await packResponse.arrayBuffer();
+    if (pack.byteLength !== delta.pack_bytes) return [];
+
+    for (const [url, entry] of packed) {
+      const extension = url.split('.').pop().toLowerCase();
+      await cache.put(url, new Response(pack.slice(entry.offset, entry.offset + entry.bytes), {
+        headers: { 'Content-Type': CONTENT_TYPES[extension] || 'application/octet-stream' },
+      }));
+    }
+    return packed.map(([url]) => url);
+  } catch {
+    return [];
+  }
+}
+
+async function precacheWorldview(worldview, prefs = {}) {
+  const cache = await caches.open(PRERENDER_CACHE);
+  const metaKey = `${MANIFEST_META_PREFIX}${worldview}.json`;
+  let cached = 0;
+  let failed = 0;
+  let skipped = 0;
+  let removed = 0;
+  let total = 0;
+
+  try {
+    const response = await fetch(`${MANIFEST_BASE}${worldview}.json`, { cache: 'no-cache' });
+    if (!response.ok) throw new Error(`manifest ${response.status}`);
+    const manifest = await response.json();
+    const files = selectPrecacheFiles(manifest.files || {}, prefs);
+    total = Object.keys(files).length;
+
+    const previousResponse = await cache.match(metaKey);
+    const previousMeta = previousResponse ? await previousResponse.json() : {};
+    const previous = previousMeta.files || {};
+
+    // 바뀌었거나 캐시에 없는 파일
+    const pending = {};
+    for (const [url, entry] of Object.entries(files)) {
+      const unchanged = previous[url] && previous[url].sha256 === entry.sha256;
+      if (unchanged && (await cache.match(url))) {
+        skipped++;
+      } else {
+        pending[url] = entry;
+      }
+    }
+
+    const index = Object.keys(pending).length ? await fetchBundleIndex() : null;
+    for (const url of await cacheFromBundlePack(worldview, previousMeta.release, index, manifest, pending, cache)) {
+      delete pending[url];
+      cached++;
+    }
+
+    for (const [url, entry] of Object.entries(pending)) {
+      const changed = previous[url] && previous[url].sha256 !== entry.sha256;
+      try {
+        const fileResponse = await fetch(url, { cache: changed ? 'reload' : 'default' });
+        if (fileResponse.ok) {
+          await cache.put(url, fileResponse);
+          cached++;
+        } else {
+          failed++;
+        }
+      } catch {
+        failed++;
+      }
+    }
+
+    // 매니페스트에서 빠졌거나 더 이상 고르지 않는 포맷/너비
+    for (const url of Object.keys(previous)) {
+      if (!files[url] && (await cache.delete(url))) {
+        removed++;
+      }
+    }
+
+    // 실패한 파일은 다음 실행에서 다시 받도록 기록에서 제외
+    if (failed > 0) {
+      for (const url of Object.keys(files)) {
+        if (!(await cache.match(url))) delete files[url];
+      }
+    }
+    // 번들 릴리스와 내용이 같으면 다음 갱신부터 델타 팩 사용 가능
+    const bundleIndex = index || (await fetchBundleIndex());
+    const release = failed === 0 && bundleIndex?.releases?.[bundleIndex.latest]?.groups?.[worldview] === manifest.hash
+      ? bundleIndex.latest
+      : null;
+    await cache.put(metaKey, new Response(JSON.stringify({ hash: manifest.hash, release, prefs, files }), {
+      headers: { 'Content-Type': 'application/json' },
+    }));
+  } catch (error) {
+    console.error('[SW] Worldview precache failed:', worldview, error);
+  }
+
+  const clients = await self.clients.matchAll();
+  clients.forEach((client) => {
+    client.postMessage({
+      type: 'PRECACHE_COMPLETE',
+      payload: { worldview, cached, failed, skipped, removed, total },
+    });
+  });
+}
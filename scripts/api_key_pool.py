@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+HearO Gemini API 키 풀 (키/모델별 할당량 관리)
+
+여러 프로젝트 키를 돌려 쓰며 키x모델 단위로 요청 수와 한도 소진을 추적한다.
+- 요청마다 남은 여유(일일 한도 - 오늘 사용량)가 가장 큰 키 선택
+- 429(분당 한도): 해당 키x모델을 잠시 쉬게 함 (Retry-After, 없으면 rate_limit_park 초)
+- 403(일일 할당량): 다음 리셋 시각(태평양 시간 자정)까지 쉬게 함
+- 사용량은 키 지문(sha256 앞 12자리) 기준으로 scripts/.tts_key_usage.json 에 저장
+  (원본 키는 파일/로그에 남기지 않음)
+
+사용법:
+    python api_key_pool.py --stats
+"""
+
+import os
+import json
+import time
+import hashlib
+import argparse
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+# ============================================================
+# 설정
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+KEY_STATE_FILE = SCRIPT_DIR / ".tts_key_usage.json"
+
+# Gemini 일일 할당량 리셋 기준 시간대
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TZ = ZoneInfo("America/Los_Angeles")
+except Exception:  # tzdata 없는 환경 (Windows 등)
+    QUOTA_TZ = timezone(timedelta(hours=-8))
+
+DEFAULT_RATE_LIMIT_PARK = 30.0
+
+STATE_VERSION = 1
+
+# ============================================================
+# 헬퍼
+# ============================================================
+
+def key_fingerprint(api_key: str) -> str:
+    """원본 키 대신 기록/출력에 쓰는 지문"""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+def quota_day(now: Optional[float] = None) -> str:
+    """할당량 기준 날짜 (태평양 시간)"""
+    return datetime.fromtimestamp(now or time.time(), QUOTA_TZ).strftime("%Y-%m-%d")
+
+def next_quota_reset(now: Optional[float] = None) -> float:
+    """다음 일일 할당량 리셋 시각 (epoch 초)"""
+    current = datetime.fromtimestamp(now or time.time(), QUOTA_TZ)
+    midnight = (current + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return midnight.timestamp()
+
+def load_api_keys(values: Optional[List[str]], key_file: Optional[Path] = None) -> List[str]:
+    """--api-key (반복/쉼표 구분), 키 파일(한 줄에 하나, # 주석), 환경 변수에서 키 수집
+
+    환경 변수는 GEMINI_API_KEYS(쉼표 구분)와 GEMINI_API_KEY 를 본다. 중복은 제거한다.
+    """
+    raw: List[str] = []
+    for value in values or []:
+        raw.extend(value.split(","))
+    if key_file is not None:
+        with open(key_file, "r", encoding="utf-8") as f:
+            raw.extend(line.split("#", 1)[0] for line in f)
+    if not raw:
+        raw.extend(os.environ.get("GEMINI_API_KEYS", "").split(","))
+        raw.append(os.environ.get("GEMINI_API_KEY", ""))
+
+    keys: List[str] = []
+    for key in (k.strip() for k in raw):
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+# ============================================================
+# 키 풀
+# ============================================================
+
+class ApiKey:
+    """풀에서 빌려준 키 (value 는 요청 헤더에만 사용)"""
+
+    __slots__ = ("value", "fingerprint")
+
+    def __init__(self, value: str):
+        self.value = value
+        self.fingerprint = key_fingerprint(value)
+
+    def __repr__(self) -> str:
+        return f"ApiKey({self.fingerprint})"
+
+
+class KeyPool:
+    """키x모델 사용량/주차 상태 (스레드 안전, 실행 간 유지)"""
+
+    def __init__(
+        self,
+        keys: List[str],
+        daily_limits: Optional[Dict[str, int]] = None,
+        rate_limit_park: float = DEFAULT_RATE_LIMIT_PARK,
+        state_file: Optional[Path] = KEY_STATE_FILE,
+    ):
+        self.keys = [ApiKey(k) for k in keys]
+        self.daily_limits = daily_limits or {}
+        self.rate_limit_park = rate_limit_park
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # 파일 쓰기/교체 직렬화 (_lock 보다 나중에 잡음)
+        self._usage: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._load()
+
+    # --------------------------------------------------------
+    # 상태 저장
+    # --------------------------------------------------------
+
+    def _load(self) -> None:
+        if self.state_file is None or not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == STATE_VERSION:
+            self._usage = data.get("keys", {})
+
+    def save(self) -> None:
+        """사용량을 state_file 에 원자적으로 저장 (워커 스레드끼리 쓰기/교체를 직렬화)"""
+        if self.state_file is None:
+            return
+        with self._save_lock:
+            with self._lock:
+                data = {"version": STATE_VERSION, "keys": json.loads(json.dumps(self._usage))}
+            fd, tmp_name = tempfile.mkstemp(
+                prefix=f".{self.state_file.name}.", suffix=".tmp", dir=self.state_file.parent
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2, sort_keys=True)
+                os.replace(tmp_name, self.state_file)
+            except BaseException:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                raise
+
+    def _entry(self, key: ApiKey, model: str, now: float) -> Dict[str, Any]:
+        """키x모델 사용량 항목 (날짜가 바뀌면 오늘 사용량 초기화)"""
+        entry = self._usage.setdefault(key.fingerprint, {}).setdefault(model, {
+            "day": quota_day(now), "used": 0, "requests": 0, "successes": 0,
+            "rate_limited": 0, "quota_exceeded": 0, "parked_until": 0.0, "park_reason": None,
+        })
+        today = quota_day(now)
+        if entry["day"] != today:
+            entry["day"] = today
+            entry["used"] = 0
+            if entry["park_reason"] == "quota":
+                entry["parked_until"] = 0.0
+                entry["park_reason"] = None
+        return entry
+
+    # --------------------------------------------------------
+    # 선택 / 기록
+    # --------------------------------------------------------
+
+    def headroom(self, key: ApiKey, model: str, now: float) -> float:
+        """남은 여유 (한도를 모르면 사용량이 적을수록 큼) - 사용량은 요청 시작 시점에 센다"""
+        used = self._entry(key, model, now)["used"]
+        limit = self.daily_limits.get(model)
+        return (limit - used) if limit else -used
+
+    def acquire(self, model: str) -> Optional[ApiKey]:
+        """여유가 가장 큰 사용 가능 키 (모두 주차 중이거나 한도 소진이면 None)"""
+        now = time.time()
+        with self._lock:
+            best, best_room = None, None
+            for key in self.keys:
+                entry = self._entry(key, model, now)
+                if entry["parked_until"] > now:
+                    continue
+                room = self.headroom(key, model, now)
+                if self.daily_limits.get(model) and room <= 0:
+                    continue
+                if best_room is None or room > best_room:
+                    best, best_room = key, room
+            if best is not None:
+                entry = self._entry(best, model, now)
+                entry["requests"] += 1
+                entry["used"] += 1
+            return best
+
+    def release(self, key: ApiKey, model: str, outcome: str, park_for: Optional[float] = None) -> None:
+        """요청 결과 기록 - outcome: ok / rate_limit / quota / error
+
+        park_for 는 서버가 알려준 재시도 대기(Retry-After) - 429 주차 시간으로 우선 사용.
+        """
+        now = time.time()
+        park_changed = False
+        with self._lock:
+            entry = self._entry(key, model, now)
+            if outcome == "ok":
+                entry["successes"] += 1
+            elif outcome == "rate_limit":
+                entry["rate_limited"] += 1
+                if not (entry["park_reason"] == "quota" and entry["parked_until"] > now):
+                    entry["parked_until"] = now + (park_for if park_for else self.rate_limit_park)
+                    entry["park_reason"] = "rate_limit"
+                park_changed = True
+            elif outcome == "quota":
+                entry["quota_exceeded"] += 1
+                entry["parked_until"] = next_quota_reset(now)
+                entry["park_reason"] = "quota"
+                park_changed = True
+        if park_changed:
+            # 저장 실패가 요청 경로(request_model 의 finally)로 번지면 합성된 클립까지 실패 처리됨
+            try:
+                self.save()
+            except OSError as e:
+                print(f"[WARN] 키 사용량 저장 실패: {e}")
+
+    def exhausted(self, model: str) -> bool:
+        """모든 키가 오늘 이 모델 할당량을 다 썼는지 (분당 한도로 쉬는 키는 곧 복귀하므로 제외)"""
+        now = time.time()
+        with self._lock:
+            for key in self.keys:
+                entry = self._entry(key, model, now)
+                if entry["parked_until"] > now and entry["park_reason"] == "quota":
+                    continue
+                limit = self.daily_limits.get(model)
+                if limit and entry["used"] >= limit:
+                    continue
+                return False
+            return bool(self.keys)
+
+    def exhaustion(self, model: str) -> Tuple[str, float]:
+        """모든 키를 쓸 수 없을 때 (사유, 가장 빠른 복귀까지 초)
+
+        사유는 일부라도 분당 한도로 쉬는 키가 있으면 rate_limit, 아니면 quota.
+        """
+        now = time.time()
+        with self._lock:
+            waits = []
+            reason = "quota"
+            for key in self.keys:
+                entry = self._entry(key, model, now)
+                if entry["parked_until"] > now:
+                    waits.append(entry["parked_until"] - now)
+                    if entry["park_reason"] == "rate_limit":
+                        reason = "rate_limit"
+                else:
+                    # 한도 소진 (daily_limits 기준) - 다음 리셋까지
+                    waits.append(next_quota_reset(now) - now)
+            return reason, min(waits, default=0.0)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """키 지문 -> 모델 -> 사용량 (이 풀의 키만)"""
+        now = time.time()
+        with self._lock:
+            result: Dict[str, Dict[str, Any]] = {}
+            for key in self.keys:
+                for model, entry in self._usage.get(key.fingerprint, {}).items():
+                    self._entry(key, model, now)
+                    if not entry["requests"]:
+                        continue
+                    info = {k: v for k, v in entry.items() if k != "parked_until"}
+                    info["parked_for"] = round(max(0.0, entry["parked_until"] - now), 1)
+                    result.setdefault(key.fingerprint, {})[model] = info
+            return result
+
+# ============================================================
+# 메인
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="HearO Gemini API 키 풀 사용량")
+    parser.add_argument("--state-file", type=Path, default=KEY_STATE_FILE, help="키 사용량 파일")
+    parser.add_argument("--stats", action="store_true", help="키별 사용량 출력 (기본 동작)")
+    args = parser.parse_args()
+
+    if not args.state_file.exists():
+        print(f"[INFO] 사용량 기록 없음: {args.state_file}")
+        return
+    with open(args.state_file, "r", encoding="utf-8") as f:
+        usage = json.load(f).get("keys", {})
+
+    now = time.time()
+    print(f"""
+============================================================
+HearO API 키 사용량 (오늘: {quota_day(now)}, 태평양 시간 기준)
+============================================================""")
+    for fingerprint, models in sorted(usage.items()):
+        for model, entry in sorted(models.items()):
+            if not entry["requests"]:
+                continue
+            used = entry["used"] if entry["day"] == quota_day(now) else 0
+            parked = entry["parked_until"] - now
+            status = f"주차 {parked / 60:.0f}분 ({entry['park_reason']})" if parked > 0 else "사용 가능"
+            print(f"{fingerprint}  {model:32s} 오늘 {used:4d}회  429 {entry['rate_limited']:3d}  "
+                  f"403 {entry['quota_exceeded']:3d}  {status}")
+    print("============================================================")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+HearO 오디오 DSP 헬퍼 (NumPy)
+
+TTS 후처리 단계에서 공통으로 쓰는 벡터화 연산 모음.
+- WAV <-> float32 배열 변환 (16bit PCM)
+- 프레임 RMS / 에너지 기반 무음 구간 검출
+- ITU-R BS.1770 통합 라우드니스 (K-weighting은 주파수 영역에서 적용)
+"""
+
+import wave
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+
+from audio_io import AtomicWavWriter, SAMPLE_RATE
+
+# ============================================================
+# 설정
+# ============================================================
+
+# 16bit PCM 정규화 계수
+INT16_SCALE = 32768.0
+
+# 무음 판정 바닥값 (dBFS)
+SILENCE_FLOOR_DB = -100.0
+
+# BS.1770 블록 (400ms, 75% 중첩) / 게이트
+LOUDNESS_BLOCK_SEC = 0.4
+LOUDNESS_STEP_SEC = 0.1
+ABSOLUTE_GATE_LUFS = -70.0
+RELATIVE_GATE_LU = -10.0
+
+# ============================================================
+# WAV 입출력
+# ============================================================
+
+def pcm_to_array(pcm_data: bytes) -> np.ndarray:
+    """16bit PCM bytes -> float32 [-1, 1)"""
+    return np.frombuffer(pcm_data, dtype="<i2").astype(np.float32) / INT16_SCALE
+
+def array_to_pcm(samples: np.ndarray) -> bytes:
+    """float32 -> 16bit PCM bytes (클리핑 포함)"""
+    scaled = np.clip(np.round(samples * INT16_SCALE), -32768, 32767)
+    return scaled.astype("<i2").tobytes()
+
+def is_riff_wav(path: Path) -> bool:
+    """RIFF/WAVE 헤더 여부 (헤더 없는 원시 PCM .wav 구분용)"""
+    with open(path, "rb") as f:
+        head = f.read(12)
+    return head[:4] == b"RIFF" and head[8:12] == b"WAVE"
+
+def read_wav(path: Path, allow_raw: bool = True) -> Tuple[np.ndarray, int]:
+    """16bit mono WAV -> (float32 샘플, 샘플레이트)
+
+    allow_raw 이면 헤더 없이 저장된 Gemini 원시 PCM(.wav 확장자)도
+    24kHz/16bit/mono 로 간주해 읽는다.
+    """
+    if allow_raw and not is_riff_wav(path):
+        with open(path, "rb") as f:
+            pcm = f.read()
+        return pcm_to_array(pcm[:len(pcm) - len(pcm) % 2]), SAMPLE_RATE
+
+    with wave.open(str(path), "rb") as wav_file:
+        if wav_file.getsampwidth() != 2:
+            raise ValueError(f"16bit PCM만 지원: {path} ({wav_file.getsampwidth() * 8}bit)")
+        channels = wav_file.getnchannels()
+        rate = wav_file.getframerate()
+        pcm = wav_file.readframes(wav_file.getnframes())
+    samples = pcm_to_array(pcm)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples, rate
+
+def write_wav(path: Path, samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> int:
+    """float32 mono -> 16bit WAV (원자적 교체), 파일 크기 반환"""
+    with AtomicWavWriter(path, sample_rate=sample_rate) as writer:
+        writer.write(array_to_pcm(samples))
+        writer.commit()
+    return Path(path).stat().st_size
+
+# ============================================================
+# 프레임 분석
+# ============================================================
+
+def frame_rms(samples: np.ndarray, frame_len: int, hop: int = 0) -> np.ndarray:
+    """프레임별 RMS (hop=0 이면 겹치지 않는 프레임)"""
+    hop = hop or frame_len
+    if len(samples) < frame_len:
+        samples = np.pad(samples, (0, frame_len - len(samples)))
+    frames = np.lib.stride_tricks.sliding_window_view(samples, frame_len)[::hop]
+    return np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1))
+
+def to_db(values: np.ndarray) -> np.ndarray:
+    """진폭 -> dBFS (0은 바닥값)"""
+    with np.errstate(divide="ignore"):
+        db = 20.0 * np.log10(values)
+    return np.maximum(db, SILENCE_FLOOR_DB)
+
+def voiced_bounds(
+    samples: np.ndarray,
+    sample_rate: int,
+    frame_ms: float = 10.0,
+    threshold_db: float = -45.0,
+    relative_db: float = 40.0,
+) -> Tuple[int, int]:
+    """음성 구간 [시작, 끝) 샘플 인덱스
+
+    프레임 에너지가 max(threshold_db, 최대 프레임 - relative_db) 이상인
+    첫/마지막 프레임을 찾는다. 전부 무음이면 (0, 0).
+    """
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    levels = to_db(frame_rms(samples, frame_len))
+    if levels.size == 0:
+        return 0, 0
+    threshold = max(threshold_db, float(levels.max()) - relative_db)
+    voiced = np.flatnonzero(levels >= threshold)
+    if voiced.size == 0 or levels.max() <= SILENCE_FLOOR_DB:
+        return 0, 0
+    start = int(voiced[0]) * frame_len
+    end = min(len(samples), (int(voiced[-1]) + 1) * frame_len)
+    return start, end
+
+def fade_edges(samples: np.ndarray, fade_len: int) -> np.ndarray:
+    """시작/끝 선형 페이드 (잘라낸 경계의 클릭 방지)"""
+    fade_len = min(fade_len, len(samples) // 2)
+    if fade_len <= 0:
+        return samples
+    out = samples.copy()
+    ramp = np.linspace(0.0, 1.0, fade_len, dtype=np.float32)
+    out[:fade_len] *= ramp
+    out[-fade_len:] *= ramp[::-1]
+    return out
+
+# ============================================================
+# 라우드니스 (BS.1770)
+# ============================================================
+
+def _biquad_response(b: Tuple[float, float, float], a: Tuple[float, float, float], w: np.ndarray) -> np.ndarray:
+    """biquad 주파수 응답 H(e^jw)"""
+    z1 = np.exp(-1j * w)
+    z2 = z1 * z1
+    return (b[0] + b[1] * z1 + b[2] * z2) / (a[0] + a[1] * z1 + a[2] * z2)
+
+def k_weighting_response(n_fft: int, sample_rate: int) -> np.ndarray:
+    """K-weighting (high shelf + high pass) 크기 응답 - rfft 빈 기준
+
+    임의 샘플레이트용으로 BS.1770 필터를 아날로그 파라미터에서 재설계한다.
+    """
+    w = np.linspace(0.0, np.pi, n_fft // 2 + 1)
+
+    # Stage 1: high shelf (+4dB @ ~1.7kHz)
+    gain_db, q, fc = 3.99984385397, 0.7071752369554193, 1681.9744509555319
+    big_a = 10 ** (gain_db / 40)
+    w0 = 2 * np.pi * fc / sample_rate
+    alpha = np.sin(w0) / (2 * q)
+    cos_w0 = np.cos(w0)
+    sqrt_a = np.sqrt(big_a)
+    shelf_b = (
+        big_a * ((big_a + 1) + (big_a - 1) * cos_w0 + 2 * sqrt_a * alpha),
+        -2 * big_a * ((big_a - 1) + (big_a + 1) * cos_w0),
+        big_a * ((big_a + 1) + (big_a - 1) * cos_w0 - 2 * sqrt_a * alpha),
+    )
+    shelf_a = (
+        (big_a + 1) - (big_a - 1) * cos_w0 + 2 * sqrt_a * alpha,
+        2 * ((big_a - 1) - (big_a + 1) * cos_w0),
+        (big_a + 1) - (big_a - 1) * cos_w0 - 2 * sqrt_a * alpha,
+    )
+
+    # Stage 2: high pass (~38Hz)
+    q, fc = 0.5003270373253953, 38.13547087613982
+    w0 = 2 * np.pi * fc / sample_rate
+    alpha = np.sin(w0) / (2 * q)
+    cos_w0 = np.cos(w0)
+    hp_b = ((1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2)
+    hp_a = (1 + alpha, -2 * cos_w0, 1 - alpha)
+
+    return np.abs(_biquad_response(shelf_b, shelf_a, w) * _biquad_response(hp_b, hp_a, w))
+
+def integrated_loudness(samples: np.ndarray, sample_rate: int) -> float:
+    """통합 라우드니스 (LUFS), 무음이면 -inf
+
+    K-weighting은 FFT 영역 곱으로 적용하고, 400ms 블록 평균 제곱은
+    누적합으로 한 번에 계산한다.
+    """
+    if len(samples) == 0:
+        return float("-inf")
+    n_fft = 1 << int(np.ceil(np.log2(len(samples) * 2)))
+    spectrum = np.fft.rfft(samples.astype(np.float64), n_fft)
+    weighted = np.fft.irfft(spectrum * k_weighting_response(n_fft, sample_rate), n_fft)[:len(samples)]
+
+    block = int(LOUDNESS_BLOCK_SEC * sample_rate)
+    step = int(LOUDNESS_STEP_SEC * sample_rate)
+    energy = np.concatenate(([0.0], np.cumsum(weighted ** 2)))
+    if len(samples) < block:
+        powers = np.array([energy[-1] / len(samples)])
+    else:
+        starts = np.arange(0, len(samples) - block + 1, step)
+        powers = (energy[starts + block] - energy[starts]) / block
+
+    def to_lufs(power):
+        with np.errstate(divide="ignore"):
+            return -0.691 + 10 * np.log10(power)
+
+    loudness = to_lufs(powers)
+    gated = powers[loudness > ABSOLUTE_GATE_LUFS]
+    if gated.size == 0:
+        return float("-inf")
+    relative_gate = to_lufs(gated.mean()) + RELATIVE_GATE_LU
+    gated = gated[to_lufs(gated) > relative_gate]
+    if gated.size == 0:
+        return float("-inf")
+    return float(to_lufs(gated.mean()))
+
+def peak_db(samples: np.ndarray) -> float:
+    """샘플 피크 (dBFS)"""
+    if len(samples) == 0:
+        return SILENCE_FLOOR_DB
+    return float(to_db(np.array([np.abs(samples).max()]))[0])
+
+# ============================================================
+# 리샘플링
+# ============================================================
+
+def resample(samples: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """FFT 영역 리샘플링 (나이퀴스트 위 성분은 잘라냄) - 짧은 효과음용"""
+    if source_rate == target_rate or len(samples) == 0:
+        return samples
+    out_len = max(1, int(round(len(samples) * target_rate / source_rate)))
+    spectrum = np.fft.rfft(samples.astype(np.float64))
+    bins = out_len // 2 + 1
+    if bins > spectrum.size:
+        spectrum = np.pad(spectrum, (0, bins - spectrum.size))
+    result = np.fft.irfft(spectrum[:bins], out_len) * (out_len / len(samples))
+    return result.astype(np.float32)
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+HearO 오디오 스트리밍 I/O 헬퍼
+
+Gemini 응답 본문을 메모리에 올리지 않고 PCM/WAV 파일로 바로 기록한다.
+- JSON 응답에서 inlineData.data 문자열만 청크 단위로 추출
+- base64 청크 디코딩 (4바이트 경계 잔여분만 보관)
+- 임시 파일에 쓰고 완료 시 os.replace 로 원자적 교체
+- WAV 헤더는 먼저 쓰고 마지막에 RIFF/data 크기만 패치
+- 빌드 스크립트가 공유하는 파일 sha256 (변경 감지)
+"""
+
+import os
+import base64
+import hashlib
+import struct
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, BinaryIO
+
+# ============================================================
+# 설정
+# ============================================================
+
+# 기본 PCM 형식 (Gemini TTS 출력: 24kHz, 16bit, mono)
+SAMPLE_RATE = 24000
+SAMPLE_WIDTH = 2
+CHANNELS = 1
+
+# 스트리밍 청크 크기
+CHUNK_SIZE = 64 * 1024
+
+# 파일 해시 청크 크기
+HASH_CHUNK = 1024 * 1024
+
+WAV_HEADER_SIZE = 44
+
+# ============================================================
+# 응답 스트림 파싱
+# ============================================================
+
+class Base64StreamDecoder:
+    """청크 단위 base64 디코더 (4자 경계 잔여분만 보관)"""
+
+    def __init__(self):
+        self._pending = b""
+
+    def feed(self, chunk: bytes) -> bytes:
+        data = self._pending + chunk
+        usable = len(data) - (len(data) % 4)
+        self._pending = data[usable:]
+        return base64.b64decode(data[:usable]) if usable else b""
+
+    def finish(self) -> bytes:
+        """남은 데이터 디코딩 (패딩 누락 보정)"""
+        if not self._pending:
+            return b""
+        data = self._pending + b"=" * (-len(self._pending) % 4)
+        self._pending = b""
+        return base64.b64decode(data)
+
+
+def iter_inline_data(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """generateContent JSON 응답에서 inlineData.data 값을 청크로 추출
+
+    전체 JSON을 파싱하지 않고 "inlineData" 이후 첫 "data" 문자열 값만
+    스트리밍한다. base64 값에는 따옴표가 없으므로 다음 '"'가 끝이다.
+    """
+    markers = [b'"inlineData"', b'"data"']
+    state = 0  # 0~1: 마커 탐색, 2: 여는 따옴표 탐색, 3: 값 스트리밍
+    buf = b""
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buf += chunk
+
+        while buf:
+            if state < 2:
+                marker = markers[state]
+                idx = buf.find(marker)
+                if idx < 0:
+                    # 청크 경계에 걸친 마커를 위해 꼬리만 보관
+                    buf = buf[-(len(marker) - 1):]
+                    break
+                buf = buf[idx + len(marker):]
+                state += 1
+            elif state == 2:
+                buf = buf.lstrip(b" \t\r\n:")
+                if not buf:
+                    break
+                if buf[:1] != b'"':
+                    # "data"가 문자열 값이 아니면 다음 "data" 탐색
+                    state = 1
+                    continue
+                buf = buf[1:]
+                state = 3
+            else:
+                idx = buf.find(b'"')
+                if idx < 0:
+                    yield buf.replace(b"\\", b"")
+                    buf = b""
+                    break
+                yield buf[:idx].replace(b"\\", b"")
+                return
+
+
+def stream_pcm(chunks: Iterable[bytes], sink: BinaryIO) -> int:
+    """JSON 응답 청크 -> PCM을 sink에 기록, 기록한 바이트 수 반환"""
+    decoder = Base64StreamDecoder()
+    written = 0
+    for encoded in iter_inline_data(chunks):
+        pcm = decoder.feed(encoded)
+        if pcm:
+            sink.write(pcm)
+            written += len(pcm)
+    tail = decoder.finish()
+    if tail:
+        sink.write(tail)
+        written += len(tail)
+    return written
+
+# ============================================================
+# 원자적 파일 쓰기
+# ============================================================
+
+class AtomicFile:
+    """같은 디렉토리의 임시 파일에 쓰고 commit() 시 원자적으로 교체
+
+    commit() 없이 with 블록을 벗어나면(예외 포함) 임시 파일을 지운다.
+    중단된 실행이 반쯤 쓰인 파일을 최종 경로에 남기지 않는다.
+    """
+
+    def __init__(self, path: Path, temp_dir: Optional[Path] = None):
+        self.path = Path(path)
+        directory = Path(temp_dir) if temp_dir is not None else self.path.parent
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{self.path.name}.", suffix=".tmp", dir=directory)
+        self.temp_path = Path(tmp_name)
+        self._file = os.fdopen(fd, "w+b")
+        self.committed = False
+
+    def write(self, data: bytes) -> int:
+        return self._file.write(data)
+
+    def reset(self) -> None:
+        """처음부터 다시 쓰기 (재시도 시 부분 데이터 제거)"""
+        self._file.seek(0)
+        self._file.truncate()
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def _finalize(self) -> None:
+        """commit 직전 훅 (헤더 패치 등)"""
+
+    def commit(self, path: Optional[Path] = None) -> Path:
+        """fsync 후 최종 경로로 rename"""
+        target = Path(path) if path is not None else self.path
+        self._finalize()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(self.temp_path, target)
+        self.committed = True
+        return target
+
+    def discard(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+        if not self.committed:
+            try:
+                self.temp_path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self) -> "AtomicFile":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if not self.committed:
+            self.discard()
+
+
+def wav_header(data_size: int, sample_rate: int = SAMPLE_RATE,
+               channels: int = CHANNELS, sample_width: int = SAMPLE_WIDTH) -> bytes:
+    """PCM WAV 44바이트 헤더"""
+    byte_rate = sample_rate * channels * sample_width
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, channels, sample_rate, byte_rate, channels * sample_width, sample_width * 8,
+        b"data", data_size,
+    )
+
+
+class AtomicWavWriter(AtomicFile):
+    """PCM 프레임을 임시 WAV 파일에 스트리밍으로 쓰는 writer
+
+    헤더를 크기 0으로 먼저 기록하고 commit 시 RIFF/data 크기만 패치한다.
+    """
+
+    def __init__(self, path: Path, sample_rate: int = SAMPLE_RATE,
+                 channels: int = CHANNELS, sample_width: int = SAMPLE_WIDTH):
+        super().__init__(path)
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.data_size = 0
+        self._file.write(wav_header(0, sample_rate, channels, sample_width))
+
+    def write(self, data: bytes) -> int:
+        written = self._file.write(data)
+        self.data_size += written
+        return written
+
+    def reset(self) -> None:
+        self._file.seek(WAV_HEADER_SIZE)
+        self._file.truncate()
+        self.data_size = 0
+
+    def _finalize(self) -> None:
+        # 홀수 길이 data 청크는 패딩 필요 (16bit PCM에서는 발생하지 않음)
+        pad = self.data_size % 2
+        if pad:
+            self._file.write(b"\x00")
+        self._file.seek(4)
+        self._file.write(struct.pack("<I", 36 + self.data_size + pad))
+        self._file.seek(40)
+        self._file.write(struct.pack("<I", self.data_size))
+        self._file.seek(0, os.SEEK_END)
+
+
+class TeeWriter:
+    """여러 writer에 동시에 쓰기 (WAV 출력 + 캐시 blob)"""
+
+    def __init__(self, *writers):
+        self.writers = [w for w in writers if w is not None]
+
+    def write(self, data: bytes) -> int:
+        for writer in self.writers:
+            writer.write(data)
+        return len(data)
+
+    def reset(self) -> None:
+        for writer in self.writers:
+            writer.reset()
+
+
+def copy_pcm_to_wav(pcm_path: Path, output_path: Path, sample_rate: int = SAMPLE_RATE) -> int:
+    """PCM 파일 -> WAV 파일 (청크 복사, 원자적 교체), data 크기 반환"""
+    with AtomicWavWriter(output_path, sample_rate=sample_rate) as writer:
+        with open(pcm_path, "rb") as src:
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                writer.write(chunk)
+        writer.commit()
+        return writer.data_size
+
+
+# ============================================================
+# WAV 헤더 읽기
+# ============================================================
+
+@dataclass
+class WavInfo:
+    """WAV 헤더 정보 (data 청크 위치 포함)"""
+    sample_rate: int
+    channels: int
+    sample_width: int
+    data_offset: int
+    data_size: int
+    headerless: bool = False
+    truncated: bool = False         # 헤더의 data 크기보다 파일이 짧음
+
+    @property
+    def duration(self) -> float:
+        frame_size = self.channels * self.sample_width
+        return self.data_size / frame_size / self.sample_rate if frame_size and self.sample_rate else 0.0
+
+
+def read_wav_info(path: Path) -> WavInfo:
+    """헤더 청크만 읽어 WAV 정보 반환 (프레임은 읽지 않음)
+
+    RIFF 헤더가 없는 파일은 Gemini 원시 PCM(24kHz/16bit/mono)으로 간주한다.
+    data 크기가 실제 파일보다 크면(잘린 파일) 실제 남은 크기로 보정한다.
+    """
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        riff = f.read(12)
+        if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+            return WavInfo(SAMPLE_RATE, CHANNELS, SAMPLE_WIDTH, 0, file_size - file_size % 2, headerless=True)
+
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"data 청크 없음: {path}")
+            chunk_id, chunk_size = struct.unpack("<4sI", header)
+            if chunk_id == b"fmt ":
+                body = f.read(chunk_size + (chunk_size % 2))
+                audio_format, channels, rate, _, _, bits = struct.unpack("<HHIIHH", body[:16])
+                if audio_format not in (1, 0xFFFE):
+                    raise ValueError(f"PCM WAV 아님 (format {audio_format}): {path}")
+                fmt = (rate, channels, bits // 8)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise ValueError(f"fmt 청크 없음: {path}")
+                offset = f.tell()
+                size = min(chunk_size, file_size - offset)
+                return WavInfo(fmt[0], fmt[1], fmt[2], offset, size, truncated=size < chunk_size)
+            else:
+                f.seek(chunk_size + (chunk_size % 2), os.SEEK_CUR)
+
+
+def iter_pcm_chunks(path: Path, info: Optional[WavInfo] = None,
+                    chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """WAV(또는 원시 PCM) 파일의 data 영역을 청크 단위로 읽기"""
+    info = info or read_wav_info(path)
+    remaining = info.data_size
+    with open(path, "rb") as f:
+        f.seek(info.data_offset)
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+# ============================================================
+# 파일 해시
+# ============================================================
+
+def file_sha256(path: Path) -> str:
+    """파일 sha256 (청크 단위) - 빌드 스크립트 공통 변경 감지용"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(HASH_CHUNK)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+HearO 프리렌더링 에셋 무결성 점검
+
+public/assets/prerendered/{tts,stories} 를 훑어 귀로 듣기 전에는 모르던 문제를 찾는다.
+- WAV 헤더: RIFF/fmt/data 청크, 24kHz/16bit/mono 여부, 헤더 없는 원시 PCM, 잘린 파일
+- 오디오: 전부 무음, 너무 짧은 클립, 클리핑(풀스케일 연속 샘플)
+- 대사 길이 대비 음성 길이 (초당 글자 수 - 너무 빠르면 합성이 중간에 끊긴 것)
+- 짝 맞추기: 오디오 없는 대사, 대사 없는 오디오, all_stories.json 과 다른 stories/<세계관>/*.txt
+- 오디오 분석은 프로세스 풀에서, 결과는 파일 지문(크기, mtime_ns)으로 캐시
+  (scripts/.asset_audit_cache.json) - 일부만 바뀐 뒤 다시 점검하면 바뀐 파일만 분석
+
+오류가 하나라도 있으면 종료 코드 1 (--strict 면 경고도 포함).
+
+사용법:
+    python audit_assets.py
+    python audit_assets.py --worldview fantasy -j 8
+    python audit_assets.py --report audit.json --strict
+    python audit_assets.py --full     # 캐시 무시하고 전부 다시 분석
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from collections import Counter
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from audio_io import read_wav_info, iter_pcm_chunks, SAMPLE_RATE, SAMPLE_WIDTH, CHANNELS
+from audio_dsp import pcm_to_array, voiced_bounds, peak_db
+
+# ============================================================
+# 설정
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+PRERENDERED_DIR = PROJECT_ROOT / "public" / "assets" / "prerendered"
+TTS_DIR = PRERENDERED_DIR / "tts"
+STORIES_DIR = PRERENDERED_DIR / "stories"
+STORIES_FILE = STORIES_DIR / "all_stories.json"
+AUDIT_CACHE_FILE = SCRIPT_DIR / ".asset_audit_cache.json"
+
+CACHE_VERSION = 1
+
+GRADES = ["perfect", "good", "normal"]
+
+ERROR = "error"
+WARNING = "warning"
+
+# 분석 결과(캐시 대상)에 영향을 주는 옵션 - 나머지는 캐시된 수치로 판정만 다시 함
+ANALYSIS_FIELDS = ("threshold_db", "relative_db", "clip_sample", "clip_run")
+
+
+@dataclass
+class AuditOptions:
+    """점검 기준"""
+    sample_rate: int = SAMPLE_RATE
+    channels: int = CHANNELS
+    sample_width: int = SAMPLE_WIDTH
+    min_duration_sec: float = 0.5       # 이보다 짧은 클립은 오류
+    threshold_db: float = -45.0         # 무음 판정 절대 임계값
+    relative_db: float = 40.0           # 최대 프레임 대비 무음 판정 폭
+    clip_sample: int = 32767            # |샘플| 이 이 값 이상이면 풀스케일
+    clip_run: int = 4                   # 풀스케일이 이만큼 연속되면 클리핑 한 번
+    max_clip_runs: int = 3              # 허용 클리핑 횟수 (짧은 피크 몇 번은 들리지 않음)
+    min_chars_per_sec: float = 2.5      # 음성 구간 초당 글자 수 (공백 제외) 하한 - 느림/긴 무음
+    max_chars_per_sec: float = 9.0      # 상한 - 넘으면 합성이 끊긴 것으로 봄
+
+# ============================================================
+# 오디오 분석 (워커 프로세스)
+# ============================================================
+
+def clipping_runs(samples: np.ndarray, level: float, min_run: int) -> Tuple[int, int]:
+    """풀스케일 연속 구간 - (min_run 이상인 구간 수, 그 샘플 수)"""
+    clipped = np.abs(samples) >= level
+    if not clipped.any():
+        return 0, 0
+    edges = np.diff(np.concatenate(([0], clipped.view(np.int8), [0])))
+    lengths = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+    runs = lengths[lengths >= min_run]
+    return int(runs.size), int(runs.sum())
+
+def analyze_clip(path: Path, options: AuditOptions) -> Dict[str, Any]:
+    """WAV 하나의 헤더/오디오 수치 (판정은 clip_issues 에서)"""
+    path = Path(path)
+    try:
+        info = read_wav_info(path)
+    except (ValueError, OSError) as e:
+        return {"header_error": str(e)}
+
+    metrics: Dict[str, Any] = {
+        "headerless": info.headerless,
+        "truncated": info.truncated,
+        "sample_rate": info.sample_rate,
+        "channels": info.channels,
+        "sample_width": info.sample_width,
+        "data_size": info.data_size,
+        "duration": round(info.duration, 3),
+    }
+    frame_size = info.channels * info.sample_width
+    metrics["partial_frame"] = bool(frame_size and info.data_size % frame_size)
+    if info.sample_width != 2 or info.data_size < frame_size or not info.sample_rate:
+        return metrics
+
+    pcm = b"".join(iter_pcm_chunks(path, info))
+    samples = pcm_to_array(pcm[:len(pcm) - len(pcm) % frame_size])
+    if info.channels > 1:
+        samples = samples.reshape(-1, info.channels).mean(axis=1)
+    rate = info.sample_rate
+
+    start, end = voiced_bounds(samples, rate, threshold_db=options.threshold_db,
+                               relative_db=options.relative_db)
+    runs, clipped = clipping_runs(samples, options.clip_sample / 32768.0, options.clip_run)
+    metrics.update({
+        "voiced_sec": round((end - start) / rate, 3),
+        "lead_silence_sec": round(start / rate, 3) if end > start else None,
+        "trail_silence_sec": round((len(samples) - end) / rate, 3) if end > start else None,
+        "peak_db": round(peak_db(samples), 2) if samples.size else None,
+        "clip_runs": runs,
+        "clipped_samples": clipped,
+    })
+    return metrics
+
+# ============================================================
+# 판정
+# ============================================================
+
+def _issue(severity: str, code: str, path: str, detail: str) -> Dict[str, str]:
+    return {"severity": severity, "code": code, "path": path, "detail": detail}
+
+def clip_issues(rel: str, metrics: Dict[str, Any], options: AuditOptions) -> List[Dict[str, str]]:
+    """헤더/오디오 수치 -> 문제 목록"""
+    if "read_error" in metrics:
+        return [_issue(ERROR, "unreadable", rel, metrics["read_error"])]
+    if "header_error" in metrics:
+        return [_issue(ERROR, "bad_header", rel, metrics["header_error"])]
+
+    issues = []
+    if metrics["data_size"] == 0:
+        return [_issue(ERROR, "empty", rel, "오디오 데이터 없음")]
+    if metrics["truncated"]:
+        issues.append(_issue(ERROR, "truncated", rel,
+                             f"헤더의 data 크기보다 파일이 짧음 (남은 {metrics['duration']:.2f}초)"))
+    if metrics["headerless"]:
+        issues.append(_issue(WARNING, "headerless", rel, "헤더 없는 원시 PCM (postprocess_tts.py 가 헤더를 붙임)"))
+    expected = (options.sample_rate, options.sample_width, options.channels)
+    actual = (metrics["sample_rate"], metrics["sample_width"], metrics["channels"])
+    if actual != expected:
+        issues.append(_issue(ERROR, "format", rel,
+                             f"{actual[0]}Hz/{actual[1] * 8}bit/{actual[2]}ch "
+                             f"(기대 {expected[0]}Hz/{expected[1] * 8}bit/{expected[2]}ch)"))
+    if metrics["partial_frame"]:
+        issues.append(_issue(WARNING, "partial_frame", rel, "data 크기가 프레임 크기의 배수가 아님"))
+    if "voiced_sec" not in metrics:
+        return issues
+
+    if metrics["voiced_sec"] <= 0:
+        issues.append(_issue(ERROR, "silent", rel, f"전부 무음 ({metrics['duration']:.2f}초)"))
+    elif metrics["duration"] < options.min_duration_sec:
+        issues.append(_issue(ERROR, "too_short", rel, f"{metrics['duration']:.2f}초"))
+    if metrics["clip_runs"] > options.max_clip_runs:
+        issues.append(_issue(WARNING, "clipping", rel,
+                             f"{metrics['clip_runs']}곳 ({metrics['clipped_samples']}샘플)"))
+    return issues
+
+def ratio_issues(rel: str, text: str, metrics: Dict[str, Any], options: AuditOptions) -> List[Dict[str, str]]:
+    """대사 길이 대비 음성 길이 (무음/분석 실패 클립은 건너뜀)"""
+    voiced = metrics.get("voiced_sec") or 0
+    chars = len("".join(text.split()))
+    if voiced <= 0 or not chars:
+        return []
+    rate = chars / voiced
+    if rate > options.max_chars_per_sec:
+        return [_issue(ERROR, "duration_ratio", rel,
+                       f"대사 {chars}자에 음성 {voiced:.1f}초 (초당 {rate:.1f}자) - 합성이 끊겼을 수 있음")]
+    if rate < options.min_chars_per_sec:
+        return [_issue(WARNING, "duration_ratio", rel,
+                       f"대사 {chars}자에 음성 {voiced:.1f}초 (초당 {rate:.1f}자) - 긴 무음/반복 의심")]
+    return []
+
+# ============================================================
+# 대사 / 오디오 짝
+# ============================================================
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split())
+
+def load_story_lines(worldviews: List[str]) -> Tuple[Dict[Tuple[str, str, str], str], List[Dict[str, str]]]:
+    """(세계관, 운동, 등급) -> 대사, 문제 목록
+
+    generate_tts_gemini.py 와 같이 all_stories.json 이 우선이고, JSON 에 없는 줄은
+    stories/<세계관>/<운동>_<등급>.txt (generateMissingStories.ts 산출물) 에서 읽는다.
+    """
+    lines: Dict[Tuple[str, str, str], str] = {}
+    issues: List[Dict[str, str]] = []
+    stories: Dict[str, Any] = {}
+    if STORIES_FILE.exists():
+        with open(STORIES_FILE, "r", encoding="utf-8") as f:
+            stories = json.load(f)
+    json_rel = STORIES_FILE.relative_to(PRERENDERED_DIR).as_posix()
+
+    for worldview in worldviews:
+        for exercise, grades in stories.get(worldview, {}).items():
+            for grade, text in grades.items():
+                if grade not in GRADES:
+                    continue
+                if not isinstance(text, str) or not text.strip():
+                    issues.append(_issue(ERROR, "empty_story", json_rel, f"{worldview}/{exercise}/{grade}"))
+                    continue
+                lines[(worldview, exercise, grade)] = text
+
+        for path in sorted((STORIES_DIR / worldview).glob("*.txt")):
+            exercise, _, grade = path.stem.rpartition("_")
+            if grade not in GRADES:
+                continue
+            rel = path.relative_to(PRERENDERED_DIR).as_posix()
+            text = path.read_text(encoding="utf-8")
+            key = (worldview, exercise, grade)
+            if not text.strip():
+                issues.append(_issue(ERROR, "empty_story", rel, "빈 대사"))
+            elif key in lines:
+                if normalize_text(text) != normalize_text(lines[key]):
+                    issues.append(_issue(WARNING, "story_mismatch", rel,
+                                         f"all_stories.json 의 {worldview}/{exercise}/{grade} 와 다름 (JSON 기준으로 합성)"))
+            else:
+                lines[key] = text
+    return lines, issues
+
+def find_clips(worldviews: List[str]) -> Tuple[List[Tuple[str, Path]], List[Dict[str, str]]]:
+    """(tts 기준 상대 경로, 파일) 목록, 남은 임시 파일 문제 목록"""
+    clips = []
+    issues = []
+    for worldview in worldviews:
+        directory = TTS_DIR / worldview
+        if not directory.is_dir():
+            continue
+        for path in sorted(directory.iterdir()):
+            rel = path.relative_to(TTS_DIR).as_posix()
+            if path.name.startswith(".") and path.suffix == ".tmp":
+                # AtomicFile 이 중단되면 남는 파일
+                issues.append(_issue(WARNING, "stale_temp", f"tts/{rel}", "중단된 쓰기의 임시 파일"))
+            elif path.is_file() and path.suffix.lower() == ".wav":
+                clips.append((rel, path))
+    return clips, issues
+
+# ============================================================
+# 캐시
+# ============================================================
+
+def analysis_signature(options: AuditOptions) -> str:
+    payload = json.dumps({name: getattr(options, name) for name in ANALYSIS_FIELDS}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+class AuditCache:
+    """(크기, mtime_ns)가 같으면 이전 분석 수치를 재사용 (분석 옵션이 바뀌면 전부 무효)"""
+
+    def __init__(self, signature: str, path: Path = AUDIT_CACHE_FILE):
+        self.path = path
+        self.signature = signature
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            if data.get("version") == CACHE_VERSION and data.get("signature") == signature:
+                self.entries = data.get("entries", {})
+
+    def get(self, rel: str, st: os.stat_result) -> Optional[Dict[str, Any]]:
+        cached = self.entries.get(rel)
+        if cached and cached["size"] == st.st_size and cached["mtime_ns"] == st.st_mtime_ns:
+            return cached["metrics"]
+        return None
+
+    def put(self, rel: str, st: os.stat_result, metrics: Dict[str, Any]) -> None:
+        self.entries[rel] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "metrics": metrics}
+
+    def prune(self) -> None:
+        """사라진 파일 항목 제거"""
+        for rel in list(self.entries):
+            if not (TTS_DIR / rel).exists():
+                del self.entries[rel]
+
+    def save(self) -> None:
+        tmp_path = self.path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "signature": self.signature, "entries": self.entries}, f)
+        os.replace(tmp_path, self.path)
+
+# ============================================================
+# 점검
+# ============================================================
+
+def audit(
+    worldviews: List[str],
+    options: Optional[AuditOptions] = None,
+    workers: int = 1,
+    full: bool = False,
+    cache_file: Path = AUDIT_CACHE_FILE,
+) -> Dict[str, Any]:
+    """전체 점검 - {"issues", "clips", "analyzed", "cached", "lines", "metrics"}"""
+    options = options or AuditOptions()
+    cache = AuditCache(analysis_signature(options), cache_file)
+    clips, issues = find_clips(worldviews)
+
+    metrics: Dict[str, Dict[str, Any]] = {}
+    todo = []
+    stats = {}
+    for rel, path in clips:
+        stats[rel] = path.stat()
+        cached = None if full else cache.get(rel, stats[rel])
+        if cached is not None:
+            metrics[rel] = cached
+        else:
+            todo.append((rel, path))
+
+    if workers > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(analyze_clip, path, options): rel for rel, path in todo}
+            for future in as_completed(futures):
+                rel = futures[future]
+                try:
+                    metrics[rel] = future.result()
+                except Exception as e:
+                    metrics[rel] = {"read_error": f"{type(e).__name__}: {e}"}
+    else:
+        for rel, path in todo:
+            try:
+                metrics[rel] = analyze_clip(path, options)
+            except Exception as e:
+                metrics[rel] = {"read_error": f"{type(e).__name__}: {e}"}
+
+    for rel, _ in todo:
+        # 읽기 실패는 캐시하지 않음 (일시적 오류일 수 있음)
+        if "read_error" not in metrics[rel]:
+            cache.put(rel, stats[rel], metrics[rel])
+    cache.prune()
+    cache.save()
+
+    lines, story_issues = load_story_lines(worldviews)
+    issues.extend(story_issues)
+    clip_keys = {}
+    for rel, _ in clips:
+        worldview, name = rel.split("/", 1)
+        exercise, _, grade = Path(name).stem.rpartition("_")
+        clip_keys[(worldview, exercise, grade)] = rel
+
+    for rel, _ in clips:
+        issues.extend(clip_issues(f"tts/{rel}", metrics[rel], options))
+    for key, rel in sorted(clip_keys.items()):
+        text = lines.get(key)
+        if text is None:
+            issues.append(_issue(WARNING, "orphan_audio", f"tts/{rel}", "대응하는 대사 없음"))
+        else:
+            issues.extend(ratio_issues(f"tts/{rel}", text, metrics[rel], options))
+    for key in sorted(set(lines) - set(clip_keys)):
+        worldview, exercise, grade = key
+        issues.append(_issue(ERROR, "missing_audio", f"tts/{worldview}/{exercise}_{grade}.wav", "대사는 있는데 오디오 없음"))
+
+    issues.sort(key=lambda issue: (issue["severity"] != ERROR, issue["code"], issue["path"]))
+    return {
+        "issues": issues,
+        "clips": len(clips),
+        "analyzed": len(todo),
+        "cached": len(clips) - len(todo),
+        "lines": len(lines),
+        "metrics": {f"tts/{rel}": metrics[rel] for rel, _ in clips},
+    }
+
+# ============================================================
+# 메인
+# ============================================================
+
+def main():
+    defaults = AuditOptions()
+    parser = argparse.ArgumentParser(description="HearO 프리렌더링 에셋 무결성 점검")
+    parser.add_argument("--worldview", "-w", action="append", help="특정 세계관만 (반복 가능)")
+    parser.add_argument("--workers", "-j", type=int, default=os.cpu_count() or 2, help="분석 프로세스 수")
+    parser.add_argument("--full", action="store_true", help="캐시 무시하고 전부 다시 분석")
+    parser.add_argument("--cache-file", type=Path, default=AUDIT_CACHE_FILE)
+    parser.add_argument("--min-cps", type=float, default=defaults.min_chars_per_sec, help="초당 글자 수 하한")
+    parser.add_argument("--max-cps", type=float, default=defaults.max_chars_per_sec, help="초당 글자 수 상한")
+    parser.add_argument("--max-clip-runs", type=int, default=defaults.max_clip_runs, help="클립당 허용 클리핑 횟수")
+    parser.add_argument("--show", type=int, default=10, help="문제 종류별 출력 개수 (0: 전부)")
+    parser.add_argument("--strict", action="store_true", help="경고도 실패로 처리 (종료 코드 1)")
+    parser.add_argument("--report", type=Path, help="문제 목록 + 클립별 수치 JSON 저장 경로")
+    args = parser.parse_args()
+
+    options = AuditOptions(
+        min_chars_per_sec=args.min_cps,
+        max_chars_per_sec=args.max_cps,
+        max_clip_runs=args.max_clip_runs,
+    )
+    if args.worldview:
+        worldviews = args.worldview
+    else:
+        found = {p.name for p in TTS_DIR.iterdir() if p.is_dir()} if TTS_DIR.exists() else set()
+        found |= {p.name for p in STORIES_DIR.iterdir() if p.is_dir()} if STORIES_DIR.exists() else set()
+        worldviews = sorted(found)
+
+    started_at = time.monotonic()
+    result = audit(worldviews, options, workers=max(1, args.workers), full=args.full,
+                   cache_file=args.cache_file)
+    elapsed = time.monotonic() - started_at
+    issues = result["issues"]
+
+    print(f"""
+============================================================
+HearO 에셋 점검
+============================================================
+세계관: {', '.join(worldviews)}
+오디오: {result['clips']}개 (분석 {result['analyzed']}개, 캐시 {result['cached']}개)
+대사: {result['lines']}줄
+============================================================
+""")
+    by_code: Dict[str, List[Dict[str, str]]] = {}
+    for issue in issues:
+        by_code.setdefault(issue["code"], []).append(issue)
+    for code, items in by_code.items():
+        shown = items if args.show <= 0 else items[:args.show]
+        for issue in shown:
+            tag = "ERROR" if issue["severity"] == ERROR else "WARN"
+            print(f"[{tag}] {code} {issue['path']}: {issue['detail']}")
+        if len(items) > len(shown):
+            print(f"       ... {code} {len(items) - len(shown)}개 더 (--show 0 또는 --report)")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({"options": asdict(options), **result}, f, indent=2, ensure_ascii=False)
+
+    severities = Counter(issue["severity"] for issue in issues)
+    codes = Counter(issue["code"] for issue in issues)
+    code_lines = "\n".join(f"  {code}: {count}개" for code, count in sorted(codes.items())) or "  없음"
+    print(f"""
+============================================================
+결과
+============================================================
+오류: {severities.get(ERROR, 0)}개 / 경고: {severities.get(WARNING, 0)}개
+종류별:
+{code_lines}
+소요 시간: {elapsed:.1f}초
+============================================================
+""")
+    if severities.get(ERROR) or (args.strict and severities.get(WARNING)):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+HearO TTS 생성 처리량 벤치마크
+
+로컬 목 서버(mock_gemini_server.py)를 띄우고 generate_tts_gemini.py 를
+시나리오 x 동시 실행 수 조합마다 전체 카탈로그에 대해 실행한다.
+- 실행마다 임시 출력/진행/캐시 디렉토리 사용 (실제 에셋과 캐시는 건드리지 않음)
+- 클립/분, 소요 시간, 요청 수, 재시도, 폴백, 실패 수 보고
+- --output 으로 결과 JSON 저장, --compare 로 이전 결과와 클립/분 비교
+
+스케줄링/동시성 변경 전후에 같은 시드로 돌려 비교하는 기준으로 쓴다.
+목 서버 지연과 백오프는 실제보다 짧게 잡고(--latency-ms, --backoff),
+모델별 요청 간격은 --min-interval 로 조절한다.
+
+사용법:
+    python bench_tts.py
+    python bench_tts.py --scenario baseline --scenario quota -j 1 -j 4 -j 8
+    python bench_tts.py --worldview fantasy --output bench.json
+    python bench_tts.py --compare bench.json
+    python bench_tts.py -s baseline -s batchsplit --batch-size 3
+"""
+
+import sys
+import json
+import tempfile
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from mock_gemini_server import MockConfig, start_mock_server, server_state
+
+# ============================================================
+# 설정
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+GENERATOR = SCRIPT_DIR / "generate_tts_gemini.py"
+
+FLASH_MODEL = "gemini-2.5-flash-preview-tts"
+PRO_MODEL = "gemini-2.5-pro-preview-tts"
+
+# 시나리오별 목 서버 설정 (지연은 --latency-ms 기준 배율)
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "baseline": {
+        "description": "오류 없음",
+    },
+    "flaky": {
+        # 403은 키 일일 할당량 소진(리셋까지 키 제외)으로 처리되므로 multikey 에서 다룸
+        "description": "429 10% / 빈 오디오 2%",
+        "rate_429": 0.10, "rate_empty": 0.02,
+    },
+    "quota": {
+        "description": "Flash 429 50% (Pro 폴백 위주)",
+        "rate_429": 0.5, "error_models": [FLASH_MODEL],
+    },
+    "slow": {
+        "description": "지연 3배, Pro 2배 느림, 타임아웃 3%",
+        "latency_scale": 3.0, "rate_timeout": 0.03, "model_latency": {PRO_MODEL: 2.0},
+    },
+    "batchsplit": {
+        "description": "배치 요청 20%가 쉼 표시 무시 (--batch-size 와 함께, 분할 실패 -> 한 줄씩)",
+        "rate_merge_pauses": 0.2,
+    },
+    "multikey": {
+        "description": "키 4개, 키x모델 한도 10회 (소진 시 403 -> 다음 키 -> Pro)",
+        "keys": 4, "key_quota": 10,
+    },
+    "ratelimit": {
+        # 생성기 aimd 가 Retry-After 를 지키며 한도(키x모델 분당 60회) 근처로 수렴하는지
+        "description": "키x모델 간격 1초 미만이면 429 + Retry-After (aimd)",
+        "key_min_interval": 1.0, "rate_control": "aimd",
+    },
+}
+
+DEFAULT_CONCURRENCY = [1, 4]
+DEFAULT_LATENCY_MS = 300.0
+DEFAULT_BACKOFF = 0.5
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_BREAKER_COOLDOWN = 2.0
+
+# ============================================================
+# 실행
+# ============================================================
+
+def build_config(name: str, latency_ms: float, seed: int) -> MockConfig:
+    spec = SCENARIOS[name]
+    return MockConfig(
+        latency="lognormal",
+        latency_ms=latency_ms * spec.get("latency_scale", 1.0),
+        model_latency=dict(spec.get("model_latency", {})),
+        rate_429=spec.get("rate_429", 0.0),
+        rate_403=spec.get("rate_403", 0.0),
+        rate_timeout=spec.get("rate_timeout", 0.0),
+        rate_empty=spec.get("rate_empty", 0.0),
+        rate_merge_pauses=spec.get("rate_merge_pauses", 0.0),
+        error_models=list(spec.get("error_models", [])),
+        key_quota=spec.get("key_quota", 0),
+        key_min_interval=spec.get("key_min_interval", 0.0),
+        # 클라이언트 타임아웃보다 약간 길게 - 늦은 응답 정리가 벤치를 붙잡지 않도록
+        timeout_sec=DEFAULT_TIMEOUT * 1.5,
+        seed=seed,
+    )
+
+def run_generator(api_base: str, workdir: Path, concurrency: int, keys: int, args,
+                  rate_control: str = "fixed") -> Dict[str, Any]:
+    """생성기를 하위 프로세스로 실행하고 요약 JSON 반환"""
+    summary_path = workdir / "summary.json"
+    cmd = [
+        sys.executable, str(GENERATOR),
+        "--api-key", ",".join(f"mock-key-{i}" for i in range(keys)),
+        "--key-state", str(workdir / "key_usage.json"),
+        "--api-base", api_base,
+        "--output-dir", str(workdir / "tts"),
+        "--job-db", str(workdir / "jobs.sqlite3"),
+        "--progress-file", str(workdir / "progress.json"),
+        "--cache-dir", str(workdir / "cache"),
+        "--concurrency", str(concurrency),
+        "--min-interval", str(args.min_interval),
+        "--rate-control", rate_control,
+        "--rate-state", str(workdir / "rate_state.json"),
+        "--rate-limit-backoff", str(args.backoff),
+        "--timeout", str(args.timeout),
+        "--breaker-cooldown", str(args.breaker_cooldown),
+        "--summary-json", str(summary_path),
+        "--reset",
+    ]
+    if args.worldview:
+        cmd += ["--worldview", args.worldview]
+    if args.new_only:
+        cmd.append("--new-only")
+    if args.batch_size > 1:
+        cmd += ["--batch-size", str(args.batch_size)]
+
+    log_path = workdir / "generator.log"
+    with open(log_path, "w", encoding="utf-8") as log:
+        result = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT, cwd=SCRIPT_DIR)
+    if result.returncode != 0 or not summary_path.exists():
+        raise RuntimeError(f"생성기 실패 (exit {result.returncode}) - 로그: {log_path}")
+    with open(summary_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def run_case(scenario: str, concurrency: int, args) -> Dict[str, Any]:
+    """시나리오 하나 x 동시 실행 수 하나"""
+    config = build_config(scenario, args.latency_ms, args.seed)
+    server, api_base = start_mock_server(config)
+    try:
+        with tempfile.TemporaryDirectory(prefix="hearo_bench_") as tmp:
+            keys = args.keys or SCENARIOS[scenario].get("keys", 1)
+            rate_control = args.rate_control or SCENARIOS[scenario].get("rate_control", "fixed")
+            summary = run_generator(api_base, Path(tmp), concurrency, keys, args, rate_control)
+        server_stats = server_state(server).snapshot()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    stats = summary.get("stats", {})
+    clips = summary["success"]
+    wall = summary["wall_time"]
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "jobs": summary["jobs"],
+        "success": clips,
+        "fail": summary["fail"],
+        "wall_time": wall,
+        "clips_per_min": round(clips / wall * 60, 2) if wall > 0 else 0.0,
+        "requests": sum(v for k, v in stats.items() if k.startswith("requests.")),
+        "retries": stats.get("retries", 0),
+        "fallbacks": stats.get("fallbacks", 0),
+        "timeouts": sum(v for k, v in stats.items() if k.startswith("timeouts.")),
+        "pro_clips": stats.get("model.Pro", 0),
+        "keys": len(summary.get("keys", {})),
+        "batch_split_failed": stats.get("batch.split_failed", 0),
+        "breaker_trips": sum(b["trips"] for b in summary.get("breakers", {}).values()),
+        "final_rpm": {slot: info["rpm"] for slot, info in summary.get("rates", {}).items()},
+        "server_max_in_flight": server_stats["max_in_flight"],
+        "http": summary.get("http", {}),
+        "stats": stats,
+    }
+
+def load_previous(path: Optional[Path]) -> Dict[str, Dict[str, Any]]:
+    """이전 결과 -> '시나리오@동시실행' 키"""
+    if not path or not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {f"{r['scenario']}@{r['concurrency']}": r for r in data.get("results", [])}
+
+# ============================================================
+# 메인
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="HearO TTS 생성 처리량 벤치마크 (목 서버)")
+    parser.add_argument("--scenario", "-s", action="append", choices=list(SCENARIOS),
+                        help="실행할 시나리오 (반복 가능, 기본: 전체)")
+    parser.add_argument("--concurrency", "-j", type=int, action="append",
+                        help=f"동시 실행 수 (반복 가능, 기본: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--worldview", help="특정 세계관만 (기본: 전체 카탈로그)")
+    parser.add_argument("--new-only", action="store_true", help="신규 운동만")
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_LATENCY_MS, help="목 서버 기준 지연 (ms)")
+    parser.add_argument("--min-interval", type=float, default=0.0, help="모델별 최소 요청 간격 (초)")
+    parser.add_argument("--rate-control", choices=["aimd", "fixed"],
+                        help="생성기 속도 제어 (기본: 시나리오 값, 없으면 fixed - 기준선 비교용)")
+    parser.add_argument("--backoff", type=float, default=DEFAULT_BACKOFF, help="생성기 429 백오프 기준 (초)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="생성기 요청 타임아웃 (초)")
+    parser.add_argument("--breaker-cooldown", type=float, default=DEFAULT_BREAKER_COOLDOWN,
+                        help="생성기 모델 차단 쿨다운 (초)")
+    parser.add_argument("--keys", type=int, help="생성기에 넘길 목 API 키 수 (기본: 시나리오 값, 없으면 1)")
+    parser.add_argument("--batch-size", type=int, default=1, help="생성기 배치 크기 (줄/요청)")
+    parser.add_argument("--seed", type=int, default=0, help="목 서버 난수 시드")
+    parser.add_argument("--output", "-o", type=Path, help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", type=Path, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    scenarios = args.scenario or list(SCENARIOS)
+    levels = args.concurrency or DEFAULT_CONCURRENCY
+    previous = load_previous(args.compare)
+
+    print(f"""
+============================================================
+HearO TTS 처리량 벤치마크
+============================================================
+시나리오: {', '.join(scenarios)}
+동시 실행: {', '.join(map(str, levels))}
+목 지연: {args.latency_ms}ms / 간격: {args.min_interval}초 / 백오프: {args.backoff}초 / 쿨다운: {args.breaker_cooldown}초
+============================================================
+""")
+
+    results: List[Dict[str, Any]] = []
+    for scenario in scenarios:
+        for concurrency in levels:
+            print(f"[BENCH] {scenario} (-j {concurrency}): {SCENARIOS[scenario]['description']}")
+            try:
+                result = run_case(scenario, concurrency, args)
+            except RuntimeError as e:
+                print(f"      [ERROR] {e}")
+                continue
+            results.append(result)
+
+            delta = ""
+            before = previous.get(f"{scenario}@{concurrency}")
+            if before and before.get("clips_per_min"):
+                change = (result["clips_per_min"] / before["clips_per_min"] - 1) * 100
+                delta = f" ({change:+.1f}% vs 이전)"
+            print(f"      [OK] {result['success']}/{result['jobs']}개, {result['wall_time']:.1f}초, "
+                  f"{result['clips_per_min']:.1f} 클립/분{delta}")
+
+    print("""
+============================================================
+결과
+============================================================
+시나리오   -j  키   성공/전체   소요(초)  클립/분  요청  재시도  폴백   Pro  차단  타임아웃  실패""")
+    for r in results:
+        print(f"{r['scenario']:10s} {r['concurrency']:3d} {r['keys']:3d} {r['success']:5d}/{r['jobs']:<5d} "
+              f"{r['wall_time']:9.1f} {r['clips_per_min']:8.1f} {r['requests']:5d} "
+              f"{r['retries']:6d} {r['fallbacks']:5d} {r['pro_clips']:5d} {r['breaker_trips']:5d} "
+              f"{r['timeouts']:8d} {r['fail']:5d}")
+    print("============================================================")
+
+    if args.output:
+        report = {
+            "settings": {
+                "latency_ms": args.latency_ms,
+                "min_interval": args.min_interval,
+                "backoff": args.backoff,
+                "timeout": args.timeout,
+                "breaker_cooldown": args.breaker_cooldown,
+                "keys": args.keys,
+                "batch_size": args.batch_size,
+                "seed": args.seed,
+                "worldview": args.worldview,
+                "new_only": args.new_only,
+            },
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"[SAVE] {args.output}")
+
+if __name__ == "__main__":
+    main()
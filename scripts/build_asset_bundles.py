@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+HearO 프리렌더링 에셋 릴리스 번들 + 델타
+
+public/assets/prerendered/{tts,npc,stories,premix} 를 번호 붙은 릴리스로 스냅샷하고, 릴리스 사이의
+세계관별 델타(추가/변경/삭제 + 바뀐 파일 바이트를 이어 붙인 팩)를 만든다.
+클라이언트는 릴리스 N -> N+1 로 갈 때 델타 팩 하나로 바뀐 바이트만 받는다
+(public/sw.js PRECACHE_WORLDVIEW). PRERENDER_CACHE 이름을 올려 전체를 다시 받을 필요가 없다.
+- 파일 해시는 build_asset_manifest.StatCache 재사용 (크기/mtime 이 바뀐 파일만 재해시)
+- 파일 내용은 sha256 으로 주소를 매긴 로컬 객체 저장소(scripts/.asset_bundle_objects/)에 한 번만 복사
+  -> 빌드 시간이 트리 크기가 아니라 바뀐 파일 수에 비례, 지난 릴리스끼리도 델타 생성 가능
+- 내용이 그대로면 새 릴리스를 만들지 않음
+
+출력 (public/assets/prerendered/bundles/):
+    index.json                       최신 릴리스, 릴리스별 세계관 해시, 준비된 델타
+    releases/<N>/<세계관>.json        세계관 번들 (URL -> sha256, 바이트, 재생 시간)
+    deltas/<세계관>/<A>-<B>.json      델타 목록 (added / changed / removed, 팩 내 오프셋)
+    deltas/<세계관>/<A>-<B>.bin       added + changed 파일 바이트를 이어 붙인 팩
+
+사용법:
+    python build_asset_bundles.py                  # 새 릴리스 + 최근 3개 릴리스에서 오는 델타
+    python build_asset_bundles.py -w fantasy       # fantasy 만 다시 스캔 (나머지는 이전 릴리스 유지)
+    python build_asset_bundles.py --delta 3 7      # 임의의 두 릴리스 사이 델타
+    python build_asset_bundles.py --list
+    python build_asset_bundles.py --keep 10        # 최근 10개 릴리스만 남기고 델타/객체 정리
+"""
+
+import sys
+import json
+import time
+import shutil
+import argparse
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from audio_io import AtomicFile
+from build_asset_manifest import (
+    StatCache, iter_assets, asset_url, asset_entry, manifest_version, save_json, PRERENDERED_DIR, SCRIPT_DIR,
+)
+
+# ============================================================
+# 설정
+# ============================================================
+
+BUNDLE_DIR = PRERENDERED_DIR / "bundles"
+RELEASE_DIR = BUNDLE_DIR / "releases"
+DELTA_DIR = BUNDLE_DIR / "deltas"
+INDEX_FILE = BUNDLE_DIR / "index.json"
+OBJECT_DIR = SCRIPT_DIR / ".asset_bundle_objects"
+
+BUNDLE_VERSION = 1
+
+# 새 릴리스마다 델타를 미리 만들어 둘 이전 릴리스 수
+DEFAULT_DELTA_FROM = 3
+
+# 릴리스 0 = 빈 상태 (델타 0-N 은 세계관 전체 팩)
+EMPTY_RELEASE = 0
+
+# ============================================================
+# 객체 저장소
+# ============================================================
+
+def object_path(sha256: str) -> Path:
+    return OBJECT_DIR / sha256[:2] / sha256
+
+def store_object(path: Path, sha256: str) -> bool:
+    """파일 내용을 객체 저장소에 복사 (이미 있으면 건너뜀) - 새로 저장했는지 반환"""
+    target = object_path(sha256)
+    if target.exists():
+        return False
+    with AtomicFile(target) as out, open(path, "rb") as f:
+        shutil.copyfileobj(f, out)
+        out.commit()
+    return True
+
+# ============================================================
+# 릴리스
+# ============================================================
+
+def load_index() -> Dict[str, Any]:
+    if INDEX_FILE.exists():
+        with open(INDEX_FILE, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") == BUNDLE_VERSION:
+            return index
+    return {"version": BUNDLE_VERSION, "latest": EMPTY_RELEASE, "releases": {}}
+
+def load_bundle(release: int, group: str) -> Dict[str, Any]:
+    """릴리스의 세계관 번들 (릴리스 0 이거나 그 세계관이 없으면 빈 번들)"""
+    path = RELEASE_DIR / str(release) / f"{group}.json"
+    if release == EMPTY_RELEASE or not path.exists():
+        return {"group": group, "release": release, "hash": None, "files": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def snapshot(worldviews: Optional[List[str]] = None, rehash: bool = False) -> Tuple[Dict[str, Dict[str, Dict[str, Any]]], Dict[str, int]]:
+    """그룹 -> URL -> {sha256, bytes, duration, 역할} 과 통계 (해시 재사용/재계산, 새 객체)"""
+    cache = StatCache()
+    groups: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    seen = set()
+    stored = 0
+    for group, path in iter_assets(worldviews):
+        rel = path.relative_to(PRERENDERED_DIR).as_posix()
+        seen.add(rel)
+        meta = cache.describe(path, rel, rehash)
+        groups.setdefault(group, {})[asset_url(path)] = asset_entry(path, meta)
+        stored += store_object(path, meta["sha256"])
+    if not worldviews:
+        cache.prune(seen)
+    cache.save()
+    return groups, {"hits": cache.hits, "misses": cache.misses, "stored": stored}
+
+def build_release(
+    worldviews: Optional[List[str]] = None,
+    rehash: bool = False,
+    delta_from: int = DEFAULT_DELTA_FROM,
+) -> Tuple[Optional[int], Dict[str, Any]]:
+    """트리를 스냅샷해 새 릴리스 저장 - (릴리스 번호, 통계), 바뀐 게 없으면 번호는 None
+
+    worldviews 를 주면 그 세계관만 다시 스캔하고 나머지는 최신 릴리스 번들을 그대로 쓴다.
+    """
+    index = load_index()
+    latest = index["latest"]
+    groups, stats = snapshot(worldviews, rehash)
+
+    previous_hashes = index["releases"].get(str(latest), {}).get("groups", {}) if latest else {}
+    hashes = {} if not worldviews else {
+        group: value for group, value in previous_hashes.items() if group not in worldviews
+    }
+    hashes.update({group: manifest_version(files) for group, files in groups.items()})
+    changed = sorted(group for group in hashes if hashes[group] != previous_hashes.get(group))
+    removed = sorted(set(previous_hashes) - set(hashes))
+    stats.update({"changed": changed, "removed": removed, "deltas": 0, "delta_bytes": 0})
+    if not changed and not removed:
+        return None, stats
+
+    release = latest + 1
+    for group in sorted(hashes):
+        if group in groups:
+            files = groups[group]
+        else:
+            files = load_bundle(latest, group)["files"]
+        save_json(RELEASE_DIR / str(release) / f"{group}.json", {
+            "version": BUNDLE_VERSION,
+            "group": group,
+            "release": release,
+            "hash": hashes[group],
+            "bytes": sum(e["bytes"] for e in files.values()),
+            "files": files,
+        })
+
+    index["releases"][str(release)] = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "groups": hashes,
+        "deltas": {},
+    }
+    index["latest"] = release
+    # 최근 릴리스들에서 오는 델타 - 그 사이에 바뀐 세계관만
+    sources = sorted((int(r) for r in index["releases"] if int(r) < release), reverse=True)[:delta_from]
+    for source in sources:
+        source_hashes = index["releases"][str(source)]["groups"]
+        for group in sorted(hashes):
+            if source_hashes.get(group) == hashes[group]:
+                continue
+            delta = make_delta(group, source, release)
+            index["releases"][str(release)]["deltas"].setdefault(group, []).append(source)
+            stats["deltas"] += 1
+            stats["delta_bytes"] += delta["pack_bytes"]
+    save_json(INDEX_FILE, index)
+    return release, stats
+
+# ============================================================
+# 델타
+# ============================================================
+
+def diff_bundles(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """두 번들의 URL 별 차이 - added / changed (새 해시 기준) / removed"""
+    old_files, new_files = old["files"], new["files"]
+    added = {url: entry for url, entry in new_files.items() if url not in old_files}
+    changed = {
+        url: entry for url, entry in new_files.items()
+        if url in old_files and old_files[url]["sha256"] != entry["sha256"]
+    }
+    removed = sorted(url for url in old_files if url not in new_files)
+    return {"added": added, "changed": changed, "removed": removed}
+
+def make_delta(group: str, source: int, target: int) -> Dict[str, Any]:
+    """릴리스 source -> target 델타 목록 + 팩 저장 (source 0 은 세계관 전체)"""
+    old = load_bundle(source, group)
+    new = load_bundle(target, group)
+    diff = diff_bundles(old, new)
+    name = f"{source}-{target}"
+
+    offset = 0
+    entries: Dict[str, Dict[str, Dict[str, Any]]] = {"added": {}, "changed": {}}
+    with AtomicFile(DELTA_DIR / group / f"{name}.bin") as pack:
+        for kind in ("added", "changed"):
+            for url in sorted(diff[kind]):
+                entry = diff[kind][url]
+                with open(object_path(entry["sha256"]), "rb") as f:
+                    shutil.copyfileobj(f, pack)
+                entries[kind][url] = {**entry, "offset": offset}
+                offset += entry["bytes"]
+        pack.commit()
+
+    delta = {
+        "version": BUNDLE_VERSION,
+        "group": group,
+        "from": source,
+        "to": target,
+        "from_hash": old["hash"],
+        "to_hash": new["hash"],
+        "added": entries["added"],
+        "changed": entries["changed"],
+        "removed": diff["removed"],
+        "pack": f"{name}.bin",
+        "pack_bytes": offset,
+    }
+    save_json(DELTA_DIR / group / f"{name}.json", delta)
+    return delta
+
+# ============================================================
+# 정리
+# ============================================================
+
+def prune_releases(keep: int) -> Dict[str, int]:
+    """최근 keep 개 릴리스만 남기고, 지운 릴리스를 잇는 델타와 참조 없는 객체 정리"""
+    index = load_index()
+    releases = sorted(int(r) for r in index["releases"])
+    dropped = releases[:-keep] if keep > 0 else []
+    for release in dropped:
+        shutil.rmtree(RELEASE_DIR / str(release), ignore_errors=True)
+        del index["releases"][str(release)]
+    kept = {int(r) for r in index["releases"]}
+
+    deltas_removed = 0
+    for info in index["releases"].values():
+        info["deltas"] = {
+            group: kept_sources for group, sources in info["deltas"].items()
+            if (kept_sources := [s for s in sources if s in kept or s == EMPTY_RELEASE])
+        }
+    for path in sorted(DELTA_DIR.glob("*/*-*.*")) if DELTA_DIR.exists() else []:
+        source, _, target = path.stem.partition("-")
+        if int(target) not in kept or (int(source) not in kept and int(source) != EMPTY_RELEASE):
+            path.unlink()
+            deltas_removed += path.suffix == ".json"
+
+    referenced: Set[str] = set()
+    for release in kept:
+        for bundle_path in (RELEASE_DIR / str(release)).glob("*.json"):
+            with open(bundle_path, "r", encoding="utf-8") as f:
+                referenced.update(e["sha256"] for e in json.load(f)["files"].values())
+    objects_removed = freed = 0
+    for path in OBJECT_DIR.glob("*/*") if OBJECT_DIR.exists() else []:
+        if path.name not in referenced:
+            freed += path.stat().st_size
+            path.unlink()
+            objects_removed += 1
+    save_json(INDEX_FILE, index)
+    return {"releases": len(dropped), "deltas": deltas_removed, "objects": objects_removed, "freed_bytes": freed}
+
+# ============================================================
+# 메인
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="HearO 프리렌더링 에셋 릴리스 번들 + 델타")
+    parser.add_argument("--worldview", "-w", action="append", help="이 세계관만 다시 스캔 (반복 가능)")
+    parser.add_argument("--rehash", action="store_true", help="해시 캐시 무시하고 전부 재해시")
+    parser.add_argument("--delta-from", type=int, default=DEFAULT_DELTA_FROM,
+                        help=f"새 릴리스로 오는 델타를 만들 이전 릴리스 수 (기본: {DEFAULT_DELTA_FROM})")
+    parser.add_argument("--delta", nargs=2, type=int, metavar=("FROM", "TO"),
+                        help="두 릴리스 사이 델타만 생성 (FROM 0 = 전체)")
+    parser.add_argument("--list", action="store_true", help="릴리스 목록 출력")
+    parser.add_argument("--keep", type=int, help="최근 N개 릴리스만 남기고 정리")
+    args = parser.parse_args()
+
+    if args.list:
+        index = load_index()
+        for release, info in sorted(index["releases"].items(), key=lambda item: int(item[0])):
+            deltas = ", ".join(f"{group}<-{'/'.join(map(str, sources))}"
+                               for group, sources in sorted(info["deltas"].items()))
+            print(f"{release:>4} {info['created_at']}  {len(info['groups'])}개 세계관  델타: {deltas or '-'}")
+        return
+
+    if args.delta:
+        source, target = args.delta
+        index = load_index()
+        if str(target) not in index["releases"] or (source and str(source) not in index["releases"]):
+            print(f"[ERROR] 없는 릴리스: {source} -> {target}")
+            sys.exit(1)
+        source_hashes = index["releases"].get(str(source), {}).get("groups", {})
+        target_hashes = index["releases"][str(target)]["groups"]
+        sources = index["releases"][str(target)]["deltas"]
+        for group in sorted(target_hashes):
+            if source_hashes.get(group) == target_hashes[group]:
+                print(f"[DELTA] {group} {source}->{target}: 변경 없음")
+                continue
+            delta = make_delta(group, source, target)
+            if source not in sources.setdefault(group, []):
+                sources[group].append(source)
+            print(f"[DELTA] {group} {source}->{target}: 추가 {len(delta['added'])} / 변경 {len(delta['changed'])} / "
+                  f"삭제 {len(delta['removed'])}, {delta['pack_bytes'] / 1024:.1f}KB")
+        save_json(INDEX_FILE, index)
+        return
+
+    if args.keep is not None:
+        result = prune_releases(args.keep)
+        print(f"[PRUNE] 릴리스 {result['releases']}개, 델타 {result['deltas']}개, 객체 {result['objects']}개 "
+              f"({result['freed_bytes'] / 1024 / 1024:.1f}MB) 정리")
+        return
+
+    started_at = time.monotonic()
+    release, stats = build_release(args.worldview, args.rehash, args.delta_from)
+    elapsed = time.monotonic() - started_at
+    print(f"""
+============================================================
+HearO 에셋 릴리스
+============================================================
+릴리스: {release if release is not None else '변경 없음 (' + str(load_index()['latest']) + ' 유지)'}
+바뀐 세계관: {', '.join(stats['changed']) or '-'}{' / 삭제: ' + ', '.join(stats['removed']) if stats['removed'] else ''}
+해시 재사용: {stats['hits']}개 / 재계산: {stats['misses']}개 / 새 객체: {stats['stored']}개
+델타: {stats['deltas']}개 ({stats['delta_bytes'] / 1024 / 1024:.1f}MB)
+소요 시간: {elapsed:.1f}초
+출력: {BUNDLE_DIR}
+============================================================
+""")
+
+if __name__ == "__main__":
+    main()
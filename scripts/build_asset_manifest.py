@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+HearO 프리렌더링 에셋 매니페스트 빌더
+
+public/assets/prerendered/{tts,npc,stories,premix} 를 스캔해 세계관별 매니페스트를 만든다.
+서비스 워커는 이를 이용해 세계관 단위 사전 캐싱과 해시 기반 무효화를 한다.
+- 파일별 sha256, 바이트 크기, WAV 재생 시간(헤더만 읽음)
+- 파일별 역할/포맷 (원본 master, 인코딩/리사이즈 결과 variant, 이미지 너비) - 서비스 워커는
+  이를 보고 클라이언트가 실제로 재생/표시하는 포맷만 사전 캐싱한다
+- 크기/mtime이 바뀐 파일만 다시 해시 (scripts/.asset_manifest_cache.json)
+- 출력: public/assets/prerendered/manifest/<세계관>.json, common.json, index.json
+
+사용법:
+    python build_asset_manifest.py
+    python build_asset_manifest.py --worldview fantasy
+    python build_asset_manifest.py --rehash     # 캐시 무시하고 전부 재해시
+"""
+
+import os
+import re
+import json
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from audio_io import read_wav_info, file_sha256
+
+# ============================================================
+# 설정
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+PUBLIC_DIR = PROJECT_ROOT / "public"
+PRERENDERED_DIR = PUBLIC_DIR / "assets" / "prerendered"
+MANIFEST_DIR = PRERENDERED_DIR / "manifest"
+STAT_CACHE_FILE = SCRIPT_DIR / ".asset_manifest_cache.json"
+
+# 스캔 대상 (prerendered 하위)
+ASSET_ROOTS = ["tts", "npc", "stories", "premix"]
+
+# 클라이언트가 아직 읽지 않는 파일 (매니페스트/번들에서 제외, 사용처가 생기면 빼기)
+EXCLUDED_NAMES = {"lipsync.bin", "lipsync.json"}  # lipsync_tts.py
+
+# 세계관 디렉토리 밖의 파일이 들어가는 매니페스트 이름
+COMMON_GROUP = "common"
+
+MANIFEST_VERSION = 1
+
+# 역할 판정 - 확장자 -> (종류, 포맷)
+MASTER_FORMATS = {
+    ".wav": ("audio", "wav"),
+    ".png": ("image", "png"),
+    ".jpg": ("image", "jpeg"),
+    ".jpeg": ("image", "jpeg"),
+}
+AUDIO_VARIANT_FORMATS = {".ogg": "opus", ".m4a": "aac"}       # encode_tts_audio.py
+IMAGE_VARIANT_PATTERN = re.compile(r"^(?P<stem>.+)\.(?P<width>\d+)w\.(?P<format>webp|avif)$")  # optimize_npc_images.py
+DATA_SUFFIXES = {".json"}
+
+# ============================================================
+# 해시 캐시
+# ============================================================
+
+class StatCache:
+    """(크기, mtime_ns)가 같으면 이전 해시/메타데이터를 재사용하는 캐시"""
+
+    def __init__(self, path: Path = STAT_CACHE_FILE):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f).get("entries", {})
+        self.hits = 0
+        self.misses = 0
+
+    def describe(self, path: Path, rel: str, rehash: bool = False) -> Dict[str, Any]:
+        """파일 메타데이터 (해시, 크기, 재생 시간)"""
+        st = path.stat()
+        cached = self.entries.get(rel)
+        if (not rehash and cached and cached["size"] == st.st_size
+                and cached["mtime_ns"] == st.st_mtime_ns):
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        entry: Dict[str, Any] = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": file_sha256(path),
+        }
+        if path.suffix.lower() == ".wav":
+            try:
+                entry["duration"] = round(read_wav_info(path).duration, 3)
+            except (ValueError, OSError):
+                entry["duration"] = None
+        self.entries[rel] = entry
+        return entry
+
+    def prune(self, seen: set) -> None:
+        """사라진 파일 항목 제거"""
+        for rel in list(self.entries):
+            if rel not in seen:
+                del self.entries[rel]
+
+    def save(self) -> None:
+        tmp_path = self.path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "entries": self.entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+# ============================================================
+# 스캔
+# ============================================================
+
+def iter_assets(worldviews: Optional[List[str]] = None) -> List[Tuple[str, Path]]:
+    """(그룹, 파일) 목록 - 그룹은 세계관 또는 common"""
+    assets = []
+    for root_name in ASSET_ROOTS:
+        root = PRERENDERED_DIR / root_name
+        if not root.exists():
+            continue
+        for path in sorted(root.rglob("*")):
+            if not path.is_file() or path.name.startswith(".") or path.suffix == ".tmp":
+                continue
+            if path.name in EXCLUDED_NAMES:
+                continue
+            rel_parts = path.relative_to(root).parts
+            group = rel_parts[0] if len(rel_parts) > 1 else COMMON_GROUP
+            if worldviews and group not in worldviews:
+                continue
+            assets.append((group, path))
+    return assets
+
+def asset_role(path: Path) -> Dict[str, Any]:
+    """매니페스트 항목의 역할 정보
+
+    role: master (원본 - 같은 clip 의 variant 를 쓸 수 없을 때만 받음), variant (인코딩/리사이즈 결과),
+          data (그대로 읽는 JSON), source (빌드 입력 - 클라이언트가 쓰지 않음)
+    clip: 같은 에셋의 master/variant 를 묶는 키 (prerendered 기준, 확장자 제외)
+    """
+    rel = path.relative_to(PRERENDERED_DIR)
+    suffix = path.suffix.lower()
+    match = IMAGE_VARIANT_PATTERN.match(path.name)
+    if match:
+        clip = (rel.parent / match.group("stem")).as_posix()
+        return {"role": "variant", "kind": "image", "format": match.group("format"),
+                "width": int(match.group("width")), "clip": clip}
+    clip = rel.with_suffix("").as_posix()
+    if suffix in AUDIO_VARIANT_FORMATS:
+        return {"role": "variant", "kind": "audio", "format": AUDIO_VARIANT_FORMATS[suffix], "clip": clip}
+    if suffix in MASTER_FORMATS:
+        kind, fmt = MASTER_FORMATS[suffix]
+        return {"role": "master", "kind": kind, "format": fmt, "clip": clip}
+    if suffix in DATA_SUFFIXES:
+        return {"role": "data", "kind": "data", "format": suffix[1:], "clip": clip}
+    return {"role": "source", "kind": "data", "format": suffix[1:], "clip": clip}
+
+def asset_entry(path: Path, meta: Dict[str, Any]) -> Dict[str, Any]:
+    """매니페스트/번들 파일 항목 (해시, 크기, 재생 시간, 역할)"""
+    entry = {"sha256": meta["sha256"], "bytes": meta["size"], **asset_role(path)}
+    if meta.get("duration") is not None:
+        entry["duration"] = meta["duration"]
+    return entry
+
+def asset_url(path: Path) -> str:
+    """public 기준 URL 경로"""
+    return "/" + path.relative_to(PUBLIC_DIR).as_posix()
+
+def manifest_version(files: Dict[str, Dict[str, Any]]) -> str:
+    """매니페스트 내용 해시 (URL + 파일 해시 기준)"""
+    digest = hashlib.sha256()
+    for url in sorted(files):
+        digest.update(f"{url}\0{files[url]['sha256']}\n".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+def save_json(path: Path, data: Dict[str, Any]) -> None:
+    """JSON 원자적 저장"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def build_manifests(
+    worldviews: Optional[List[str]] = None,
+    rehash: bool = False
+) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """세계관별 매니페스트 생성 - (상위 인덱스, 해시 캐시 통계) 반환"""
+    cache = StatCache()
+    groups: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    seen = set()
+
+    for group, path in iter_assets(worldviews):
+        rel = path.relative_to(PRERENDERED_DIR).as_posix()
+        seen.add(rel)
+        meta = cache.describe(path, rel, rehash)
+        groups.setdefault(group, {})[asset_url(path)] = asset_entry(path, meta)
+
+    if not worldviews:
+        cache.prune(seen)
+    cache.save()
+
+    index_path = MANIFEST_DIR / "index.json"
+    index: Dict[str, Any] = {"version": MANIFEST_VERSION, "manifests": {}}
+    if worldviews and index_path.exists():
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+
+    for group, files in sorted(groups.items()):
+        version = manifest_version(files)
+        save_json(MANIFEST_DIR / f"{group}.json", {
+            "version": MANIFEST_VERSION,
+            "group": group,
+            "hash": version,
+            "bytes": sum(e["bytes"] for e in files.values()),
+            "files": files,
+        })
+        index["manifests"][group] = {
+            "url": f"{group}.json",
+            "hash": version,
+            "files": len(files),
+            "bytes": sum(e["bytes"] for e in files.values()),
+        }
+
+    if not worldviews:
+        # 전체 빌드에서 사라진 그룹 정리
+        for group in list(index["manifests"]):
+            if group not in groups:
+                (MANIFEST_DIR / f"{group}.json").unlink(missing_ok=True)
+                del index["manifests"][group]
+
+    save_json(index_path, index)
+    return index, {"hits": cache.hits, "misses": cache.misses}
+
+# ============================================================
+# 메인
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="HearO 프리렌더링 에셋 매니페스트 빌더")
+    parser.add_argument("--worldview", "-w", action="append", help="특정 세계관만 (반복 가능)")
+    parser.add_argument("--rehash", action="store_true", help="캐시 무시하고 전부 재해시")
+    args = parser.parse_args()
+
+    index, stats = build_manifests(args.worldview, args.rehash)
+
+    print(f"""
+============================================================
+HearO 에셋 매니페스트
+============================================================""")
+    for group, info in sorted(index["manifests"].items()):
+        print(f"{group:10s} 파일 {info['files']:4d}개  {info['bytes'] / 1024 / 1024:7.1f}MB  hash {info['hash']}")
+    print(f"""============================================================
+해시 재사용: {stats['hits']}개 / 재계산: {stats['misses']}개
+출력: {MANIFEST_DIR}
+============================================================
+""")
+
+if __name__ == "__main__":
+    main()
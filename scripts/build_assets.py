@@ -0,0 +1,606 @@
+#!/usr/bin/env python3
+"""
+HearO 프리렌더링 에셋 증분 빌드 (make 방식)
+
+스토리 -> TTS -> 후처리 -> 압축 인코딩/립싱크 -> 매니페스트 단계를 타깃 그래프로 선언하고,
+입력 지문이 바뀐 타깃과 그 하위 타깃만 의존 순서대로 워커 풀에서 다시 만든다.
+- 타깃 입력: 스토리 텍스트, 음성 설정, 후처리/인코딩 옵션, 생성 스크립트 소스 해시
+- 타깃 지문 = 단계 + 입력 + 의존 타깃 지문 (scripts/.asset_build_state.json 에 저장)
+- 지문이 다르거나, 출력이 없거나, 기록된 출력 해시와 다르면 dirty (하위 타깃으로 전파)
+- 기록이 없는데 출력이 이미 있으면 재생성 없이 현재 지문으로 채택 (--force 로 무시)
+- 실패한 타깃의 하위 타깃은 건너뜀, 성공한 타깃은 바로 기록 (중단 후 이어서 빌드)
+- --dry-run: 단계별 계획과 예상 API 호출 수 (캐시 재사용분 제외) 출력
+
+단계:
+    stories:txt            generateMissingStories.ts -> stories/<세계관>/*.txt
+    tts:<세계관>/<클립>      Gemini TTS (generate_tts_gemini.generate_tts, 캐시 재사용)
+    post:<세계관>/<클립>     무음 트리밍 + 라우드니스 정규화 (WAV 제자리 수정)
+    encode:<세계관>/<클립>   Opus/AAC 압축본 + tts/encodings.json (ffmpeg 있을 때만)
+    lipsync:<세계관>        RMS + 비즘 타임라인 (tts/<세계관>/lipsync.bin/json)
+    manifest               세계관별 에셋 매니페스트
+    prompts                스카이박스 프롬프트 샤드 (prompt_generator.py -> skybox_prompts/)
+
+사용법:
+    python build_assets.py --dry-run
+    python build_assets.py -j 4
+    python build_assets.py "tts:fantasy/*" "post:fantasy/*"
+    python build_assets.py --worldview fantasy --exercise squat --force
+"""
+
+import os
+import sys
+import json
+import time
+import fnmatch
+import shutil
+import hashlib
+import argparse
+import subprocess
+import threading
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
+
+import generate_tts_gemini as tts
+from api_key_pool import KeyPool, load_api_keys, KEY_STATE_FILE
+from build_asset_manifest import build_manifests, file_sha256, MANIFEST_DIR, PRERENDERED_DIR
+
+# ============================================================
+# 설정
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+TTS_DIR = PRERENDERED_DIR / "tts"
+STORIES_DIR = PRERENDERED_DIR / "stories"
+STATE_FILE = SCRIPT_DIR / ".asset_build_state.json"
+
+STORY_SCRIPT = SCRIPT_DIR / "generateMissingStories.ts"
+PROMPT_SCRIPT = SCRIPT_DIR / "prompt_generator.py"
+PROMPT_OUTPUT = PROJECT_ROOT / "skybox_prompts" / "index.json"
+
+STATE_VERSION = 1
+
+# 단계 순서 (계획 출력용)
+STAGES = ["stories", "tts", "post", "encode", "lipsync", "manifest", "prompts"]
+
+# ============================================================
+# 타깃 / 상태
+# ============================================================
+
+@dataclass
+class Target:
+    """빌드 타깃 하나"""
+    id: str
+    stage: str
+    deps: List[str]
+    inputs: Dict[str, Any]                  # 지문에 들어가는 입력 (값이 함수면 계산 시점에 호출)
+    outputs: List[Path]
+    action: Callable[[], None]
+    hash_outputs: bool = True               # False 면 출력 존재만 확인 (다음 단계가 제자리 수정하는 파일 등)
+    api_calls: int = 0                      # 예상 외부 API 호출 수
+    fingerprint: str = ""
+
+    def compute_fingerprint(self, dep_fingerprints: List[str]) -> str:
+        inputs = {k: (v() if callable(v) else v) for k, v in self.inputs.items()}
+        payload = json.dumps([self.stage, inputs, dep_fingerprints], ensure_ascii=False,
+                             sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def rel_path(path: Path) -> str:
+    try:
+        return path.relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        return str(path)
+
+
+class BuildState:
+    """타깃별 지문과 출력 해시 (크기/mtime 이 같으면 해시 재사용)"""
+
+    def __init__(self, path: Path = STATE_FILE):
+        self.path = path
+        self.targets: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == STATE_VERSION:
+                self.targets = data.get("targets", {})
+
+    def check_outputs(self, target: Target) -> Optional[str]:
+        """출력 상태 - 문제 없으면 None, 아니면 사유"""
+        record = self.targets.get(target.id, {})
+        for path in target.outputs:
+            if not path.exists():
+                return f"출력 없음: {rel_path(path)}"
+            if not target.hash_outputs:
+                continue
+            recorded = record.get("outputs", {}).get(rel_path(path))
+            if recorded is None:
+                return f"출력 기록 없음: {rel_path(path)}"
+            st = path.stat()
+            if recorded["size"] == st.st_size and recorded["mtime_ns"] == st.st_mtime_ns:
+                continue
+            if file_sha256(path) != recorded["sha256"]:
+                return f"출력 변경됨: {rel_path(path)}"
+        return None
+
+    def record(self, target: Target, fingerprint: str) -> None:
+        outputs = {}
+        if target.hash_outputs:
+            for path in target.outputs:
+                st = path.stat()
+                outputs[rel_path(path)] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                                           "sha256": file_sha256(path)}
+        with self._lock:
+            self.targets[target.id] = {"fingerprint": fingerprint, "outputs": outputs, "built_at": time.time()}
+
+    def save(self) -> None:
+        with self._lock:
+            data = json.dumps({"version": STATE_VERSION, "targets": self.targets}, indent=1, ensure_ascii=False)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+# ============================================================
+# 그래프
+# ============================================================
+
+class BuildGraph:
+    """타깃 그래프 - 지문 계산, dirty 집합, 병렬 실행"""
+
+    def __init__(self):
+        self.targets: Dict[str, Target] = {}
+
+    def add(self, target: Target) -> Target:
+        self.targets[target.id] = target
+        return target
+
+    def order(self, selected: Optional[Set[str]] = None) -> List[str]:
+        """의존 순서 (selected 가 주어지면 그 타깃과 의존 타깃만)"""
+        result: List[str] = []
+        visiting: Set[str] = set()
+        done: Set[str] = set()
+
+        def visit(target_id: str) -> None:
+            if target_id in done:
+                return
+            if target_id in visiting:
+                raise ValueError(f"순환 의존: {target_id}")
+            visiting.add(target_id)
+            for dep in self.targets[target_id].deps:
+                visit(dep)
+            visiting.discard(target_id)
+            done.add(target_id)
+            result.append(target_id)
+
+        for target_id in self.targets:
+            if selected is None or target_id in selected:
+                visit(target_id)
+        return result
+
+    def plan(self, order: List[str], state: BuildState, force: bool = False) -> Tuple[Dict[str, str], List[str]]:
+        """(dirty 타깃 -> 사유, 채택할 타깃) - order 순서로 지문 계산"""
+        dirty: Dict[str, str] = {}
+        adopt: List[str] = []
+        for target_id in order:
+            target = self.targets[target_id]
+            target.fingerprint = target.compute_fingerprint([self.targets[d].fingerprint for d in target.deps])
+            record = state.targets.get(target_id)
+            dirty_deps = [d for d in target.deps if d in dirty]
+            if force:
+                dirty[target_id] = "강제"
+            elif dirty_deps:
+                dirty[target_id] = f"의존 대상 재빌드 ({dirty_deps[0]}{' 외' if len(dirty_deps) > 1 else ''})"
+            elif record is None:
+                if target.outputs and all(p.exists() for p in target.outputs):
+                    adopt.append(target_id)
+                else:
+                    dirty[target_id] = "첫 빌드"
+            elif record["fingerprint"] != target.fingerprint:
+                dirty[target_id] = "입력 변경"
+            else:
+                reason = state.check_outputs(target)
+                if reason:
+                    dirty[target_id] = reason
+        return dirty, adopt
+
+    def execute(self, order: List[str], dirty: Dict[str, str], state: BuildState,
+                workers: int) -> Dict[str, str]:
+        """dirty 타깃을 의존 순서대로 병렬 실행 - 타깃별 결과(ok/failed/skipped)"""
+        pending = [t for t in order if t in dirty]
+        waiting = {t: {d for d in self.targets[t].deps if d in dirty} for t in pending}
+        children: Dict[str, List[str]] = {t: [] for t in pending}
+        for target_id in pending:
+            for dep in waiting[target_id]:
+                children[dep].append(target_id)
+
+        results: Dict[str, str] = {}
+
+        def run(target: Target) -> None:
+            target.action()
+            missing = [rel_path(p) for p in target.outputs if not p.exists()]
+            if missing:
+                raise RuntimeError(f"출력이 만들어지지 않음: {', '.join(missing)}")
+
+        def skip(target_id: str) -> None:
+            for child in children[target_id]:
+                if child not in results:
+                    results[child] = "skipped"
+                    skip(child)
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            running = {}
+
+            def submit_ready() -> None:
+                for target_id in pending:
+                    if target_id in results or target_id in running.values() or waiting[target_id]:
+                        continue
+                    running[executor.submit(run, self.targets[target_id])] = target_id
+
+            submit_ready()
+            while running:
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    target_id = running.pop(future)
+                    target = self.targets[target_id]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        results[target_id] = "failed"
+                        print(f"[FAIL] {target_id}: {e}")
+                        skip(target_id)
+                        continue
+                    # 실행 후 입력(예: 새로 생긴 파일 목록)으로 지문을 다시 계산해 기록
+                    fingerprint = target.compute_fingerprint([self.targets[d].fingerprint for d in target.deps])
+                    target.fingerprint = fingerprint
+                    state.record(target, fingerprint)
+                    state.save()
+                    results[target_id] = "ok"
+                    print(f"[OK] {target_id}")
+                    for child in children[target_id]:
+                        waiting[child].discard(target_id)
+                submit_ready()
+        return results
+
+# ============================================================
+# 타깃 선언
+# ============================================================
+
+@dataclass
+class BuildOptions:
+    worldviews: List[str] = field(default_factory=lambda: list(tts.ALL_WORLDVIEWS))
+    exercises: Optional[List[str]] = None   # None 이면 MVP 운동 (all_stories 전체는 all_stories=True)
+    all_stories: bool = False
+    postprocess: bool = True
+    encode: bool = True
+    lipsync: bool = True
+    formats: Dict[str, str] = field(default_factory=dict)
+    ffmpeg: Optional[str] = None
+
+
+def source_sha256(path: Path) -> Optional[str]:
+    return file_sha256(path) if path.exists() else None
+
+def txt_story_files() -> List[Path]:
+    """stories/<세계관>/<운동>_<등급>.txt 파일 (generateMissingStories.ts 산출물)"""
+    if not STORIES_DIR.exists():
+        return []
+    return sorted(p for p in STORIES_DIR.glob("*/*.txt")
+                  if p.parent.name in tts.ALL_WORLDVIEWS and p.stem.rsplit("_", 1)[-1] in tts.GRADES)
+
+def txt_story_exercises() -> Dict[str, List[str]]:
+    """세계관 -> txt 스토리가 있는 운동 목록"""
+    result: Dict[str, List[str]] = {}
+    for path in txt_story_files():
+        exercise = path.stem.rsplit("_", 1)[0]
+        if exercise not in result.setdefault(path.parent.name, []):
+            result[path.parent.name].append(exercise)
+    return result
+
+def tree_listing(root: Path) -> List[Tuple[str, int, int]]:
+    """디렉토리 파일 목록 (상대 경로, 크기, mtime) - 매니페스트 입력용"""
+    if not root.exists():
+        return []
+    return [(p.relative_to(root).as_posix(), p.stat().st_size, p.stat().st_mtime_ns)
+            for p in sorted(root.rglob("*")) if p.is_file() and not p.name.startswith(".")]
+
+def collect_clips(options: BuildOptions) -> List[Tuple[str, str, str, Optional[str], bool]]:
+    """(세계관, 운동, 등급, 텍스트, txt 스토리 여부) - 텍스트는 아직 없으면 None"""
+    stories = tts.load_stories()
+    txt_exercises = txt_story_exercises()
+    clips = []
+    for worldview in options.worldviews:
+        exercises = list(options.exercises or tts.MVP_EXERCISES)
+        if options.all_stories and not options.exercises:
+            exercises += [e for e in stories.get(worldview, {}) if e not in exercises]
+            exercises += [e for e in txt_exercises.get(worldview, []) if e not in exercises]
+        for exercise in exercises:
+            from_txt = exercise in txt_exercises.get(worldview, []) and exercise not in stories.get(worldview, {})
+            for grade in tts.GRADES:
+                if from_txt:
+                    path = STORIES_DIR / worldview / f"{exercise}_{grade}.txt"
+                    text = path.read_text(encoding="utf-8").strip() if path.exists() else None
+                else:
+                    text = stories.get(worldview, {}).get(exercise, {}).get(grade)
+                    if not text:
+                        continue
+                clips.append((worldview, exercise, grade, text, from_txt))
+    return clips
+
+def build_graph(options: BuildOptions, runtime: Dict[str, Any]) -> BuildGraph:
+    """에셋 타깃 그래프 구성 (runtime: TTS 실행에 필요한 키 풀/리미터/라우터/캐시)"""
+    graph = BuildGraph()
+
+    def run_command(cmd: List[str]) -> None:
+        result = subprocess.run(cmd, cwd=PROJECT_ROOT, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError((result.stderr or result.stdout).strip()[-500:] or f"종료 코드 {result.returncode}")
+
+    graph.add(Target(
+        id="stories:txt",
+        stage="stories",
+        deps=[],
+        inputs={"script": source_sha256(STORY_SCRIPT)},
+        outputs=txt_story_files(),
+        action=lambda: run_command(["npx", "ts-node", str(STORY_SCRIPT)]),
+        hash_outputs=False,
+    ))
+
+    cache = runtime.get("cache")
+    post_options = None
+    if options.postprocess:
+        # numpy 의존성은 후처리 단계가 있을 때만 필요
+        from postprocess_tts import PostprocessOptions, process_clip
+        post_options = PostprocessOptions()
+
+    encode_lock = threading.Lock()
+    final_targets: List[str] = []
+    audio_targets: Dict[str, List[str]] = {}
+
+    for worldview, exercise, grade, text, from_txt in collect_clips(options):
+        name = f"{worldview}/{exercise}_{grade}"
+        wav = tts.OUTPUT_DIR / worldview / f"{exercise}_{grade}.wav"
+        voice_settings = tts.get_voice_settings(worldview, grade)
+        cache_keys = tts.get_cache_keys(text, voice_settings) if text else []
+        cached = cache is not None and bool(cache_keys) and cache.lookup(cache_keys) is not None
+
+        def synthesize(worldview=worldview, exercise=exercise, grade=grade, from_txt=from_txt, text=text):
+            if from_txt:
+                text = (STORIES_DIR / worldview / f"{exercise}_{grade}.txt").read_text(encoding="utf-8").strip()
+            report: Dict[str, Any] = {}
+            ok = tts.generate_tts(worldview, exercise, grade, text, runtime["keys"], False,
+                                  runtime["rate_limiter"], cache, runtime["router"], report)
+            if not ok:
+                raise RuntimeError("; ".join(report.get("errors", [])) or "TTS 생성 실패")
+
+        tts_target = graph.add(Target(
+            id=f"tts:{name}",
+            stage="tts",
+            deps=["stories:txt"] if from_txt else [],
+            inputs={
+                "text": text,
+                "voice": voice_settings,
+                "prefix": tts.VOICE_STYLES.get(voice_settings["style"], ""),
+                "models": tts.FALLBACK_CHAIN,
+            },
+            outputs=[wav],
+            action=synthesize,
+            # 후처리가 같은 WAV를 제자리에서 고치므로 TTS 단계는 존재만 확인
+            hash_outputs=not options.postprocess,
+            api_calls=0 if cached else 1,
+        ))
+        last = tts_target.id
+
+        if post_options is not None:
+            graph.add(Target(
+                id=f"post:{name}",
+                stage="post",
+                deps=[last],
+                inputs={"options": asdict(post_options)},
+                outputs=[wav],
+                action=lambda wav=wav: process_clip(wav, post_options),
+            ))
+            last = f"post:{name}"
+        audio_targets.setdefault(worldview, []).append(last)
+
+        if options.encode and options.formats:
+            from encode_tts_audio import (
+                FORMATS, encode_clip, load_manifest, save_manifest, clip_key,
+            )
+
+            def encode(wav=wav):
+                result = encode_clip(options.ffmpeg, wav, file_sha256(wav), options.formats)
+                with encode_lock:
+                    manifest = load_manifest()
+                    manifest["clips"][clip_key(wav)] = result
+                    manifest["formats"].update({
+                        fmt: {"ext": FORMATS[fmt]["ext"], "mime": FORMATS[fmt]["mime"], "bitrate": bitrate}
+                        for fmt, bitrate in options.formats.items()
+                    })
+                    save_manifest(manifest)
+
+            graph.add(Target(
+                id=f"encode:{name}",
+                stage="encode",
+                deps=[last],
+                inputs={"formats": options.formats},
+                outputs=[wav.with_suffix(f".{FORMATS[fmt]['ext']}") for fmt in options.formats],
+                action=encode,
+            ))
+            last = f"encode:{name}"
+        final_targets.append(last)
+
+    if options.lipsync:
+        from lipsync_tts import LipsyncOptions, pack_worldview, INDEX_NAME, DATA_NAME
+        lipsync_options = LipsyncOptions()
+        for worldview, deps in audio_targets.items():
+            graph.add(Target(
+                id=f"lipsync:{worldview}",
+                stage="lipsync",
+                deps=deps,
+                inputs={"options": asdict(lipsync_options)},
+                outputs=[tts.OUTPUT_DIR / worldview / DATA_NAME, tts.OUTPUT_DIR / worldview / INDEX_NAME],
+                action=lambda worldview=worldview: pack_worldview(worldview, lipsync_options, tts_dir=tts.OUTPUT_DIR),
+            ))
+            final_targets.append(f"lipsync:{worldview}")
+
+    graph.add(Target(
+        id="manifest",
+        stage="manifest",
+        deps=final_targets,
+        # TTS 밖의 파일(NPC 이미지, 스토리)은 목록(크기/mtime)으로 변경 감지
+        inputs={"npc": lambda: tree_listing(PRERENDERED_DIR / "npc"),
+                "stories": lambda: tree_listing(STORIES_DIR)},
+        outputs=[MANIFEST_DIR / "index.json"],
+        action=lambda: build_manifests(None, False),
+        hash_outputs=False,
+    ))
+
+    graph.add(Target(
+        id="prompts",
+        stage="prompts",
+        deps=[],
+        inputs={"script": source_sha256(PROMPT_SCRIPT)},
+        outputs=[PROMPT_OUTPUT],
+        action=lambda: run_command([sys.executable, str(PROMPT_SCRIPT)]),
+        hash_outputs=False,
+    ))
+    return graph
+
+# ============================================================
+# 메인
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="HearO 프리렌더링 에셋 증분 빌드")
+    parser.add_argument("targets", nargs="*", help="빌드할 타깃 (glob, 예: 'tts:fantasy/*', 기본: 전체)")
+    parser.add_argument("--dry-run", action="store_true", help="계획과 예상 API 호출 수만 출력")
+    parser.add_argument("--force", action="store_true", help="선택한 타깃 전부 다시 빌드")
+    parser.add_argument("--worldview", "-w", action="append", choices=tts.ALL_WORLDVIEWS, help="특정 세계관만 (반복 가능)")
+    parser.add_argument("--exercise", "-e", action="append", help="특정 운동만 (반복 가능)")
+    parser.add_argument("--all-stories", action="store_true",
+                        help="MVP 운동 외에 all_stories.json / stories/*.txt 의 모든 운동 포함")
+    parser.add_argument("--no-postprocess", action="store_true", help="후처리 단계 제외")
+    parser.add_argument("--no-lipsync", action="store_true", help="립싱크 타임라인 단계 제외")
+    parser.add_argument("--no-encode", action="store_true", help="압축 인코딩 단계 제외")
+    parser.add_argument("--formats", default="opus,aac", help="인코딩 포맷 (기본: opus,aac)")
+    parser.add_argument("--ffmpeg", default=os.environ.get("FFMPEG", "ffmpeg"), help="ffmpeg 실행 파일")
+    parser.add_argument("--workers", "-j", type=int, default=4, help="동시 실행 타깃 수")
+    parser.add_argument("--state-file", type=Path, default=STATE_FILE, help="빌드 상태 파일")
+    parser.add_argument("--api-key", "-k", action="append", help="API 키 (반복 또는 쉼표 구분)")
+    parser.add_argument("--api-key-file", type=Path, help="API 키 파일 (한 줄에 하나)")
+    parser.add_argument("--output-dir", type=Path, default=tts.OUTPUT_DIR, help="TTS 출력 디렉토리")
+    parser.add_argument("--api-base", default=tts.GEMINI_API_BASE, help="generateContent 엔드포인트 기준 URL")
+    parser.add_argument("--min-interval", type=float, default=tts.DEFAULT_MIN_INTERVAL,
+                        help=f"키x모델별 최소 요청 간격 초 (기본: {tts.DEFAULT_MIN_INTERVAL})")
+    parser.add_argument("--no-cache", action="store_true", help="TTS 콘텐츠 캐시 사용 안함")
+    args = parser.parse_args()
+
+    formats: Dict[str, str] = {}
+    ffmpeg = None
+    if not args.no_encode:
+        from encode_tts_audio import FORMATS
+        ffmpeg = shutil.which(args.ffmpeg)
+        if ffmpeg:
+            names = [f.strip() for f in args.formats.split(",") if f.strip()]
+            unknown = [f for f in names if f not in FORMATS]
+            if unknown:
+                print(f"[ERROR] 지원하지 않는 포맷: {', '.join(unknown)} (가능: {', '.join(FORMATS)})")
+                sys.exit(1)
+            formats = {f: FORMATS[f]["default_bitrate"] for f in names}
+        else:
+            print(f"[WARN] ffmpeg 없음 ({args.ffmpeg}) - 인코딩 단계 제외")
+
+    options = BuildOptions(
+        worldviews=args.worldview or list(tts.ALL_WORLDVIEWS),
+        exercises=args.exercise,
+        all_stories=args.all_stories,
+        postprocess=not args.no_postprocess,
+        lipsync=not args.no_lipsync,
+        encode=bool(formats),
+        formats=formats,
+        ffmpeg=ffmpeg,
+    )
+
+    tts.GEMINI_API_BASE = args.api_base.rstrip("/")
+    tts.OUTPUT_DIR = args.output_dir
+    keys = load_api_keys(args.api_key, args.api_key_file)
+    runtime = {
+        "keys": KeyPool(keys, state_file=KEY_STATE_FILE),
+        "rate_limiter": tts.RateLimiter(args.min_interval),
+        "router": tts.ModelRouter(tts.FALLBACK_CHAIN, tts.MODEL_LABELS),
+        "cache": None if args.no_cache else tts.TTSCache(),
+    }
+
+    graph = build_graph(options, runtime)
+    selected = None
+    if args.targets:
+        selected = {t for t in graph.targets if any(fnmatch.fnmatchcase(t, p) for p in args.targets)}
+        if not selected:
+            print(f"[ERROR] 일치하는 타깃 없음: {', '.join(args.targets)}")
+            sys.exit(1)
+    order = graph.order(selected)
+    state = BuildState(args.state_file)
+    dirty, adopt = graph.plan(order, state, args.force)
+
+    api_calls = sum(graph.targets[t].api_calls for t in dirty)
+    cached = sum(1 for t in dirty if graph.targets[t].stage == "tts" and not graph.targets[t].api_calls)
+    stage_lines = "\n".join(
+        f"  {stage:9s} 전체 {sum(1 for t in order if graph.targets[t].stage == stage):4d}개 / "
+        f"빌드 {sum(1 for t in dirty if graph.targets[t].stage == stage):4d}개"
+        for stage in STAGES if any(graph.targets[t].stage == stage for t in order)
+    )
+    print(f"""
+============================================================
+HearO 에셋 증분 빌드
+============================================================
+타깃: {len(order)}개 (빌드 {len(dirty)}개, 기존 출력 채택 {len(adopt)}개)
+{stage_lines}
+예상 API 호출: {api_calls}회 (캐시 재사용 {cached}개)
+워커: {args.workers}개
+============================================================
+""")
+
+    if args.dry_run:
+        for target_id in order:
+            if target_id in dirty:
+                print(f"[PLAN] {target_id:45s} {dirty[target_id]}")
+        return
+
+    if api_calls and not keys:
+        print("[ERROR] Gemini API 키 필요 (TTS 타깃 빌드)")
+        print("        set GEMINI_API_KEY=your_api_key")
+        sys.exit(1)
+
+    for target_id in adopt:
+        state.record(graph.targets[target_id], graph.targets[target_id].fingerprint)
+    if adopt:
+        state.save()
+        print(f"[INFO] 기존 출력 {len(adopt)}개를 현재 입력으로 채택")
+
+    started_at = time.monotonic()
+    results = graph.execute(order, dirty, state, args.workers)
+    runtime["keys"].save()
+    if runtime["cache"] is not None:
+        runtime["cache"].gc()
+
+    counts = {status: sum(1 for r in results.values() if r == status) for status in ("ok", "failed", "skipped")}
+    print(f"""
+============================================================
+결과
+============================================================
+성공: {counts['ok']}개
+실패: {counts['failed']}개
+건너뜀 (실패한 타깃의 하위): {counts['skipped']}개
+소요 시간: {time.monotonic() - started_at:.1f}초
+============================================================
+""")
+    if counts["failed"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
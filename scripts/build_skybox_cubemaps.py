@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+HearO 스카이박스 큐브맵 변환 (2:1 Equirectangular -> 6면 큐브맵 + 밉 레벨)
+
+backgrounds/<세계관>/*.png|jpg 파노라마를 미리 큐브맵 6면으로 펼쳐 둔다.
+브라우저는 전체 파노라마를 올려 구체 매핑하는 대신 작은 면 세트부터 받고
+큰 해상도는 나중에 스트리밍할 수 있다.
+- NumPy 벡터화 방향 계산 + 바이리니어 샘플링 (가로 방향은 경도 wrap)
+- 가장 큰 면 크기(원본 너비/4 이하의 2의 거듭제곱)에서 한 번 샘플링 후
+  2x2 박스 필터(선형 광 공간)로 min_size 까지 밉 레벨 생성
+- 면 순서/방향은 three.js CubeTexture 기준 (px, nx, py, ny, pz, nz)
+- 프로세스 풀 병렬 처리, 원본 해시/옵션이 그대로면 스킵
+- cubemaps/<세계관>/index.json 디스크립터 (레벨별 면 경로, 바이트 수)
+
+사용법:
+    python build_skybox_cubemaps.py
+    python build_skybox_cubemaps.py -w sf --max-size 512 --min-size 64
+    python build_skybox_cubemaps.py --format jpg --force
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+from PIL import Image, features
+
+from audio_io import file_sha256
+
+# ============================================================
+# 설정
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+PUBLIC_DIR = PROJECT_ROOT / "public"
+WORLDVIEWS_DIR = PUBLIC_DIR / "images" / "worldviews"
+BACKGROUNDS_DIR = WORLDVIEWS_DIR / "backgrounds"
+CUBEMAP_DIR = WORLDVIEWS_DIR / "cubemaps"
+
+DESCRIPTOR_VERSION = 1
+
+FACES = ["px", "nx", "py", "ny", "pz", "nz"]
+
+DEFAULT_MAX_SIZE = 1024
+DEFAULT_MIN_SIZE = 32
+
+# 포맷별 저장 옵션
+FORMATS = {
+    "webp": {"pil": "WEBP", "ext": "webp", "mime": "image/webp", "options": {"quality": 82, "method": 6}},
+    "jpg": {"pil": "JPEG", "ext": "jpg", "mime": "image/jpeg", "options": {"quality": 85, "optimize": True}},
+    "png": {"pil": "PNG", "ext": "png", "mime": "image/png", "options": {"optimize": True}},
+}
+
+SOURCE_EXTENSIONS = [".png", ".jpg", ".jpeg"]
+
+# ============================================================
+# 헬퍼 함수
+# ============================================================
+
+def find_panoramas(worldviews: Optional[List[str]] = None) -> Dict[str, List[Path]]:
+    """세계관 -> 파노라마 원본 목록"""
+    result: Dict[str, List[Path]] = {}
+    if not BACKGROUNDS_DIR.exists():
+        return result
+    for worldview_dir in sorted(p for p in BACKGROUNDS_DIR.iterdir() if p.is_dir()):
+        if worldviews and worldview_dir.name not in worldviews:
+            continue
+        paths = sorted(p for p in worldview_dir.iterdir() if p.suffix.lower() in SOURCE_EXTENSIONS)
+        if paths:
+            result[worldview_dir.name] = paths
+    return result
+
+def options_signature(max_size: int, min_size: int, fmt: str) -> str:
+    """변환 옵션 서명 (바뀌면 전부 재생성)"""
+    payload = json.dumps([max_size, min_size, fmt, FORMATS[fmt]["options"], FACES], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+def face_size_for(width: int, max_size: int) -> int:
+    """원본 너비/4(면 하나가 덮는 경도 90도)를 넘지 않는 가장 큰 2의 거듭제곱"""
+    limit = max(1, min(max_size, width // 4))
+    return 1 << (limit.bit_length() - 1)
+
+def load_descriptor(worldview: str) -> Dict[str, Any]:
+    path = CUBEMAP_DIR / worldview / "index.json"
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            descriptor = json.load(f)
+        if descriptor.get("version") == DESCRIPTOR_VERSION:
+            return descriptor
+    return {"version": DESCRIPTOR_VERSION, "faces": FACES, "panoramas": {}}
+
+def save_descriptor(worldview: str, descriptor: Dict[str, Any]) -> None:
+    path = CUBEMAP_DIR / worldview / "index.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(descriptor, f, indent=2, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def save_image_atomic(pixels: np.ndarray, path: Path, fmt: str) -> int:
+    """임시 파일에 저장 후 원자적 교체, 바이트 수 반환"""
+    spec = FORMATS[fmt]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        Image.fromarray(pixels).save(tmp_path, spec["pil"], **spec["options"])
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return path.stat().st_size
+
+# ============================================================
+# 투영 / 샘플링
+# ============================================================
+
+def face_directions(size: int) -> np.ndarray:
+    """(6, size, size, 3) 면별 픽셀 중심 방향 벡터 (three.js CubeTexture 면 방향)"""
+    coords = (np.arange(size, dtype=np.float32) + 0.5) / size * 2.0 - 1.0
+    u, v = np.meshgrid(coords, coords)       # u: 열 (왼->오), v: 행 (위->아래)
+    one = np.ones_like(u)
+    directions = np.stack([
+        np.stack([one, -v, -u], axis=-1),    # px
+        np.stack([-one, -v, u], axis=-1),    # nx
+        np.stack([u, one, v], axis=-1),      # py
+        np.stack([u, -one, -v], axis=-1),    # ny
+        np.stack([u, -v, one], axis=-1),     # pz
+        np.stack([-u, -v, -one], axis=-1),   # nz
+    ])
+    return directions / np.linalg.norm(directions, axis=-1, keepdims=True)
+
+def sample_bilinear(image: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """image(H, W, C) 를 실수 픽셀 좌표에서 바이리니어 샘플링 (x 는 wrap, y 는 clamp)"""
+    height, width = image.shape[:2]
+    x0 = np.floor(x).astype(np.int64)
+    y0 = np.floor(y).astype(np.int64)
+    fx = (x - x0)[..., None]
+    fy = (y - y0)[..., None]
+    x1 = (x0 + 1) % width
+    x0 %= width
+    y1 = np.clip(y0 + 1, 0, height - 1)
+    y0 = np.clip(y0, 0, height - 1)
+    top = image[y0, x0] * (1 - fx) + image[y0, x1] * fx
+    bottom = image[y1, x0] * (1 - fx) + image[y1, x1] * fx
+    return top * (1 - fy) + bottom * fy
+
+def equirect_to_cubemap(image: np.ndarray, size: int) -> np.ndarray:
+    """(H, W, C) 파노라마 -> (6, size, size, C) 큐브맵 면 (three.js equirectUv 와 같은 매핑)"""
+    height, width = image.shape[:2]
+    d = face_directions(size)
+    lon = np.arctan2(d[..., 2], d[..., 0])
+    lat = np.arcsin(np.clip(d[..., 1], -1.0, 1.0))
+    x = (lon / (2 * np.pi) + 0.5) * width - 0.5
+    y = (0.5 - lat / np.pi) * height - 0.5
+    return sample_bilinear(image, x, y)
+
+def srgb_to_linear(values: np.ndarray) -> np.ndarray:
+    return np.where(values <= 0.04045, values / 12.92, ((values + 0.055) / 1.055) ** 2.4)
+
+def linear_to_srgb(values: np.ndarray) -> np.ndarray:
+    values = np.clip(values, 0.0, 1.0)
+    return np.where(values <= 0.0031308, values * 12.92, 1.055 * values ** (1 / 2.4) - 0.055)
+
+def downsample(faces_linear: np.ndarray) -> np.ndarray:
+    """(6, N, N, C) -> (6, N/2, N/2, C) 2x2 박스 필터"""
+    n, size = faces_linear.shape[0], faces_linear.shape[1]
+    half = size // 2
+    return faces_linear.reshape(n, half, 2, half, 2, -1).mean(axis=(2, 4))
+
+def to_uint8(faces_linear: np.ndarray) -> np.ndarray:
+    return np.round(linear_to_srgb(faces_linear) * 255.0).astype(np.uint8)
+
+# ============================================================
+# 변환 (워커 프로세스)
+# ============================================================
+
+def convert_panorama(source: Path, source_hash: str, out_dir: Path, max_size: int,
+                     min_size: int, fmt: str) -> Dict[str, Any]:
+    """파노라마 하나 -> 레벨별 6면 이미지"""
+    with Image.open(source) as opened:
+        image = np.asarray(opened.convert("RGB"), dtype=np.float32) / 255.0
+    height, width = image.shape[:2]
+    size = face_size_for(width, max_size)
+
+    # 샘플링은 sRGB 값 그대로 (GPU 텍스처 필터링과 같음), 밉은 선형 광에서 평균
+    faces = srgb_to_linear(equirect_to_cubemap(image, size).astype(np.float64))
+
+    ext = FORMATS[fmt]["ext"]
+    levels = []
+    while True:
+        pixels = to_uint8(faces)
+        level_faces = {}
+        total = 0
+        for index, face in enumerate(FACES):
+            path = out_dir / str(size) / f"{face}.{ext}"
+            total += save_image_atomic(pixels[index], path, fmt)
+            level_faces[face] = path.relative_to(PUBLIC_DIR).as_posix()
+        levels.append({"size": size, "faces": level_faces, "bytes": total})
+        if size // 2 < max(1, min_size):
+            break
+        faces = downsample(faces)
+        size //= 2
+
+    return {
+        "source": source.relative_to(PUBLIC_DIR).as_posix(),
+        "hash": source_hash,
+        "width": width,
+        "height": height,
+        # 작은 레벨부터 (저사양 기기는 앞쪽만 먼저 로드)
+        "levels": sorted(levels, key=lambda level: level["size"]),
+    }
+
+# ============================================================
+# 메인
+# ============================================================
+
+def is_up_to_date(entry: Optional[Dict[str, Any]], source_hash: str, signature: str) -> bool:
+    if not entry or entry.get("hash") != source_hash or entry.get("options") != signature:
+        return False
+    return all((PUBLIC_DIR / path).exists() for level in entry.get("levels", []) for path in level["faces"].values())
+
+def main():
+    parser = argparse.ArgumentParser(description="HearO 스카이박스 큐브맵 변환")
+    parser.add_argument("--worldview", "-w", action="append", help="특정 세계관만 (반복 가능)")
+    parser.add_argument("--max-size", type=int, default=DEFAULT_MAX_SIZE, help="가장 큰 면 크기 (px, 2의 거듭제곱으로 내림)")
+    parser.add_argument("--min-size", type=int, default=DEFAULT_MIN_SIZE, help="가장 작은 밉 레벨 면 크기 (px)")
+    parser.add_argument("--format", choices=list(FORMATS), default="webp", help="면 이미지 포맷 (기본: webp)")
+    parser.add_argument("--workers", "-j", type=int, default=os.cpu_count() or 2, help="프로세스 수")
+    parser.add_argument("--force", action="store_true", help="해시와 무관하게 전부 재생성")
+    parser.add_argument("--dry-run", action="store_true", help="변환 대상만 출력")
+    args = parser.parse_args()
+
+    if FORMATS[args.format]["pil"] == "WEBP" and not features.check("webp"):
+        print("[ERROR] Pillow에 webp 인코더 없음 (--format jpg 사용)")
+        sys.exit(1)
+
+    signature = options_signature(args.max_size, args.min_size, args.format)
+    panoramas = find_panoramas(args.worldview)
+    descriptors = {worldview: load_descriptor(worldview) for worldview in panoramas}
+
+    jobs = []
+    skip_count = 0
+    for worldview, sources in panoramas.items():
+        entries = descriptors[worldview]["panoramas"]
+        for source in sources:
+            source_hash = file_sha256(source)
+            if not args.force and is_up_to_date(entries.get(source.stem), source_hash, signature):
+                skip_count += 1
+                continue
+            jobs.append((worldview, source, source_hash))
+
+    print(f"""
+============================================================
+HearO 스카이박스 큐브맵 변환
+============================================================
+파노라마: {sum(len(s) for s in panoramas.values())}개 (변환 {len(jobs)}개, 스킵 {skip_count}개)
+면 크기: 최대 {args.max_size}px ~ 최소 {args.min_size}px / 포맷: {args.format}
+============================================================
+""")
+
+    if args.dry_run:
+        for worldview, source, _ in jobs:
+            print(f"[DRY-RUN] {worldview}/{source.name}")
+        return
+
+    fail_count = 0
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = {
+            executor.submit(convert_panorama, source, source_hash, CUBEMAP_DIR / worldview / source.stem,
+                            args.max_size, args.min_size, args.format): (worldview, source)
+            for worldview, source, source_hash in jobs
+        }
+        for future in as_completed(futures):
+            worldview, source = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                fail_count += 1
+                print(f"[ERROR] {worldview}/{source.name}: {e}")
+                continue
+            result["options"] = signature
+            descriptors[worldview]["panoramas"][source.stem] = result
+            sizes = [level["size"] for level in result["levels"]]
+            print(f"[OK] {worldview}/{source.name}: {result['width']}x{result['height']} -> "
+                  f"{max(sizes)}px 6면, 레벨 {len(sizes)}개 "
+                  f"(최소 세트 {result['levels'][0]['bytes'] / 1024:.0f}KB)")
+
+    # 원본이 사라진 항목 정리
+    for worldview, descriptor in descriptors.items():
+        stems = {source.stem for source in panoramas[worldview]}
+        for name in list(descriptor["panoramas"]):
+            if name not in stems:
+                del descriptor["panoramas"][name]
+        descriptor["format"] = {"ext": FORMATS[args.format]["ext"], "mime": FORMATS[args.format]["mime"]}
+        save_descriptor(worldview, descriptor)
+
+    print(f"""
+============================================================
+결과
+============================================================
+성공: {len(jobs) - fail_count}개 / 실패: {fail_count}개 / 스킵: {skip_count}개
+디스크립터: {', '.join(f'cubemaps/{w}/index.json' for w in descriptors) or '없음'}
+============================================================
+""")
+    if fail_count:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+HearO TTS 압축 오디오 인코딩 (Opus/Ogg + AAC/M4A)
+
+generate_tts_gemini.py 가 만든 WAV 마스터에서 전송용 압축본을 생성한다.
+- 프로세스 풀로 병렬 인코딩 (ffmpeg)
+- 마스터 해시/비트레이트가 그대로인 클립은 스킵
+- tts/encodings.json 매니페스트에 클립별 사용 가능한 인코딩 기록
+
+사용법:
+    python encode_tts_audio.py
+    python encode_tts_audio.py --worldview fantasy
+    python encode_tts_audio.py --opus-bitrate 32k --aac-bitrate 64k
+    python encode_tts_audio.py --formats opus --workers 8
+    python encode_tts_audio.py --force
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Tuple
+
+from audio_io import file_sha256
+
+# ============================================================
+# 설정
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+TTS_DIR = PROJECT_ROOT / "public" / "assets" / "prerendered" / "tts"
+MANIFEST_FILE = TTS_DIR / "encodings.json"
+
+MANIFEST_VERSION = 1
+
+# 포맷별 ffmpeg 설정 (음성 전용 저비트레이트)
+FORMATS = {
+    "opus": {
+        "ext": "ogg",
+        "mime": "audio/ogg; codecs=opus",
+        "muxer": "ogg",
+        "codec_args": ["-c:a", "libopus", "-application", "voip", "-vbr", "on"],
+        "default_bitrate": "24k",
+    },
+    "aac": {
+        "ext": "m4a",
+        "mime": "audio/mp4; codecs=mp4a.40.2",
+        "muxer": "mp4",
+        "codec_args": ["-c:a", "aac", "-movflags", "+faststart"],
+        "default_bitrate": "48k",
+    },
+}
+
+# ============================================================
+# 헬퍼 함수
+# ============================================================
+
+def load_manifest() -> Dict[str, Any]:
+    """인코딩 매니페스트 로드"""
+    if MANIFEST_FILE.exists():
+        with open(MANIFEST_FILE, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    return {"version": MANIFEST_VERSION, "formats": {}, "clips": {}}
+
+def save_manifest(manifest: Dict[str, Any]) -> None:
+    """매니페스트 원자적 저장"""
+    tmp_path = MANIFEST_FILE.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_FILE)
+
+def find_masters(worldviews: Optional[List[str]] = None) -> List[Path]:
+    """WAV 마스터 목록"""
+    if not TTS_DIR.exists():
+        return []
+    dirs = [TTS_DIR / w for w in worldviews] if worldviews else sorted(p for p in TTS_DIR.iterdir() if p.is_dir())
+    masters = []
+    for directory in dirs:
+        masters.extend(sorted(directory.glob("*.wav")))
+    return masters
+
+def clip_key(master: Path) -> str:
+    """tts 디렉토리 기준 클립 키 (예: fantasy/squat_good)"""
+    return master.relative_to(TTS_DIR).with_suffix("").as_posix()
+
+# ============================================================
+# 인코딩 (워커 프로세스)
+# ============================================================
+
+def encode_variant(ffmpeg: str, master: Path, fmt: str, bitrate: str) -> Tuple[Path, int]:
+    """마스터 WAV -> 압축본 (임시 파일에 인코딩 후 원자적 교체)"""
+    spec = FORMATS[fmt]
+    output_path = master.with_suffix(f".{spec['ext']}")
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{output_path.name}.", suffix=".tmp", dir=output_path.parent)
+    os.close(fd)
+    try:
+        cmd = [
+            ffmpeg, "-nostdin", "-hide_banner", "-loglevel", "error", "-y",
+            "-i", str(master),
+            "-ac", "1",
+            *spec["codec_args"],
+            "-b:a", bitrate,
+            "-map_metadata", "-1",
+            "-f", spec["muxer"],
+            tmp_name,
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or f"ffmpeg 종료 코드 {result.returncode}")
+        os.replace(tmp_name, output_path)
+    finally:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+    return output_path, output_path.stat().st_size
+
+def encode_clip(ffmpeg: str, master: Path, master_hash: str, targets: Dict[str, str]) -> Dict[str, Any]:
+    """클립 하나의 모든 대상 포맷 인코딩 (프로세스 풀 작업 단위)"""
+    variants = {}
+    for fmt, bitrate in targets.items():
+        output_path, size = encode_variant(ffmpeg, master, fmt, bitrate)
+        variants[fmt] = {
+            "path": output_path.relative_to(TTS_DIR).as_posix(),
+            "bitrate": bitrate,
+            "bytes": size,
+        }
+    return {"hash": master_hash, "bytes": master.stat().st_size, "variants": variants}
+
+# ============================================================
+# 메인
+# ============================================================
+
+def is_up_to_date(entry: Optional[Dict[str, Any]], master_hash: str, fmt: str, bitrate: str) -> bool:
+    """매니페스트 기준 해당 포맷이 최신인지"""
+    if not entry or entry.get("hash") != master_hash:
+        return False
+    variant = entry.get("variants", {}).get(fmt)
+    return (
+        variant is not None
+        and variant.get("bitrate") == bitrate
+        and (TTS_DIR / variant["path"]).exists()
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="HearO TTS 압축 오디오 인코딩")
+    parser.add_argument("--worldview", "-w", action="append", help="특정 세계관만 (반복 가능)")
+    parser.add_argument("--formats", default="opus,aac", help="생성할 포맷 (기본: opus,aac)")
+    parser.add_argument("--opus-bitrate", default=FORMATS["opus"]["default_bitrate"], help="Opus 비트레이트")
+    parser.add_argument("--aac-bitrate", default=FORMATS["aac"]["default_bitrate"], help="AAC 비트레이트")
+    parser.add_argument("--workers", "-j", type=int, default=os.cpu_count() or 2, help="인코딩 프로세스 수")
+    parser.add_argument("--force", action="store_true", help="해시와 무관하게 전부 재인코딩")
+    parser.add_argument("--dry-run", action="store_true", help="인코딩 대상만 출력")
+    parser.add_argument("--ffmpeg", default=os.environ.get("FFMPEG", "ffmpeg"), help="ffmpeg 실행 파일")
+    args = parser.parse_args()
+
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    unknown = [f for f in formats if f not in FORMATS]
+    if unknown:
+        print(f"[ERROR] 지원하지 않는 포맷: {', '.join(unknown)} (가능: {', '.join(FORMATS)})")
+        sys.exit(1)
+    bitrates = {"opus": args.opus_bitrate, "aac": args.aac_bitrate}
+
+    ffmpeg = shutil.which(args.ffmpeg)
+    if not ffmpeg and not args.dry_run:
+        print(f"[ERROR] ffmpeg 없음: {args.ffmpeg}")
+        print("        ffmpeg 설치 후 PATH에 추가하거나 --ffmpeg 로 경로 지정")
+        sys.exit(1)
+
+    masters = find_masters(args.worldview)
+    manifest = load_manifest()
+    clips = manifest["clips"]
+
+    # 작업 목록: 클립별로 최신이 아닌 포맷만
+    jobs: List[Tuple[Path, str, Dict[str, str]]] = []
+    skip_count = 0
+    for master in masters:
+        key = clip_key(master)
+        master_hash = file_sha256(master)
+        entry = clips.get(key)
+        targets = {
+            fmt: bitrates[fmt] for fmt in formats
+            if args.force or not is_up_to_date(entry, master_hash, fmt, bitrates[fmt])
+        }
+        if not targets:
+            skip_count += 1
+            continue
+        jobs.append((master, master_hash, targets))
+
+    print(f"""
+============================================================
+HearO TTS 압축 인코딩
+============================================================
+포맷: {', '.join(f'{fmt}@{bitrates[fmt]}' for fmt in formats)}
+마스터: {len(masters)}개 (인코딩 {len(jobs)}개, 스킵 {skip_count}개)
+워커: {args.workers}개
+============================================================
+""")
+
+    if args.dry_run:
+        for master, _, targets in jobs:
+            print(f"[DRY-RUN] {clip_key(master)} -> {', '.join(targets)}")
+        return
+
+    success_count = 0
+    fail_count = 0
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=max(1, args.workers)) as executor:
+            futures = {
+                executor.submit(encode_clip, ffmpeg, master, master_hash, targets): master
+                for master, master_hash, targets in jobs
+            }
+            for future in as_completed(futures):
+                master = futures[future]
+                key = clip_key(master)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    fail_count += 1
+                    print(f"[ERROR] {key}: {e}")
+                    continue
+
+                # 같은 해시의 기존 포맷 정보는 유지하고 새로 만든 포맷만 갱신
+                entry = clips.get(key)
+                if entry and entry.get("hash") == result["hash"]:
+                    entry["variants"].update(result["variants"])
+                else:
+                    clips[key] = result
+                success_count += 1
+                sizes = ", ".join(f"{fmt} {v['bytes'] / 1024:.1f}KB" for fmt, v in result["variants"].items())
+                print(f"[OK] {key} ({result['bytes'] / 1024:.1f}KB -> {sizes})")
+
+    # 마스터가 사라진 클립 정리 (세계관 필터 시 해당 세계관만)
+    existing = {clip_key(m) for m in masters}
+    scope = tuple(f"{w}/" for w in args.worldview) if args.worldview else None
+    for key in list(clips):
+        if key not in existing and (scope is None or key.startswith(scope)):
+            del clips[key]
+
+    # 이번에 인코딩하지 않은 포맷도 클립 variants 가 남아 있으면 유지
+    # (--formats opus 만 돌려도 Safari/iOS 용 aac 정보가 사라지지 않게)
+    known_formats = dict(manifest.get("formats", {}))
+    known_formats.update({
+        fmt: {"ext": FORMATS[fmt]["ext"], "mime": FORMATS[fmt]["mime"], "bitrate": bitrates[fmt]}
+        for fmt in formats
+    })
+    used = {fmt for c in clips.values() for fmt in c.get("variants", {})}
+    manifest["formats"] = {fmt: info for fmt, info in known_formats.items() if fmt in used or fmt in formats}
+    save_manifest(manifest)
+
+    master_bytes = sum(c["bytes"] for c in clips.values())
+    print(f"""
+============================================================
+결과
+============================================================
+성공: {success_count}개
+실패: {fail_count}개
+스킵: {skip_count}개
+마스터 합계: {master_bytes / 1024 / 1024:.1f}MB""")
+    for fmt in formats:
+        total = sum(c["variants"][fmt]["bytes"] for c in clips.values() if fmt in c["variants"])
+        ratio = master_bytes / total if total else 0
+        print(f"{fmt}: {total / 1024 / 1024:.1f}MB ({ratio:.1f}x 감소)")
+    print("============================================================")
+
+if __name__ == "__main__":
+    main()
@@ -238,7 +238,7 @@ const STORIES: Record<MissingExercise, Record<WorldviewType, Record<GradeType, s
 
 // 스토리 파일 생성
 function generateStoryFiles() {
-  const baseDir = 'C:/Users/dbals/VibeCoding/HearO_web/public/assets/prerendered/stories';
+  const baseDir = path.resolve(__dirname, '../public/assets/prerendered/stories');
   const worldviews: WorldviewType[] = ['fantasy', 'sports', 'idol', 'sf', 'zombie', 'spy'];
   const grades: GradeType[] = ['perfect', 'good', 'normal'];
 
@@ -9,10 +9,20 @@ MVP 운동 6개에 대한 TTS 음성 파일 생성
 사용법:
     set GEMINI_API_KEY=your_api_key
     python generate_tts_gemini.py
+    python generate_tts_gemini.py -k KEY1 -k KEY2 -j 4  # 키 여러 개 (키x모델별 한도로 분산)
+    python generate_tts_gemini.py --max-rpm 30     # 적응형 속도 상한 (--rate-control fixed 면 고정 간격)
     python generate_tts_gemini.py --worldview fantasy
     python generate_tts_gemini.py --exercise lunge
     python generate_tts_gemini.py --dry-run
     python generate_tts_gemini.py --new-only  # 신규 운동만 생성
+    python generate_tts_gemini.py --concurrency 4  # 4개 동시 생성
+    python generate_tts_gemini.py --no-cache       # 캐시 무시하고 진행 기록 기준으로만 스킵
+    python generate_tts_gemini.py --postprocess    # 생성 직후 무음 트리밍 + 라우드니스 정규화
+    python generate_tts_gemini.py --lipsync        # 생성 후 세계관별 립싱크 타임라인(lipsync.bin/json) 갱신
+    python generate_tts_gemini.py --batch-size 3   # 같은 세계관 3줄씩 요청 하나로 합성 후 분할
+    python generate_tts_gemini.py --chunk-chars 60 # 60자 넘는 대사는 문장 단위로 나눠 동시 합성 후 크로스페이드 연결
+    python generate_tts_gemini.py --api-base http://127.0.0.1:8765/v1beta/models  # 로컬 목 서버
+    python generate_tts_gemini.py --telemetry run.jsonl  # 시도별 이벤트 기록 (리포트: tts_telemetry.py report)
 """
 
 import os
@@ -20,12 +30,28 @@ import sys
 import json
 import time
 import argparse
-import base64
+import threading
 import wave
 import io
-import requests
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Optional, List, Set, Tuple, Union
+
+from requests.exceptions import RequestException, Timeout
+
+from audio_io import AtomicWavWriter, TeeWriter, stream_pcm, copy_pcm_to_wav, CHUNK_SIZE, file_sha256
+from tts_cache import TTSCache, make_cache_key, DEFAULT_MAX_MB
+from http_transport import Transport, TransportConfig, TimingStats, DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT
+from api_key_pool import KeyPool, load_api_keys, KEY_STATE_FILE
+from rate_control import (
+    AdaptiveRateLimiter, RateLimitHint, parse_rate_limit_hint, RATE_STATE_FILE, DEFAULT_MAX_RPM,
+)
+from job_store import (
+    JobStore, LeaseKeeper, JOB_DB_FILE, DEFAULT_LEASE_SECONDS, COMPLETED, FAILED,
+    make_owner_id, parse_shard, in_shard,
+)
+from model_router import ModelRouter, DEFAULT_COOLDOWN, DEFAULT_FAILURE_THRESHOLD, DEFAULT_MAX_WAIT
+from tts_telemetry import Telemetry, TELEMETRY_DIR, build_report, format_report, make_run_id
 
 # ============================================================
 # 설정
@@ -35,7 +61,7 @@ SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 OUTPUT_DIR = PROJECT_ROOT / "public" / "assets" / "prerendered" / "tts"
 STORIES_FILE = PROJECT_ROOT / "public" / "assets" / "prerendered" / "stories" / "all_stories.json"
-PROGRESS_FILE = SCRIPT_DIR / ".tts_gemini_progress.json"
+PROGRESS_FILE = SCRIPT_DIR / ".tts_gemini_progress.json"  # 이전 형식 (작업 DB로 한 번 가져옴)
 
 # 전체 세계관 (6개)
 ALL_WORLDVIEWS = ["fantasy", "sports", "idol", "sf", "zombie", "spy"]
@@ -60,9 +86,40 @@ EXISTING_EXERCISES = ["squat", "high_knees", "plank_hold"]
 GRADES = ["perfect", "good", "normal"]
 
 # Gemini TTS API 설정
-GEMINI_API_BASE = "https://generativelanguage.googleapis.com/v1beta/models"
+GEMINI_API_BASE = os.environ.get("GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1beta/models")
 TTS_MODEL = "gemini-2.5-flash-preview-tts"  # Flash 모델 우선 사용
 TTS_MODEL_FALLBACK = "gemini-2.5-pro-preview-tts"  # Pro 모델 폴백
+FALLBACK_CHAIN = [TTS_MODEL, TTS_MODEL_FALLBACK]
+MODEL_LABELS = {TTS_MODEL: "Flash", TTS_MODEL_FALLBACK: "Pro"}
+
+# 모델별 최소 요청 간격 (초) - 기존 파일당 8초 대기와 동일
+DEFAULT_MIN_INTERVAL = 8.0
+
+# 429 백오프 기본값 (초)
+RATE_LIMIT_BACKOFF = 30
+
+# 서버가 알려준 재시도 대기(Retry-After)가 이 이하면 다음 모델로 넘기지 않고 기다림 (요청당 횟수 제한)
+SHORT_RETRY_WAIT = 10.0
+SHORT_RETRY_LIMIT = 3
+
+# 서킷 대기가 이보다 짧으면 막힌 게 아니라 acquire 호출 자체의 시간 - 텔레메트리에 남기지 않음 (초)
+BREAKER_WAIT_THRESHOLD = 0.001
+
+# 공유 HTTP 전송 계층 (main 에서 옵션에 맞게 다시 생성)
+TRANSPORT = Transport()
+TRANSPORT_STATS = TimingStats()
+TRANSPORT.add_hook(TRANSPORT_STATS)
+
+# 시도별 이벤트 기록 (main 에서 --telemetry 경로로 다시 생성, 기본은 메모리에도 안 남김)
+TELEMETRY = Telemetry(enabled=False)
+
+# 문장 단위 분할 합성 (main 에서 --chunk-chars 를 주면 설정, None 이면 대사 하나 = 요청 하나)
+SENTENCE_CHUNKING = None    # Optional[tts_chunking.ChunkOptions]
+CHUNK_EXECUTOR: Optional[ThreadPoolExecutor] = None
+DEFAULT_CHUNK_WORKERS = 3
+
+# 분할 합성에서 실패한 조각만 다시 요청하는 횟수
+CHUNK_RETRIES = 2
 
 # ============================================================
 # 음성 스타일 정의
@@ -170,116 +227,318 @@ def load_stories() -> Dict:
     with open(STORIES_FILE, "r", encoding="utf-8") as f:
         return json.load(f)
 
-def load_progress() -> Dict:
-    """진행 상황 로드"""
-    if PROGRESS_FILE.exists():
-        with open(PROGRESS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {"completed": [], "failed": [], "skipped": []}
-
-def save_progress(progress: Dict) -> None:
-    """진행 상황 저장"""
-    with open(PROGRESS_FILE, "w", encoding="utf-8") as f:
-        json.dump(progress, f, indent=2, ensure_ascii=False)
-
 def get_file_key(worldview: str, exercise: str, grade: str) -> str:
     """파일 키 생성"""
     return f"{worldview}/{exercise}_{grade}"
 
+def build_styled_text(text: str, voice_settings: Dict[str, Any]) -> str:
+    """스타일 접두사 적용 텍스트"""
+    return VOICE_STYLES.get(voice_settings["style"], "") + text
+
+def get_cache_keys(text: str, voice_settings: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """(캐시 키, 모델) 후보 - Flash 우선, Pro 폴백 순"""
+    styled_text = build_styled_text(text, voice_settings)
+    return [
+        (make_cache_key(styled_text, voice_settings["voice_name"], voice_settings["style"], model), model)
+        for model in FALLBACK_CHAIN
+    ]
+
 # ============================================================
-# Gemini TTS API
+# Rate Limiter
 # ============================================================
 
-def call_gemini_tts_api(
-    text: str,
-    voice_settings: Dict[str, Any],
-    api_key: str,
-    use_fallback: bool = False
-) -> Optional[bytes]:
-    """Gemini TTS API 호출"""
-    model = TTS_MODEL_FALLBACK if use_fallback else TTS_MODEL
-    model_name = "Pro" if use_fallback else "Flash"
+class RateLimiter:
+    """키x모델별 최소 요청 간격을 보장하는 스레드 안전 Rate Limiter
+
+    모든 워커가 공유하며, 같은 슬롯 이름("<키 지문>:<모델>")에 대한 요청은
+    min_interval 초 간격으로 슬롯을 예약받는다. 키나 모델이 다르면 서로
+    간섭하지 않으므로 키를 늘리면 그만큼 처리량이 늘어난다.
+    """
+
+    def __init__(self, min_interval: float = DEFAULT_MIN_INTERVAL):
+        self.min_interval = min_interval
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, name: str) -> float:
+        """다음 슬롯까지 대기 후 실제 대기 시간(초) 반환"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(name, now))
+            self._next_slot[name] = slot + self.min_interval
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def record(self, name: str, outcome: str, issued_at: float, hint: Optional[RateLimitHint] = None) -> None:
+        """고정 간격이라 결과와 무관 (AdaptiveRateLimiter 와 같은 인터페이스)"""
 
-    try:
-        style = voice_settings["style"]
-        style_prefix = VOICE_STYLES.get(style, "")
-        styled_text = style_prefix + text
+# ============================================================
+# 실행 통계
+# ============================================================
 
-        url = f"{GEMINI_API_BASE}/{model}:generateContent"
-        headers = {
-            "Content-Type": "application/json",
-            "x-goog-api-key": api_key
-        }
+class RunStats:
+    """요청/재시도/폴백 카운터 (스레드 안전)"""
+
+    def __init__(self):
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + amount
 
-        payload = {
-            "contents": [{"parts": [{"text": styled_text}]}],
-            "generationConfig": {
-                "responseModalities": ["AUDIO"],
-                "speechConfig": {
-                    "voiceConfig": {
-                        "prebuiltVoiceConfig": {
-                            "voiceName": voice_settings["voice_name"]
-                        }
+    def get(self, name: str) -> int:
+        with self._lock:
+            return self._counts.get(name, 0)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(sorted(self._counts.items()))
+
+RUN_STATS = RunStats()
+
+# ============================================================
+# Gemini TTS API
+# ============================================================
+
+def build_payload(text: str, voice_settings: Dict[str, Any]) -> Dict[str, Any]:
+    """generateContent 요청 본문"""
+    return {
+        "contents": [{"parts": [{"text": build_styled_text(text, voice_settings)}]}],
+        "generationConfig": {
+            "responseModalities": ["AUDIO"],
+            "speechConfig": {
+                "voiceConfig": {
+                    "prebuiltVoiceConfig": {
+                        "voiceName": voice_settings["voice_name"]
                     }
                 }
             }
         }
+    }
 
-        max_retries = 2
-        for retry in range(max_retries):
-            response = requests.post(url, headers=headers, json=payload, timeout=60)
-
-            if response.status_code == 429:
-                if not use_fallback:
-                    print(f"      [FALLBACK] {model_name} rate limit -> Pro")
-                    return call_gemini_tts_api(text, voice_settings, api_key, use_fallback=True)
-                wait_time = 30 + (30 * retry)
-                print(f"      [RATE_LIMIT] {wait_time}초 대기 ({retry + 1}/{max_retries})")
+def request_model(
+    model: str,
+    payload: Dict[str, Any],
+    api_key: Union[str, KeyPool],
+    sink,
+    rate_limiter: Optional[RateLimiter] = None,
+    last_resort: bool = False
+) -> Optional[str]:
+    """모델 하나에 요청 - 성공 시 None, 실패 시 실패 종류 반환
+
+    실패 종류: rate_limit / quota / http_<코드> / empty / timeout / network / bad_response
+    키 풀이면 429/403을 받은 키를 주차시키고 다른 키로 바로 다시 보낸다. 모든 키가
+    주차 중일 때만 실패로 돌려주며, last_resort(남은 모델이 없음)이면 분당 한도로
+    쉬는 키가 풀릴 때까지 한 번 기다린다. 주차가 Retry-After 로 짧게 끝나면
+    (SHORT_RETRY_WAIT 이하) 남은 모델이 있어도 폴백 대신 기다린다.
+    """
+    pool = api_key if isinstance(api_key, KeyPool) else KeyPool([api_key], state_file=None,
+                                                                 rate_limit_park=RATE_LIMIT_BACKOFF)
+    model_name = MODEL_LABELS[model]
+    url = f"{GEMINI_API_BASE}/{model}:generateContent"
+    backoff_left = 1 if last_resort else 0
+    short_waits_left = SHORT_RETRY_LIMIT
+    input_chars = sum(len(part.get("text", "")) for c in payload.get("contents", []) for part in c.get("parts", []))
+
+    while True:
+        key = pool.acquire(model)
+        if key is None:
+            reason, wait_time = pool.exhaustion(model)
+            short_wait = wait_time <= SHORT_RETRY_WAIT and short_waits_left > 0
+            if reason == "rate_limit" and (backoff_left > 0 or short_wait):
+                if short_wait:
+                    short_waits_left -= 1
+                else:
+                    backoff_left -= 1
+                print(f"      [RATE_LIMIT] {model_name} 모든 키 대기 - {wait_time:.0f}초 후 재시도")
+                RUN_STATS.incr("retries")
+                RUN_STATS.incr("sleep_ms", int(wait_time * 1000))
+                TELEMETRY.add_sleep(wait_time, "backoff")
                 time.sleep(wait_time)
                 continue
-            break
-
-        if response.status_code == 429:
-            print(f"      [RATE_LIMIT] 재시도 횟수 초과")
+            if reason == "quota":
+                print(f"      [QUOTA] {model_name} 모든 키 할당량 초과 - 한도 리셋 필요")
+            else:
+                print(f"      [RATE_LIMIT] {model_name} 모든 키 요청 한도 초과")
+            return reason
+
+        # 요청 간격은 키x모델 단위 (키마다 한도가 따로 있음)
+        slot = f"{key.fingerprint}:{model}"
+        # 예약 시각 기준 - 속도를 줄이기 전에 예약한 요청의 429 로 다시 줄이지 않음
+        issued_at = time.monotonic()
+        if rate_limiter is not None:
+            TELEMETRY.add_sleep(rate_limiter.acquire(slot), "rate_limit")
+        hint = None
+        headers = {
+            "Content-Type": "application/json",
+            "x-goog-api-key": key.value
+        }
+        outcome = "error"
+        status = "error"
+        http_status = None
+        written = 0
+        started = time.monotonic()
+        try:
+            RUN_STATS.incr(f"requests.{model_name}")
+            with TRANSPORT.stream("POST", url, headers=headers, json=payload) as response:
+                http_status = response.status_code
+                RUN_STATS.incr(f"status.{model_name}.{response.status_code}")
+
+                if response.status_code in (429, 403):
+                    # Retry-After / RetryInfo / QuotaFailure 힌트 (본문은 작은 JSON)
+                    hint = parse_rate_limit_hint(response.headers, response.content)
+                if response.status_code == 429 and not hint.daily:
+                    outcome = status = "rate_limit"
+                    after = f", {hint.retry_after:.0f}초 후" if hint.retry_after else ""
+                    print(f"      [RATE_LIMIT] {model_name} 키 {key.fingerprint[:6]} 요청 한도 초과{after} - 다른 키로")
+                    if rate_limiter is not None:
+                        rate_limiter.record(slot, "rate_limit", issued_at, hint)
+                    continue
+                if response.status_code in (429, 403):
+                    outcome = status = "quota"
+                    print(f"      [QUOTA] {model_name} 키 {key.fingerprint[:6]} 할당량 초과 - 리셋까지 주차")
+                    continue
+                if response.status_code != 200:
+                    print(f"      [ERROR] {model_name} API 오류: {response.status_code}")
+                    status = f"http_{response.status_code}"
+                    return status
+
+                # 응답 본문을 청크 단위로 base64 디코딩하며 바로 sink에 기록
+                written = stream_pcm(response.iter_content(chunk_size=CHUNK_SIZE), sink)
+
+            if written == 0:
+                RUN_STATS.incr(f"empty_audio.{model_name}")
+                print(f"      [ERROR] {model_name} 오디오 데이터 없음")
+                status = "empty"
+                return status
+            outcome = status = "ok"
+            if rate_limiter is not None:
+                rate_limiter.record(slot, "ok", issued_at)
             return None
 
-        if response.status_code == 403:
-            if not use_fallback:
-                print(f"      [FALLBACK] {model_name} 할당량 초과 -> Pro")
-                return call_gemini_tts_api(text, voice_settings, api_key, use_fallback=True)
-            print(f"      [QUOTA] 할당량 초과 - 한도 리셋 필요")
+        except Timeout:
+            RUN_STATS.incr(f"timeouts.{model_name}")
+            print(f"      [TIMEOUT] {model_name}")
+            status = "timeout"
+            return status
+        except RequestException as e:
+            RUN_STATS.incr(f"exceptions.{model_name}")
+            print(f"      [ERROR] {model_name} 네트워크 오류: {e}")
+            status = "network"
+            return status
+        except ValueError as e:
+            # 응답 JSON/base64 해석 실패
+            RUN_STATS.incr(f"exceptions.{model_name}")
+            print(f"      [ERROR] {model_name} 응답 해석 실패: {e}")
+            status = "bad_response"
+            return status
+        finally:
+            pool.release(key, model, outcome, park_for=hint.retry_after if hint is not None else None)
+            TELEMETRY.attempt(model, key.fingerprint, status, time.monotonic() - started,
+                              http_status, written, input_chars)
+
+def stream_gemini_tts_api(
+    text: str,
+    voice_settings: Dict[str, Any],
+    api_key: Union[str, KeyPool],
+    sink,
+    use_fallback: bool = False,
+    rate_limiter: Optional[RateLimiter] = None,
+    router: Optional[ModelRouter] = None,
+    errors: Optional[List[str]] = None
+) -> Optional[str]:
+    """Gemini TTS API 호출 - PCM을 sink에 스트리밍으로 기록하고 사용 모델 반환
+
+    sink는 write()/reset()을 지원해야 한다. 다음 모델로 넘어가기 전에 reset()으로
+    이전 시도의 부분 데이터를 비운다. 모델 선택은 router의 서킷 브레이커를 따르며,
+    차단된 모델은 요청 없이 건너뛴다. 로컬 오류(sink 기록 실패 등)는 폴백하지 않는다.
+    errors가 주어지면 모델별 실패 사유를 덧붙인다.
+    """
+    if errors is None:
+        errors = []
+    if router is None:
+        router = ModelRouter(FALLBACK_CHAIN, MODEL_LABELS)
+    payload = build_payload(text, voice_settings)
+
+    tried: List[str] = [TTS_MODEL] if use_fallback else []
+    if isinstance(api_key, KeyPool):
+        # 모든 키의 오늘 할당량이 끝난 모델은 쿨다운을 기다리지 않고 제외
+        exhausted = [m for m in router.models if m not in tried and api_key.exhausted(m)]
+        if exhausted and len(tried) + len(exhausted) == len(router.models):
+            print(f"      [QUOTA] 모든 키의 할당량 소진 - 한도 리셋 필요")
+            RUN_STATS.incr("quota_exhausted")
+            errors.append("quota_exhausted")
             return None
-
-        if response.status_code != 200:
-            if not use_fallback:
-                return call_gemini_tts_api(text, voice_settings, api_key, use_fallback=True)
-            print(f"      [ERROR] API 오류: {response.status_code}")
+        tried.extend(exhausted)
+    while True:
+        wait_start = time.monotonic()
+        model = router.acquire(exclude=tried)
+        waited = time.monotonic() - wait_start
+        if waited >= BREAKER_WAIT_THRESHOLD:
+            TELEMETRY.add_sleep(waited, "breaker")
+        if model is None:
+            if len(tried) < len(router.models):
+                print(f"      [CIRCUIT] 사용 가능한 모델 없음 (모두 차단)")
+                RUN_STATS.incr("circuit_rejected")
+                errors.append("circuit_open")
+            return None
+        if tried:
+            RUN_STATS.incr("fallbacks")
+            print(f"      [FALLBACK] -> {MODEL_LABELS[model]}")
+        elif model != router.models[0]:
+            RUN_STATS.incr("circuit_bypass")
+        tried.append(model)
+
+        last_resort = len(tried) == len(router.models)
+        try:
+            failure = request_model(model, payload, api_key, sink, rate_limiter, last_resort)
+        except Exception as e:
+            router.release(model)
+            print(f"      [ERROR] {e}")
+            errors.append(f"{MODEL_LABELS[model]} {type(e).__name__}: {e}")
             return None
 
-        data = response.json()
-        audio_data = data.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("inlineData", {})
+        if failure is None:
+            router.record_success(model)
+            RUN_STATS.incr(f"model.{MODEL_LABELS[model]}")
+            if model != router.models[0]:
+                print(f"      [OK] {MODEL_LABELS[model]} 모델 사용")
+            return model
 
-        if not audio_data.get("data"):
-            if not use_fallback:
-                return call_gemini_tts_api(text, voice_settings, api_key, use_fallback=True)
-            print(f"      [ERROR] 오디오 데이터 없음")
-            return None
+        router.record_failure(model, failure)
+        errors.append(f"{MODEL_LABELS[model]} {failure}")
+        sink.reset()
 
-        audio_bytes = base64.b64decode(audio_data["data"])
-        if use_fallback:
-            print(f"      [OK] Pro 모델 사용")
-        return audio_bytes
+class _BufferSink:
+    """메모리 버퍼 sink (call_gemini_tts_api 호환용)"""
 
-    except requests.exceptions.Timeout:
-        if not use_fallback:
-            return call_gemini_tts_api(text, voice_settings, api_key, use_fallback=True)
-        print(f"      [TIMEOUT]")
-        return None
-    except Exception as e:
-        if not use_fallback:
-            return call_gemini_tts_api(text, voice_settings, api_key, use_fallback=True)
-        print(f"      [ERROR] {e}")
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def write(self, data: bytes) -> int:
+        return self.buffer.write(data)
+
+    def reset(self) -> None:
+        self.buffer.seek(0)
+        self.buffer.truncate()
+
+def call_gemini_tts_api(
+    text: str,
+    voice_settings: Dict[str, Any],
+    api_key: Union[str, KeyPool],
+    use_fallback: bool = False,
+    rate_limiter: Optional[RateLimiter] = None,
+    router: Optional[ModelRouter] = None
+) -> Optional[Tuple[bytes, str]]:
+    """Gemini TTS API 호출 - (PCM 데이터, 사용 모델) 반환"""
+    sink = _BufferSink()
+    model = stream_gemini_tts_api(text, voice_settings, api_key, sink, use_fallback, rate_limiter, router)
+    if model is None:
         return None
+    return sink.buffer.getvalue(), model
 
 def pcm_to_wav(pcm_data: bytes, sample_rate: int = 24000) -> bytes:
     """PCM -> WAV 변환"""
@@ -292,17 +551,21 @@ def pcm_to_wav(pcm_data: bytes, sample_rate: int = 24000) -> bytes:
     return wav_buffer.getvalue()
 
 def save_audio_file(audio_data: bytes, output_path: Path) -> bool:
-    """오디오 파일 저장"""
+    """오디오 파일 저장 (임시 파일 -> 원자적 교체)"""
     try:
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        wav_data = pcm_to_wav(audio_data)
-        with open(output_path, "wb") as f:
-            f.write(wav_data)
+        with AtomicWavWriter(output_path) as writer:
+            writer.write(audio_data)
+            writer.commit()
         return True
     except Exception as e:
         print(f"      [ERROR] 저장 실패: {e}")
         return False
 
+def read_wav_pcm(path: Path) -> bytes:
+    """WAV 파일의 PCM 프레임 읽기"""
+    with wave.open(str(path), "rb") as wav_file:
+        return wav_file.readframes(wav_file.getnframes())
+
 # ============================================================
 # TTS 생성
 # ============================================================
@@ -312,10 +575,20 @@ def generate_tts(
     exercise: str,
     grade: str,
     text: str,
-    api_key: str,
-    dry_run: bool = False
+    api_key: Union[str, KeyPool],
+    dry_run: bool = False,
+    rate_limiter: Optional[RateLimiter] = None,
+    cache: Optional[TTSCache] = None,
+    router: Optional[ModelRouter] = None,
+    report: Optional[Dict[str, Any]] = None
 ) -> bool:
-    """TTS 생성"""
+    """TTS 생성 (캐시에 같은 입력의 PCM이 있으면 API 호출 없이 재사용)
+
+    report가 주어지면 사용 모델("model")과 실패 사유 목록("errors")을 채운다.
+    """
+    if report is None:
+        report = {}
+    errors = report.setdefault("errors", [])
     voice_settings = get_voice_settings(worldview, grade)
     output_path = OUTPUT_DIR / worldview / f"{exercise}_{grade}.wav"
 
@@ -328,21 +601,256 @@ def generate_tts(
         print(f"      [DRY-RUN] 건너뜀")
         return True
 
-    audio_data = call_gemini_tts_api(text, voice_settings, api_key)
-    if audio_data is None:
-        return False
-
-    if save_audio_file(audio_data, output_path):
+    file_key = get_file_key(worldview, exercise, grade)
+    cache_keys = get_cache_keys(text, voice_settings)
+
+    hit = cache.lookup(cache_keys) if cache is not None else None
+    blob_path = cache.get_path(hit[0]) if hit is not None else None
+    with TELEMETRY.clip(file_key) as clip:
+        try:
+            if blob_path is not None:
+                cache_key, model = hit
+                print(f"      [CACHE] 캐시된 음성 재사용 ({cache_key[:12]})")
+                copy_pcm_to_wav(blob_path, output_path)
+                clip.outcome = "cached"
+            elif SENTENCE_CHUNKING is not None and len(text) > SENTENCE_CHUNKING.target_chars:
+                result = synthesize_chunked(file_key, text, voice_settings, api_key,
+                                            rate_limiter, cache, router, errors)
+                if result is None:
+                    return False
+                pcm_data, model = result
+                if not save_audio_file(pcm_data, output_path):
+                    errors.append("저장 실패")
+                    return False
+                # 이어 붙인 결과를 대표 모델의 줄 캐시 키로 저장 (다음 실행에서 그대로 스킵/재사용)
+                cache_key = dict((m, k) for k, m in cache_keys)[model]
+                if cache is not None:
+                    cache.put(cache_key, pcm_data)
+            else:
+                # WAV 출력과 캐시 blob에 동시에 스트리밍, 성공 시에만 둘 다 커밋
+                with AtomicWavWriter(output_path) as wav_out:
+                    blob = cache.staging() if cache is not None else None
+                    try:
+                        model = stream_gemini_tts_api(
+                            text, voice_settings, api_key, TeeWriter(wav_out, blob),
+                            rate_limiter=rate_limiter, router=router, errors=errors
+                        )
+                        if model is None:
+                            return False
+                        cache_key = dict((m, k) for k, m in cache_keys)[model]
+                        if blob is not None:
+                            cache.commit(blob, cache_key)
+                    finally:
+                        if blob is not None:
+                            blob.discard()
+                    wav_out.commit()
+        except Exception as e:
+            print(f"      [ERROR] 저장 실패: {e}")
+            errors.append(f"저장 실패: {e}")
+            return False
+
+        report["model"] = model
+        if clip.outcome != "cached":
+            clip.outcome = "ok"
+        clip.model = model
+        if cache is not None:
+            cache.set_ref(file_key, cache_key, model)
         file_size = output_path.stat().st_size / 1024
         print(f"      [OK] 저장됨 ({file_size:.1f}KB)")
         return True
-    return False
+
+def synthesize_chunked(
+    file_key: str,
+    text: str,
+    voice_settings: Dict[str, Any],
+    api_key: Union[str, KeyPool],
+    rate_limiter: Optional[RateLimiter],
+    cache: Optional[TTSCache],
+    router: Optional[ModelRouter],
+    errors: List[str],
+) -> Optional[Tuple[bytes, str]]:
+    """긴 대사를 문장 단위 조각으로 나눠 동시에 합성 후 연결 - (PCM, 대표 모델)
+
+    조각도 줄과 같은 음성/스타일로 요청하고, 조각별로 캐시한다. 실패한 조각만
+    CHUNK_RETRIES 회까지 다시 요청하며(성공한 조각은 다시 요청하지 않음), 그래도
+    남으면 None. 대표 모델은 가장 많은 조각을 만든 모델 (같으면 우선순위 순).
+    """
+    from tts_chunking import split_text, stitch_chunks, chunk_has_voice
+
+    chunks = split_text(text, SENTENCE_CHUNKING)
+    print(f"      [CHUNK] {len(chunks)}조각 ({'/'.join(str(len(c)) for c in chunks)}자)")
+    RUN_STATS.incr("chunk.lines")
+    RUN_STATS.incr("chunk.pieces", len(chunks))
+    results: List[Optional[Tuple[bytes, str]]] = [None] * len(chunks)
+
+    def synth_chunk(index: int) -> Optional[Tuple[bytes, str]]:
+        chunk = chunks[index]
+        chunk_keys = get_cache_keys(chunk, voice_settings)
+        if cache is not None:
+            hit = cache.lookup(chunk_keys)
+            data = cache.get(hit[0]) if hit is not None else None
+            if data is not None:
+                RUN_STATS.incr("chunk.cached")
+                return data, hit[1]
+
+        chunk_errors: List[str] = []
+        sink = _BufferSink()
+        # 조각은 줄 수에 넣지 않음 (시도/지연/폴백은 조각 단위로 기록)
+        with TELEMETRY.clip(f"{file_key}#{index + 1}", lines=0) as clip:
+            model = stream_gemini_tts_api(chunk, voice_settings, api_key, sink, rate_limiter=rate_limiter,
+                                          router=router, errors=chunk_errors)
+            pcm_data = sink.buffer.getvalue()
+            if model is not None and not chunk_has_voice(pcm_data, SENTENCE_CHUNKING):
+                chunk_errors.append(f"{MODEL_LABELS[model]} 무음")
+                model = None
+            if model is None:
+                errors.extend(f"조각 {index + 1} {e}" for e in chunk_errors)
+                return None
+            clip.outcome = "ok"
+            clip.model = model
+        if cache is not None:
+            cache.put(dict((m, k) for k, m in chunk_keys)[model], pcm_data)
+        return pcm_data, model
+
+    executor = CHUNK_EXECUTOR or ThreadPoolExecutor(max_workers=DEFAULT_CHUNK_WORKERS)
+    try:
+        for attempt in range(1 + CHUNK_RETRIES):
+            pending = [i for i, result in enumerate(results) if result is None]
+            if not pending:
+                break
+            if attempt:
+                print(f"      [CHUNK] 실패한 조각만 재시도: {', '.join(str(i + 1) for i in pending)}번")
+                RUN_STATS.incr("chunk.retries", len(pending))
+            futures = {i: executor.submit(synth_chunk, i) for i in pending}
+            for i, future in futures.items():
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    errors.append(f"조각 {i + 1} {type(e).__name__}: {e}")
+    finally:
+        if executor is not CHUNK_EXECUTOR:
+            executor.shutdown(wait=True)
+
+    if any(result is None for result in results):
+        failed = [i + 1 for i, result in enumerate(results) if result is None]
+        print(f"      [CHUNK] 조각 {', '.join(map(str, failed))}번 실패")
+        return None
+
+    models = [model for _, model in results]
+    model = max(FALLBACK_CHAIN, key=models.count)
+    if len(set(models)) > 1:
+        print(f"      [CHUNK] 조각 모델 혼합: " + ", ".join(MODEL_LABELS.get(m, m) for m in models))
+    return stitch_chunks([pcm for pcm, _ in results], SENTENCE_CHUNKING), model
+
+def generate_tts_batch(
+    lines: List[Tuple[str, str, str, str]],
+    api_key: Union[str, KeyPool],
+    rate_limiter: Optional[RateLimiter] = None,
+    cache: Optional[TTSCache] = None,
+    router: Optional[ModelRouter] = None,
+    reports: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Dict[str, bool]:
+    """같은 세계관(음성)의 여러 줄을 요청 하나로 합성 - 파일 키별 성공 여부 반환
+
+    줄 사이에 쉼 표시를 넣어 합성한 뒤 무음 구간으로 나누고, 줄별 길이가
+    글자 수 비율과 맞지 않으면 해당 배치를 한 줄씩 다시 요청한다.
+    캐시에 있는 줄은 배치에서 빼고 generate_tts 로 처리한다.
+    """
+    # numpy 의존성은 배치 모드를 켤 때만 필요
+    from tts_batch import build_batch_text, split_batch_pcm
+
+    if reports is None:
+        reports = {}
+    results: Dict[str, bool] = {}
+    pending: List[Tuple[str, str, str, str]] = []
+    for line in lines:
+        file_key = get_file_key(*line[:3])
+        report = reports.setdefault(file_key, {})
+        voice_settings = get_voice_settings(line[0], line[2])
+        if cache is not None and cache.lookup(get_cache_keys(line[3], voice_settings)) is not None:
+            results[file_key] = generate_tts(*line, api_key, False, rate_limiter, cache, router, report)
+        else:
+            pending.append(line)
+    if len(pending) <= 1:
+        for line in pending:
+            file_key = get_file_key(*line[:3])
+            results[file_key] = generate_tts(*line, api_key, False, rate_limiter, cache, router, reports[file_key])
+        return results
+
+    worldview = pending[0][0]
+    styled_lines = [build_styled_text(line[3], get_voice_settings(worldview, line[2])) for line in pending]
+    # 줄별 스타일 접두사가 이미 텍스트에 들어 있으므로 요청 자체는 neutral
+    batch_settings = {**get_voice_settings(worldview, pending[0][2]), "style": "neutral"}
+
+    print(f"\n[BATCH] {worldview} {len(pending)}줄: {', '.join(f'{l[1]}_{l[2]}' for l in pending)}")
+    RUN_STATS.incr("batch.requests")
+    RUN_STATS.incr("batch.lines", len(pending))
+    errors: List[str] = []
+    sink = _BufferSink()
+    with TELEMETRY.clip(f"batch:{worldview}", lines=len(pending)) as batch_clip:
+        model = stream_gemini_tts_api(build_batch_text(styled_lines), batch_settings, api_key, sink,
+                                      rate_limiter=rate_limiter, router=router, errors=errors)
+        if model is None:
+            for line in pending:
+                file_key = get_file_key(*line[:3])
+                reports[file_key].setdefault("errors", []).extend(f"배치 {e}" for e in errors)
+                results[file_key] = False
+            return results
+
+        clips, reason = split_batch_pcm(sink.buffer.getvalue(), styled_lines)
+        batch_clip.model = model
+        # 분할 실패한 줄은 아래에서 한 줄씩 다시 요청하므로 성공/실패로 세지 않음
+        batch_clip.outcome = "ok" if clips is not None else "split_failed"
+    if clips is None:
+        # 잘못 잘린 오디오는 쓰지 않고 한 줄씩 다시 요청
+        print(f"      [BATCH] 분할 실패 ({reason}) - 한 줄씩 재요청")
+        RUN_STATS.incr("batch.split_failed")
+        for line in pending:
+            file_key = get_file_key(*line[:3])
+            results[file_key] = generate_tts(*line, api_key, False, rate_limiter, cache, router, reports[file_key])
+        return results
+
+    RUN_STATS.incr("batch.split_ok")
+    for line, pcm in zip(pending, clips):
+        worldview, exercise, grade, text = line
+        file_key = get_file_key(worldview, exercise, grade)
+        output_path = OUTPUT_DIR / worldview / f"{exercise}_{grade}.wav"
+        if not save_audio_file(pcm, output_path):
+            reports[file_key].setdefault("errors", []).append("저장 실패")
+            results[file_key] = False
+            continue
+        if cache is not None:
+            cache_key = dict((m, k) for k, m in get_cache_keys(text, get_voice_settings(worldview, grade)))[model]
+            cache.put(cache_key, pcm)
+            cache.set_ref(file_key, cache_key, model)
+        reports[file_key]["model"] = model
+        results[file_key] = True
+        print(f"      [OK] {file_key} ({len(pcm) / 2 / 24000:.1f}초)")
+    return results
 
 # ============================================================
 # 메인
 # ============================================================
 
+def describe_slot(slot: str) -> str:
+    """슬롯 이름(<키 지문>:<모델>) -> "Flash 6ab9f1" (속도 로그용)"""
+    fingerprint, _, model = slot.partition(":")
+    return f"{MODEL_LABELS.get(model, model)} {fingerprint[:6]}"
+
+def parse_daily_limits(values: List[str]) -> Dict[str, int]:
+    """['flash=100', 'pro=50'] -> 모델 ID별 일일 한도"""
+    aliases = {label.lower(): model for model, label in MODEL_LABELS.items()}
+    limits: Dict[str, int] = {}
+    for value in values:
+        name, _, count = value.partition("=")
+        model = aliases.get(name.strip().lower(), name.strip())
+        if model not in MODEL_LABELS or not count.strip().isdigit():
+            raise ValueError(f"키 한도 형식은 flash=N / pro=N: {value}")
+        limits[model] = int(count)
+    return limits
+
 def main():
+    global GEMINI_API_BASE, RATE_LIMIT_BACKOFF, OUTPUT_DIR, TRANSPORT, TELEMETRY, SENTENCE_CHUNKING, CHUNK_EXECUTOR
     parser = argparse.ArgumentParser(description="HearO Web MVP TTS 생성")
     parser.add_argument("--dry-run", action="store_true", help="실제 생성 없이 확인만")
     parser.add_argument("--worldview", "-w", choices=ALL_WORLDVIEWS, help="특정 세계관만")
@@ -350,23 +858,108 @@ def main():
     parser.add_argument("--new-only", action="store_true", help="신규 운동만 (lunge, bicep_curl, arm_raise)")
     parser.add_argument("--reset", action="store_true", help="진행 상황 초기화")
     parser.add_argument("--retry-failed", action="store_true", help="실패한 항목만 재시도")
-    parser.add_argument("--api-key", "-k", default=os.environ.get("GEMINI_API_KEY"))
+    parser.add_argument("--api-key", "-k", action="append",
+                        help="API 키 (반복 또는 쉼표 구분, 기본: GEMINI_API_KEYS / GEMINI_API_KEY)")
+    parser.add_argument("--api-key-file", type=Path, help="API 키 파일 (한 줄에 하나)")
+    parser.add_argument("--key-state", type=Path, default=KEY_STATE_FILE, help="키별 사용량 기록 파일")
+    parser.add_argument("--key-daily-limit", action="append", default=[], metavar="MODEL=N",
+                        help="키 하나의 모델별 일일 요청 한도 (예: flash=100, pro=50)")
+    parser.add_argument("--concurrency", "-j", type=int, default=1, help="동시 생성 워커 수")
+    parser.add_argument("--min-interval", type=float, default=DEFAULT_MIN_INTERVAL,
+                        help=f"키x모델별 요청 간격 초 - fixed: 고정 간격, aimd: 처음 시작 속도 (기본: {DEFAULT_MIN_INTERVAL})")
+    parser.add_argument("--rate-control", choices=["aimd", "fixed"], default="aimd",
+                        help="aimd: 성공 시 속도 증가, 429 시 절반 + Retry-After 준수 (기본) / fixed: 고정 간격")
+    parser.add_argument("--max-rpm", type=float, default=DEFAULT_MAX_RPM,
+                        help=f"aimd 키x모델별 최대 분당 요청 수 (기본: {DEFAULT_MAX_RPM:.0f})")
+    parser.add_argument("--rate-state", type=Path, default=RATE_STATE_FILE,
+                        help="aimd 학습 속도 기록 파일 (다음 실행이 이어서 시작)")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="같은 세계관 대사 N줄을 요청 하나로 합성 후 무음으로 분할 (기본: 1, 배치 안함)")
+    parser.add_argument("--chunk-chars", type=int, default=0,
+                        help="N자보다 긴 대사를 문장 단위 조각(약 N자)으로 나눠 동시 합성 후 연결 (numpy 필요, 기본: 0 안함)")
+    parser.add_argument("--chunk-workers", type=int, default=DEFAULT_CHUNK_WORKERS,
+                        help=f"대사 하나의 조각 동시 요청 수 (기본: {DEFAULT_CHUNK_WORKERS})")
+    parser.add_argument("--postprocess", action="store_true", help="생성 직후 무음 트리밍 + 라우드니스 정규화 (numpy 필요)")
+    parser.add_argument("--lipsync", action="store_true", help="생성된 세계관의 립싱크 타임라인 갱신 (numpy 필요)")
+    parser.add_argument("--no-cache", action="store_true", help="콘텐츠 캐시 사용 안함")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_MB,
+                        help=f"캐시 최대 크기 MB (기본: {DEFAULT_MAX_MB})")
+    parser.add_argument("--api-base", default=GEMINI_API_BASE, help="generateContent 엔드포인트 기준 URL")
+    parser.add_argument("--read-timeout", "--timeout", dest="read_timeout", type=float, default=DEFAULT_READ_TIMEOUT,
+                        help=f"응답 읽기 타임아웃 초 (기본: {DEFAULT_READ_TIMEOUT:.0f})")
+    parser.add_argument("--connect-timeout", type=float, default=DEFAULT_CONNECT_TIMEOUT,
+                        help=f"연결 타임아웃 초 (기본: {DEFAULT_CONNECT_TIMEOUT:.0f})")
+    parser.add_argument("--pool-size", type=int, help="호스트당 유지할 HTTP 연결 수 (기본: 동시 실행 수)")
+    parser.add_argument("--rate-limit-backoff", type=float, default=RATE_LIMIT_BACKOFF,
+                        help=f"Pro 429 백오프 기준 초 (기본: {RATE_LIMIT_BACKOFF})")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR, help="WAV 출력 디렉토리")
+    parser.add_argument("--progress-file", type=Path, default=PROGRESS_FILE,
+                        help="이전 진행 JSON (작업 DB가 비어 있을 때 한 번 가져옴)")
+    parser.add_argument("--job-db", type=Path, default=JOB_DB_FILE, help="작업 DB (여러 프로세스/머신이 공유 가능)")
+    parser.add_argument("--shard", help="i/N - 전체 카탈로그 중 i번째 조각만 처리 (DB를 공유하지 않는 머신 분할)")
+    parser.add_argument("--lease-seconds", type=float, default=DEFAULT_LEASE_SECONDS,
+                        help=f"작업 점유 리스 시간 초 (기본: {DEFAULT_LEASE_SECONDS:.0f})")
+    parser.add_argument("--cache-dir", type=Path, default=None, help="오디오 캐시 디렉토리")
+    parser.add_argument("--summary-json", type=Path, help="실행 결과 요약 JSON 저장 경로")
+    parser.add_argument("--breaker-cooldown", type=float, default=DEFAULT_COOLDOWN,
+                        help=f"모델 차단 후 재시도까지 쿨다운 초 (기본: {DEFAULT_COOLDOWN:.0f})")
+    parser.add_argument("--breaker-threshold", type=int, default=DEFAULT_FAILURE_THRESHOLD,
+                        help=f"타임아웃/서버 오류 연속 몇 회에 차단할지 (기본: {DEFAULT_FAILURE_THRESHOLD})")
+    parser.add_argument("--breaker-max-wait", type=float, default=DEFAULT_MAX_WAIT,
+                        help=f"모든 모델 차단 시 파일당 최대 대기 초 (기본: {DEFAULT_MAX_WAIT:.0f})")
+    parser.add_argument("--telemetry", type=Path,
+                        help=f"시도별 이벤트 JSONL 경로 (기본: {TELEMETRY_DIR.name}/<실행ID>.jsonl)")
+    parser.add_argument("--no-telemetry", action="store_true", help="텔레메트리 기록 안함")
     args = parser.parse_args()
 
-    api_key = args.api_key
-    if not api_key and not args.dry_run:
+    GEMINI_API_BASE = args.api_base.rstrip("/")
+    TRANSPORT = Transport(TransportConfig(
+        pool_maxsize=max(1, args.pool_size or args.concurrency),
+        connect_timeout=args.connect_timeout,
+        read_timeout=args.read_timeout,
+    ))
+    TRANSPORT.add_hook(TRANSPORT_STATS)
+    RATE_LIMIT_BACKOFF = args.rate_limit_backoff
+    OUTPUT_DIR = args.output_dir
+    started_at = time.monotonic()
+
+    try:
+        shard = parse_shard(args.shard)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    if args.chunk_chars > 0 and args.batch_size > 1:
+        print("[ERROR] --chunk-chars 와 --batch-size 는 함께 쓸 수 없음 (대사를 나누거나 묶거나 하나만)")
+        sys.exit(1)
+    if args.chunk_chars > 0:
+        # numpy 의존성은 분할 합성을 켤 때만 필요
+        from tts_chunking import ChunkOptions
+        SENTENCE_CHUNKING = ChunkOptions(target_chars=args.chunk_chars,
+                                         max_chars=max(args.chunk_chars, ChunkOptions.max_chars))
+        CHUNK_EXECUTOR = ThreadPoolExecutor(max_workers=max(1, args.chunk_workers),
+                                            thread_name_prefix="tts-chunk")
+
+    try:
+        keys = load_api_keys(args.api_key, args.api_key_file)
+        daily_limits = parse_daily_limits(args.key_daily_limit)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    if not keys and not args.dry_run:
         print("[ERROR] Gemini API 키 필요")
         print("        set GEMINI_API_KEY=your_api_key")
         sys.exit(1)
+    api_key = KeyPool(keys, daily_limits, rate_limit_park=RATE_LIMIT_BACKOFF, state_file=args.key_state)
 
     stories = load_stories()
 
+    store = JobStore(args.job_db)
     if args.reset:
-        progress = {"completed": [], "failed": [], "skipped": []}
-        save_progress(progress)
+        store.reset()
         print("[INFO] 진행 상황 초기화")
-    else:
-        progress = load_progress()
+    imported = store.import_progress_json(args.progress_file)
+    if imported:
+        print(f"[INFO] 이전 진행 기록 {imported}개를 작업 DB로 가져옴 ({args.progress_file.name})")
 
     # 대상 결정
     worldviews = [args.worldview] if args.worldview else ALL_WORLDVIEWS
@@ -388,12 +981,26 @@ HearO Web MVP TTS 생성 - Gemini 2.5 Flash/Pro
 운동: {', '.join(exercises)}
 등급: perfect, good, normal
 총 파일: {total}개
+동시 실행: {max(1, args.concurrency)}개 / 키x모델별 간격: {args.min_interval}초 ({args.rate_control})
+API 키: {len(keys)}개
+샤드: {args.shard or '전체'} / 작업 DB: {args.job_db.name}
 ============================================================
 """)
 
-    success_count = 0
-    fail_count = 0
+    cache = None
+    if not args.no_cache:
+        cache_kwargs = {"root": args.cache_dir} if args.cache_dir else {}
+        cache = TTSCache(max_bytes=args.cache_max_mb * 1024 * 1024, **cache_kwargs)
+
+    # 작업 목록 수집
+    scanned_at = time.time()
+    jobs: List[Tuple[str, str, str, str]] = []
+    input_hashes: Dict[str, str] = {}
     skip_count = 0
+    adopt_count = 0
+    job_rows = {row["file_key"]: row for row in store.rows()}
+    completed_keys = {key for key, row in job_rows.items() if row["status"] == COMPLETED}
+    failed_keys = {key for key, row in job_rows.items() if row["status"] == FAILED}
 
     for worldview in worldviews:
         if worldview not in stories:
@@ -407,38 +1014,249 @@ HearO Web MVP TTS 생성 - Gemini 2.5 Flash/Pro
 
             for grade in GRADES:
                 file_key = get_file_key(worldview, exercise, grade)
+                if not in_shard(file_key, shard):
+                    continue
+
+                text = stories[worldview][exercise].get(grade)
+                cache_keys = get_cache_keys(text, get_voice_settings(worldview, grade)) if text else []
+                input_hash = cache_keys[0][0] if cache_keys else None
 
                 if args.retry_failed:
-                    if file_key not in progress.get("failed", []):
+                    if file_key not in failed_keys:
+                        continue
+                elif cache is None:
+                    # 입력 해시가 기록되지 않은 행(이전 진행 JSON)은 완료 여부만 본다
+                    row = job_rows.get(file_key)
+                    if file_key in completed_keys and row["input_hash"] in (None, input_hash):
+                        skip_count += 1
+                        continue
+                elif text:
+                    # 입력(텍스트/음성/스타일/모델)이 그대로인 출력만 스킵
+                    output_path = OUTPUT_DIR / worldview / f"{exercise}_{grade}.wav"
+                    if cache.is_fresh(file_key, [k for k, _ in cache_keys], output_path):
+                        skip_count += 1
+                        continue
+                    # 캐시 도입 이전에 생성된 파일은 현재 입력으로 만들어진 것으로 보고 등록
+                    if (file_key in completed_keys and output_path.exists()
+                            and cache.get_ref(file_key) is None and not args.dry_run):
+                        cache_key, model = cache_keys[0]
+                        cache.put(cache_key, read_wav_pcm(output_path))
+                        cache.set_ref(file_key, cache_key, model)
+                        store.mark_completed(file_key, worldview, exercise, grade, input_hash,
+                                             file_sha256(output_path), model)
+                        adopt_count += 1
+                        skip_count += 1
                         continue
-                elif file_key in progress["completed"]:
-                    skip_count += 1
-                    continue
 
-                text = stories[worldview][exercise].get(grade)
                 if not text:
                     print(f"[WARN] 텍스트 없음: {file_key}")
                     continue
 
-                success = generate_tts(worldview, exercise, grade, text, api_key, args.dry_run)
-
-                if success:
-                    success_count += 1
-                    if file_key not in progress["completed"]:
-                        progress["completed"].append(file_key)
-                    if file_key in progress.get("failed", []):
-                        progress["failed"].remove(file_key)
-                else:
-                    fail_count += 1
-                    if "failed" not in progress:
-                        progress["failed"] = []
-                    if file_key not in progress["failed"]:
-                        progress["failed"].append(file_key)
-
-                save_progress(progress)
-
-                if not args.dry_run:
-                    time.sleep(8)  # Rate limit 방지
+                jobs.append((worldview, exercise, grade, text))
+                input_hashes[file_key] = input_hash
+
+    rate_limiter = None
+    if not args.dry_run and args.rate_control == "aimd":
+        rate_limiter = AdaptiveRateLimiter(
+            start_rpm=60.0 / args.min_interval if args.min_interval > 0 else args.max_rpm,
+            max_rpm=args.max_rpm,
+            state_file=args.rate_state,
+            describe=describe_slot,
+            on_change=lambda slot, rpm, reason: TELEMETRY.emit("rate", slot=slot, rpm=round(rpm, 2), reason=reason),
+        )
+    elif not args.dry_run:
+        rate_limiter = RateLimiter(args.min_interval)
+    router = ModelRouter(FALLBACK_CHAIN, MODEL_LABELS, cooldown=args.breaker_cooldown,
+                         failure_threshold=args.breaker_threshold, max_wait=args.breaker_max_wait)
+
+    if not args.dry_run and not args.no_telemetry:
+        run_id = make_run_id()
+        telemetry_path = args.telemetry or TELEMETRY_DIR / f"{run_id}.jsonl"
+        TELEMETRY = Telemetry(telemetry_path, run_id)
+        TELEMETRY.emit("run", phase="start", settings={
+            "jobs": len(jobs),
+            "concurrency": max(1, args.concurrency),
+            "min_interval": args.min_interval,
+            "rate_control": args.rate_control,
+            "batch_size": max(1, args.batch_size),
+            "chunk_chars": args.chunk_chars,
+            "keys": len(keys),
+            "models": FALLBACK_CHAIN,
+            "postprocess": args.postprocess,
+        })
+        print(f"[TELEMETRY] {telemetry_path}")
+
+    postprocess = None
+    if args.postprocess and not args.dry_run:
+        # numpy 의존성은 후처리를 켤 때만 필요
+        from postprocess_tts import PostprocessOptions, process_clip
+        postprocess_options = PostprocessOptions()
+
+        def postprocess(path: Path) -> None:
+            result = process_clip(path, postprocess_options)
+            print(f"      [POST] 앞 무음 -{result['lead_silence_removed_ms']:.0f}ms, "
+                  f"게인 {result['gain_db']:+.1f}dB, -{result['bytes_saved'] / 1024:.1f}KB")
+    batch_size = max(1, args.batch_size)
+    progress_lock = threading.Lock()
+    counts = {"success": 0, "fail": 0, "lost": 0}
+    changed_worldviews: Set[str] = set()
+    jobs_by_key = {get_file_key(*job[:3]): job for job in jobs}
+    owner = make_owner_id()
+
+    def run_job(job: Tuple[str, str, str, str]) -> None:
+        worldview, exercise, grade, text = job
+        file_key = get_file_key(worldview, exercise, grade)
+        report: Dict[str, Any] = {}
+        try:
+            success = generate_tts(worldview, exercise, grade, text, api_key, args.dry_run,
+                                   rate_limiter, cache, router, report)
+        except Exception as e:
+            print(f"      [ERROR] {file_key}: {e}")
+            report.setdefault("errors", []).append(f"{type(e).__name__}: {e}")
+            success = False
+        record_result(job, success, report)
+
+    def run_batch(batch: List[Tuple[str, str, str, str]]) -> None:
+        reports: Dict[str, Dict[str, Any]] = {}
+        try:
+            results = generate_tts_batch(batch, api_key, rate_limiter, cache, router, reports)
+        except Exception as e:
+            print(f"      [ERROR] 배치: {e}")
+            results = {}
+            for job in batch:
+                reports.setdefault(get_file_key(*job[:3]), {}).setdefault("errors", []).append(
+                    f"{type(e).__name__}: {e}")
+        for job in batch:
+            file_key = get_file_key(*job[:3])
+            record_result(job, results.get(file_key, False), reports.get(file_key, {}))
+
+    def record_result(job: Tuple[str, str, str, str], success: bool, report: Dict[str, Any]) -> None:
+        worldview, exercise, grade, _ = job
+        file_key = get_file_key(worldview, exercise, grade)
+        if success and postprocess is not None:
+            try:
+                postprocess(OUTPUT_DIR / worldview / f"{exercise}_{grade}.wav")
+            except Exception as e:
+                print(f"      [ERROR] {file_key}: {e}")
+                report.setdefault("errors", []).append(f"{type(e).__name__}: {e}")
+                success = False
+
+        # 결과는 작업 DB에 트랜잭션으로 기록 (리스를 잃었으면 다른 워커 결과를 존중)
+        recorded = True
+        if not args.dry_run:
+            if success:
+                output_hash = file_sha256(OUTPUT_DIR / worldview / f"{exercise}_{grade}.wav")
+                recorded = store.complete(file_key, owner, output_hash, report.get("model"))
+            else:
+                recorded = store.fail(file_key, owner, "; ".join(report.get("errors", [])) or "알 수 없는 오류")
+
+        with progress_lock:
+            counts["success" if success else "fail"] += 1
+            if success:
+                changed_worldviews.add(worldview)
+            if not recorded:
+                counts["lost"] += 1
+                print(f"      [WARN] 리스 만료 - 다른 워커가 점유한 작업: {file_key}")
+            done = counts["success"] + counts["fail"]
+            print(f"[PROGRESS] {done}/{len(jobs)} ({file_key})")
+
+    def worker() -> None:
+        # 대기/리스 만료 작업을 하나씩 점유해 처리 (배치 모드면 같은 세계관 작업을 더 점유)
+        while True:
+            row = store.claim(owner, jobs_by_key, args.lease_seconds)
+            if row is None:
+                break
+            job = jobs_by_key[row["file_key"]]
+            if batch_size <= 1:
+                run_job(job)
+                continue
+            batch = [job]
+            same_voice = [key for key, other in jobs_by_key.items() if other[0] == job[0]]
+            while len(batch) < batch_size:
+                extra = store.claim(owner, same_voice, args.lease_seconds)
+                if extra is None:
+                    break
+                batch.append(jobs_by_key[extra["file_key"]])
+            run_batch(batch)
+        store.close()
+
+    if batch_size > 1:
+        per_voice: Dict[str, int] = {}
+        for job in jobs:
+            per_voice[job[0]] = per_voice.get(job[0], 0) + 1
+        batches = sum(-(-n // batch_size) for n in per_voice.values())
+        print(f"[BATCH] {len(jobs)}줄 -> 요청 약 {batches}회 (세계관별 {batch_size}줄씩)")
+
+    concurrency = max(1, args.concurrency)
+    if args.dry_run:
+        for job in jobs:
+            run_job(job)
+    else:
+        queued = store.enqueue(
+            ((key, *job[:3], input_hashes[key]) for key, job in jobs_by_key.items()), scanned_at
+        )
+        if queued < len(jobs):
+            print(f"[INFO] {len(jobs) - queued}개는 이미 대기열에 있거나 다른 프로세스가 진행/완료함")
+        if concurrency > 1:
+            print(f"[INFO] 동시 실행: {concurrency} 워커")
+        with LeaseKeeper(store, owner, args.lease_seconds):
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = [executor.submit(worker) for _ in range(concurrency)]
+                for future in as_completed(futures):
+                    future.result()
+
+    success_count = counts["success"]
+    fail_count = counts["fail"]
+
+    if args.lipsync and not args.dry_run:
+        # 후처리까지 끝난 최종 오디오 기준 (바뀐 클립만 다시 분석)
+        from lipsync_tts import pack_worldview
+        for worldview in sorted(changed_worldviews):
+            result = pack_worldview(worldview, tts_dir=OUTPUT_DIR)
+            print(f"[LIPSYNC] {worldview}: 분석 {result['analyzed']}개, 재사용 {result['reused']}개")
+
+    if adopt_count:
+        print(f"[CACHE] 기존 파일 {adopt_count}개를 캐시에 등록")
+    if cache is not None and not args.dry_run:
+        gc_result = cache.gc()
+        if gc_result["removed"]:
+            print(f"[CACHE] GC: {gc_result['removed']}개 정리 "
+                  f"({gc_result['freed_bytes'] / 1024 / 1024:.1f}MB)")
+
+    if CHUNK_EXECUTOR is not None:
+        CHUNK_EXECUTOR.shutdown(wait=True)
+    if not args.dry_run:
+        api_key.save()
+    rates = rate_limiter.snapshot() if isinstance(rate_limiter, AdaptiveRateLimiter) else {}
+    if rates:
+        rate_limiter.save()
+
+    wall_time = time.monotonic() - started_at
+    TELEMETRY.emit("run", phase="end", success=success_count, fail=fail_count, skip=skip_count,
+                   wall_ms=round(wall_time * 1000, 1))
+    telemetry_report = build_report(TELEMETRY.events) if TELEMETRY.enabled else None
+    TELEMETRY.close()
+    stats = RUN_STATS.snapshot()
+    key_usage = api_key.snapshot()
+    key_lines = "\n".join(
+        f"  {fingerprint[:6]}: " + ", ".join(
+            f"{MODEL_LABELS.get(model, model)} {info['requests']}회 (429 {info['rate_limited']}, 403 {info['quota_exceeded']})"
+            for model, info in sorted(models.items())
+        )
+        for fingerprint, models in key_usage.items()
+    ) or "  (요청 없음)"
+    breakers = router.snapshot()
+    http = TRANSPORT_STATS.summary()
+    rate_lines = "\n".join(
+        f"  {describe_slot(slot)}: {info['rpm']:.1f} rpm (범위 {info['min_rpm']:.1f}~{info['max_rpm']:.1f}, "
+        f"성공 {info['successes']}회, 감소 {info['cuts']}회)"
+        for slot, info in rates.items()
+    ) or f"  고정 간격 {args.min_interval}초"
+    breaker_lines = "\n".join(
+        f"  {name}: {info['state']} (생성 {stats.get(f'model.{name}', 0)}개, 실패 {sum(info['failures'].values())}회, "
+        f"차단 {info['trips']}회, 건너뜀 {info['skipped']}회)"
+        for name, info in breakers.items()
+    )
 
     print(f"""
 ============================================================
@@ -447,9 +1265,49 @@ HearO Web MVP TTS 생성 - Gemini 2.5 Flash/Pro
 성공: {success_count}개
 실패: {fail_count}개
 스킵: {skip_count}개
-총 완료: {len(progress['completed'])}개
+총 완료: {store.counts().get(COMPLETED, 0)}개
+소요 시간: {wall_time:.1f}초
+요청: Flash {stats.get('requests.Flash', 0)}회 / Pro {stats.get('requests.Pro', 0)}회
+재시도: {stats.get('retries', 0)}회 / 폴백: {stats.get('fallbacks', 0)}회
+배치: {stats.get('batch.requests', 0)}회 ({stats.get('batch.lines', 0)}줄), 분할 실패 {stats.get('batch.split_failed', 0)}회
+문장 분할: {stats.get('chunk.lines', 0)}줄 -> {stats.get('chunk.pieces', 0)}조각 (캐시 {stats.get('chunk.cached', 0)}), 조각 재시도 {stats.get('chunk.retries', 0)}회
+모델 상태:
+{breaker_lines}
+키별 요청:
+{key_lines}
+요청 속도:
+{rate_lines}
+HTTP: 새 연결 {http['new_connections']}회 / 재사용 {http['reused_connections']}회, 수신 {http['wire_bytes'] / 1024 / 1024:.1f}MB
+  평균 연결 {http['avg_connect_ms']:.0f}ms / 서버 {http['avg_server_ms']:.0f}ms / 전송 {http['avg_transfer_ms']:.0f}ms
 ============================================================
 """)
+    if telemetry_report is not None:
+        print(f"""텔레메트리
+============================================================
+{format_report(telemetry_report)}
+============================================================
+""")
+
+    if args.summary_json:
+        summary = {
+            "success": success_count,
+            "fail": fail_count,
+            "skip": skip_count,
+            "jobs": len(jobs),
+            "concurrency": max(1, args.concurrency),
+            "min_interval": args.min_interval,
+            "batch_size": batch_size,
+            "chunk_chars": args.chunk_chars,
+            "wall_time": round(wall_time, 3),
+            "stats": stats,
+            "breakers": breakers,
+            "http": http,
+            "keys": key_usage,
+            "rates": rates,
+            "telemetry": telemetry_report,
+        }
+        with open(args.summary_json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
 
     if fail_count > 0:
         print(f"[TIP] 실패 재시도: python generate_tts_gemini.py --retry-failed")
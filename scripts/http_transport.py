@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+HearO 에셋 생성기 공용 HTTP 전송 계층
+
+생성 스크립트가 외부 API를 부를 때 공유하는 커넥션 풀 세션.
+- requests.Session + HTTPAdapter 커넥션 풀 (keep-alive, 크기 조절 가능)
+- 연결/읽기 타임아웃 분리 (connect, read)
+- gzip 응답 압축 요청, 연결 단계 오류만 자동 재시도 (POST 중복 방지)
+- 요청별 단계 시간 측정: 연결, TTFB(헤더 수신), 본문 전송, 수신 바이트(압축 상태)
+- 측정값은 등록된 훅으로 전달 (통계 집계용)
+
+사용 예:
+    transport = Transport(TransportConfig(pool_maxsize=8, read_timeout=60))
+    transport.add_hook(lambda timing: print(timing.ttfb_ms))
+    with transport.stream("POST", url, json=payload) as response:
+        for chunk in response.iter_content(64 * 1024):
+            ...
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import PoolManager
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+# ============================================================
+# 설정
+# ============================================================
+
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 60.0
+DEFAULT_POOL_SIZE = 8
+
+
+@dataclass
+class TransportConfig:
+    """커넥션 풀 / 타임아웃 설정"""
+    pool_connections: int = 4             # 호스트별 풀 개수
+    pool_maxsize: int = DEFAULT_POOL_SIZE # 호스트당 유지할 연결 수 (동시 실행 수 이상 권장)
+    pool_block: bool = True               # 풀이 가득 차면 새 연결 대신 대기
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT
+    read_timeout: float = DEFAULT_READ_TIMEOUT
+    connect_retries: int = 2              # 연결 실패만 재시도 (요청 본문 전송 전)
+    gzip: bool = True
+
+
+@dataclass
+class RequestTiming:
+    """요청 하나의 단계별 시간 (ms) / 바이트"""
+    method: str
+    url: str
+    status: int = 0
+    new_connection: bool = False
+    connect_ms: float = 0.0     # TCP + TLS (재사용 연결이면 0)
+    ttfb_ms: float = 0.0        # 요청 시작 -> 응답 헤더 (연결 포함)
+    transfer_ms: float = 0.0    # 응답 헤더 -> 본문 끝
+    total_ms: float = 0.0
+    wire_bytes: int = 0         # 수신 본문 (압축 상태)
+    encoding: str = ""
+    error: str = ""
+
+    @property
+    def server_ms(self) -> float:
+        """TTFB에서 연결 시간을 뺀 서버 처리 + 왕복 시간"""
+        return max(0.0, self.ttfb_ms - self.connect_ms)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["server_ms"] = round(self.server_ms, 1)
+        return data
+
+# ============================================================
+# 연결 시간 측정 (urllib3 연결 클래스)
+# ============================================================
+
+# 현재 스레드에서 진행 중인 요청의 측정 기록 (연결은 요청 스레드에서 맺어짐)
+_current = threading.local()
+
+
+class _TimedConnectMixin:
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            timing = getattr(_current, "timing", None)
+            if timing is not None:
+                timing.new_connection = True
+                timing.connect_ms += (time.perf_counter() - started) * 1000
+
+
+class TimedHTTPConnection(_TimedConnectMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """연결 시간을 기록하는 커넥션 풀을 쓰는 어댑터"""
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        super().init_poolmanager(connections, maxsize, block, **pool_kwargs)
+        manager: PoolManager = self.poolmanager
+        manager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+# ============================================================
+# 전송 계층
+# ============================================================
+
+TimingHook = Callable[[RequestTiming], None]
+
+
+class Transport:
+    """커넥션 풀 세션 + 단계별 시간 측정 (스레드 간 공유 가능)"""
+
+    def __init__(self, config: Optional[TransportConfig] = None):
+        self.config = config or TransportConfig()
+        self.session = requests.Session()
+        retry = Retry(total=None, connect=self.config.connect_retries, read=0, status=0,
+                      other=0, backoff_factor=0.5, allowed_methods=None)
+        adapter = TimedHTTPAdapter(
+            pool_connections=self.config.pool_connections,
+            pool_maxsize=self.config.pool_maxsize,
+            pool_block=self.config.pool_block,
+            max_retries=retry,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Accept-Encoding"] = "gzip" if self.config.gzip else "identity"
+        self._hooks: List[TimingHook] = []
+
+    @property
+    def timeout(self):
+        return (self.config.connect_timeout, self.config.read_timeout)
+
+    def add_hook(self, hook: TimingHook) -> None:
+        self._hooks.append(hook)
+
+    def _emit(self, timing: RequestTiming) -> None:
+        for hook in self._hooks:
+            try:
+                hook(timing)
+            except Exception as e:
+                print(f"      [WARN] 전송 측정 훅 오류: {e}")
+
+    @contextmanager
+    def stream(self, method: str, url: str, **kwargs) -> Iterator[requests.Response]:
+        """스트리밍 요청 - 블록을 벗어나면 응답을 닫고 측정값을 훅으로 전달
+
+        본문 전송 시간은 응답 헤더 수신부터 블록 종료까지로 잰다.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        timing = RequestTiming(method=method.upper(), url=url)
+        _current.timing = timing
+        started = time.perf_counter()
+        headers_at = started
+        response = None
+        try:
+            response = self.session.request(method, url, stream=True, **kwargs)
+            headers_at = time.perf_counter()
+            timing.status = response.status_code
+            timing.encoding = response.headers.get("Content-Encoding", "")
+            _current.timing = None
+            yield response
+        except Exception as e:
+            timing.error = type(e).__name__
+            raise
+        finally:
+            _current.timing = None
+            finished = time.perf_counter()
+            if response is not None:
+                timing.ttfb_ms = (headers_at - started) * 1000
+                timing.transfer_ms = (finished - headers_at) * 1000
+                try:
+                    timing.wire_bytes = response.raw.tell()
+                except (AttributeError, OSError):
+                    pass
+                response.close()
+            timing.total_ms = (finished - started) * 1000
+            self._emit(timing)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """본문을 모두 받은 응답 (작은 JSON 요청용)"""
+        with self.stream(method, url, **kwargs) as response:
+            response.content  # noqa: B018 - 본문을 읽어 전송 시간에 포함
+        return response
+
+    def close(self) -> None:
+        self.session.close()
+
+# ============================================================
+# 통계 집계
+# ============================================================
+
+class TimingStats:
+    """RequestTiming 집계 훅 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.errors = 0
+        self.totals = {"connect_ms": 0.0, "ttfb_ms": 0.0, "server_ms": 0.0, "transfer_ms": 0.0}
+        self.wire_bytes = 0
+        self.compressed = 0
+
+    def __call__(self, timing: RequestTiming) -> None:
+        with self._lock:
+            self.requests += 1
+            self.new_connections += int(timing.new_connection)
+            self.errors += int(bool(timing.error))
+            self.totals["connect_ms"] += timing.connect_ms
+            self.totals["ttfb_ms"] += timing.ttfb_ms
+            self.totals["server_ms"] += timing.server_ms
+            self.totals["transfer_ms"] += timing.transfer_ms
+            self.wire_bytes += timing.wire_bytes
+            self.compressed += int(bool(timing.encoding) and timing.encoding != "identity")
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            count = max(1, self.requests)
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused_connections": self.requests - self.new_connections,
+                "errors": self.errors,
+                "compressed_responses": self.compressed,
+                "wire_bytes": self.wire_bytes,
+                **{f"avg_{name}": round(total / count, 1) for name, total in self.totals.items()},
+            }
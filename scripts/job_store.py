@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+HearO TTS 작업 저장소 (SQLite, 리스 기반)
+
+(세계관, 운동, 등급)마다 한 행을 두고 상태/시도 횟수/마지막 오류/출력 해시를 기록한다.
+- 워커는 시간 제한 리스로 작업을 점유 (여러 프로세스/머신이 같은 DB를 공유해도 중복 없음)
+- 프로세스가 죽으면 리스가 만료되어 작업이 다시 대기열로 돌아감
+- --shard i/N 으로 DB를 공유하지 않는 머신 간 분할도 가능 (file_key 해시 기준)
+- 기존 .tts_gemini_progress.json 은 처음 열 때 한 번만 가져옴
+
+상태: pending -> leased -> completed | failed
+
+사용법:
+    python job_store.py --stats
+    python job_store.py --list failed
+    python job_store.py --requeue-failed
+"""
+
+import os
+import json
+import time
+import uuid
+import zlib
+import socket
+import sqlite3
+import argparse
+import threading
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+# ============================================================
+# 설정
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+JOB_DB_FILE = SCRIPT_DIR / ".tts_jobs.sqlite3"
+
+PENDING = "pending"
+LEASED = "leased"
+COMPLETED = "completed"
+FAILED = "failed"
+
+# 기본 리스 시간 (초) - 레이트 리밋 대기와 429 백오프를 포함해도 넉넉하게
+DEFAULT_LEASE_SECONDS = 900.0
+
+# 다른 프로세스가 쓰기 잠금을 잡고 있을 때 기다리는 시간 (ms)
+BUSY_TIMEOUT_MS = 30000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    file_key      TEXT PRIMARY KEY,
+    worldview     TEXT NOT NULL,
+    exercise      TEXT NOT NULL,
+    grade         TEXT NOT NULL,
+    input_hash    TEXT,
+    status        TEXT NOT NULL DEFAULT 'pending',
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    last_error    TEXT,
+    output_hash   TEXT,
+    model         TEXT,
+    lease_owner   TEXT,
+    lease_expires REAL,
+    updated_at    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# ============================================================
+# 헬퍼
+# ============================================================
+
+def make_owner_id() -> str:
+    """리스 소유자 ID (호스트:PID:임의값)"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+def parse_shard(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    """'i/N' -> (i, N), 0 <= i < N"""
+    if not value:
+        return None
+    try:
+        index, count = (int(part) for part in value.split("/", 1))
+    except ValueError:
+        raise ValueError(f"샤드 형식은 i/N: {value}")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"샤드 범위 오류: {value} (0 <= i < N)")
+    return index, count
+
+def in_shard(file_key: str, shard: Optional[Tuple[int, int]]) -> bool:
+    """file_key 해시 기준 샤드 소속 여부 (머신/파이썬 버전 무관하게 고정)"""
+    if shard is None:
+        return True
+    index, count = shard
+    return zlib.crc32(file_key.encode("utf-8")) % count == index
+
+# ============================================================
+# 저장소
+# ============================================================
+
+class JobStore:
+    """SQLite 작업 저장소 (스레드별 연결, 프로세스 간 공유 가능)"""
+
+    def __init__(self, path: Path = JOB_DB_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            db.row_factory = sqlite3.Row
+            db.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+            db.execute("PRAGMA journal_mode = WAL")
+            db.execute("PRAGMA synchronous = NORMAL")
+            self._local.db = db
+        return db
+
+    class _Tx:
+        def __init__(self, db: sqlite3.Connection):
+            self.db = db
+
+        def __enter__(self) -> sqlite3.Connection:
+            # 쓰기 잠금을 먼저 잡아 점유 경합을 직렬화
+            self.db.execute("BEGIN IMMEDIATE")
+            return self.db
+
+        def __exit__(self, exc_type, exc, tb):
+            self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+            return False
+
+    def _transaction(self) -> "_Tx":
+        return JobStore._Tx(self._connect())
+
+    def close(self) -> None:
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+    # --------------------------------------------------------
+    # 메타 / 마이그레이션
+    # --------------------------------------------------------
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._transaction() as db:
+            db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def import_progress_json(self, progress_file: Path) -> int:
+        """기존 진행 JSON(completed/failed 목록)을 한 번만 가져옴 - 가져온 행 수 반환"""
+        if self.get_meta("progress_imported") or not progress_file.exists():
+            return 0
+        with open(progress_file, "r", encoding="utf-8") as f:
+            progress = json.load(f)
+
+        now = time.time()
+        imported = 0
+        with self._transaction() as db:
+            for status, keys in ((COMPLETED, progress.get("completed", [])), (FAILED, progress.get("failed", []))):
+                for file_key in keys:
+                    worldview, _, name = file_key.partition("/")
+                    exercise, _, grade = name.rpartition("_")
+                    if not (worldview and exercise and grade):
+                        continue
+                    cursor = db.execute(
+                        "INSERT OR IGNORE INTO jobs (file_key, worldview, exercise, grade, status, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (file_key, worldview, exercise, grade, status, now),
+                    )
+                    imported += cursor.rowcount
+            db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('progress_imported', ?)",
+                       (str(progress_file),))
+        return imported
+
+    # --------------------------------------------------------
+    # 조회
+    # --------------------------------------------------------
+
+    def get(self, file_key: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute("SELECT * FROM jobs WHERE file_key = ?", (file_key,)).fetchone()
+        return dict(row) if row else None
+
+    def rows(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        db = self._connect()
+        if status:
+            cursor = db.execute("SELECT * FROM jobs WHERE status = ? ORDER BY file_key", (status,))
+        else:
+            cursor = db.execute("SELECT * FROM jobs ORDER BY file_key")
+        return [dict(row) for row in cursor]
+
+    def counts(self) -> Dict[str, int]:
+        cursor = self._connect().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")
+        return {row["status"]: row["n"] for row in cursor}
+
+    # --------------------------------------------------------
+    # 대기열
+    # --------------------------------------------------------
+
+    def enqueue(self, jobs: Iterable[Tuple[str, str, str, str, Optional[str]]], scanned_at: float) -> int:
+        """(file_key, worldview, exercise, grade, input_hash) 를 pending 으로 등록
+
+        이미 있는 행은 유효한 리스가 없고, scanned_at(대상 스캔 시작 시각) 이후
+        다른 프로세스가 완료하지 않은 경우에만 pending 으로 되돌린다.
+        """
+        now = time.time()
+        queued = 0
+        with self._transaction() as db:
+            for file_key, worldview, exercise, grade, input_hash in jobs:
+                cursor = db.execute(
+                    "INSERT OR IGNORE INTO jobs (file_key, worldview, exercise, grade, input_hash, status, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, 'pending', ?)",
+                    (file_key, worldview, exercise, grade, input_hash, now),
+                )
+                if cursor.rowcount == 0:
+                    cursor = db.execute(
+                        "UPDATE jobs SET status = 'pending', input_hash = ?, lease_owner = NULL, "
+                        "lease_expires = NULL, updated_at = ? "
+                        "WHERE file_key = ? AND status != 'pending' "
+                        "AND NOT (status = 'leased' AND lease_expires >= ?) "
+                        "AND NOT (status = 'completed' AND updated_at >= ?)",
+                        (input_hash, now, file_key, now, scanned_at),
+                    )
+                queued += cursor.rowcount
+        return queued
+
+    def claim(self, owner: str, keys: Iterable[str], lease_seconds: float = DEFAULT_LEASE_SECONDS) -> Optional[Dict[str, Any]]:
+        """keys 중 대기/리스 만료 작업 하나를 점유 (없으면 None)"""
+        keys = list(keys)
+        if not keys:
+            return None
+        now = time.time()
+        placeholders = ",".join("?" * len(keys))
+        with self._transaction() as db:
+            row = db.execute(
+                f"SELECT file_key FROM jobs WHERE file_key IN ({placeholders}) "
+                "AND (status = 'pending' OR (status = 'leased' AND lease_expires < ?)) "
+                "ORDER BY attempts, file_key LIMIT 1",
+                (*keys, now),
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE file_key = ?",
+                (owner, now + lease_seconds, now, row["file_key"]),
+            )
+            claimed = db.execute("SELECT * FROM jobs WHERE file_key = ?", (row["file_key"],)).fetchone()
+        return dict(claimed)
+
+    def renew(self, owner: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> int:
+        """owner 가 가진 모든 리스 연장 (하트비트)"""
+        now = time.time()
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE status = 'leased' AND lease_owner = ?",
+                (now + lease_seconds, owner),
+            )
+        return cursor.rowcount
+
+    def complete(self, file_key: str, owner: str, output_hash: Optional[str] = None,
+                 model: Optional[str] = None) -> bool:
+        """완료 기록 - 리스를 잃었으면(만료 후 다른 워커가 점유) False"""
+        return self._finish(file_key, owner, COMPLETED, None, output_hash, model)
+
+    def fail(self, file_key: str, owner: str, error: str) -> bool:
+        return self._finish(file_key, owner, FAILED, error[:500], None, None)
+
+    def _finish(self, file_key: str, owner: str, status: str, error: Optional[str],
+                output_hash: Optional[str], model: Optional[str]) -> bool:
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET status = ?, last_error = ?, "
+                "output_hash = COALESCE(?, output_hash), model = COALESCE(?, model), "
+                "lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE file_key = ? AND status = 'leased' AND lease_owner = ?",
+                (status, error, output_hash, model, time.time(), file_key, owner),
+            )
+        return cursor.rowcount == 1
+
+    def mark_completed(self, file_key: str, worldview: str, exercise: str, grade: str,
+                       input_hash: Optional[str], output_hash: Optional[str] = None,
+                       model: Optional[str] = None) -> None:
+        """생성 없이 완료로 기록 (기존 파일 채택 등)"""
+        with self._transaction() as db:
+            db.execute(
+                "INSERT INTO jobs (file_key, worldview, exercise, grade, input_hash, status, output_hash, model, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, 'completed', ?, ?, ?) "
+                "ON CONFLICT(file_key) DO UPDATE SET status = 'completed', input_hash = excluded.input_hash, "
+                "output_hash = COALESCE(excluded.output_hash, output_hash), model = COALESCE(excluded.model, model), "
+                "updated_at = excluded.updated_at",
+                (file_key, worldview, exercise, grade, input_hash, output_hash, model, time.time()),
+            )
+
+    def requeue_failed(self) -> int:
+        with self._transaction() as db:
+            cursor = db.execute("UPDATE jobs SET status = 'pending', updated_at = ? WHERE status = 'failed'",
+                                (time.time(),))
+        return cursor.rowcount
+
+    def reset(self) -> None:
+        """모든 작업 기록 삭제 (진행 JSON은 다시 가져오지 않음)"""
+        with self._transaction() as db:
+            db.execute("DELETE FROM jobs")
+
+
+class LeaseKeeper:
+    """소유한 리스를 주기적으로 연장하는 백그라운드 스레드"""
+
+    def __init__(self, store: JobStore, owner: str, lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        self.store = store
+        self.owner = owner
+        self.lease_seconds = lease_seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.lease_seconds / 3):
+            try:
+                self.store.renew(self.owner, self.lease_seconds)
+            except sqlite3.Error as e:
+                print(f"[WARN] 리스 연장 실패: {e}")
+        self.store.close()
+
+    def __enter__(self) -> "LeaseKeeper":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+# ============================================================
+# 메인
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="HearO TTS 작업 저장소")
+    parser.add_argument("--db", type=Path, default=JOB_DB_FILE, help="작업 DB 경로")
+    parser.add_argument("--stats", action="store_true", help="상태별 개수 출력")
+    parser.add_argument("--list", metavar="STATUS", help="상태별 작업 목록 (pending/leased/completed/failed)")
+    parser.add_argument("--requeue-failed", action="store_true", help="실패 작업을 대기열로")
+    args = parser.parse_args()
+
+    store = JobStore(args.db)
+
+    if args.requeue_failed:
+        print(f"[REQUEUE] {store.requeue_failed()}개")
+
+    if args.list:
+        now = time.time()
+        for row in store.rows(args.list):
+            note = row["last_error"] or ""
+            if row["status"] == LEASED:
+                remaining = (row["lease_expires"] or 0) - now
+                note = f"{row['lease_owner']} ({'만료' if remaining < 0 else f'{remaining:.0f}초 남음'})"
+            print(f"{row['file_key']:40s} 시도 {row['attempts']}회  {row['model'] or '-':10s} {note}")
+
+    if args.stats or not (args.list or args.requeue_failed):
+        counts = store.counts()
+        print(f"""
+============================================================
+HearO TTS 작업 저장소
+============================================================
+DB: {args.db}
+대기: {counts.get(PENDING, 0)}개 / 진행: {counts.get(LEASED, 0)}개
+완료: {counts.get(COMPLETED, 0)}개 / 실패: {counts.get(FAILED, 0)}개
+============================================================
+""")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+HearO TTS 립싱크 타임라인 (RMS 엔벨로프 + 비즘 클래스)
+
+VRM 아바타 입 모양을 WebAudio 분석기 대신 미리 계산한 배열로 구동한다.
+- 고정 프레임레이트(기본 30fps)마다 RMS 엔벨로프(0~255)와 대략적인 비즘 클래스
+- 비즘은 VRM 표정 프리셋 기준: sil, aa, ih, ou, ee, oh
+  (프레임 스펙트럼의 저역 피크/중역 무게중심으로 F1/F2 를 근사해 분류, NumPy 벡터화)
+- 세계관별로 묶어 저장: tts/<세계관>/lipsync.bin + lipsync.json
+  bin 은 클립별 프레임을 이어 붙인 [rms, viseme] uint8 쌍,
+  json 은 클립 키 -> offset/frames (프레임 단위)
+  클라이언트: i = offset + floor(재생 시각 * fps) -> bin[2i] (rms), bin[2i + 1] (비즘)
+- 클립 해시와 옵션이 그대로인 클립은 이전 프레임 재사용
+
+사용법:
+    python lipsync_tts.py
+    python lipsync_tts.py --worldview fantasy --fps 60
+    python lipsync_tts.py --force
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from audio_dsp import read_wav, to_db
+from audio_io import AtomicFile, file_sha256
+
+# ============================================================
+# 설정
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+TTS_DIR = PROJECT_ROOT / "public" / "assets" / "prerendered" / "tts"
+
+INDEX_NAME = "lipsync.json"
+DATA_NAME = "lipsync.bin"
+INDEX_VERSION = 1
+
+# 비즘 클래스 (인덱스가 bin 에 저장되는 값, VRM 표정 프리셋 이름)
+VISEMES = ["sil", "aa", "ih", "ou", "ee", "oh"]
+SIL, AA, IH, OU, EE, OH = range(len(VISEMES))
+
+
+
+@dataclass
+class LipsyncOptions:
+    """분석 옵션"""
+    fps: int = 30
+    window_ms: float = 40.0         # 프레임 분석 창 (프레임 중심 기준)
+    threshold_db: float = -45.0     # 무음 판정 절대 임계값
+    relative_db: float = 40.0       # 최대 프레임 대비 무음 판정 폭
+    f1_band: Tuple[float, float] = (250.0, 1000.0)
+    f2_band: Tuple[float, float] = (1000.0, 3000.0)
+    open_f1_hz: float = 650.0       # F1 이 이보다 높으면 크게 벌린 입 (aa)
+    front_f2_hz: float = 1800.0     # F2 가 이보다 높으면 앞 모음 (ee/ih)
+    back_f2_hz: float = 1350.0      # F2 가 이보다 낮으면 둥근 모음 (ou/oh)
+    close_f1_hz: float = 420.0      # F1 이 이보다 낮으면 닫힌 모음 (ee, ou)
+
+# ============================================================
+# 분석
+# ============================================================
+
+def band_centroid(power: np.ndarray, freqs: np.ndarray, band: Tuple[float, float]) -> np.ndarray:
+    """프레임별 대역 내 스펙트럼 무게중심 (Hz)"""
+    mask = (freqs >= band[0]) & (freqs < band[1])
+    weights = power[:, mask]
+    total = weights.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        centroid = (weights * freqs[mask]).sum(axis=1) / total
+    return np.where(total > 0, centroid, 0.0)
+
+def band_peak(power: np.ndarray, freqs: np.ndarray, band: Tuple[float, float]) -> np.ndarray:
+    """프레임별 대역 내 최대 에너지 주파수 (Hz)"""
+    mask = (freqs >= band[0]) & (freqs < band[1])
+    return freqs[mask][np.argmax(power[:, mask], axis=1)]
+
+def smooth_classes(classes: np.ndarray) -> np.ndarray:
+    """한 프레임짜리 튀는 비즘 제거 (양옆이 같으면 양옆 값으로)"""
+    if len(classes) < 3:
+        return classes
+    result = classes.copy()
+    prev, cur, nxt = classes[:-2], classes[1:-1], classes[2:]
+    flip = (prev == nxt) & (cur != prev)
+    result[1:-1][flip] = prev[flip]
+    return result
+
+def analyze_samples(samples: np.ndarray, sample_rate: int,
+                    options: Optional[LipsyncOptions] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """float32 mono -> (RMS uint8, 비즘 uint8), 프레임 i 는 시각 i / fps 중심"""
+    options = options or LipsyncOptions()
+    hop = sample_rate / options.fps
+    window = max(2, int(sample_rate * options.window_ms / 1000))
+    count = max(1, int(np.ceil(len(samples) / hop)))
+
+    # 프레임 중심이 i * hop 이 되도록 앞뒤 패딩 후 창 추출
+    padded = np.pad(samples.astype(np.float32), (window // 2, window))
+    starts = np.round(np.arange(count) * hop).astype(np.int64)
+    frames = padded[starts[:, None] + np.arange(window)[None, :]]
+
+    rms = np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1))
+    levels = to_db(rms)
+    threshold = max(options.threshold_db, float(levels.max()) - options.relative_db)
+    voiced = levels >= threshold
+
+    # 입 벌림 정도: 클립 최대 RMS 기준 0~255 (무음 프레임은 0)
+    peak = rms[voiced].max() if voiced.any() else 1.0
+    envelope = np.where(voiced, np.clip(rms / peak, 0.0, 1.0) * 255.0, 0.0)
+
+    spectrum = np.abs(np.fft.rfft(frames * np.hanning(window)[None, :], axis=1)) ** 2
+    freqs = np.fft.rfftfreq(window, 1.0 / sample_rate)
+    # F1 은 저역 최대 에너지 주파수, F2 는 중역 무게중심으로 근사
+    f1 = band_peak(spectrum, freqs, options.f1_band)
+    f2 = band_centroid(spectrum, freqs, options.f2_band)
+
+    classes = np.select(
+        [
+            ~voiced,
+            f1 >= options.open_f1_hz,
+            (f2 >= options.front_f2_hz) & (f1 < options.close_f1_hz),
+            f2 >= options.front_f2_hz,
+            (f2 < options.back_f2_hz) & (f1 < options.close_f1_hz),
+            f2 < options.back_f2_hz,
+        ],
+        [SIL, AA, EE, IH, OU, OH],
+        default=AA,
+    )
+    return np.round(envelope).astype(np.uint8), smooth_classes(classes).astype(np.uint8)
+
+def analyze_clip(path: Path, options: LipsyncOptions) -> bytes:
+    """WAV 하나 -> [rms, viseme] 쌍 바이트열"""
+    samples, rate = read_wav(path)
+    envelope, visemes = analyze_samples(samples, rate, options)
+    return np.stack([envelope, visemes], axis=1).tobytes()
+
+# ============================================================
+# 세계관 팩
+# ============================================================
+
+def options_signature(options: LipsyncOptions) -> str:
+    payload = json.dumps([asdict(options), VISEMES], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+def load_pack(worldview: str, tts_dir: Path = TTS_DIR) -> Tuple[Dict[str, Any], bytes]:
+    """(인덱스, bin 바이트) - 없거나 버전이 다르면 빈 팩"""
+    index_path = tts_dir / worldview / INDEX_NAME
+    data_path = tts_dir / worldview / DATA_NAME
+    if index_path.exists() and data_path.exists():
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") == INDEX_VERSION:
+            return index, data_path.read_bytes()
+    return {}, b""
+
+def pack_worldview(
+    worldview: str,
+    options: Optional[LipsyncOptions] = None,
+    force: bool = False,
+    workers: int = 1,
+    tts_dir: Path = TTS_DIR,
+) -> Dict[str, int]:
+    """세계관 클립 전체를 분석해 팩 저장 - {"clips", "analyzed", "reused", "bytes"}"""
+    options = options or LipsyncOptions()
+    signature = options_signature(options)
+    clips = sorted((tts_dir / worldview).glob("*.wav"))
+    previous, previous_data = load_pack(worldview, tts_dir)
+    reusable = {} if force or previous.get("options") != signature else previous.get("clips", {})
+
+    hashes = {clip.stem: file_sha256(clip) for clip in clips}
+    frames: Dict[str, bytes] = {}
+    todo = []
+    for clip in clips:
+        entry = reusable.get(clip.stem)
+        if entry and entry["hash"] == hashes[clip.stem]:
+            start = entry["offset"] * 2
+            frames[clip.stem] = previous_data[start:start + entry["frames"] * 2]
+        else:
+            todo.append(clip)
+
+    if workers > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(analyze_clip, clip, options): clip for clip in todo}
+            for future in as_completed(futures):
+                frames[futures[future].stem] = future.result()
+    else:
+        for clip in todo:
+            frames[clip.stem] = analyze_clip(clip, options)
+
+    index: Dict[str, Any] = {
+        "version": INDEX_VERSION,
+        "fps": options.fps,
+        "visemes": VISEMES,
+        "stride": 2,
+        "data": DATA_NAME,
+        "options": signature,
+        "clips": {},
+    }
+    offset = 0
+    for clip in clips:
+        count = len(frames[clip.stem]) // 2
+        index["clips"][clip.stem] = {"offset": offset, "frames": count, "hash": hashes[clip.stem]}
+        offset += count
+
+    data = b"".join(frames[clip.stem] for clip in clips)
+    with AtomicFile(tts_dir / worldview / DATA_NAME) as f:
+        f.write(data)
+        f.commit()
+    with AtomicFile(tts_dir / worldview / INDEX_NAME) as f:
+        f.write(json.dumps(index, indent=2, ensure_ascii=False).encode("utf-8"))
+        f.commit()
+    return {"clips": len(clips), "analyzed": len(todo), "reused": len(clips) - len(todo), "bytes": len(data)}
+
+# ============================================================
+# 메인
+# ============================================================
+
+def main():
+    defaults = LipsyncOptions()
+    parser = argparse.ArgumentParser(description="HearO TTS 립싱크 타임라인 (RMS + 비즘)")
+    parser.add_argument("--worldview", "-w", action="append", help="특정 세계관만 (반복 가능)")
+    parser.add_argument("--fps", type=int, default=defaults.fps, help="타임라인 프레임레이트")
+    parser.add_argument("--threshold-db", type=float, default=defaults.threshold_db, help="무음 임계값 (dBFS)")
+    parser.add_argument("--workers", "-j", type=int, default=os.cpu_count() or 2, help="프로세스 수")
+    parser.add_argument("--force", action="store_true", help="해시와 무관하게 전부 다시 분석")
+    args = parser.parse_args()
+
+    options = LipsyncOptions(fps=args.fps, threshold_db=args.threshold_db)
+    if not TTS_DIR.exists():
+        print(f"[ERROR] TTS 디렉토리 없음: {TTS_DIR}")
+        sys.exit(1)
+    worldviews = args.worldview or sorted(p.name for p in TTS_DIR.iterdir() if p.is_dir())
+
+    print(f"""
+============================================================
+HearO TTS 립싱크 타임라인
+============================================================
+세계관: {', '.join(worldviews)}
+프레임: {options.fps}fps / 비즘: {', '.join(VISEMES)}
+============================================================
+""")
+
+    fail_count = 0
+    for worldview in worldviews:
+        try:
+            result = pack_worldview(worldview, options, args.force, max(1, args.workers))
+        except Exception as e:
+            fail_count += 1
+            print(f"[ERROR] {worldview}: {e}")
+            continue
+        print(f"[OK] {worldview}: 클립 {result['clips']}개 (분석 {result['analyzed']}개, "
+              f"재사용 {result['reused']}개), {result['bytes'] / 1024:.1f}KB")
+
+    if fail_count:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
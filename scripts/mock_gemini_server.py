@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+HearO 로컬 Gemini TTS 목 서버
+
+실제 쿼터를 쓰지 않고 generate_tts_gemini.py 의 처리량/재시도/폴백 동작을
+측정하기 위한 generateContent 엔드포인트 대역.
+- POST /v1beta/models/<모델>:generateContent -> 합성 PCM(24kHz/16bit/mono) base64 응답
+- 지연 분포: fixed / uniform / lognormal (모델별 배율)
+- 오류 주입: 429 / 403 / 타임아웃(응답 지연) / 빈 오디오 비율
+- 오류 주입 대상 모델 제한 가능 (예: Flash만 429)
+- 배치 요청: PAUSE_MARKER 자리에 긴 무음, 문장 끝마다 짧은 무음 (쉼 무시 비율 주입 가능)
+- 키x모델별 한도 흉내: 요청 수 초과 시 403, 최소 간격 위반 시 429
+  (실제 API처럼 Retry-After 헤더 + RetryInfo/QuotaFailure 상세 포함)
+- 시드 고정 난수로 재현 가능
+- Accept-Encoding: gzip 요청에는 압축 응답
+- GET /stats -> 요청/응답 카운터 JSON, POST /reset -> 카운터 초기화
+
+사용법:
+    python mock_gemini_server.py --port 8765
+    python mock_gemini_server.py --latency lognormal --latency-ms 1200 --rate-429 0.1
+    python mock_gemini_server.py --rate-429 0.3 --error-models gemini-2.5-flash-preview-tts
+    python mock_gemini_server.py --key-quota 20 --key-min-interval 1.0
+
+    python generate_tts_gemini.py --api-key test --api-base http://127.0.0.1:8765/v1beta/models
+"""
+
+import re
+import sys
+import math
+import gzip
+import json
+import time
+import base64
+import random
+import argparse
+import threading
+from dataclasses import dataclass, field, asdict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from audio_io import SAMPLE_RATE
+from tts_batch import PAUSE_MARKER, DIRECTION_PATTERN
+
+# ============================================================
+# 설정
+# ============================================================
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# 합성 음성 길이: 글자당 초 (한국어 낭독 기준 대략값)
+SECONDS_PER_CHAR = 0.07
+MIN_AUDIO_SEC = 0.5
+TONE_HZ = 220.0
+
+# 배치 줄 사이 / 문장 사이 무음 (초)
+LINE_PAUSE_SEC = 1.0
+SENTENCE_PAUSE_SEC = 0.2
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+LATENCY_MODES = ["fixed", "uniform", "lognormal"]
+
+
+@dataclass
+class MockConfig:
+    """목 서버 동작 설정"""
+    latency: str = "lognormal"      # fixed / uniform / lognormal
+    latency_ms: float = 800.0       # 기준(중앙값) 지연
+    jitter: float = 0.4             # uniform: ±비율, lognormal: sigma
+    model_latency: Dict[str, float] = field(default_factory=dict)  # 모델별 지연 배율
+    rate_429: float = 0.0
+    rate_403: float = 0.0
+    rate_timeout: float = 0.0
+    rate_empty: float = 0.0
+    rate_merge_pauses: float = 0.0  # 배치 요청에서 쉼 표시를 무시하는 비율 (분할 실패 흉내)
+    timeout_sec: float = 90.0       # 타임아웃 주입 시 응답 지연
+    error_models: List[str] = field(default_factory=list)  # 비어 있으면 전체 모델
+    key_quota: int = 0              # 키x모델별 요청 한도 (초과 시 403, 0이면 무제한)
+    key_min_interval: float = 0.0   # 키x모델별 최소 요청 간격 (위반 시 429)
+    retry_after_sec: float = 0.0    # 주입된 429 의 Retry-After (0이면 생략)
+    seconds_per_char: float = SECONDS_PER_CHAR
+    gzip: bool = True               # Accept-Encoding: gzip 이면 압축 응답
+    seed: int = 0
+
+# ============================================================
+# 합성 응답
+# ============================================================
+
+def tone(duration: float) -> np.ndarray:
+    t = np.arange(int(SAMPLE_RATE * duration))
+    return (8000 * np.sin(2 * np.pi * TONE_HZ * t / SAMPLE_RATE)).astype("<i2")
+
+def silence(duration: float) -> np.ndarray:
+    return np.zeros(int(SAMPLE_RATE * duration), dtype="<i2")
+
+def synth_pcm(text: str, seconds_per_char: float = SECONDS_PER_CHAR, honor_pauses: bool = True) -> bytes:
+    """텍스트 길이에 비례하는 사인파 PCM (앞뒤 짧은 무음 포함)
+
+    대괄호 지시는 읽지 않고, 문장 끝마다 짧은 무음, PAUSE_MARKER 자리에는
+    긴 무음을 넣는다. honor_pauses=False 면 쉼 표시를 문장 사이 쉼으로 취급한다.
+    """
+    parts: List[np.ndarray] = [silence(0.1)]
+    for line_index, line in enumerate(text.split(PAUSE_MARKER)):
+        if line_index:
+            parts.append(silence(LINE_PAUSE_SEC if honor_pauses else SENTENCE_PAUSE_SEC))
+        sentences = [s for s in SENTENCE_END.split(DIRECTION_PATTERN.sub("", line).strip()) if s]
+        for index, sentence in enumerate(sentences):
+            if index:
+                parts.append(silence(SENTENCE_PAUSE_SEC))
+            parts.append(tone(len(sentence) * seconds_per_char))
+    if sum(len(p) for p in parts) < SAMPLE_RATE * MIN_AUDIO_SEC:
+        parts.append(tone(MIN_AUDIO_SEC))
+    parts.append(silence(0.1))
+    return np.concatenate(parts).tobytes()
+
+def audio_response(pcm: bytes) -> Dict[str, Any]:
+    """generateContent 응답 형태"""
+    return {
+        "candidates": [{
+            "content": {
+                "parts": [{
+                    "inlineData": {
+                        "mimeType": f"audio/L16;codec=pcm;rate={SAMPLE_RATE}",
+                        "data": base64.b64encode(pcm).decode("ascii"),
+                    }
+                }],
+                "role": "model",
+            },
+            "finishReason": "STOP",
+        }],
+    }
+
+def error_response(code: int, status: str, message: str,
+                   details: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    error: Dict[str, Any] = {"code": code, "status": status, "message": message}
+    if details:
+        error["details"] = details
+    return {"error": error}
+
+def limit_details(retry_after: Optional[float], quota_id: Optional[str] = None,
+                  quota_value: Optional[float] = None) -> List[Dict[str, Any]]:
+    """google.rpc 오류 상세 (QuotaFailure / RetryInfo)"""
+    details: List[Dict[str, Any]] = []
+    if quota_id:
+        details.append({
+            "@type": "type.googleapis.com/google.rpc.QuotaFailure",
+            "violations": [{"quotaId": quota_id, "quotaValue": str(quota_value)}],
+        })
+    if retry_after:
+        details.append({"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": f"{math.ceil(retry_after)}s"})
+    return details
+
+# ============================================================
+# 서버
+# ============================================================
+
+class MockState:
+    """요청 카운터와 난수 (스레드 안전)"""
+
+    def __init__(self, config: MockConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.key_usage: Dict[str, int] = {}
+        self.key_last: Dict[str, float] = {}
+
+    def incr(self, name: str) -> None:
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def count(self, name: str) -> None:
+        with self.lock:
+            self.incr(name)
+
+    def check_key(self, api_key: str, model: str) -> Tuple[str, Optional[float]]:
+        """키x모델 한도 검사 (잠금 안에서 호출) - (ok / 429 / 403, 다시 보내도 되는 때까지 초)"""
+        config = self.config
+        slot = f"{api_key}:{model}"
+        now = time.monotonic()
+        if config.key_quota and self.key_usage.get(slot, 0) >= config.key_quota:
+            return "403", None
+        last = self.key_last.get(slot)
+        if config.key_min_interval and last is not None and now - last < config.key_min_interval:
+            return "429", config.key_min_interval - (now - last)
+        self.key_usage[slot] = self.key_usage.get(slot, 0) + 1
+        self.key_last[slot] = now
+        return "ok", None
+
+    def begin(self, model: str, api_key: str = "") -> Tuple[str, float, Optional[float]]:
+        """요청 하나의 결과(ok/429/403/timeout/empty), 지연(초), 429 재시도 대기(초) 결정"""
+        config = self.config
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.incr(f"requests.{model}")
+
+            outcome, retry_after = self.check_key(api_key, model)
+            if outcome != "ok":
+                self.incr(f"key_limit.{outcome}")
+            elif not config.error_models or model in config.error_models:
+                roll = self.rng.random()
+                for name, rate in (("429", config.rate_429), ("403", config.rate_403),
+                                   ("timeout", config.rate_timeout), ("empty", config.rate_empty),
+                                   ("merge", config.rate_merge_pauses)):
+                    if roll < rate:
+                        outcome = name
+                        break
+                    roll -= rate
+                if outcome == "429":
+                    retry_after = config.retry_after_sec or None
+
+            base = config.latency_ms / 1000 * config.model_latency.get(model, 1.0)
+            if config.latency == "uniform":
+                delay = base * (1 + self.rng.uniform(-config.jitter, config.jitter))
+            elif config.latency == "lognormal":
+                delay = base * self.rng.lognormvariate(0.0, config.jitter)
+            else:
+                delay = base
+            if outcome == "timeout":
+                delay = config.timeout_sec
+            elif outcome in ("429", "403"):
+                delay = min(delay, 0.05)
+
+            self.incr(f"outcome.{outcome}")
+        return outcome, max(0.0, delay), retry_after
+
+    def end(self) -> None:
+        with self.lock:
+            self.in_flight -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "counts": dict(sorted(self.counts.items())),
+                "max_in_flight": self.max_in_flight,
+                "config": asdict(self.config),
+            }
+
+    def reset(self) -> None:
+        with self.lock:
+            self.counts = {}
+            self.key_usage = {}
+            self.key_last = {}
+            self.max_in_flight = self.in_flight
+            self.rng = random.Random(self.config.seed)
+
+
+class MockGeminiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: MockState = None  # make_server 에서 서브클래스로 주입
+
+    def log_message(self, format, *args):  # noqa: A002 - 기본 access 로그 끔
+        pass
+
+    def send_json(self, status: int, data: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(data).encode("utf-8")
+        compress = self.state.config.gzip and "gzip" in self.headers.get("Accept-Encoding", "")
+        if compress:
+            body = gzip.compress(body, compresslevel=5)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        if compress:
+            self.send_header("Content-Encoding", "gzip")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/stats":
+            self.send_json(200, self.state.snapshot())
+        else:
+            self.send_json(404, error_response(404, "NOT_FOUND", self.path))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b""
+
+        if self.path.rstrip("/") == "/reset":
+            self.state.reset()
+            self.send_json(200, {"ok": True})
+            return
+
+        # /v1beta/models/<모델>:generateContent
+        path = self.path.split("?", 1)[0]
+        if not path.endswith(":generateContent") or "/models/" not in path:
+            self.send_json(404, error_response(404, "NOT_FOUND", self.path))
+            return
+        model = path.rsplit("/models/", 1)[1].split(":", 1)[0]
+
+        api_key = self.headers.get("x-goog-api-key", "")
+        if not api_key and "key=" in self.path:
+            api_key = self.path.split("key=", 1)[1].split("&", 1)[0]
+        if not api_key:
+            self.send_json(403, error_response(403, "PERMISSION_DENIED", "API key missing"))
+            return
+
+        try:
+            payload = json.loads(raw or b"{}")
+            text = payload["contents"][0]["parts"][0]["text"]
+        except (ValueError, KeyError, IndexError, TypeError):
+            self.send_json(400, error_response(400, "INVALID_ARGUMENT", "contents[0].parts[0].text 필요"))
+            return
+
+        outcome, delay, retry_after = self.state.begin(model, api_key)
+        config = self.state.config
+        try:
+            time.sleep(delay)
+            if outcome == "429":
+                headers = {"Retry-After": str(max(1, math.ceil(retry_after)))} if retry_after else None
+                per_minute = 60.0 / config.key_min_interval if config.key_min_interval else None
+                details = limit_details(retry_after, per_minute and "GenerateRequestsPerMinutePerProjectPerModel",
+                                        per_minute)
+                self.send_json(429, error_response(429, "RESOURCE_EXHAUSTED", "Quota exceeded (mock)", details),
+                               headers)
+            elif outcome == "403":
+                details = limit_details(None, config.key_quota and "GenerateRequestsPerDayPerProjectPerModel",
+                                        config.key_quota or None)
+                self.send_json(403, error_response(403, "PERMISSION_DENIED", "Permission denied (mock)", details))
+            elif outcome == "empty":
+                self.send_json(200, {"candidates": [{"content": {"parts": [{"text": ""}]}, "finishReason": "OTHER"}]})
+            else:
+                # timeout 주입 시에도 늦게나마 정상 응답 (클라이언트가 먼저 끊는 것이 정상)
+                if PAUSE_MARKER in text:
+                    self.state.count("batch_requests")
+                pcm = synth_pcm(text, self.state.config.seconds_per_char, honor_pauses=outcome != "merge")
+                self.send_json(200, audio_response(pcm))
+        finally:
+            self.state.end()
+
+
+class MockGeminiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # 클라이언트가 429 본문을 읽지 않고 끊는 경우는 정상 흐름
+        if isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            return
+        super().handle_error(request, client_address)
+
+
+def make_server(config: MockConfig, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """설정이 주입된 서버 생성 (port=0 이면 임의 포트)"""
+    handler = type("BoundMockGeminiHandler", (MockGeminiHandler,), {"state": MockState(config)})
+    server = MockGeminiServer((host, port), handler)
+    return server
+
+def start_mock_server(config: MockConfig, host: str = DEFAULT_HOST, port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """백그라운드 스레드로 서버 시작 - (서버, API 기준 URL) 반환"""
+    server = make_server(config, host, port)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    actual_host, actual_port = server.server_address[:2]
+    return server, f"http://{actual_host}:{actual_port}/v1beta/models"
+
+def server_state(server: ThreadingHTTPServer) -> MockState:
+    return server.RequestHandlerClass.state
+
+# ============================================================
+# 메인
+# ============================================================
+
+def parse_model_latency(value: Optional[str]) -> Dict[str, float]:
+    """'모델=배율,모델=배율' -> dict"""
+    result: Dict[str, float] = {}
+    for item in (value or "").split(","):
+        if "=" in item:
+            model, factor = item.split("=", 1)
+            result[model.strip()] = float(factor)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="HearO 로컬 Gemini TTS 목 서버")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", choices=LATENCY_MODES, default="lognormal", help="지연 분포")
+    parser.add_argument("--latency-ms", type=float, default=800.0, help="기준 지연 (ms)")
+    parser.add_argument("--jitter", type=float, default=0.4, help="uniform ±비율 / lognormal sigma")
+    parser.add_argument("--model-latency", help="모델별 지연 배율 (예: gemini-2.5-pro-preview-tts=2.0)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="429 비율 (0~1)")
+    parser.add_argument("--rate-403", type=float, default=0.0, help="403 비율 (0~1)")
+    parser.add_argument("--rate-timeout", type=float, default=0.0, help="응답 지연(타임아웃) 비율 (0~1)")
+    parser.add_argument("--rate-empty", type=float, default=0.0, help="빈 오디오 비율 (0~1)")
+    parser.add_argument("--rate-merge-pauses", type=float, default=0.0, help="배치 쉼 표시 무시 비율 (0~1)")
+    parser.add_argument("--timeout-sec", type=float, default=90.0, help="타임아웃 주입 시 지연 (초)")
+    parser.add_argument("--error-models", help="오류 주입 대상 모델 (쉼표 구분, 기본: 전체)")
+    parser.add_argument("--key-quota", type=int, default=0, help="키x모델별 요청 한도 (초과 시 403)")
+    parser.add_argument("--key-min-interval", type=float, default=0.0, help="키x모델별 최소 요청 간격 초 (위반 시 429)")
+    parser.add_argument("--retry-after", type=float, default=0.0, help="주입된 429 응답의 Retry-After 초 (0이면 생략)")
+    parser.add_argument("--no-gzip", action="store_true", help="응답 압축 안함")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드")
+    args = parser.parse_args()
+
+    config = MockConfig(
+        latency=args.latency,
+        latency_ms=args.latency_ms,
+        jitter=args.jitter,
+        model_latency=parse_model_latency(args.model_latency),
+        rate_429=args.rate_429,
+        rate_403=args.rate_403,
+        rate_timeout=args.rate_timeout,
+        rate_empty=args.rate_empty,
+        rate_merge_pauses=args.rate_merge_pauses,
+        timeout_sec=args.timeout_sec,
+        error_models=[m.strip() for m in (args.error_models or "").split(",") if m.strip()],
+        key_quota=args.key_quota,
+        key_min_interval=args.key_min_interval,
+        retry_after_sec=args.retry_after,
+        gzip=not args.no_gzip,
+        seed=args.seed,
+    )
+    server = make_server(config, args.host, args.port)
+    print(f"""
+============================================================
+HearO Gemini TTS 목 서버
+============================================================
+주소: http://{args.host}:{args.port}/v1beta/models
+지연: {config.latency} {config.latency_ms}ms (jitter {config.jitter})
+오류: 429 {config.rate_429:.0%} / 403 {config.rate_403:.0%} / timeout {config.rate_timeout:.0%} / empty {config.rate_empty:.0%}
+키 한도: {config.key_quota or '무제한'}회 / 간격 {config.key_min_interval}초 (키x모델)
+============================================================
+""")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+HearO TTS 모델 라우터 (모델별 서킷 브레이커)
+
+Flash -> Pro 우선순위로 모델을 고르되, 직전에 실패한 모델은 쿨다운 동안 건너뛴다.
+- closed: 정상. 429/403 은 즉시, 그 외 실패는 연속 threshold 회에서 open
+- open: 쿨다운 동안 요청하지 않음 (다음 우선순위 모델로 바로 전송)
+- half-open: 쿨다운이 끝나면 요청 하나만 탐침으로 허용
+  성공 -> closed, 실패 -> open (쿨다운 2배, 최대 max_cooldown)
+- 남은 모델이 모두 차단이면 가장 먼저 풀리는 모델을 max_wait 까지 기다림
+
+모든 워커 스레드가 하나의 라우터를 공유한다.
+"""
+
+import time
+import threading
+from typing import Dict, Any, Iterable, List, Optional
+
+# ============================================================
+# 설정
+# ============================================================
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+DEFAULT_COOLDOWN = 60.0
+DEFAULT_MAX_COOLDOWN = 600.0
+DEFAULT_FAILURE_THRESHOLD = 3
+
+# 모든 모델이 차단일 때 요청 하나가 쿨다운을 기다리는 최대 시간
+DEFAULT_MAX_WAIT = 120.0
+
+# 한 번만 받아도 즉시 차단하는 실패 종류 (쿼터/한도)
+TRIP_IMMEDIATELY = {"rate_limit", "quota"}
+
+# ============================================================
+# 서킷 브레이커
+# ============================================================
+
+class CircuitBreaker:
+    """모델 하나의 상태 (잠금은 ModelRouter가 관리)"""
+
+    def __init__(self, cooldown: float, max_cooldown: float, failure_threshold: int):
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.failure_threshold = max(1, failure_threshold)
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.consecutive_failures = 0
+        self.probe_in_flight = False
+        self.trips = 0
+        self.successes = 0
+        self.failures: Dict[str, int] = {}
+        self.skipped = 0
+
+    def allow(self, now: float) -> bool:
+        """요청 허용 여부 (half-open 전환 시 이 호출이 탐침이 됨)"""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and now - self.opened_at >= self.cooldown:
+            self.state = HALF_OPEN
+            self.probe_in_flight = False
+        if self.state == HALF_OPEN and not self.probe_in_flight:
+            self.probe_in_flight = True
+            return True
+        return False
+
+    def on_success(self) -> None:
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.probe_in_flight = False
+        if self.state != CLOSED:
+            self.state = CLOSED
+            self.cooldown = self.base_cooldown
+
+    def on_failure(self, kind: str, now: float) -> bool:
+        """실패 기록 - 이번 실패로 open 되면 True"""
+        self.failures[kind] = self.failures.get(kind, 0) + 1
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN:
+            # 탐침 실패: 쿨다운을 늘려 다시 차단
+            self.probe_in_flight = False
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            return self._trip(now)
+        if self.state == CLOSED and (kind in TRIP_IMMEDIATELY
+                                     or self.consecutive_failures >= self.failure_threshold):
+            return self._trip(now)
+        return False
+
+    def release(self) -> None:
+        """결과 판정 없이 끝난 탐침 반납 (로컬 오류 등)"""
+        self.probe_in_flight = False
+
+    def _trip(self, now: float) -> bool:
+        self.state = OPEN
+        self.opened_at = now
+        self.trips += 1
+        return True
+
+    def remaining(self, now: float) -> float:
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.cooldown - (now - self.opened_at))
+
+# ============================================================
+# 라우터
+# ============================================================
+
+class ModelRouter:
+    """우선순위 모델 목록 + 모델별 서킷 브레이커 (스레드 안전)"""
+
+    def __init__(
+        self,
+        models: List[str],
+        labels: Optional[Dict[str, str]] = None,
+        cooldown: float = DEFAULT_COOLDOWN,
+        max_cooldown: float = DEFAULT_MAX_COOLDOWN,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        max_wait: float = DEFAULT_MAX_WAIT,
+    ):
+        self.models = list(models)
+        self.labels = labels or {}
+        self._breakers = {m: CircuitBreaker(cooldown, max_cooldown, failure_threshold) for m in self.models}
+        self.max_wait = max_wait
+        self._cond = threading.Condition()
+
+    def label(self, model: str) -> str:
+        return self.labels.get(model, model)
+
+    def acquire(self, exclude: Iterable[str] = (), max_wait: Optional[float] = None) -> Optional[str]:
+        """우선순위대로 첫 허용 모델 반환
+
+        exclude 모델(이번 호출에서 이미 실패한 모델)은 제외한다. 남은 모델이 모두
+        차단이면 가장 빨리 풀리는 쿨다운까지 최대 max_wait 초 기다린 뒤 None.
+        """
+        max_wait = self.max_wait if max_wait is None else max_wait
+        candidates = [m for m in self.models if m not in set(exclude)]
+        if not candidates:
+            return None
+        deadline = time.monotonic() + max_wait
+        counted = False
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                for model in candidates:
+                    if self._breakers[model].allow(now):
+                        return model
+                    if not counted:
+                        self._breakers[model].skipped += 1
+                counted = True
+                if now >= deadline:
+                    return None
+                # 쿨다운 만료 또는 탐침 결과 통지까지 대기
+                soonest = min((self._breakers[m].remaining(now) for m in candidates), default=0.0)
+                self._cond.wait(timeout=min(max(soonest, 0.05), deadline - now))
+
+    def record_success(self, model: str) -> None:
+        with self._cond:
+            self._breakers[model].on_success()
+            self._cond.notify_all()
+
+    def record_failure(self, model: str, kind: str) -> bool:
+        """실패 기록 - 차단되면 True"""
+        with self._cond:
+            tripped = self._breakers[model].on_failure(kind, time.monotonic())
+            cooldown = self._breakers[model].cooldown
+            self._cond.notify_all()
+        if tripped:
+            print(f"      [CIRCUIT] {self.label(model)} 차단 ({kind}, {cooldown:.0f}초)")
+        return tripped
+
+    def release(self, model: str) -> None:
+        with self._cond:
+            self._breakers[model].release()
+            self._cond.notify_all()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """모델별 상태 요약 (라벨 기준)"""
+        now = time.monotonic()
+        with self._cond:
+            return {
+                self.label(model): {
+                    "state": breaker.state,
+                    "successes": breaker.successes,
+                    "failures": dict(sorted(breaker.failures.items())),
+                    "trips": breaker.trips,
+                    "skipped": breaker.skipped,
+                    "cooldown_remaining": round(breaker.remaining(now), 1),
+                }
+                for model, breaker in self._breakers.items()
+            }
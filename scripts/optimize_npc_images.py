@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+HearO NPC 이미지 최적화 (WebP/AVIF 반응형 크기 + 블러 플레이스홀더)
+
+npc/<세계관>/<NPC>/<감정>.png|jpg 원본에서 전송용 이미지를 만든다.
+- 여러 표시 너비의 WebP/AVIF 변환 (원본보다 크게 확대하지 않음)
+- 아주 작은 블러 WebP 플레이스홀더 (data URI)
+- 프로세스 풀 병렬 처리, 원본 해시/옵션이 그대로면 스킵
+- 다시 만든 이미지는 더 이상 설정에 없는 너비/포맷의 변환본을 삭제 (원본이 사라지면 변환본도 삭제)
+- npc/images.json 매핑 파일 (프론트엔드 srcset 구성용)
+
+같은 이름의 PNG와 JPG가 있으면 투명도를 보존하는 PNG를 원본으로 쓴다.
+
+사용법:
+    python optimize_npc_images.py
+    python optimize_npc_images.py --worldview fantasy
+    python optimize_npc_images.py --widths 320,640,960 --formats webp
+    python optimize_npc_images.py --force
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import base64
+import hashlib
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
+
+from PIL import Image, ImageFilter, features
+
+from audio_io import file_sha256
+
+# ============================================================
+# 설정
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+NPC_DIR = PROJECT_ROOT / "public" / "assets" / "prerendered" / "npc"
+MAPPING_FILE = NPC_DIR / "images.json"
+
+MAPPING_VERSION = 1
+
+DEFAULT_WIDTHS = [256, 512, 768]
+
+# 포맷별 저장 옵션
+FORMATS = {
+    "webp": {"pil": "WEBP", "mime": "image/webp", "quality": 80, "extra": {"method": 6}},
+    "avif": {"pil": "AVIF", "mime": "image/avif", "quality": 55, "extra": {"speed": 6}},
+}
+
+# 플레이스홀더 너비 (px)
+PLACEHOLDER_WIDTH = 16
+PLACEHOLDER_BLUR = 1.5
+
+SOURCE_EXTENSIONS = [".png", ".jpg", ".jpeg"]
+
+# 변환본 파일 이름 (<원본 이름>.<너비>w.<포맷>)
+VARIANT_PATTERN = re.compile(r"^(?P<stem>.+)\.(?P<width>\d+)w\.(?P<format>" + "|".join(FORMATS) + r")$")
+
+# ============================================================
+# 헬퍼 함수
+# ============================================================
+
+def format_available(fmt: str) -> bool:
+    """현재 Pillow 빌드에서 인코딩 가능한지"""
+    return features.check(fmt)
+
+def find_sources(worldviews: Optional[List[str]] = None) -> Dict[str, Path]:
+    """이미지 키(<세계관>/<NPC>/<감정>) -> 원본 경로 (PNG 우선)"""
+    sources: Dict[str, Path] = {}
+    if not NPC_DIR.exists():
+        return sources
+    for worldview_dir in sorted(p for p in NPC_DIR.iterdir() if p.is_dir()):
+        if worldviews and worldview_dir.name not in worldviews:
+            continue
+        for npc_dir in sorted(p for p in worldview_dir.iterdir() if p.is_dir()):
+            for ext in SOURCE_EXTENSIONS:
+                for path in sorted(npc_dir.glob(f"*{ext}")):
+                    key = f"{worldview_dir.name}/{npc_dir.name}/{path.stem}"
+                    sources.setdefault(key, path)
+    return sources
+
+def remove_stale_variants(source: Path, entry: Optional[Dict[str, Any]]) -> int:
+    """원본 옆 변환본 중 매핑 항목에 없는 파일 삭제 (너비/포맷 설정 변경, 원본 삭제), 삭제 수 반환"""
+    keep = {v["path"] for variants in (entry or {}).get("variants", {}).values() for v in variants}
+    removed = 0
+    for path in source.parent.glob(f"{source.stem}.*w.*"):
+        match = VARIANT_PATTERN.match(path.name)
+        if not match or match.group("stem") != source.stem:
+            continue
+        if path.relative_to(NPC_DIR).as_posix() not in keep:
+            path.unlink()
+            removed += 1
+    return removed
+
+def options_signature(widths: List[int], formats: List[str]) -> str:
+    """변환 옵션 서명 (바뀌면 전부 재생성)"""
+    spec = {fmt: {"quality": FORMATS[fmt]["quality"], **FORMATS[fmt]["extra"]} for fmt in formats}
+    payload = json.dumps([sorted(widths), spec, PLACEHOLDER_WIDTH, PLACEHOLDER_BLUR], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+def load_mapping() -> Dict[str, Any]:
+    if MAPPING_FILE.exists():
+        with open(MAPPING_FILE, "r", encoding="utf-8") as f:
+            mapping = json.load(f)
+        if mapping.get("version") == MAPPING_VERSION:
+            return mapping
+    return {"version": MAPPING_VERSION, "images": {}}
+
+def save_mapping(mapping: Dict[str, Any]) -> None:
+    tmp_path = MAPPING_FILE.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(mapping, f, indent=2, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp_path, MAPPING_FILE)
+
+def save_image_atomic(image: Image.Image, path: Path, fmt: str) -> int:
+    """임시 파일에 저장 후 원자적 교체, 바이트 수 반환"""
+    spec = FORMATS[fmt]
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        image.save(tmp_path, spec["pil"], quality=spec["quality"], **spec["extra"])
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return path.stat().st_size
+
+# ============================================================
+# 변환 (워커 프로세스)
+# ============================================================
+
+def optimize_image(source: Path, source_hash: str, widths: List[int], formats: List[str]) -> Dict[str, Any]:
+    """원본 하나 -> 너비/포맷별 변형 + 플레이스홀더"""
+    with Image.open(source) as opened:
+        image = opened.convert("RGBA" if opened.mode in ("RGBA", "LA", "P") else "RGB")
+    width, height = image.size
+
+    # 원본보다 큰 너비는 원본 너비 하나로 대체
+    targets = sorted({min(w, width) for w in widths})
+    variants: Dict[str, List[Dict[str, Any]]] = {fmt: [] for fmt in formats}
+
+    for target_width in targets:
+        target_height = round(height * target_width / width)
+        resized = image if target_width == width else image.resize((target_width, target_height), Image.LANCZOS)
+        for fmt in formats:
+            out_path = source.with_name(f"{source.stem}.{target_width}w.{fmt}")
+            size = save_image_atomic(resized, out_path, fmt)
+            variants[fmt].append({
+                "width": target_width,
+                "height": target_height,
+                "path": out_path.relative_to(NPC_DIR).as_posix(),
+                "bytes": size,
+            })
+
+    placeholder_height = max(1, round(height * PLACEHOLDER_WIDTH / width))
+    tiny = image.resize((PLACEHOLDER_WIDTH, placeholder_height), Image.BILINEAR)
+    tiny = tiny.filter(ImageFilter.GaussianBlur(PLACEHOLDER_BLUR))
+    buffer = io.BytesIO()
+    tiny.save(buffer, "WEBP", quality=40)
+    placeholder = "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+    return {
+        "source": source.relative_to(NPC_DIR).as_posix(),
+        "hash": source_hash,
+        "bytes": source.stat().st_size,
+        "width": width,
+        "height": height,
+        "placeholder": placeholder,
+        "variants": variants,
+    }
+
+# ============================================================
+# 메인
+# ============================================================
+
+def is_up_to_date(entry: Optional[Dict[str, Any]], source_hash: str, signature: str) -> bool:
+    if not entry or entry.get("hash") != source_hash or entry.get("options") != signature:
+        return False
+    return all(
+        (NPC_DIR / v["path"]).exists()
+        for variants in entry.get("variants", {}).values()
+        for v in variants
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="HearO NPC 이미지 최적화")
+    parser.add_argument("--worldview", "-w", action="append", help="특정 세계관만 (반복 가능)")
+    parser.add_argument("--widths", default=",".join(map(str, DEFAULT_WIDTHS)), help="표시 너비 목록 (px)")
+    parser.add_argument("--formats", default="webp,avif", help="출력 포맷 (기본: webp,avif)")
+    parser.add_argument("--workers", "-j", type=int, default=os.cpu_count() or 2, help="프로세스 수")
+    parser.add_argument("--force", action="store_true", help="해시와 무관하게 전부 재생성")
+    parser.add_argument("--dry-run", action="store_true", help="변환 대상만 출력")
+    args = parser.parse_args()
+
+    widths = [int(w) for w in args.widths.split(",") if w.strip()]
+    formats = []
+    for fmt in (f.strip() for f in args.formats.split(",") if f.strip()):
+        if fmt not in FORMATS:
+            print(f"[ERROR] 지원하지 않는 포맷: {fmt} (가능: {', '.join(FORMATS)})")
+            sys.exit(1)
+        if not format_available(fmt):
+            print(f"[WARN] Pillow에 {fmt} 인코더 없음 - 건너뜀")
+            continue
+        formats.append(fmt)
+    if not formats:
+        print("[ERROR] 사용 가능한 출력 포맷 없음")
+        sys.exit(1)
+
+    signature = options_signature(widths, formats)
+    sources = find_sources(args.worldview)
+    mapping = load_mapping()
+    images = mapping["images"]
+
+    jobs = []
+    skip_count = 0
+    for key, source in sources.items():
+        source_hash = file_sha256(source)
+        if not args.force and is_up_to_date(images.get(key), source_hash, signature):
+            skip_count += 1
+            continue
+        jobs.append((key, source, source_hash))
+
+    print(f"""
+============================================================
+HearO NPC 이미지 최적화
+============================================================
+원본: {len(sources)}개 (변환 {len(jobs)}개, 스킵 {skip_count}개)
+너비: {', '.join(map(str, widths))}px / 포맷: {', '.join(formats)}
+============================================================
+""")
+
+    if args.dry_run:
+        for key, source, _ in jobs:
+            print(f"[DRY-RUN] {key} ({source.name})")
+        return
+
+    fail_count = 0
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = {
+            executor.submit(optimize_image, source, source_hash, widths, formats): key
+            for key, source, source_hash in jobs
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                fail_count += 1
+                print(f"[ERROR] {key}: {e}")
+                continue
+            result["options"] = signature
+            images[key] = result
+            removed = remove_stale_variants(sources[key], result)
+            smallest = min(v["bytes"] for vs in result["variants"].values() for v in vs)
+            stale = f" (이전 변환본 {removed}개 삭제)" if removed else ""
+            print(f"[OK] {key}: {result['bytes'] / 1024:.0f}KB -> 최소 {smallest / 1024:.0f}KB{stale}")
+
+    # 원본이 사라진 항목과 그 변환본 정리 (세계관 필터 시 해당 세계관만)
+    scope = tuple(f"{w}/" for w in args.worldview) if args.worldview else None
+    for key in list(images):
+        if key not in sources and (scope is None or key.startswith(scope)):
+            removed = remove_stale_variants(NPC_DIR / images[key]["source"], None)
+            print(f"[CLEAN] {key}: 원본 없음 (변환본 {removed}개 삭제)")
+            del images[key]
+
+    mapping["formats"] = {fmt: FORMATS[fmt]["mime"] for fmt in formats}
+    save_mapping(mapping)
+
+    source_total = sum(e["bytes"] for e in images.values())
+    print(f"""
+============================================================
+결과
+============================================================
+성공: {len(jobs) - fail_count}개 / 실패: {fail_count}개 / 스킵: {skip_count}개
+원본 합계: {source_total / 1024 / 1024:.1f}MB""")
+    for fmt in formats:
+        for width in sorted(widths):
+            total = sum(
+                next((v["bytes"] for v in e["variants"].get(fmt, []) if v["width"] == min(width, e["width"])), 0)
+                for e in images.values()
+            )
+            print(f"{fmt} {width}px: {total / 1024 / 1024:.1f}MB")
+    print("============================================================")
+
+if __name__ == "__main__":
+    main()
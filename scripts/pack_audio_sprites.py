@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+HearO TTS 오디오 스프라이트 패커
+
+세계관(또는 세계관+운동) 단위로 TTS 클립을 하나의 WAV로 이어 붙이고
+클립별 offset/duration 인덱스를 만든다. 클라이언트는 스프라이트를 한 번
+디코딩한 뒤 구간만 재생하면 된다.
+- 클립 사이에 짧은 무음 간격 (디코더/리샘플러 경계 번짐 방지)
+- 클립 해시(크기/mtime 변동 시에만 재계산)가 그대로인 그룹은 스킵
+- 출력: public/assets/prerendered/sprites/<그룹>.wav + <그룹>.json + index.json
+
+사용법:
+    python pack_audio_sprites.py
+    python pack_audio_sprites.py --worldview fantasy
+    python pack_audio_sprites.py --group exercise      # fantasy_squat.wav 처럼 운동별
+    python pack_audio_sprites.py --gap-ms 150 --force
+"""
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from audio_io import AtomicWavWriter, read_wav_info, iter_pcm_chunks, WavInfo, file_sha256
+
+# ============================================================
+# 설정
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+TTS_DIR = PROJECT_ROOT / "public" / "assets" / "prerendered" / "tts"
+SPRITE_DIR = PROJECT_ROOT / "public" / "assets" / "prerendered" / "sprites"
+SPRITE_INDEX_FILE = SPRITE_DIR / "index.json"
+
+INDEX_VERSION = 1
+DEFAULT_GAP_MS = 100
+
+# ============================================================
+# 헬퍼 함수
+# ============================================================
+
+def clip_fingerprint(path: Path, previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """크기/mtime이 그대로면 이전 해시 재사용, 아니면 재계산"""
+    st = path.stat()
+    if previous and previous.get("size") == st.st_size and previous.get("mtime_ns") == st.st_mtime_ns:
+        digest = previous["hash"]
+    else:
+        digest = file_sha256(path)
+    return {"hash": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+def load_json(path: Path) -> Optional[Dict[str, Any]]:
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return None
+
+def save_json(path: Path, data: Dict[str, Any]) -> None:
+    """JSON 원자적 저장"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def collect_groups(worldviews: List[str], group_by: str) -> Dict[str, List[Path]]:
+    """그룹 이름 -> 클립 목록 (이름순)"""
+    groups: Dict[str, List[Path]] = {}
+    for worldview in worldviews:
+        for clip in sorted((TTS_DIR / worldview).glob("*.wav")):
+            if group_by == "exercise":
+                exercise = clip.stem.rsplit("_", 1)[0]
+                name = f"{worldview}_{exercise}"
+            else:
+                name = worldview
+            groups.setdefault(name, []).append(clip)
+    return groups
+
+# ============================================================
+# 스프라이트 빌드
+# ============================================================
+
+def is_up_to_date(index: Optional[Dict[str, Any]], fingerprints: Dict[str, Dict[str, Any]],
+                  gap_ms: int, sprite_path: Path) -> bool:
+    """이전 인덱스와 클립 구성/해시/간격이 모두 같은지"""
+    if not index or index.get("version") != INDEX_VERSION or index.get("gapMs") != gap_ms:
+        return False
+    if not sprite_path.exists():
+        return False
+    clips = index.get("clips", {})
+    if list(clips) != list(fingerprints):
+        return False
+    return all(clips[name]["hash"] == fp["hash"] for name, fp in fingerprints.items())
+
+def build_sprite(group: str, clips: List[Path], fingerprints: Dict[str, Dict[str, Any]],
+                 gap_ms: int) -> Dict[str, Any]:
+    """클립들을 하나의 WAV로 이어 붙이고 인덱스 반환 (PCM 청크 스트리밍)"""
+    infos: List[Tuple[Path, WavInfo]] = [(clip, read_wav_info(clip)) for clip in clips]
+    first = infos[0][1]
+    for clip, info in infos:
+        if (info.sample_rate, info.channels, info.sample_width) != (first.sample_rate, first.channels, first.sample_width):
+            raise ValueError(
+                f"형식 불일치: {clip.name} ({info.sample_rate}Hz/{info.channels}ch/{info.sample_width * 8}bit), "
+                f"기준 {first.sample_rate}Hz/{first.channels}ch/{first.sample_width * 8}bit"
+            )
+
+    frame_size = first.channels * first.sample_width
+    gap_frames = int(first.sample_rate * gap_ms / 1000)
+    gap = b"\x00" * (gap_frames * frame_size)
+
+    sprite_path = SPRITE_DIR / f"{group}.wav"
+    entries: Dict[str, Any] = {}
+    position = 0  # 프레임 단위
+
+    with AtomicWavWriter(sprite_path, sample_rate=first.sample_rate,
+                         channels=first.channels, sample_width=first.sample_width) as writer:
+        for i, (clip, info) in enumerate(infos):
+            if i > 0:
+                writer.write(gap)
+                position += gap_frames
+            frames = 0
+            for chunk in iter_pcm_chunks(clip, info):
+                writer.write(chunk)
+                frames += len(chunk) // frame_size
+            entries[clip.stem] = {
+                "start": position,
+                "frames": frames,
+                "offset": round(position / first.sample_rate, 6),
+                "duration": round(frames / first.sample_rate, 6),
+                **fingerprints[clip.stem],
+            }
+            position += frames
+        writer.commit()
+
+    return {
+        "version": INDEX_VERSION,
+        "sprite": sprite_path.name,
+        "sampleRate": first.sample_rate,
+        "channels": first.channels,
+        "gapMs": gap_ms,
+        "frames": position,
+        "bytes": sprite_path.stat().st_size,
+        "clips": entries,
+    }
+
+# ============================================================
+# 메인
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="HearO TTS 오디오 스프라이트 패커")
+    parser.add_argument("--worldview", "-w", action="append", help="특정 세계관만 (반복 가능)")
+    parser.add_argument("--group", choices=["worldview", "exercise"], default="worldview",
+                        help="스프라이트 단위 (기본: worldview)")
+    parser.add_argument("--gap-ms", type=int, default=DEFAULT_GAP_MS, help=f"클립 간 무음 (기본: {DEFAULT_GAP_MS}ms)")
+    parser.add_argument("--force", action="store_true", help="변경 여부와 무관하게 전부 재생성")
+    parser.add_argument("--dry-run", action="store_true", help="재생성 대상만 출력")
+    args = parser.parse_args()
+
+    if not TTS_DIR.exists():
+        print(f"[ERROR] TTS 디렉토리 없음: {TTS_DIR}")
+        sys.exit(1)
+
+    worldviews = args.worldview or sorted(p.name for p in TTS_DIR.iterdir() if p.is_dir())
+    groups = collect_groups(worldviews, args.group)
+
+    top_index = load_json(SPRITE_INDEX_FILE) or {"version": INDEX_VERSION, "sprites": {}, "clips": {}}
+    built = skipped = failed = 0
+
+    for group, clips in groups.items():
+        index_path = SPRITE_DIR / f"{group}.json"
+        sprite_path = SPRITE_DIR / f"{group}.wav"
+        previous = load_json(index_path)
+        prev_clips = previous.get("clips", {}) if previous else {}
+        fingerprints = {clip.stem: clip_fingerprint(clip, prev_clips.get(clip.stem)) for clip in clips}
+
+        if not args.force and is_up_to_date(previous, fingerprints, args.gap_ms, sprite_path):
+            skipped += 1
+            continue
+
+        changed = [name for name, fp in fingerprints.items() if prev_clips.get(name, {}).get("hash") != fp["hash"]]
+        print(f"[SPRITE] {group}: 클립 {len(clips)}개 (변경 {len(changed)}개)")
+        if args.dry_run:
+            continue
+
+        try:
+            index = build_sprite(group, clips, fingerprints, args.gap_ms)
+        except Exception as e:
+            failed += 1
+            print(f"      [ERROR] {e}")
+            continue
+        save_json(index_path, index)
+        built += 1
+        print(f"      [OK] {sprite_path.name} ({index['bytes'] / 1024 / 1024:.1f}MB, "
+              f"{index['frames'] / index['sampleRate']:.1f}초)")
+
+    if args.dry_run:
+        return
+
+    # 상위 인덱스: 스프라이트 목록 + 클립 키 -> 스프라이트
+    for group in list(top_index["sprites"]):
+        worldview = top_index["sprites"][group]["worldview"]
+        if worldview in worldviews and group not in groups:
+            # 범위 안에서 사라진 그룹 정리
+            for suffix in (".wav", ".json"):
+                (SPRITE_DIR / f"{group}{suffix}").unlink(missing_ok=True)
+            del top_index["sprites"][group]
+
+    for group, clips in groups.items():
+        index = load_json(SPRITE_DIR / f"{group}.json")
+        if not index:
+            continue
+        worldview = clips[0].parent.name
+        top_index["sprites"][group] = {
+            "worldview": worldview,
+            "sprite": index["sprite"],
+            "index": f"{group}.json",
+            "bytes": index["bytes"],
+        }
+
+    top_index["clips"] = {
+        f"{info['worldview']}/{name}": group
+        for group, info in sorted(top_index["sprites"].items())
+        for name in (load_json(SPRITE_DIR / info["index"]) or {}).get("clips", {})
+    }
+    save_json(SPRITE_INDEX_FILE, top_index)
+
+    print(f"""
+============================================================
+결과
+============================================================
+생성: {built}개
+스킵: {skipped}개 (변경 없음)
+실패: {failed}개
+============================================================
+""")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+HearO TTS 후처리 - 무음 트리밍 + 라우드니스 정규화
+
+Flash/Pro 모델과 음성마다 다른 앞뒤 무음과 음량을 맞춘다.
+- 프레임 에너지 기반 앞/뒤 무음 제거 (패딩 유지, 경계 페이드)
+- BS.1770 통합 라우드니스를 목표 LUFS로 정규화 (피크 상한 유지)
+- 세계관 디렉토리 단위 배치 처리 (프로세스 풀)
+- 클립별 절약 바이트와 제거된 앞 무음(ms) 보고
+- 헤더 없는 원시 PCM .wav 는 24kHz/16bit/mono 로 읽고 WAV 헤더를 붙여 저장
+
+사용법:
+    python postprocess_tts.py
+    python postprocess_tts.py --worldview fantasy
+    python postprocess_tts.py --target-lufs -16 --lead-pad-ms 50 --trail-pad-ms 150
+    python postprocess_tts.py --dry-run --report report.json
+"""
+
+import os
+import sys
+import json
+import argparse
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from audio_dsp import (
+    read_wav, write_wav, is_riff_wav, voiced_bounds, fade_edges, integrated_loudness, peak_db,
+)
+
+# ============================================================
+# 설정
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+TTS_DIR = PROJECT_ROOT / "public" / "assets" / "prerendered" / "tts"
+
+
+@dataclass
+class PostprocessOptions:
+    """후처리 옵션"""
+    target_lufs: float = -16.0      # 모바일 음성 기준
+    max_peak_db: float = -1.0       # 정규화 후 피크 상한
+    lead_pad_ms: float = 50.0       # 첫 음성 앞에 남길 무음
+    trail_pad_ms: float = 150.0     # 마지막 음성 뒤에 남길 무음
+    threshold_db: float = -45.0     # 무음 판정 절대 임계값
+    relative_db: float = 40.0       # 최대 프레임 대비 무음 판정 폭
+    fade_ms: float = 5.0            # 잘린 경계 페이드
+    trim_tolerance_ms: float = 20.0 # 한쪽에서 잘라낼 양이 이보다 작으면 그쪽은 유지 (재실행 시 변경 없음)
+    min_gain_change_db: float = 0.1 # 이보다 작은 게인 변화는 무시
+    trim: bool = True
+    normalize: bool = True
+
+# ============================================================
+# 처리
+# ============================================================
+
+def trim_silence(
+    samples: np.ndarray,
+    sample_rate: int,
+    options: PostprocessOptions,
+    gain_db: float = 0.0,
+) -> Tuple[np.ndarray, int, int]:
+    """앞/뒤 무음 제거 - (결과, 제거된 앞 샘플 수, 제거된 뒤 샘플 수)
+
+    gain_db 는 이후 적용할 정규화 게인 - 무음 임계값을 게인 적용 후 음량 기준으로 맞춰
+    정규화 전후 어느 쪽에서 돌려도 같은 경계를 찾게 한다.
+    """
+    start, end = voiced_bounds(samples, sample_rate, threshold_db=options.threshold_db - gain_db,
+                               relative_db=options.relative_db)
+    if end <= start:
+        return samples, 0, 0
+
+    start = max(0, start - int(sample_rate * options.lead_pad_ms / 1000))
+    end = min(len(samples), end + int(sample_rate * options.trail_pad_ms / 1000))
+    # 이미 트리밍된 클립은 판정 경계가 몇 프레임 흔들려도 다시 자르지 않음
+    tolerance = int(sample_rate * options.trim_tolerance_ms / 1000)
+    if start < tolerance:
+        start = 0
+    if len(samples) - end < tolerance:
+        end = len(samples)
+    if start == 0 and end == len(samples):
+        return samples, 0, 0
+
+    trimmed = fade_edges(samples[start:end], int(sample_rate * options.fade_ms / 1000))
+    return trimmed, start, len(samples) - end
+
+def normalize_loudness(
+    samples: np.ndarray,
+    sample_rate: int,
+    options: PostprocessOptions,
+) -> Tuple[np.ndarray, float, float, bool]:
+    """목표 LUFS로 게인 적용 - (결과, 측정 라우드니스, 적용 게인 dB, 목표 도달 여부)
+
+    올리는 게인만 피크 상한으로 제한한다 (이미 상한을 넘은 조용한 클립을 더 줄이지 않음).
+    상한 때문에 목표까지 못 올리면 도달 여부가 False.
+    """
+    loudness = integrated_loudness(samples, sample_rate)
+    if not np.isfinite(loudness):
+        return samples, loudness, 0.0, True
+
+    needed_db = options.target_lufs - loudness
+    gain_db = needed_db
+    if gain_db > 0:
+        headroom = options.max_peak_db - peak_db(samples)
+        gain_db = min(gain_db, max(0.0, headroom))
+    reached = needed_db - gain_db < options.min_gain_change_db
+    if abs(gain_db) < options.min_gain_change_db:
+        return samples, loudness, 0.0, reached
+    return samples * np.float32(10 ** (gain_db / 20)), loudness, gain_db, reached
+
+def process_clip(path: Path, options: PostprocessOptions, dry_run: bool = False) -> Dict[str, Any]:
+    """WAV 하나 후처리 후 덮어쓰기 (변경 없으면 그대로 둠)"""
+    path = Path(path)
+    bytes_before = path.stat().st_size
+    headerless = not is_riff_wav(path)
+    samples, rate = read_wav(path)
+
+    lead_removed = trail_removed = 0
+    if options.trim:
+        expected_gain = normalize_loudness(samples, rate, options)[2] if options.normalize else 0.0
+        samples, lead_removed, trail_removed = trim_silence(samples, rate, options, expected_gain)
+
+    loudness_before = float("-inf")
+    gain_db = 0.0
+    target_reached = True
+    if options.normalize:
+        samples, loudness_before, gain_db, target_reached = normalize_loudness(samples, rate, options)
+
+    changed = bool(lead_removed or trail_removed or gain_db or headerless)
+    bytes_after = bytes_before
+    if changed and not dry_run:
+        bytes_after = write_wav(path, samples, rate)
+    elif changed:
+        bytes_after = 44 + len(samples) * 2
+
+    return {
+        "path": str(path),
+        "changed": changed,
+        "headerless": headerless,
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "bytes_saved": bytes_before - bytes_after,
+        "lead_silence_removed_ms": round(lead_removed * 1000 / rate, 1),
+        "trail_silence_removed_ms": round(trail_removed * 1000 / rate, 1),
+        "loudness_before_lufs": round(loudness_before, 2) if np.isfinite(loudness_before) else None,
+        "gain_db": round(gain_db, 2),
+        "target_reached": target_reached,
+        "duration_sec": round(len(samples) / rate, 3),
+    }
+
+def find_clips(worldviews: Optional[List[str]] = None, tts_dir: Path = TTS_DIR) -> List[Path]:
+    """세계관 디렉토리의 WAV 목록"""
+    if not tts_dir.exists():
+        return []
+    dirs = [tts_dir / w for w in worldviews] if worldviews else sorted(p for p in tts_dir.iterdir() if p.is_dir())
+    clips = []
+    for directory in dirs:
+        clips.extend(sorted(directory.glob("*.wav")))
+    return clips
+
+# ============================================================
+# 메인
+# ============================================================
+
+def main():
+    defaults = PostprocessOptions()
+    parser = argparse.ArgumentParser(description="HearO TTS 무음 트리밍 + 라우드니스 정규화")
+    parser.add_argument("--worldview", "-w", action="append", help="특정 세계관만 (반복 가능)")
+    parser.add_argument("--target-lufs", type=float, default=defaults.target_lufs, help="목표 라우드니스 (LUFS)")
+    parser.add_argument("--max-peak-db", type=float, default=defaults.max_peak_db, help="피크 상한 (dBFS)")
+    parser.add_argument("--lead-pad-ms", type=float, default=defaults.lead_pad_ms, help="앞 무음 패딩 (ms)")
+    parser.add_argument("--trail-pad-ms", type=float, default=defaults.trail_pad_ms, help="뒤 무음 패딩 (ms)")
+    parser.add_argument("--threshold-db", type=float, default=defaults.threshold_db, help="무음 임계값 (dBFS)")
+    parser.add_argument("--no-trim", action="store_true", help="무음 트리밍 안함")
+    parser.add_argument("--no-normalize", action="store_true", help="라우드니스 정규화 안함")
+    parser.add_argument("--workers", "-j", type=int, default=os.cpu_count() or 2, help="프로세스 수")
+    parser.add_argument("--dry-run", action="store_true", help="파일 수정 없이 결과만 계산")
+    parser.add_argument("--report", type=Path, help="클립별 결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    options = PostprocessOptions(
+        target_lufs=args.target_lufs,
+        max_peak_db=args.max_peak_db,
+        lead_pad_ms=args.lead_pad_ms,
+        trail_pad_ms=args.trail_pad_ms,
+        threshold_db=args.threshold_db,
+        trim=not args.no_trim,
+        normalize=not args.no_normalize,
+    )
+
+    clips = find_clips(args.worldview)
+    if not clips:
+        print(f"[ERROR] 처리할 WAV 없음: {TTS_DIR}")
+        sys.exit(1)
+
+    print(f"""
+============================================================
+HearO TTS 후처리
+============================================================
+대상: {len(clips)}개
+목표: {options.target_lufs} LUFS (피크 {options.max_peak_db} dBFS)
+패딩: 앞 {options.lead_pad_ms}ms / 뒤 {options.trail_pad_ms}ms
+============================================================
+""")
+
+    results: List[Dict[str, Any]] = []
+    fail_count = 0
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = {executor.submit(process_clip, clip, options, args.dry_run): clip for clip in clips}
+        for future in as_completed(futures):
+            clip = futures[future]
+            name = clip.relative_to(TTS_DIR).as_posix() if clip.is_relative_to(TTS_DIR) else str(clip)
+            try:
+                result = future.result()
+            except Exception as e:
+                fail_count += 1
+                print(f"[ERROR] {name}: {e}")
+                continue
+            results.append(result)
+            if result["changed"]:
+                header_note = " [WAV 헤더 추가]" if result["headerless"] else ""
+                print(f"[OK] {name}{header_note}: -{result['bytes_saved'] / 1024:.1f}KB, "
+                      f"앞 무음 -{result['lead_silence_removed_ms']:.0f}ms, "
+                      f"게인 {result['gain_db']:+.1f}dB")
+            if not result["target_reached"]:
+                print(f"[WARN] {name}: 피크 상한 때문에 목표 라우드니스 미달 "
+                      f"(측정 {result['loudness_before_lufs']} LUFS)")
+
+    results.sort(key=lambda r: r["path"])
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({"options": asdict(options), "clips": results}, f, indent=2, ensure_ascii=False)
+
+    changed = [r for r in results if r["changed"]]
+    unreached = [r for r in results if not r["target_reached"]]
+    total_saved = sum(r["bytes_saved"] for r in results)
+    lead_ms = [r["lead_silence_removed_ms"] for r in results]
+    print(f"""
+============================================================
+결과{' (DRY-RUN)' if args.dry_run else ''}
+============================================================
+변경: {len(changed)}개 / 유지: {len(results) - len(changed)}개 / 실패: {fail_count}개
+목표 미달 (피크 상한): {len(unreached)}개
+절약: {total_saved / 1024 / 1024:.2f}MB
+앞 무음 제거: 평균 {np.mean(lead_ms) if lead_ms else 0:.0f}ms, 최대 {max(lead_ms, default=0):.0f}ms
+============================================================
+""")
+
+if __name__ == "__main__":
+    main()
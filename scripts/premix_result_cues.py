@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+HearO 결과 화면 큐 사전 믹싱 (TTS + 세계관 효과음 -> 클립 하나)
+
+결과 화면은 등급 TTS 위에 public/assets/sounds/<세계관>/, common/ 효과음을 겹쳐 재생하는데,
+재생할 때마다 기기가 버퍼 여러 개를 디코딩해 섞는다. 세계관 x 등급별 믹스 스펙
+(scripts/premix_spec.json)대로 미리 섞어 클립 하나로 저장한다.
+- 레이어: 효과음, 시작 시각(ms, 믹스 시작 또는 음성 끝 기준), 게인(dB)
+- 음성이 나오는 동안 효과음을 덕킹 (NumPy 프레임 RMS -> 게인 곡선, attack/release 램프)
+- 마스터: 목표 LUFS 정규화(피크 상한) + 꼬리 무음 + 끝 페이드
+- 입력(TTS, 효과음 해시)과 스펙이 그대로인 믹스는 다시 렌더링하지 않음
+- 효과음은 TTS 와 같은 24kHz mono 로 리샘플링, RIFF 가 아닌 파일(.wav 확장자의 MP3 등)은 ffmpeg 로 디코딩
+
+출력: public/assets/prerendered/premix/<세계관>/<운동>_<등급>.wav, premix/index.json
+(index.json 의 voice_offset 은 믹스 안에서 음성이 시작하는 시각 - 립싱크 정렬용)
+
+사용법:
+    python premix_result_cues.py
+    python premix_result_cues.py --worldview fantasy -j 4
+    python premix_result_cues.py --spec my_spec.json --force
+    python premix_result_cues.py --dry-run
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+import argparse
+import subprocess
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from audio_io import AtomicFile, SAMPLE_RATE
+from audio_dsp import (
+    read_wav, write_wav, is_riff_wav, pcm_to_array, frame_rms, to_db, voiced_bounds, fade_edges,
+    integrated_loudness, peak_db, resample,
+)
+from build_asset_manifest import StatCache
+
+# ============================================================
+# 설정
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+SOUNDS_DIR = PROJECT_ROOT / "public" / "assets" / "sounds"
+PRERENDERED_DIR = PROJECT_ROOT / "public" / "assets" / "prerendered"
+TTS_DIR = PRERENDERED_DIR / "tts"
+PREMIX_DIR = PRERENDERED_DIR / "premix"
+SPEC_FILE = SCRIPT_DIR / "premix_spec.json"
+HASH_CACHE_FILE = SCRIPT_DIR / ".premix_hash_cache.json"
+INDEX_NAME = "index.json"
+
+SPEC_VERSION = 1
+INDEX_VERSION = 1
+
+# 렌더링 방식이 바뀌면 올림 (전체 다시 렌더링)
+RENDER_VERSION = 1
+
+# 덕킹 분석 프레임
+DUCK_FRAME_MS = 10.0
+
+# ============================================================
+# 스펙
+# ============================================================
+
+def load_spec(path: Path = SPEC_FILE) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    if spec.get("version") != SPEC_VERSION:
+        raise ValueError(f"지원하지 않는 스펙 버전: {spec.get('version')} ({path})")
+    return spec
+
+def resolve_mix(spec: Dict[str, Any], worldview: str, grade: str) -> Optional[Dict[str, Any]]:
+    """세계관 x 등급 믹스 (공통 등급 레이어 + 세계관 레이어), 레이어가 없으면 None"""
+    layers = list(spec.get("grades", {}).get(grade, []))
+    layers += spec.get("worldviews", {}).get(worldview, {}).get(grade, [])
+    if not layers:
+        return None
+    return {
+        "voice": spec.get("voice", {}),
+        "duck": spec.get("duck", {}),
+        "master": spec.get("master", {}),
+        "layers": layers,
+    }
+
+def sound_path(name: str) -> Path:
+    """레이어 sound ("common/success") -> 파일 경로"""
+    return SOUNDS_DIR / f"{name}.wav"
+
+# ============================================================
+# 입력 읽기
+# ============================================================
+
+_SOUND_CACHE: Dict[Tuple[str, str], np.ndarray] = {}
+
+def decode_with_ffmpeg(path: Path, ffmpeg: str, sample_rate: int) -> np.ndarray:
+    """ffmpeg 로 16bit mono PCM 디코딩"""
+    result = subprocess.run(
+        [ffmpeg, "-nostdin", "-hide_banner", "-loglevel", "error", "-i", str(path),
+         "-f", "s16le", "-ac", "1", "-ar", str(sample_rate), "-"],
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode("utf-8", "replace").strip() or f"ffmpeg 종료 코드 {result.returncode}")
+    pcm = result.stdout
+    return pcm_to_array(pcm[:len(pcm) - len(pcm) % 2])
+
+def load_sound(path: Path, sha256: str, sample_rate: int, ffmpeg: Optional[str]) -> np.ndarray:
+    """효과음 -> float32 mono (sample_rate), 프로세스 안에서 해시별로 한 번만 디코딩"""
+    key = (str(path), sha256)
+    if key not in _SOUND_CACHE:
+        if is_riff_wav(path):
+            samples, rate = read_wav(path, allow_raw=False)
+            samples = resample(samples, rate, sample_rate)
+        elif ffmpeg:
+            samples = decode_with_ffmpeg(path, ffmpeg, sample_rate)
+        else:
+            raise ValueError(f"RIFF WAV 아님 (디코딩에 ffmpeg 필요): {path}")
+        _SOUND_CACHE[key] = samples
+    return _SOUND_CACHE[key]
+
+# ============================================================
+# 믹싱
+# ============================================================
+
+def duck_gain(voice: np.ndarray, sample_rate: int, duck: Dict[str, Any]) -> np.ndarray:
+    """타임라인 위 음성 트랙 -> 효과음 게인 곡선 (샘플별, 1.0 = 그대로)
+
+    음성 프레임 앞 attack 부터 끝난 뒤 release 까지 depth_db 만큼 내리고,
+    attack 길이 이동 평균으로 램프를 만든다.
+    """
+    depth = 10 ** (duck.get("depth_db", -12.0) / 20)
+    if depth >= 1.0 or len(voice) == 0:
+        return np.ones(len(voice), dtype=np.float32)
+    frame = max(1, int(sample_rate * DUCK_FRAME_MS / 1000))
+    active = (to_db(frame_rms(voice, frame)) >= duck.get("threshold_db", -40.0)).astype(np.float64)
+    attack = max(1, int(round(duck.get("attack_ms", 60) / DUCK_FRAME_MS)))
+    release = max(1, int(round(duck.get("release_ms", 300) / DUCK_FRAME_MS)))
+
+    # held[i] = 프레임 [i - release, i + attack] 안에 음성이 있는지
+    padded = np.pad(active, (release, attack))
+    held = np.lib.stride_tricks.sliding_window_view(padded, attack + release + 1).max(axis=1)
+    amount = np.convolve(held, np.ones(attack) / attack, mode="same")
+    frame_gain = 1.0 - amount * (1.0 - depth)
+    centers = np.arange(len(frame_gain)) * frame + frame / 2
+    return np.interp(np.arange(len(voice)), centers, frame_gain).astype(np.float32)
+
+def place(track: np.ndarray, samples: np.ndarray, start: int, gain: float = 1.0) -> None:
+    """track[start:] 에 samples 를 게인 곱해 더함 (넘치는 부분은 잘림)"""
+    end = min(len(track), start + len(samples))
+    if end > start:
+        track[start:end] += samples[:end - start] * np.float32(gain)
+
+def render_mix(
+    voice: np.ndarray,
+    sounds: List[np.ndarray],
+    mix: Dict[str, Any],
+    sample_rate: int = SAMPLE_RATE,
+) -> Tuple[np.ndarray, float]:
+    """음성 + 레이어 효과음 -> (믹스, 음성 시작 시각 초) - sounds 는 mix["layers"] 순서"""
+    ms = sample_rate / 1000
+    voice_cfg, master = mix["voice"], mix["master"]
+    voice_start = int(voice_cfg.get("offset_ms", 0) * ms)
+    _, voiced_end = voiced_bounds(voice, sample_rate)
+    voice_end = voice_start + (voiced_end or len(voice))
+
+    starts = []
+    for layer in mix["layers"]:
+        base = voice_end if layer.get("anchor") == "voice_end" else 0
+        starts.append(max(0, base + int(layer.get("at_ms", 0) * ms)))
+    length = max([voice_start + len(voice)] + [s + len(snd) for s, snd in zip(starts, sounds)])
+    length += int(master.get("tail_ms", 0) * ms)
+
+    voice_track = np.zeros(length, dtype=np.float32)
+    place(voice_track, voice, voice_start, 10 ** (voice_cfg.get("gain_db", 0.0) / 20))
+    ducked = np.zeros(length, dtype=np.float32)
+    direct = np.zeros(length, dtype=np.float32)
+    for layer, start, samples in zip(mix["layers"], starts, sounds):
+        bus = ducked if layer.get("duck", True) else direct
+        place(bus, samples, start, 10 ** (layer.get("gain_db", 0.0) / 20))
+
+    result = voice_track + ducked * duck_gain(voice_track, sample_rate, mix["duck"]) + direct
+
+    loudness = integrated_loudness(result, sample_rate)
+    if np.isfinite(loudness) and "target_lufs" in master:
+        gain_db = master["target_lufs"] - loudness
+        gain_db = min(gain_db, master.get("max_peak_db", -1.0) - peak_db(result))
+        result = result * np.float32(10 ** (gain_db / 20))
+    result = fade_edges(result, int(master.get("fade_ms", 0) * ms))
+    return np.clip(result, -1.0, 1.0), voice_start / sample_rate
+
+def render_clip(
+    tts_path: Path,
+    output_path: Path,
+    mix: Dict[str, Any],
+    sound_hashes: List[str],
+    sample_rate: int = SAMPLE_RATE,
+    ffmpeg: Optional[str] = None,
+) -> Dict[str, Any]:
+    """클립 하나 렌더링 후 저장 (워커 프로세스)"""
+    voice, rate = read_wav(tts_path)
+    voice = resample(voice, rate, sample_rate)
+    sounds = [load_sound(sound_path(layer["sound"]), sha, sample_rate, ffmpeg)
+              for layer, sha in zip(mix["layers"], sound_hashes)]
+    samples, voice_offset = render_mix(voice, sounds, mix, sample_rate)
+    size = write_wav(output_path, samples, sample_rate)
+    return {
+        "bytes": size,
+        "duration": round(len(samples) / sample_rate, 3),
+        "voice_offset": round(voice_offset, 3),
+    }
+
+# ============================================================
+# 증분 빌드
+# ============================================================
+
+def mix_fingerprint(mix: Dict[str, Any], tts_hash: str, sound_hashes: List[str], sample_rate: int) -> str:
+    payload = json.dumps([RENDER_VERSION, sample_rate, mix, tts_hash, sound_hashes], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+def load_index(premix_dir: Path = PREMIX_DIR) -> Dict[str, Any]:
+    path = premix_dir / INDEX_NAME
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") == INDEX_VERSION:
+            return index
+    return {"version": INDEX_VERSION, "sample_rate": SAMPLE_RATE, "clips": {}}
+
+def save_index(index: Dict[str, Any], premix_dir: Path = PREMIX_DIR) -> None:
+    with AtomicFile(premix_dir / INDEX_NAME) as f:
+        f.write(json.dumps(index, indent=2, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+        f.commit()
+
+def find_worldviews(worldviews: Optional[List[str]]) -> List[str]:
+    if worldviews:
+        return worldviews
+    return sorted(p.name for p in TTS_DIR.iterdir() if p.is_dir()) if TTS_DIR.exists() else []
+
+# ============================================================
+# 메인
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="HearO 결과 화면 큐 사전 믹싱 (TTS + 효과음)")
+    parser.add_argument("--worldview", "-w", action="append", help="특정 세계관만 (반복 가능)")
+    parser.add_argument("--spec", type=Path, default=SPEC_FILE, help="믹스 스펙 JSON")
+    parser.add_argument("--workers", "-j", type=int, default=os.cpu_count() or 2, help="프로세스 수")
+    parser.add_argument("--force", action="store_true", help="입력이 그대로여도 전부 다시 렌더링")
+    parser.add_argument("--dry-run", action="store_true", help="렌더링할 믹스만 출력")
+    parser.add_argument("--ffmpeg", default=os.environ.get("FFMPEG", "ffmpeg"),
+                        help="RIFF 가 아닌 효과음 디코딩용 ffmpeg (없으면 그런 효과음을 쓰는 믹스는 실패)")
+    args = parser.parse_args()
+
+    try:
+        spec = load_spec(args.spec)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] 스펙 로드 실패: {e}")
+        sys.exit(1)
+    ffmpeg = shutil.which(args.ffmpeg)
+    worldviews = find_worldviews(args.worldview)
+    hashes = StatCache(HASH_CACHE_FILE)
+    index = load_index()
+    seen = set()
+
+    def input_hash(path: Path) -> str:
+        rel = path.relative_to(PROJECT_ROOT).as_posix()
+        seen.add(rel)
+        return hashes.describe(path, rel)["sha256"]
+
+    jobs = []
+    failed: List[Tuple[str, str]] = []
+    up_to_date = 0
+    produced = set()
+    for worldview in worldviews:
+        for tts_path in sorted((TTS_DIR / worldview).glob("*.wav")):
+            exercise, _, grade = tts_path.stem.rpartition("_")
+            mix = resolve_mix(spec, worldview, grade)
+            if mix is None:
+                continue
+            key = f"{worldview}/{tts_path.stem}"
+            produced.add(key)
+            missing = [layer["sound"] for layer in mix["layers"] if not sound_path(layer["sound"]).exists()]
+            if missing:
+                failed.append((key, f"효과음 없음: {', '.join(missing)}"))
+                continue
+            sound_hashes = [input_hash(sound_path(layer["sound"])) for layer in mix["layers"]]
+            fingerprint = mix_fingerprint(mix, input_hash(tts_path), sound_hashes, SAMPLE_RATE)
+            output_path = PREMIX_DIR / worldview / f"{tts_path.stem}.wav"
+            entry = index["clips"].get(key)
+            if not args.force and entry and entry.get("fingerprint") == fingerprint and output_path.exists():
+                up_to_date += 1
+                continue
+            jobs.append((key, tts_path, output_path, mix, sound_hashes, fingerprint))
+
+    print(f"""
+============================================================
+HearO 결과 큐 사전 믹싱
+============================================================
+세계관: {', '.join(worldviews)}
+스펙: {args.spec}
+렌더링: {len(jobs)}개 / 최신: {up_to_date}개
+ffmpeg: {ffmpeg or '없음 (RIFF WAV 효과음만 사용 가능)'}
+============================================================
+""")
+
+    rendered = 0
+    if args.dry_run:
+        for key, *_ in jobs:
+            print(f"[PLAN] {key}")
+    elif jobs:
+        with ProcessPoolExecutor(max_workers=max(1, args.workers)) as executor:
+            futures = {
+                executor.submit(render_clip, tts_path, output_path, mix, sound_hashes, SAMPLE_RATE, ffmpeg):
+                    (key, output_path, fingerprint)
+                for key, tts_path, output_path, mix, sound_hashes, fingerprint in jobs
+            }
+            for future in as_completed(futures):
+                key, output_path, fingerprint = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failed.append((key, f"{type(e).__name__}: {e}"))
+                    continue
+                index["clips"][key] = {
+                    "path": output_path.relative_to(PREMIX_DIR).as_posix(),
+                    "fingerprint": fingerprint,
+                    **result,
+                }
+                rendered += 1
+                print(f"[OK] {key}: {result['duration']:.1f}초, 음성 {result['voice_offset']:.2f}초부터")
+
+    # TTS 가 사라졌거나 스펙에서 빠진 믹스 정리
+    removed = 0
+    if not args.dry_run:
+        for key in list(index["clips"]):
+            if key.split("/", 1)[0] in worldviews and key not in produced:
+                (PREMIX_DIR / index["clips"][key]["path"]).unlink(missing_ok=True)
+                del index["clips"][key]
+                removed += 1
+        index["sample_rate"] = SAMPLE_RATE
+        save_index(index)
+        if not args.worldview:
+            hashes.prune(seen)
+        hashes.save()
+
+    for key, error in sorted(failed):
+        print(f"[ERROR] {key}: {error}")
+    print(f"""
+============================================================
+결과{' (DRY-RUN)' if args.dry_run else ''}
+============================================================
+렌더링: {rendered}개 / 최신: {up_to_date}개 / 정리: {removed}개 / 실패: {len(failed)}개
+출력: {PREMIX_DIR}
+============================================================
+""")
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,40 @@
-import random
+"""
+HearO 360도 스카이박스 프롬프트 카탈로그
+
+세계관별 장소 x 시간/날씨 전체 조합을 지연(lazy) 생성해 JSONL 샤드로 스트리밍 저장한다.
+- 시드 기반 순열(아핀 순열, 조합 목록을 메모리에 만들지 않음)로 비복원 샘플링
+  -> 같은 시드/개수면 항상 같은 순서, 같은 배치
+- 프롬프트 텍스트 해시로 중복 제거, ID = <세계관>-<해시 12자리> (목록 순서가 바뀌어도 유지)
+- 출력: <out-dir>/<세계관>/batch_0000.jsonl (배치 구성은 렌더링 여부와 무관하게 고정)
+        <out-dir>/index.json (샤드 목록, 시드, 개수)
+- --rendered: 이미 렌더링한 ID(이미지 파일명 또는 ID 목록 파일)는 샤드에서 제외
+
+사용법:
+    python prompt_generator.py                            # 전체 조합 (세계관당 80개)
+    python prompt_generator.py --seed 7 --limit 20        # 세계관당 20개 샘플
+    python prompt_generator.py --world Fantasy --batch-size 10
+    python prompt_generator.py --rendered ../skybox_renders  # 렌더링된 ID 건너뜀
+    python prompt_generator.py --txt hearo_skybox_prompts.txt  # 이전 텍스트 형식도 저장
+"""
+
 import os
+import json
+import math
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional, Set
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+OUTPUT_DIR = PROJECT_ROOT / "skybox_prompts"
+
+DEFAULT_SEED = 0
+DEFAULT_BATCH_SIZE = 20
+ID_HASH_LENGTH = 12
+
+# 렌더링 결과로 인정하는 이미지 확장자
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp", ".exr", ".hdr"}
 
 # ==========================================
 # 1. 360도 스카이박스 전용 설정 (수정됨)
@@ -211,43 +246,197 @@ worlds = {
 }
 
 # ==========================================
-# 3. 실행 및 파일 저장
+# 3. 조합 생성 (지연 + 시드 순열)
+# ==========================================
+
+def seeded_int(seed: int, *parts: str) -> int:
+    """시드 + 이름에서 파생한 정수 (Python hash 와 달리 실행마다 같음)"""
+    digest = hashlib.sha256(":".join([str(seed), *parts]).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+def affine_permutation(n: int, seed: int, world_name: str) -> Iterator[int]:
+    """0..n-1 을 i -> (a*i + b) mod n 순서로 (gcd(a, n) = 1 이면 전단사, 메모리 O(1))"""
+    if n <= 1:
+        yield from range(n)
+        return
+    a = 1 + seeded_int(seed, world_name, "a") % (n - 1)
+    while math.gcd(a, n) != 1:
+        a = a % (n - 1) + 1
+    b = seeded_int(seed, world_name, "b") % n
+    for i in range(n):
+        yield (a * i + b) % n
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+def iter_prompts(world_name: str, data: Dict[str, Any], seed: int = DEFAULT_SEED,
+                 limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """세계관 하나의 프롬프트 레코드 (시드 순서, 중복 제거, 최대 limit 개)"""
+    locations = data["locations"]
+    times = data["times"]
+    seen: Set[str] = set()
+    for combo in affine_permutation(len(locations) * len(times), seed, world_name):
+        if limit is not None and len(seen) >= limit:
+            return
+        location = locations[combo // len(times)]
+        time_weather = times[combo % len(times)]
+        prompt = data["template"].format(
+            prefix=PREFIX,
+            location=location,
+            time_weather=time_weather,
+            suffix=SUFFIX
+        )
+        digest = prompt_hash(prompt)
+        if digest in seen:
+            continue
+        seen.add(digest)
+        yield {
+            "id": f"{world_name.lower()}-{digest[:ID_HASH_LENGTH]}",
+            "world": world_name,
+            "location": location,
+            "time": time_weather,
+            "prompt": prompt,
+            "sha256": digest,
+            "position": len(seen) - 1,
+        }
+
+def load_rendered_ids(path: Optional[Path]) -> Set[str]:
+    """렌더링 완료 ID - 디렉토리면 이미지 파일명(확장자 제외), 파일이면 한 줄에 하나 (JSONL 은 "id")"""
+    if path is None or not path.exists():
+        return set()
+    if path.is_dir():
+        return {p.stem for p in path.rglob("*") if p.suffix.lower() in IMAGE_EXTENSIONS}
+    ids = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            ids.add(json.loads(line)["id"] if line.startswith("{") else line)
+    return ids
+
+# ==========================================
+# 4. 실행 및 파일 저장
 # ==========================================
 
-def generate_prompts():
-    all_prompts = []
-    
+class ShardWriter:
+    """<세계관>/batch_NNNN.jsonl 로 한 줄씩 스트리밍 기록"""
+
+    def __init__(self, out_dir: Path, world_name: str):
+        self.dir = out_dir / world_name.lower()
+        self.batch = None
+        self.file = None
+        self.shards: Dict[str, int] = {}
+
+    def write(self, batch: int, record: Dict[str, Any]) -> None:
+        if batch != self.batch:
+            self.close()
+            self.dir.mkdir(parents=True, exist_ok=True)
+            path = self.dir / f"batch_{batch:04d}.jsonl"
+            self.file = open(path, "w", encoding="utf-8")
+            self.batch = batch
+            self.shards[path.name] = 0
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.shards[f"batch_{batch:04d}.jsonl"] += 1
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+def generate_prompts(out_dir: Path = OUTPUT_DIR, seed: int = DEFAULT_SEED, limit: Optional[int] = None,
+                     batch_size: int = DEFAULT_BATCH_SIZE, world_names: Optional[list] = None,
+                     rendered: Optional[Set[str]] = None, txt_path: Optional[Path] = None) -> Dict[str, Any]:
+    """프롬프트 샤드 생성 - index.json 내용 반환
+
+    world_names 를 주면 그 세계관 항목만 갱신하고 나머지 세계관 항목은 기존 index.json 에서 유지한다.
+    """
+    rendered = rendered or set()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    index_path = out_dir / "index.json"
+    previous_worlds: Dict[str, Any] = {}
+    if world_names and index_path.exists():
+        with open(index_path, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+        # 세계관별 설정이 없는 이전 형식 항목은 당시 상위 설정으로 채움
+        for name, entry in previous.get("worlds", {}).items():
+            previous_worlds[name] = {
+                "seed": previous.get("seed"), "limit": previous.get("limit"),
+                "batch_size": previous.get("batch_size"), **entry,
+            }
+    index = {"seed": seed, "limit": limit, "batch_size": batch_size, "worlds": previous_worlds}
+    txt = open(txt_path, "w", encoding="utf-8") if txt_path else None
+
     print("🚀 HearO 스카이박스 프롬프트 생성을 시작합니다... (2:1 Ratio)")
+    try:
+        for world_name in world_names or list(worlds):
+            data = worlds[world_name]
+            total = len(data["locations"]) * len(data["times"])
+            print(f"   - Processing: {world_name} ({len(data['locations'])} locations x {len(data['times'])} times)...")
+
+            # 이전 실행의 샤드는 지움 (배치 크기/개수가 바뀌었을 수 있음)
+            for old in (out_dir / world_name.lower()).glob("batch_*.jsonl"):
+                old.unlink()
+
+            writer = ShardWriter(out_dir, world_name)
+            count = skipped = 0
+            try:
+                for record in iter_prompts(world_name, data, seed, limit):
+                    count += 1
+                    # 배치는 렌더링 여부와 무관한 위치로 정함 -> 재실행해도 같은 배치
+                    batch = record["position"] // batch_size
+                    if record["id"] in rendered:
+                        skipped += 1
+                        continue
+                    writer.write(batch, {**record, "batch": batch, "seed": seed})
+                    if txt is not None:
+                        txt.write(f"[{world_name}] {record['prompt']}\n\n")
+            finally:
+                writer.close()
+
+            index["worlds"][world_name] = {
+                "seed": seed,
+                "limit": limit,
+                "batch_size": batch_size,
+                "combinations": total,
+                "prompts": count,
+                "rendered": skipped,
+                "shards": writer.shards,
+            }
+            print(f"     {count}개 (렌더링됨 {skipped}개 제외), 샤드 {len(writer.shards)}개")
+    finally:
+        if txt is not None:
+            txt.close()
+
+    tmp_path = index_path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, index_path)
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description="HearO 360도 스카이박스 프롬프트 카탈로그")
+    parser.add_argument("--out-dir", "-o", type=Path, default=OUTPUT_DIR, help="샤드 출력 디렉토리")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="샘플링 순서 시드")
+    parser.add_argument("--limit", type=int, help="세계관당 프롬프트 수 (기본: 전체 조합)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="샤드 하나당 프롬프트 수")
+    parser.add_argument("--world", action="append", choices=list(worlds), help="특정 세계관만 (반복 가능)")
+    parser.add_argument("--rendered", type=Path, help="렌더링 완료 이미지 디렉토리 또는 ID 목록 파일")
+    parser.add_argument("--txt", type=Path, help="이전 형식 텍스트 파일도 저장 ([세계관] 프롬프트)")
+    args = parser.parse_args()
 
-    for world_name, data in worlds.items():
-        print(f"   - Processing: {world_name} (20 locations)...")
-        
-        for location in data["locations"]:
-            # 각 장소마다 시간/날씨를 랜덤하게 하나 선택
-            selected_time = random.choice(data["times"])
-            
-            # 템플릿 적용
-            prompt = data["template"].format(
-                prefix=PREFIX,
-                location=location,
-                time_weather=selected_time,
-                suffix=SUFFIX
-            )
-            
-            all_prompts.append(f"[{world_name}] {prompt}\n")
-
-    # 결과 파일 저장
-    file_name = "hearo_skybox_prompts.txt"
     try:
-        with open(file_name, "w", encoding="utf-8") as f:
-            f.write("\n".join(all_prompts))
-        
-        print(f"\n✅ 완료! 총 {len(all_prompts)}개의 프롬프트가 생성되었습니다.")
-        print(f"📂 파일 위치: {os.path.abspath(file_name)}")
-        print("👉 팁: 이제 Gemini나 Midjourney가 2:1 비율의 360도용 이미지를 만들어줍니다.")
-        
+        index = generate_prompts(args.out_dir, args.seed, args.limit, max(1, args.batch_size),
+                                 args.world, load_rendered_ids(args.rendered), args.txt)
     except Exception as e:
         print(f"\n❌ 파일 저장 중 오류 발생: {e}")
+        raise SystemExit(1)
+
+    total = sum(index["worlds"][name]["prompts"] - index["worlds"][name]["rendered"]
+                for name in args.world or index["worlds"])
+    print(f"\n✅ 완료! 총 {total}개의 프롬프트가 생성되었습니다. (시드 {args.seed})")
+    print(f"📂 파일 위치: {os.path.abspath(args.out_dir)}")
+    print("👉 팁: 렌더링한 이미지를 <ID>.png 로 저장하고 --rendered 로 넘기면 다음 실행에서 건너뜁니다.")
 
 if __name__ == "__main__":
-    generate_prompts()
\ No newline at end of file
+    main()
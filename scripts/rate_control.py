@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+HearO TTS 적응형 요청 속도 제어 (AIMD)
+
+키x모델 슬롯("<키 지문>:<모델>")마다 분당 요청 수(rpm)를 따로 조절한다.
+- 성공할 때마다 rpm 을 조금씩 올림 (additive increase)
+- 429 를 받으면 rpm 을 비율로 깎음 (multiplicative decrease) - 깎기 전에 보낸
+  요청들이 뒤늦게 받은 429 로 연달아 깎지 않도록 한 번의 감소로 묶음
+- Retry-After / 응답 본문의 RetryInfo.retryDelay 동안 그 슬롯 요청 보류
+- QuotaFailure 의 분당 한도(quotaValue)가 오면 상한으로 사용
+- 학습한 rpm 은 상태 파일에 남겨 다음 실행이 그 값부터 시작
+
+RateLimiter(고정 간격)와 같은 acquire(name) / record(...) 인터페이스라 generate_tts_gemini.py
+의 request_model 이 어느 쪽이든 그대로 쓴다.
+
+사용법:
+    python rate_control.py --stats
+    python rate_control.py --reset
+"""
+
+import os
+import re
+import json
+import time
+import argparse
+import threading
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, Mapping, Callable
+
+# ============================================================
+# 설정
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+RATE_STATE_FILE = SCRIPT_DIR / ".tts_rate_state.json"
+
+STATE_VERSION = 1
+
+DEFAULT_START_RPM = 7.5         # 기존 고정 간격 8초와 같은 속도에서 시작
+DEFAULT_MIN_RPM = 1.0
+DEFAULT_MAX_RPM = 60.0
+DEFAULT_INCREASE_RPM = 0.5      # 성공 1회당 증가량
+DEFAULT_DECREASE_FACTOR = 0.5   # 429 1회당 곱할 비율
+
+# 로그: 마지막으로 알린 값에서 이만큼 오르면 한 줄 출력
+LOG_INCREASE_RATIO = 1.25
+
+# 슬롯 상태 파일에서 이보다 오래된 학습값은 버림 (한도가 바뀌었을 수 있음)
+STATE_MAX_AGE_SEC = 7 * 24 * 3600
+
+# ============================================================
+# 한도 힌트 파싱
+# ============================================================
+
+@dataclass
+class RateLimitHint:
+    """429/403 응답에서 읽은 재시도/한도 정보"""
+    retry_after: Optional[float] = None     # 초
+    daily: bool = False                     # 일일 할당량 소진 (분당 한도가 아님)
+    limit_rpm: Optional[float] = None       # 서버가 알려준 분당 한도
+
+
+_DELAY_PATTERN = re.compile(r"^\s*([0-9]+(?:\.[0-9]+)?)s\s*$")
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Retry-After 헤더 (초 또는 HTTP 날짜) -> 초"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - (now or time.time()))
+
+def parse_rate_limit_hint(headers: Mapping[str, str], body: bytes) -> RateLimitHint:
+    """Retry-After 헤더와 google.rpc 오류 상세(RetryInfo, QuotaFailure)에서 힌트 추출"""
+    hint = RateLimitHint(retry_after=parse_retry_after(headers.get("Retry-After")))
+    try:
+        error = json.loads(body or b"{}").get("error", {})
+        details = error.get("details", []) or []
+    except (ValueError, AttributeError):
+        return hint
+    for detail in details:
+        if not isinstance(detail, dict):
+            continue
+        kind = str(detail.get("@type", ""))
+        if kind.endswith("google.rpc.RetryInfo"):
+            match = _DELAY_PATTERN.match(str(detail.get("retryDelay", "")))
+            if match and hint.retry_after is None:
+                hint.retry_after = float(match.group(1))
+        elif kind.endswith("google.rpc.QuotaFailure"):
+            for violation in detail.get("violations", []) or []:
+                quota_id = str(violation.get("quotaId", ""))
+                if "PerDay" in quota_id:
+                    hint.daily = True
+                elif "PerMinute" in quota_id:
+                    try:
+                        hint.limit_rpm = float(violation.get("quotaValue"))
+                    except (TypeError, ValueError):
+                        pass
+    return hint
+
+# ============================================================
+# AIMD 제어기
+# ============================================================
+
+class _Slot:
+    def __init__(self, rpm: float):
+        self.rpm = rpm
+        self.next_at = 0.0              # 다음 요청 가능 시각 (monotonic)
+        self.hold_until = 0.0           # Retry-After 보류 끝 (monotonic)
+        self.last_cut = 0.0             # 마지막 감소 시각 (monotonic)
+        self.ceiling: Optional[float] = None
+        self.logged_rpm = rpm
+        self.successes = 0
+        self.cuts = 0
+        self.min_seen = rpm
+        self.max_seen = rpm
+
+
+class AdaptiveRateLimiter:
+    """키x모델 슬롯별 AIMD 속도 제어 (스레드 안전, 모든 워커가 공유)"""
+
+    def __init__(
+        self,
+        start_rpm: float = DEFAULT_START_RPM,
+        min_rpm: float = DEFAULT_MIN_RPM,
+        max_rpm: float = DEFAULT_MAX_RPM,
+        increase_rpm: float = DEFAULT_INCREASE_RPM,
+        decrease_factor: float = DEFAULT_DECREASE_FACTOR,
+        state_file: Optional[Path] = RATE_STATE_FILE,
+        describe: Optional[Callable[[str], str]] = None,
+        on_change: Optional[Callable[[str, float, str], None]] = None,
+    ):
+        self.min_rpm = min_rpm
+        self.max_rpm = max(min_rpm, max_rpm)
+        self.start_rpm = min(self.max_rpm, max(min_rpm, start_rpm))
+        self.increase_rpm = increase_rpm
+        self.decrease_factor = decrease_factor
+        self.state_file = state_file
+        self.describe = describe or (lambda name: name)
+        self.on_change = on_change
+        self._slots: Dict[str, _Slot] = {}
+        self._learned: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    # --------------------------------------------------------
+    # 상태 파일
+    # --------------------------------------------------------
+
+    def _load(self) -> None:
+        if self.state_file is None or not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != STATE_VERSION:
+            return
+        now = time.time()
+        self._learned = {
+            name: info for name, info in data.get("slots", {}).items()
+            if now - info.get("updated_at", 0) < STATE_MAX_AGE_SEC
+        }
+
+    def save(self) -> None:
+        if self.state_file is None:
+            return
+        with self._lock:
+            slots = dict(self._learned)
+            now = time.time()
+            for name, slot in self._slots.items():
+                slots[name] = {"rpm": round(slot.rpm, 3), "ceiling": slot.ceiling, "updated_at": now}
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_file.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": STATE_VERSION, "slots": slots}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.state_file)
+
+    # --------------------------------------------------------
+    # 슬롯
+    # --------------------------------------------------------
+
+    def _slot(self, name: str) -> _Slot:
+        slot = self._slots.get(name)
+        if slot is None:
+            learned = self._learned.get(name, {})
+            slot = _Slot(min(self.max_rpm, max(self.min_rpm, learned.get("rpm", self.start_rpm))))
+            slot.ceiling = learned.get("ceiling")
+            self._slots[name] = slot
+        return slot
+
+    def _notify(self, name: str, slot: _Slot, reason: str) -> None:
+        """잠금 안에서 호출 - rpm 변화 로그 + 콜백"""
+        print(f"      [RATE] {self.describe(name)}: {slot.logged_rpm:.1f} -> {slot.rpm:.1f} rpm ({reason})")
+        slot.logged_rpm = slot.rpm
+        if self.on_change is not None:
+            self.on_change(name, slot.rpm, reason)
+
+    def acquire(self, name: str) -> float:
+        """현재 rpm 기준 다음 슬롯(및 Retry-After 보류)까지 대기 후 실제 대기 시간(초) 반환"""
+        with self._lock:
+            now = time.monotonic()
+            slot = self._slot(name)
+            at = max(now, slot.next_at, slot.hold_until)
+            slot.next_at = at + 60.0 / slot.rpm
+        wait = at - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def record(self, name: str, outcome: str, issued_at: float, hint: Optional[RateLimitHint] = None) -> None:
+        """요청 결과 반영 - issued_at 은 acquire 를 부른 시각 (monotonic)
+
+        outcome: ok -> 증가, rate_limit -> 감소 + 보류, 그 외 -> 변화 없음.
+        """
+        with self._lock:
+            slot = self._slot(name)
+            now = time.monotonic()
+            if hint is not None and hint.limit_rpm:
+                slot.ceiling = hint.limit_rpm
+
+            if outcome == "ok":
+                slot.successes += 1
+                limit = min(self.max_rpm, slot.ceiling or self.max_rpm)
+                slot.rpm = min(limit, slot.rpm + self.increase_rpm)
+                slot.max_seen = max(slot.max_seen, slot.rpm)
+                if slot.rpm >= slot.logged_rpm * LOG_INCREASE_RATIO:
+                    self._notify(name, slot, "증가")
+                return
+
+            if outcome != "rate_limit":
+                return
+
+            retry_after = hint.retry_after if hint is not None else None
+            if retry_after:
+                slot.hold_until = max(slot.hold_until, now + retry_after)
+                slot.next_at = max(slot.next_at, slot.hold_until)
+            # 감소 이후에 보낸 요청의 429 만 다시 감소
+            if issued_at < slot.last_cut:
+                return
+            slot.rpm = max(self.min_rpm, slot.rpm * self.decrease_factor)
+            if slot.ceiling:
+                slot.rpm = min(slot.rpm, slot.ceiling)
+            slot.last_cut = now
+            slot.cuts += 1
+            slot.min_seen = min(slot.min_seen, slot.rpm)
+            reason = "429" + (f", Retry-After {retry_after:.0f}초" if retry_after else "")
+            self._notify(name, slot, reason)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """슬롯 -> 현재/최저/최고 rpm, 성공/감소 횟수"""
+        with self._lock:
+            return {
+                name: {
+                    "rpm": round(slot.rpm, 2),
+                    "min_rpm": round(slot.min_seen, 2),
+                    "max_rpm": round(slot.max_seen, 2),
+                    "ceiling": slot.ceiling,
+                    "successes": slot.successes,
+                    "cuts": slot.cuts,
+                }
+                for name, slot in sorted(self._slots.items())
+            }
+
+# ============================================================
+# 메인
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="HearO TTS 학습된 요청 속도 관리")
+    parser.add_argument("--state-file", type=Path, default=RATE_STATE_FILE)
+    parser.add_argument("--stats", action="store_true", help="슬롯별 학습된 rpm 출력")
+    parser.add_argument("--reset", action="store_true", help="학습값 삭제 (다음 실행은 시작 rpm 부터)")
+    args = parser.parse_args()
+
+    if args.reset:
+        if args.state_file.exists():
+            args.state_file.unlink()
+        print(f"[RESET] {args.state_file}")
+        return
+
+    if not args.state_file.exists():
+        print("[INFO] 학습된 속도 없음")
+        return
+    with open(args.state_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    for name, info in sorted(data.get("slots", {}).items()):
+        fingerprint, _, model = name.partition(":")
+        ceiling = f", 상한 {info['ceiling']:.0f}" if info.get("ceiling") else ""
+        updated = time.strftime("%Y-%m-%d %H:%M", time.localtime(info.get("updated_at", 0)))
+        print(f"  {fingerprint[:6]} {model}: {info['rpm']:.1f} rpm{ceiling} ({updated})")
+
+if __name__ == "__main__":
+    main()
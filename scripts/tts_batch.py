@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+HearO TTS 배치 합성 헬퍼 (여러 줄 -> 요청 하나)
+
+같은 음성(세계관)의 대사 여러 줄을 긴 쉼 표시로 이어 한 번에 합성하고,
+받은 PCM을 삽입된 무음 구간으로 다시 줄별 클립으로 나눈다.
+- 줄마다 기존 스타일 접두사([Dramatic, ...])를 그대로 붙이고 사이에 PAUSE_MARKER 삽입
+- 10ms 프레임 에너지로 음성 구간 안의 무음 구간을 찾고, 가장 긴 (줄 수 - 1)개에서 자름
+- 줄별 음성 길이 비율을 글자 수 비율과 비교해 검증 (잘못 잘렸으면 None -> 한 줄씩 재요청)
+- 잘린 클립은 앞뒤 edge_pad_ms 무음만 남기고 경계 페이드
+
+사용 예:
+    text = build_batch_text(styled_lines)
+    clips, reason = split_batch_pcm(pcm, lines)
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from audio_io import SAMPLE_RATE
+from audio_dsp import pcm_to_array, array_to_pcm, frame_rms, to_db, voiced_bounds, fade_edges
+
+# ============================================================
+# 설정
+# ============================================================
+
+# 줄 사이 쉼 지시 (스타일 접두사와 같은 대괄호 지시 형식)
+PAUSE_MARKER = "[long pause]"
+
+# 대괄호 지시는 읽지 않는 부분 (길이 추정에서 제외)
+DIRECTION_PATTERN = re.compile(r"\[[^\]]*\]")
+
+FRAME_MS = 10.0
+
+
+@dataclass
+class SplitOptions:
+    """무음 분할 / 검증 옵션"""
+    min_pause_ms: float = 600.0     # 줄 경계로 볼 최소 무음 길이 (문장 사이 쉼보다 길게)
+    threshold_db: float = -45.0     # 무음 판정 절대 임계값
+    relative_db: float = 40.0       # 최대 프레임 대비 무음 판정 폭
+    edge_pad_ms: float = 100.0      # 잘린 클립 앞뒤에 남길 무음
+    fade_ms: float = 5.0
+    share_tolerance: float = 1.6    # 줄별 길이 비율 / 글자 수 비율 허용 배수
+    min_sec_per_char: float = 0.02  # 줄 하나의 발화 속도 하한/상한 (초/글자)
+    max_sec_per_char: float = 0.3
+
+# ============================================================
+# 요청 텍스트
+# ============================================================
+
+def build_batch_text(styled_lines: Sequence[str]) -> str:
+    """스타일 접두사가 붙은 줄들을 쉼 표시로 연결"""
+    return f"\n\n{PAUSE_MARKER}\n\n".join(line.strip() for line in styled_lines)
+
+def spoken_length(text: str) -> int:
+    """실제로 읽히는 글자 수 (대괄호 지시, 공백 제외)"""
+    return len(re.sub(r"\s+", "", DIRECTION_PATTERN.sub("", text)))
+
+# ============================================================
+# 분할
+# ============================================================
+
+def find_pauses(levels_db: np.ndarray, threshold: float, min_frames: int) -> List[Tuple[int, int]]:
+    """임계값 미만 프레임이 min_frames 이상 이어지는 구간 [시작, 끝) 목록"""
+    silent = np.concatenate(([False], levels_db < threshold, [False]))
+    edges = np.flatnonzero(np.diff(silent.astype(np.int8)))
+    runs = edges.reshape(-1, 2)
+    return [(int(start), int(end)) for start, end in runs if end - start >= min_frames]
+
+def split_batch_pcm(
+    pcm_data: bytes,
+    lines: Sequence[str],
+    sample_rate: int = SAMPLE_RATE,
+    options: Optional[SplitOptions] = None,
+) -> Tuple[Optional[List[bytes]], str]:
+    """배치 응답 PCM -> 줄별 PCM 목록 (검증 실패 시 None) 과 사유"""
+    options = options or SplitOptions()
+    count = len(lines)
+    samples = pcm_to_array(pcm_data[:len(pcm_data) - len(pcm_data) % 2])
+    start, end = voiced_bounds(samples, sample_rate, FRAME_MS, options.threshold_db, options.relative_db)
+    if end <= start:
+        return None, "음성 없음"
+    if count == 1:
+        return [pcm_data], "ok"
+
+    frame_len = max(1, int(sample_rate * FRAME_MS / 1000))
+    voiced = samples[start:end]
+    levels = to_db(frame_rms(voiced, frame_len))
+    threshold = max(options.threshold_db, float(levels.max()) - options.relative_db)
+    pauses = find_pauses(levels, threshold, int(options.min_pause_ms / FRAME_MS))
+    if len(pauses) < count - 1:
+        return None, f"쉼 {len(pauses)}개 (필요 {count - 1}개)"
+
+    # 삽입한 쉼이 문장 사이 쉼보다 길다고 보고 가장 긴 것부터 고름
+    chosen = sorted(sorted(pauses, key=lambda p: p[1] - p[0], reverse=True)[:count - 1])
+    bounds = [0] + [p for pause in chosen for p in pause] + [len(levels)]
+    segments = [(bounds[i] * frame_len + start, min(end, bounds[i + 1] * frame_len + start))
+                for i in range(0, len(bounds), 2)]
+
+    # 길이 검증: 줄별 음성 길이 비율 vs 글자 수 비율, 절대 발화 속도
+    chars = np.array([max(1, spoken_length(line)) for line in lines], dtype=np.float64)
+    durations = np.array([(seg_end - seg_start) / sample_rate for seg_start, seg_end in segments])
+    ratios = (durations / durations.sum()) / (chars / chars.sum())
+    for index, (ratio, duration, length) in enumerate(zip(ratios, durations, chars)):
+        if not 1 / options.share_tolerance <= ratio <= options.share_tolerance:
+            return None, f"{index + 1}번째 줄 길이 비율 {ratio:.2f}"
+        if not options.min_sec_per_char <= duration / length <= options.max_sec_per_char:
+            return None, f"{index + 1}번째 줄 발화 속도 {duration / length:.3f}초/글자"
+
+    pad = int(sample_rate * options.edge_pad_ms / 1000)
+    fade = int(sample_rate * options.fade_ms / 1000)
+    clips = []
+    for seg_start, seg_end in segments:
+        clip = samples[max(0, seg_start - pad):min(len(samples), seg_end + pad)]
+        clips.append(array_to_pcm(fade_edges(clip, fade)))
+    return clips, "ok"
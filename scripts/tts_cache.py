@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+HearO TTS 콘텐츠 주소 기반 오디오 캐시
+
+(스타일 적용 텍스트, voice_name, style, model) 해시를 키로 PCM을 저장한다.
+- 텍스트나 음성 설정이 바뀐 라인만 재합성
+- 세계관/등급 간 동일 라인은 같은 blob 재사용
+- 출력 파일(file_key) -> 캐시 키 참조 기록, 참조 없는 blob부터 GC
+
+사용법:
+    python tts_cache.py --stats
+    python tts_cache.py --gc --max-mb 512
+"""
+
+import os
+import json
+import time
+import hashlib
+import argparse
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+
+from audio_io import AtomicFile
+
+# ============================================================
+# 설정
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+CACHE_DIR = SCRIPT_DIR / ".tts_cache"
+
+# 캐시 최대 크기 (MB)
+DEFAULT_MAX_MB = 1024
+
+# 키 형식 버전 (해시 입력 구조가 바뀌면 올림)
+KEY_VERSION = 1
+
+# ============================================================
+# 캐시
+# ============================================================
+
+def make_cache_key(styled_text: str, voice_name: str, style: str, model: str) -> str:
+    """합성 입력 -> 캐시 키 (sha256)"""
+    payload = json.dumps(
+        [KEY_VERSION, styled_text, voice_name, style, model],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """콘텐츠 주소 기반 PCM 캐시
+
+    blobs/<앞 2자리>/<키>.pcm 에 원본 PCM을 저장하고, index.json 에
+    출력 파일 키별 참조(cache key, model)를 기록한다. blob 파일의 mtime을
+    마지막 접근 시각으로 사용하므로 조회 시 인덱스를 다시 쓰지 않는다.
+    """
+
+    def __init__(self, root: Path = CACHE_DIR, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.root = Path(root)
+        self.blob_dir = self.root / "blobs"
+        self.index_file = self.root / "index.json"
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._refs: Dict[str, Dict[str, Any]] = self._load_index()
+
+    # --------------------------------------------------------
+    # 인덱스
+    # --------------------------------------------------------
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        if self.index_file.exists():
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                return json.load(f).get("refs", {})
+        return {}
+
+    def _save_index(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_file.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": KEY_VERSION, "refs": self._refs}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.index_file)
+
+    def get_ref(self, file_key: str) -> Optional[Dict[str, Any]]:
+        """출력 파일이 마지막으로 사용한 캐시 참조"""
+        with self._lock:
+            return self._refs.get(file_key)
+
+    def set_ref(self, file_key: str, key: str, model: str) -> None:
+        """출력 파일 -> 캐시 키 참조 기록"""
+        with self._lock:
+            self._refs[file_key] = {"key": key, "model": model, "updated_at": time.time()}
+            self._save_index()
+
+    def is_fresh(self, file_key: str, keys: List[str], output_path: Path) -> bool:
+        """출력 파일이 존재하고 현재 입력 키 중 하나로 생성되었는지"""
+        ref = self.get_ref(file_key)
+        return ref is not None and ref["key"] in keys and output_path.exists()
+
+    # --------------------------------------------------------
+    # Blob
+    # --------------------------------------------------------
+
+    def blob_path(self, key: str) -> Path:
+        return self.blob_dir / key[:2] / f"{key}.pcm"
+
+    def has(self, key: str) -> bool:
+        return self.blob_path(key).exists()
+
+    def get_path(self, key: str) -> Optional[Path]:
+        """캐시된 PCM 파일 경로 (없으면 None) - 스트리밍 복사용"""
+        path = self.blob_path(key)
+        if not path.exists():
+            return None
+        self._touch(path)
+        return path
+
+    def get(self, key: str) -> Optional[bytes]:
+        """캐시된 PCM 반환 (없으면 None)"""
+        path = self.blob_path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        self._touch(path)
+        return data
+
+    def put(self, key: str, pcm_data: bytes) -> Path:
+        """PCM 저장 (임시 파일 -> rename)"""
+        with self.staging() as blob:
+            blob.write(pcm_data)
+            return self.commit(blob, key)
+
+    def staging(self) -> AtomicFile:
+        """키가 정해지기 전 PCM을 스트리밍으로 받을 임시 blob"""
+        return AtomicFile(self.root / "tmp" / "blob.pcm", temp_dir=self.root / "tmp")
+
+    def commit(self, blob: AtomicFile, key: str) -> Path:
+        """임시 blob을 키 경로로 원자적 이동"""
+        return blob.commit(self.blob_path(key))
+
+    def lookup(self, keys: List[Tuple[str, str]]) -> Optional[Tuple[str, str]]:
+        """(key, model) 후보 중 캐시에 있는 첫 항목"""
+        for key, model in keys:
+            if self.has(key):
+                return key, model
+        return None
+
+    @staticmethod
+    def _touch(path: Path) -> None:
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+    # --------------------------------------------------------
+    # GC
+    # --------------------------------------------------------
+
+    def _iter_blobs(self) -> List[Tuple[Path, int, float]]:
+        blobs = []
+        if not self.blob_dir.exists():
+            return blobs
+        for path in self.blob_dir.glob("*/*.pcm"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            blobs.append((path, st.st_size, st.st_mtime))
+        return blobs
+
+    def stats(self) -> Dict[str, Any]:
+        blobs = self._iter_blobs()
+        referenced = {ref["key"] for ref in self._refs.values()}
+        return {
+            "blobs": len(blobs),
+            "bytes": sum(size for _, size, _ in blobs),
+            "refs": len(self._refs),
+            "unreferenced": sum(1 for path, _, _ in blobs if path.stem not in referenced),
+        }
+
+    def gc(self, max_bytes: Optional[int] = None) -> Dict[str, int]:
+        """크기 제한 초과 시 blob 정리
+
+        참조 없는 blob을 오래된 순으로 먼저 지우고, 그래도 초과하면
+        참조 중인 blob도 LRU 순으로 지운다 (출력 WAV는 남아 있으므로
+        재합성은 해당 WAV가 없어졌을 때만 필요하다).
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        with self._lock:
+            referenced = {ref["key"] for ref in self._refs.values()}
+            blobs = self._iter_blobs()
+            total = sum(size for _, size, _ in blobs)
+
+            # 참조 없는 blob 먼저, 각 그룹 안에서는 오래된 순
+            blobs.sort(key=lambda b: (b[0].stem in referenced, b[2]))
+
+            removed = 0
+            freed = 0
+            for path, size, _ in blobs:
+                if total <= limit:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    continue
+                total -= size
+                freed += size
+                removed += 1
+
+        return {"removed": removed, "freed_bytes": freed, "remaining_bytes": total}
+
+    def prune_unreferenced(self) -> Dict[str, int]:
+        """참조 없는 blob 전부 삭제"""
+        with self._lock:
+            referenced = {ref["key"] for ref in self._refs.values()}
+            removed = 0
+            freed = 0
+            for path, size, _ in self._iter_blobs():
+                if path.stem in referenced:
+                    continue
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    continue
+                removed += 1
+                freed += size
+        return {"removed": removed, "freed_bytes": freed}
+
+# ============================================================
+# 메인
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="HearO TTS 오디오 캐시 관리")
+    parser.add_argument("--stats", action="store_true", help="캐시 통계 출력")
+    parser.add_argument("--gc", action="store_true", help="크기 제한에 맞춰 정리")
+    parser.add_argument("--prune", action="store_true", help="참조 없는 blob 전부 삭제")
+    parser.add_argument("--max-mb", type=int, default=DEFAULT_MAX_MB, help="캐시 최대 크기 (MB)")
+    args = parser.parse_args()
+
+    cache = TTSCache(max_bytes=args.max_mb * 1024 * 1024)
+
+    if args.prune:
+        result = cache.prune_unreferenced()
+        print(f"[PRUNE] {result['removed']}개 삭제 ({result['freed_bytes'] / 1024 / 1024:.1f}MB)")
+
+    if args.gc:
+        result = cache.gc()
+        print(f"[GC] {result['removed']}개 삭제 ({result['freed_bytes'] / 1024 / 1024:.1f}MB), "
+              f"남은 크기 {result['remaining_bytes'] / 1024 / 1024:.1f}MB")
+
+    stats = cache.stats()
+    print(f"[CACHE] blob {stats['blobs']}개 / {stats['bytes'] / 1024 / 1024:.1f}MB, "
+          f"참조 {stats['refs']}개, 미참조 blob {stats['unreferenced']}개")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+HearO TTS 문장 단위 분할 합성 헬퍼 (긴 대사 -> 여러 요청 -> 이어 붙이기)
+
+긴 대사를 한 요청으로 보내면 생성 시간이 길이에 비례해 늘고, 타임아웃 한 번에
+줄 전체가 실패해 Pro 폴백으로 번진다. 목표 길이 이하 조각으로 나눠 동시에 합성하고
+PCM을 다시 잇는다.
+- 문장 경계(. ! ? … ~ 줄바꿈)에서 나누고, 목표 길이 안으로 문장을 묶음
+- 한 문장이 최대 길이를 넘으면 절 경계(쉼표 > 연결 어미 "~고/~며/~지만/~는데" 등 > 공백) 순으로 나눔
+- 조각마다 앞뒤 무음을 문장 사이 쉼 길이로 맞추고, 라우드니스를 조각 중앙값에 맞춘 뒤
+  등전력 크로스페이드로 연결
+
+사용 예:
+    chunks = split_text(text, ChunkOptions(target_chars=80))
+    pcm = stitch_chunks([pcm_1, pcm_2, ...])
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from audio_io import SAMPLE_RATE
+from audio_dsp import pcm_to_array, array_to_pcm, voiced_bounds, fade_edges, integrated_loudness
+
+# ============================================================
+# 설정
+# ============================================================
+
+@dataclass
+class ChunkOptions:
+    """분할 / 연결 옵션"""
+    target_chars: int = 80          # 조각 목표 길이 (이보다 짧은 대사는 나누지 않음)
+    max_chars: int = 140            # 한 문장이 이보다 길면 절 경계에서 나눔
+    min_chars: int = 12             # 이보다 짧은 조각은 이웃과 합침
+    pause_ms: float = 250.0         # 조각 사이 무음 (앞뒤 절반씩 남김)
+    crossfade_ms: float = 30.0      # 이음새 크로스페이드
+    max_gain_db: float = 6.0        # 조각별 라우드니스 보정 상한
+    threshold_db: float = -45.0     # 무음 판정 절대 임계값
+    relative_db: float = 40.0       # 최대 프레임 대비 무음 판정 폭
+    fade_ms: float = 5.0            # 전체 시작/끝 페이드
+
+# 문장 끝: 종결 부호(+ 닫는 따옴표/괄호) 뒤 공백, 또는 줄바꿈
+SENTENCE_BREAK = re.compile(r"(?<=[.!?…~])\s+|(?<=[.!?…~][\"'”’」』)])\s+|\s*\n+\s*")
+
+# 절 경계 후보 (우선순위 낮을수록 먼저)
+CLAUSE_PUNCT = re.compile(r"(?<=[,，、;:])\s+")
+CLAUSE_ENDINGS = ("면서", "지만", "는데", "은데", "니까", "려고", "도록", "거나", "든지", "고", "며", "서", "면")
+CLAUSE_ENDING_BREAK = re.compile(r"(?<=[가-힣])\s+")
+
+# ============================================================
+# 텍스트 분할
+# ============================================================
+
+def split_sentences(text: str) -> List[str]:
+    """문장 목록 (빈 문장 제외)"""
+    return [s.strip() for s in SENTENCE_BREAK.split(text.strip()) if s and s.strip()]
+
+def _clause_breaks(sentence: str) -> List[Tuple[int, int]]:
+    """(우선순위, 자를 위치) 후보 - 위치는 다음 조각이 시작하는 인덱스"""
+    breaks = [(0, m.end()) for m in CLAUSE_PUNCT.finditer(sentence)]
+    for match in CLAUSE_ENDING_BREAK.finditer(sentence):
+        word = sentence[:match.start()].rsplit(" ", 1)[-1]
+        priority = 1 if word.endswith(CLAUSE_ENDINGS) else 2
+        breaks.append((priority, match.end()))
+    return breaks
+
+def split_long_sentence(sentence: str, options: ChunkOptions) -> List[str]:
+    """max_chars 를 넘는 문장을 절 경계에서 나눔 (경계가 없으면 max_chars 에서 자름)"""
+    pieces = []
+    rest = sentence
+    while len(rest) > options.max_chars:
+        candidates = [(priority, pos) for priority, pos in _clause_breaks(rest)
+                      if options.min_chars <= pos <= options.max_chars]
+        if candidates:
+            # 우선순위가 가장 높은 경계 중 목표 길이에 가장 가까운 곳
+            best = min(priority for priority, _ in candidates)
+            cut = min((pos for priority, pos in candidates if priority == best),
+                      key=lambda pos: abs(pos - options.target_chars))
+        else:
+            cut = options.max_chars
+        pieces.append(rest[:cut].strip())
+        rest = rest[cut:].strip()
+    if rest:
+        pieces.append(rest)
+    return pieces
+
+def split_text(text: str, options: Optional[ChunkOptions] = None) -> List[str]:
+    """대사 -> 합성 조각 목록 (target_chars 이하 대사는 그대로 한 조각)"""
+    options = options or ChunkOptions()
+    text = text.strip()
+    if len(text) <= options.target_chars:
+        return [text] if text else []
+
+    pieces: List[str] = []
+    for sentence in split_sentences(text):
+        if len(sentence) > options.max_chars:
+            pieces.extend(split_long_sentence(sentence, options))
+        else:
+            pieces.append(sentence)
+
+    # 목표 길이 안에서 앞에서부터 묶음
+    chunks: List[str] = []
+    for piece in pieces:
+        if chunks and len(chunks[-1]) + 1 + len(piece) <= options.target_chars:
+            chunks[-1] = f"{chunks[-1]} {piece}"
+        else:
+            chunks.append(piece)
+
+    # 너무 짧은 조각은 이웃에 합침 (최대 길이 안에서)
+    merged: List[str] = []
+    for chunk in chunks:
+        if merged and (len(chunk) < options.min_chars or len(merged[-1]) < options.min_chars) \
+                and len(merged[-1]) + 1 + len(chunk) <= options.max_chars:
+            merged[-1] = f"{merged[-1]} {chunk}"
+        else:
+            merged.append(chunk)
+    return merged
+
+# ============================================================
+# PCM 연결
+# ============================================================
+
+def chunk_has_voice(pcm_data: bytes, options: Optional[ChunkOptions] = None,
+                    sample_rate: int = SAMPLE_RATE) -> bool:
+    """조각 PCM에 음성이 있는지 (무음/빈 응답 조각은 다시 요청)"""
+    options = options or ChunkOptions()
+    samples = pcm_to_array(pcm_data[:len(pcm_data) - len(pcm_data) % 2])
+    start, end = voiced_bounds(samples, sample_rate, threshold_db=options.threshold_db,
+                               relative_db=options.relative_db)
+    return end > start
+
+def _trim_to_pause(samples: np.ndarray, sample_rate: int, options: ChunkOptions) -> np.ndarray:
+    """앞뒤 무음을 pause_ms / 2 로 맞춤 (모자라면 무음 추가)"""
+    start, end = voiced_bounds(samples, sample_rate, threshold_db=options.threshold_db,
+                               relative_db=options.relative_db)
+    if end <= start:
+        return samples
+    half = int(sample_rate * options.pause_ms / 2000)
+    clip = samples[max(0, start - half):min(len(samples), end + half)]
+    lead = max(0, half - start)
+    trail = max(0, half - (len(samples) - end))
+    if lead or trail:
+        clip = np.concatenate((np.zeros(lead, dtype=np.float32), clip, np.zeros(trail, dtype=np.float32)))
+    return clip
+
+def match_gains(chunks: Sequence[np.ndarray], sample_rate: int, options: ChunkOptions) -> Tuple[List[np.ndarray], List[float]]:
+    """조각별 라우드니스를 중앙값에 맞춤 - (결과, 적용 게인 dB)"""
+    loudness = [integrated_loudness(chunk, sample_rate) for chunk in chunks]
+    finite = [value for value in loudness if np.isfinite(value)]
+    if len(finite) < 2:
+        return list(chunks), [0.0] * len(chunks)
+    target = float(np.median(finite))
+    results, gains = [], []
+    for chunk, value in zip(chunks, loudness):
+        gain_db = float(np.clip(target - value, -options.max_gain_db, options.max_gain_db)) if np.isfinite(value) else 0.0
+        results.append(chunk * np.float32(10 ** (gain_db / 20)) if gain_db else chunk)
+        gains.append(round(gain_db, 2))
+    return results, gains
+
+def stitch_chunks(
+    pcm_chunks: Sequence[bytes],
+    options: Optional[ChunkOptions] = None,
+    sample_rate: int = SAMPLE_RATE,
+) -> bytes:
+    """조각 PCM들을 무음 정리 + 게인 보정 + 등전력 크로스페이드로 연결"""
+    options = options or ChunkOptions()
+    if len(pcm_chunks) == 1:
+        return pcm_chunks[0]
+    arrays = [_trim_to_pause(pcm_to_array(p[:len(p) - len(p) % 2]), sample_rate, options) for p in pcm_chunks]
+    arrays, _ = match_gains(arrays, sample_rate, options)
+
+    fade = int(sample_rate * options.crossfade_ms / 1000)
+    result = arrays[0]
+    for chunk in arrays[1:]:
+        overlap = min(fade, len(result), len(chunk))
+        if overlap <= 0:
+            result = np.concatenate((result, chunk))
+            continue
+        t = np.linspace(0.0, 1.0, overlap, dtype=np.float32)
+        mixed = result[-overlap:] * np.cos(t * np.pi / 2) + chunk[:overlap] * np.sin(t * np.pi / 2)
+        result = np.concatenate((result[:-overlap], mixed, chunk[overlap:]))
+    return array_to_pcm(fade_edges(result, int(sample_rate * options.fade_ms / 1000)))
@@ -0,0 +1,647 @@
+#!/usr/bin/env python3
+"""
+HearO 로컬 온디맨드 TTS 서버
+
+사전 렌더링되지 않은 동적 대사를 (세계관, 등급, 텍스트) 단위로 바로 들려주기 위한
+로컬 HTTP 서비스. 음성 매핑(get_voice_settings, VOICE_STYLES)과 콘텐츠 캐시,
+키 풀, 모델 폴백/서킷 브레이커는 generate_tts_gemini.py 와 같은 것을 쓴다.
+- 캐시 적중: 캐시 blob을 그대로 스트리밍 (API 호출 없음)
+- 캐시 미스: 합성은 한 번만 - 같은 입력의 동시 요청은 진행 중인 합성 하나에 합류
+- 합성 중인 PCM을 받는 대로 클라이언트에 스트리밍 (chunked), 끝나면 캐시에 커밋
+- 동시 합성 수 제한 + 대기열 길이 제한 (초과 시 503 + Retry-After)
+- 클라이언트가 끊어도 합성은 끝까지 진행해 캐시에 남김
+
+엔드포인트:
+    GET  /tts?worldview=fantasy&grade=good&text=...   -> audio/wav (format=pcm 이면 raw PCM)
+    POST /tts  {"worldview": ..., "grade": ..., "text": ..., "format": "wav"}
+    GET  /stats                                       -> 요청/캐시/합류/대기열 카운터 JSON
+    GET  /health
+
+사용법:
+    set GEMINI_API_KEY=your_api_key
+    python tts_server.py --port 8790
+    python tts_server.py -k KEY1 -k KEY2 --concurrency 2 --max-queue 16
+    python tts_server.py --mock                       # 내장 목 서버로 (API 키 불필요)
+    python tts_server.py --api-key test --api-base http://127.0.0.1:8765/v1beta/models
+
+    curl -o line.wav "http://127.0.0.1:8790/tts?worldview=fantasy&grade=perfect&text=좋아요"
+"""
+
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+import generate_tts_gemini as tts
+from audio_io import TeeWriter, wav_header, CHUNK_SIZE
+from tts_cache import TTSCache, CACHE_DIR, DEFAULT_MAX_MB
+from http_transport import Transport, TransportConfig, DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT
+from api_key_pool import KeyPool, load_api_keys, KEY_STATE_FILE
+from model_router import ModelRouter, DEFAULT_COOLDOWN, DEFAULT_FAILURE_THRESHOLD, DEFAULT_MAX_WAIT
+from tts_telemetry import Telemetry
+
+# ============================================================
+# 설정
+# ============================================================
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8790
+
+DEFAULT_CONCURRENCY = 2
+DEFAULT_MAX_QUEUE = 16
+
+# 요청 간격 - 실시간 응답용이라 일괄 생성(8초)보다 짧게, 429는 키 주차/폴백으로 흡수
+DEFAULT_MIN_INTERVAL = 1.0
+
+# 첫 바이트까지 최대 대기 (대기열 + 폴백 포함)
+DEFAULT_FIRST_BYTE_TIMEOUT = 180.0
+
+MAX_TEXT_CHARS = 1000
+
+# 길이를 모르는 스트리밍 WAV - data 크기를 최대값으로 두면 브라우저가 끝까지 재생
+STREAM_DATA_SIZE = 0xFFFFFFFF - 36
+
+FORMATS = {"wav": "audio/wav", "pcm": "audio/L16;rate=24000;channels=1"}
+
+# ============================================================
+# 합성 합류 (coalescing)
+# ============================================================
+
+class Flight:
+    """진행 중인 합성 하나 - 생산자(합성 워커)가 쓰고 여러 요청이 동시에 읽는 PCM 버퍼
+
+    모델 폴백으로 sink가 reset()되면 generation이 바뀐다. 아직 아무것도 보내지 않은
+    요청은 처음부터 다시 읽고, 이미 일부를 보낸 요청은 연결을 끊는다.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.buffer = bytearray()
+        self.generation = 0
+        self.done = False
+        self.model: Optional[str] = None
+        self.errors: List[str] = []
+        self.started = False
+        self.joined = 0
+        self._cond = threading.Condition()
+
+    # sink 인터페이스 (stream_gemini_tts_api)
+    def write(self, data: bytes) -> int:
+        with self._cond:
+            self.buffer.extend(data)
+            self._cond.notify_all()
+        return len(data)
+
+    def reset(self) -> None:
+        with self._cond:
+            self.buffer = bytearray()
+            self.generation += 1
+            self._cond.notify_all()
+
+    def mark_started(self) -> None:
+        with self._cond:
+            self.started = True
+
+    def finish(self, model: Optional[str], errors: List[str]) -> None:
+        with self._cond:
+            self.model = model
+            self.errors = errors
+            self.done = True
+            self._cond.notify_all()
+
+    def read(self, offset: int, generation: int, timeout: float) -> Tuple[bytes, int, bool]:
+        """offset 이후 데이터가 생기거나 끝날 때까지 대기 - (데이터, generation, 완료 여부)
+
+        generation이 바뀌었으면 빈 데이터와 새 generation을 돌려준다.
+        timeout 안에 아무 변화가 없으면 TimeoutError.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self.generation != generation:
+                    return b"", self.generation, False
+                if len(self.buffer) > offset:
+                    return bytes(self.buffer[offset:offset + CHUNK_SIZE]), generation, False
+                if self.done:
+                    return b"", generation, True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("합성 응답 대기 시간 초과")
+                self._cond.wait(remaining)
+
+
+class QueueFull(Exception):
+    """동시 합성 + 대기열이 가득 참"""
+
+
+class ServerStats:
+    """요청 카운터 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+        self.max_flights = 0
+        self.started_at = time.time()
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + amount
+
+    def observe_flights(self, count: int) -> None:
+        with self._lock:
+            self.max_flights = max(self.max_flights, count)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "counts": dict(sorted(self.counts.items())),
+                "max_flights": self.max_flights,
+                "uptime_sec": round(time.time() - self.started_at, 1),
+            }
+
+# ============================================================
+# 서비스
+# ============================================================
+
+class TTSService:
+    """캐시 조회 -> 진행 중 합성 합류 -> 새 합성 순서로 요청 처리
+
+    합성은 concurrency 크기의 워커 풀에서만 돈다. 새 합성이 필요한 요청은
+    진행 중 + 대기 중 합성이 concurrency + max_queue 이상이면 거절한다
+    (진행 중인 합성에 합류하는 요청은 업스트림 호출을 늘리지 않으므로 항상 받는다).
+    """
+
+    def __init__(
+        self,
+        api_key: KeyPool,
+        cache: Optional[TTSCache],
+        rate_limiter: Optional[tts.RateLimiter],
+        router: ModelRouter,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+    ):
+        self.api_key = api_key
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.router = router
+        self.concurrency = max(1, concurrency)
+        self.max_queue = max(0, max_queue)
+        self.stats = ServerStats()
+        self._flights: Dict[str, Flight] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="tts-synth")
+
+    def queue_depth(self) -> Tuple[int, int]:
+        """(진행 중 합성 수, 대기 중 합성 수)"""
+        with self._lock:
+            running = sum(1 for f in self._flights.values() if f.started)
+            return running, len(self._flights) - running
+
+    def resolve(self, worldview: str, grade: str, text: str) -> Tuple[str, Any]:
+        """("hit", (캐시 blob 경로, 모델)) / ("join", Flight) / ("new", Flight)"""
+        voice_settings = tts.get_voice_settings(worldview, grade)
+        cache_keys = tts.get_cache_keys(text, voice_settings)
+        flight_key = cache_keys[0][0]
+
+        with self._lock:
+            # 합성 완료 후 캐시 커밋 -> 목록 제거 순서라, 잠금 안에서 보면 둘 중 하나에는 있다
+            if self.cache is not None:
+                hit = self.cache.lookup(cache_keys)
+                path = self.cache.get_path(hit[0]) if hit is not None else None
+                if path is not None:
+                    self.stats.incr("cache_hits")
+                    return "hit", (path, hit[1])
+
+            flight = self._flights.get(flight_key)
+            if flight is not None:
+                flight.joined += 1
+                self.stats.incr("coalesced")
+                return "join", flight
+
+            if len(self._flights) >= self.concurrency + self.max_queue:
+                self.stats.incr("rejected")
+                raise QueueFull()
+            flight = Flight(flight_key)
+            self._flights[flight_key] = flight
+            self.stats.observe_flights(len(self._flights))
+        self.stats.incr("synth_started")
+        self._executor.submit(self._synthesize, flight, worldview, grade, text, voice_settings, cache_keys)
+        return "new", flight
+
+    def _synthesize(
+        self,
+        flight: Flight,
+        worldview: str,
+        grade: str,
+        text: str,
+        voice_settings: Dict[str, Any],
+        cache_keys: List[Tuple[str, str]],
+    ) -> None:
+        flight.mark_started()
+        errors: List[str] = []
+        model = None
+        blob = self.cache.staging() if self.cache is not None else None
+        clip_key = f"live:{worldview}/{grade}/{hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]}"
+        try:
+            with tts.TELEMETRY.clip(clip_key) as clip:
+                model = tts.stream_gemini_tts_api(
+                    text, voice_settings, self.api_key, TeeWriter(flight, blob),
+                    rate_limiter=self.rate_limiter, router=self.router, errors=errors,
+                )
+                if model is not None:
+                    clip.outcome = "ok"
+                    clip.model = model
+                    if blob is not None:
+                        cache_key = dict((m, k) for k, m in cache_keys)[model]
+                        self.cache.commit(blob, cache_key)
+                        # 참조를 남겨 GC 때 참조 없는 blob보다 오래 유지
+                        self.cache.set_ref(clip_key, cache_key, model)
+        except Exception as e:
+            print(f"[ERROR] 합성 실패 ({clip_key}): {e}")
+            errors.append(f"{type(e).__name__}: {e}")
+            model = None
+        finally:
+            if blob is not None:
+                blob.discard()
+            with self._lock:
+                self._flights.pop(flight.key, None)
+            flight.finish(model, errors)
+            self.stats.incr("synth_ok" if model is not None else "synth_failed")
+            if model is not None:
+                self.stats.incr(f"model.{tts.MODEL_LABELS.get(model, model)}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        running, queued = self.queue_depth()
+        data = self.stats.snapshot()
+        data.update({
+            "running": running,
+            "queued": queued,
+            "concurrency": self.concurrency,
+            "max_queue": self.max_queue,
+            "breakers": self.router.snapshot(),
+            "cache": self.cache.stats() if self.cache is not None else None,
+        })
+        return data
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+        self.api_key.save()
+
+# ============================================================
+# HTTP
+# ============================================================
+
+class BadRequest(ValueError):
+    pass
+
+
+def parse_request(params: Dict[str, Any]) -> Tuple[str, str, str, str]:
+    """요청 파라미터 검증 - (worldview, grade, text, format)"""
+    worldview = str(params.get("worldview") or "")
+    grade = str(params.get("grade") or "normal")
+    text = str(params.get("text") or "").strip()
+    audio_format = str(params.get("format") or "wav")
+    if worldview not in tts.ALL_WORLDVIEWS:
+        raise BadRequest(f"worldview 는 {', '.join(tts.ALL_WORLDVIEWS)} 중 하나")
+    if grade not in tts.GRADES:
+        raise BadRequest(f"grade 는 {', '.join(tts.GRADES)} 중 하나")
+    if not text:
+        raise BadRequest("text 필요")
+    if len(text) > MAX_TEXT_CHARS:
+        raise BadRequest(f"text 는 {MAX_TEXT_CHARS}자 이하")
+    if audio_format not in FORMATS:
+        raise BadRequest(f"format 은 {', '.join(FORMATS)} 중 하나")
+    return worldview, grade, text, audio_format
+
+
+class TTSRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    service: TTSService = None  # make_server 에서 서브클래스로 주입
+    first_byte_timeout: float = DEFAULT_FIRST_BYTE_TIMEOUT
+
+    def log_message(self, format, *args):  # noqa: A002 - 기본 access 로그 끔
+        pass
+
+    def send_cors(self) -> None:
+        # 개발 서버(다른 포트)의 웹 앱에서 바로 호출
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Expose-Headers", "X-TTS-Source, X-TTS-Model")
+
+    def send_json(self, status: int, data: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_cors()
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_cors()
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        path = url.path.rstrip("/")
+        if path == "/health":
+            self.send_json(200, {"ok": True})
+        elif path == "/stats":
+            self.send_json(200, self.service.snapshot())
+        elif path == "/tts":
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            self.handle_tts(params)
+        else:
+            self.send_json(404, {"error": f"없는 경로: {url.path}"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b""
+        if urlsplit(self.path).path.rstrip("/") != "/tts":
+            self.send_json(404, {"error": f"없는 경로: {self.path}"})
+            return
+        try:
+            params = json.loads(raw or b"{}")
+            if not isinstance(params, dict):
+                raise ValueError("JSON 객체 필요")
+        except ValueError as e:
+            self.send_json(400, {"error": f"잘못된 JSON: {e}"})
+            return
+        self.handle_tts(params)
+
+    def handle_tts(self, params: Dict[str, Any]) -> None:
+        service = self.service
+        service.stats.incr("requests")
+        try:
+            worldview, grade, text, audio_format = parse_request(params)
+        except BadRequest as e:
+            service.stats.incr("bad_requests")
+            self.send_json(400, {"error": str(e)})
+            return
+
+        try:
+            source, target = service.resolve(worldview, grade, text)
+        except QueueFull:
+            running, queued = service.queue_depth()
+            self.send_json(503, {"error": "합성 대기열 가득 참", "running": running, "queued": queued},
+                           headers={"Retry-After": "5"})
+            return
+
+        if source == "hit":
+            path, model = target
+            self.send_cached(path, model, audio_format)
+        else:
+            self.send_flight(target, source, audio_format)
+
+    def send_audio_headers(self, audio_format: str, source: str, model: Optional[str],
+                           length: Optional[int]) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", FORMATS[audio_format])
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("X-TTS-Source", source)
+        if model:
+            self.send_header("X-TTS-Model", model)
+        if length is None:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.send_header("Content-Length", str(length))
+        self.send_cors()
+        self.end_headers()
+
+    def send_cached(self, path: Path, model: str, audio_format: str) -> None:
+        """캐시 blob 스트리밍 (길이를 알므로 Content-Length)"""
+        try:
+            size = path.stat().st_size
+            src = open(path, "rb")
+        except FileNotFoundError:
+            # 조회 직후 GC로 지워진 경우 - 클라이언트가 다시 요청하면 새로 합성
+            self.send_json(503, {"error": "캐시 항목이 방금 정리됨"}, headers={"Retry-After": "1"})
+            return
+        with src:
+            header = wav_header(size) if audio_format == "wav" else b""
+            self.send_audio_headers(audio_format, "cache", model, len(header) + size)
+            try:
+                self.wfile.write(header)
+                while True:
+                    chunk = src.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+
+    def write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+
+    def send_flight(self, flight: Flight, source: str, audio_format: str) -> None:
+        """합성 중인 PCM을 받는 대로 chunked 전송
+
+        첫 바이트 전까지는 실패를 JSON 오류로 돌려줄 수 있고, 전송 시작 후
+        실패(중간 폴백 포함)하면 마지막 청크 없이 연결을 끊어 불완전함을 알린다.
+        """
+        offset = 0
+        generation = 0
+        headers_sent = False
+        try:
+            while True:
+                try:
+                    data, new_generation, done = flight.read(offset, generation, self.first_byte_timeout)
+                except TimeoutError as e:
+                    if headers_sent:
+                        self.close_connection = True
+                    else:
+                        self.service.stats.incr("timeouts")
+                        self.send_json(504, {"error": str(e)})
+                    return
+
+                if new_generation != generation:
+                    if headers_sent:
+                        self.service.stats.incr("aborted_streams")
+                        self.close_connection = True
+                        return
+                    generation = new_generation
+                    offset = 0
+                    continue
+
+                if done:
+                    if flight.model is None:
+                        if headers_sent:
+                            self.close_connection = True
+                        else:
+                            self.send_json(502, {"error": "합성 실패", "details": flight.errors})
+                        return
+                    if not headers_sent:
+                        # 데이터 없이 끝난 경우는 없지만(빈 오디오는 실패) 방어적으로
+                        self.send_audio_headers(audio_format, source, flight.model, None)
+                        if audio_format == "wav":
+                            self.write_chunk(wav_header(STREAM_DATA_SIZE))
+                    self.wfile.write(b"0\r\n\r\n")
+                    return
+
+                if not headers_sent:
+                    self.send_audio_headers(audio_format, source, None, None)
+                    if audio_format == "wav":
+                        self.write_chunk(wav_header(STREAM_DATA_SIZE))
+                    headers_sent = True
+                self.write_chunk(data)
+                offset += len(data)
+        except (BrokenPipeError, ConnectionResetError):
+            # 클라이언트가 끊어도 합성은 계속 (캐시에 남김)
+            self.service.stats.incr("client_disconnects")
+            self.close_connection = True
+
+
+class TTSServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            return
+        super().handle_error(request, client_address)
+
+
+def make_server(service: TTSService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                first_byte_timeout: float = DEFAULT_FIRST_BYTE_TIMEOUT) -> ThreadingHTTPServer:
+    """서비스가 주입된 서버 생성 (port=0 이면 임의 포트)"""
+    handler = type("BoundTTSRequestHandler", (TTSRequestHandler,),
+                   {"service": service, "first_byte_timeout": first_byte_timeout})
+    return TTSServer((host, port), handler)
+
+def start_tts_server(service: TTSService, host: str = DEFAULT_HOST, port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """백그라운드 스레드로 서버 시작 - (서버, 기준 URL) 반환"""
+    server = make_server(service, host, port)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    actual_host, actual_port = server.server_address[:2]
+    return server, f"http://{actual_host}:{actual_port}"
+
+# ============================================================
+# 메인
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="HearO 로컬 온디맨드 TTS 서버")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--api-key", "-k", action="append",
+                        help="Gemini API 키 (여러 번 지정 가능, 기본: GEMINI_API_KEY)")
+    parser.add_argument("--api-key-file", type=Path, help="API 키 파일 (한 줄에 하나)")
+    parser.add_argument("--key-state", type=Path, default=KEY_STATE_FILE, help="키별 사용량 기록 파일")
+    parser.add_argument("--api-base", default=tts.GEMINI_API_BASE, help="generateContent 엔드포인트 기준 URL")
+    parser.add_argument("--mock", action="store_true", help="내장 목 서버를 띄워 업스트림으로 사용")
+    parser.add_argument("--mock-latency-ms", type=float, default=300.0, help="내장 목 서버 기준 지연 (ms)")
+    parser.add_argument("--concurrency", "-j", type=int, default=DEFAULT_CONCURRENCY, help="동시 합성 수")
+    parser.add_argument("--max-queue", type=int, default=DEFAULT_MAX_QUEUE,
+                        help=f"동시 합성 수를 넘어 대기시킬 합성 수 (기본: {DEFAULT_MAX_QUEUE})")
+    parser.add_argument("--min-interval", type=float, default=DEFAULT_MIN_INTERVAL,
+                        help=f"키x모델별 최소 요청 간격 초 (기본: {DEFAULT_MIN_INTERVAL})")
+    parser.add_argument("--first-byte-timeout", type=float, default=DEFAULT_FIRST_BYTE_TIMEOUT,
+                        help="첫 오디오 바이트까지 최대 대기 초 (대기열 포함)")
+    parser.add_argument("--read-timeout", type=float, default=DEFAULT_READ_TIMEOUT, help="업스트림 응답 대기 초")
+    parser.add_argument("--connect-timeout", type=float, default=DEFAULT_CONNECT_TIMEOUT, help="업스트림 연결 대기 초")
+    parser.add_argument("--rate-limit-backoff", type=float, default=tts.RATE_LIMIT_BACKOFF,
+                        help="429 시 키 주차 초")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR, help="오디오 캐시 디렉토리")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_MB, help="캐시 최대 크기 (MB)")
+    parser.add_argument("--no-cache", action="store_true", help="캐시 사용 안함 (합류만)")
+    parser.add_argument("--breaker-cooldown", type=float, default=DEFAULT_COOLDOWN, help="모델 차단 후 쿨다운 초")
+    parser.add_argument("--breaker-threshold", type=int, default=DEFAULT_FAILURE_THRESHOLD,
+                        help="연속 실패 몇 회에 모델 차단")
+    parser.add_argument("--breaker-max-wait", type=float, default=DEFAULT_MAX_WAIT,
+                        help="모든 모델 차단 시 요청당 최대 대기 초")
+    parser.add_argument("--telemetry", type=Path, help="시도별 이벤트 JSONL 경로 (tts_telemetry.py report)")
+    args = parser.parse_args()
+
+    mock_server = None
+    api_base = args.api_base
+    keys_arg = args.api_key
+    if args.mock:
+        from mock_gemini_server import MockConfig, start_mock_server
+        mock_server, api_base = start_mock_server(MockConfig(latency_ms=args.mock_latency_ms))
+        keys_arg = keys_arg or ["mock"]
+        print(f"[MOCK] 업스트림: {api_base}")
+
+    try:
+        keys = load_api_keys(keys_arg, args.api_key_file)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    if not keys:
+        print("[ERROR] Gemini API 키 필요 (또는 --mock)")
+        print("        set GEMINI_API_KEY=your_api_key")
+        sys.exit(1)
+
+    # 생성 스크립트의 모듈 설정을 그대로 사용 (request_model 이 참조)
+    tts.GEMINI_API_BASE = api_base.rstrip("/")
+    tts.RATE_LIMIT_BACKOFF = args.rate_limit_backoff
+    tts.TRANSPORT = Transport(TransportConfig(
+        pool_maxsize=max(1, args.concurrency),
+        connect_timeout=args.connect_timeout,
+        read_timeout=args.read_timeout,
+    ))
+    if args.telemetry:
+        tts.TELEMETRY = Telemetry(args.telemetry)
+        tts.TELEMETRY.emit("run", phase="start", settings={
+            "service": True,
+            "concurrency": max(1, args.concurrency),
+            "min_interval": args.min_interval,
+            "keys": len(keys),
+            "models": tts.FALLBACK_CHAIN,
+        })
+
+    # 목 서버 키로 실제 키 상태 파일을 건드리지 않음
+    key_state = None if args.mock and not args.api_key else args.key_state
+    service = TTSService(
+        api_key=KeyPool(keys, rate_limit_park=args.rate_limit_backoff, state_file=key_state),
+        cache=None if args.no_cache else TTSCache(args.cache_dir, args.cache_max_mb * 1024 * 1024),
+        rate_limiter=tts.RateLimiter(args.min_interval),
+        router=ModelRouter(tts.FALLBACK_CHAIN, tts.MODEL_LABELS, cooldown=args.breaker_cooldown,
+                           failure_threshold=args.breaker_threshold, max_wait=args.breaker_max_wait),
+        concurrency=args.concurrency,
+        max_queue=args.max_queue,
+    )
+    server = make_server(service, args.host, args.port, args.first_byte_timeout)
+    host, port = server.server_address[:2]
+
+    print(f"""
+============================================================
+HearO 온디맨드 TTS 서버
+============================================================
+주소: http://{host}:{port}/tts?worldview=fantasy&grade=good&text=...
+업스트림: {tts.GEMINI_API_BASE}
+키: {len(keys)}개 / 동시 합성: {service.concurrency} / 대기열: {service.max_queue}
+캐시: {'사용 안함' if service.cache is None else service.cache.root}
+============================================================
+""")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[STOP] 종료 중 (진행 중인 합성 마무리)")
+    finally:
+        server.server_close()
+        service.shutdown()
+        stats = service.stats.snapshot()
+        if args.telemetry:
+            tts.TELEMETRY.emit("run", phase="end")
+            tts.TELEMETRY.close()
+        if mock_server is not None:
+            mock_server.server_close()
+        print(f"[STATS] {json.dumps(stats['counts'], ensure_ascii=False)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+HearO TTS 생성 텔레메트리 (시도별 JSONL 이벤트 + 실행 리포트)
+
+generate_tts_gemini.py 의 HTTP 시도마다 이벤트 한 줄을 남기고, 실행이 끝나면
+같은 이벤트로 리포트를 만든다. 리포트는 클립당 지표 위주라 실행 간 비교가 된다.
+- attempt: 모델, 키 지문, 상태, HTTP 코드, 지연, 재시도 순번, 바이트, 오디오 길이,
+           직전 대기 시간(요청 간격 / 429 백오프 / 서킷 대기)
+- clip:    클립(또는 배치) 하나의 결과 - ok/cached/failed/split_failed, 시도한 모델 순서, 소요 시간
+- run:     실행 시작/끝 (동시 실행 수, 요청 간격 등 설정)
+- 리포트: 지연 백분위(모델별), 대기/작업 시간 비율, Flash->Pro 폴백 비율,
+          클립당 시도 수, 추정 비용(클립당)
+
+사용법:
+    python tts_telemetry.py report .tts_telemetry/20250118-101500-1234.jsonl
+    python tts_telemetry.py report after.jsonl --baseline before.jsonl   # 두 실행 비교
+    python tts_telemetry.py report run.jsonl --run 20250118-101500-1234   # 파일에 실행이 여럿일 때
+    python tts_telemetry.py report run.jsonl --json report.json
+
+같은 파일을 다시 지정하면 이벤트가 이어 붙으므로, 리포트는 실행 ID 하나의 이벤트만
+사용한다 (기본: 마지막으로 시작한 실행).
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterator
+
+# ============================================================
+# 설정
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+TELEMETRY_DIR = SCRIPT_DIR / ".tts_telemetry"
+
+EVENT_VERSION = 1
+REPORT_VERSION = 1
+
+# 24kHz / 16bit / mono PCM
+PCM_BYTES_PER_SEC = 24000 * 2
+
+# 비용 추정 (USD / 100만 토큰, 입력 텍스트 / 출력 오디오) - 요금표가 바뀌면 같이 수정
+PRICING = {
+    "gemini-2.5-flash-preview-tts": {"input": 0.50, "output": 10.00},
+    "gemini-2.5-pro-preview-tts": {"input": 1.00, "output": 20.00},
+}
+AUDIO_TOKENS_PER_SEC = 25
+CHARS_PER_INPUT_TOKEN = 2.0         # 한국어 텍스트 대략치
+
+PERCENTILES = [50, 90, 99]
+
+# ============================================================
+# 기록
+# ============================================================
+
+class ClipContext:
+    """클립(또는 배치) 하나의 진행 상태 - 스레드별 스택으로 관리"""
+
+    def __init__(self, key: str, lines: int):
+        self.key = key
+        self.lines = lines
+        self.started = time.monotonic()
+        self.attempts = 0
+        self.models: List[str] = []
+        self.pending_sleep: Dict[str, float] = {}
+        self.outcome = "failed"
+        self.model: Optional[str] = None
+
+
+class Telemetry:
+    """JSONL 이벤트 기록기 (스레드 안전, path 가 None 이면 메모리에만 보관)"""
+
+    def __init__(self, path: Optional[Path] = None, run_id: Optional[str] = None, enabled: bool = True):
+        self.path = path
+        self.run_id = run_id or make_run_id()
+        self.enabled = enabled
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._file = None
+        if enabled and path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(path, "a", encoding="utf-8")
+
+    def emit(self, event_type: str, **fields: Any) -> None:
+        if not self.enabled:
+            return
+        event = {"v": EVENT_VERSION, "type": event_type, "run": self.run_id, "ts": round(time.time(), 3), **fields}
+        line = json.dumps(event, ensure_ascii=False)
+        with self._lock:
+            self.events.append(event)
+            if self._file is not None:
+                self._file.write(line + "\n")
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # --------------------------------------------------------
+    # 클립 / 시도
+    # --------------------------------------------------------
+
+    def _stack(self) -> List[ClipContext]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def current(self) -> Optional[ClipContext]:
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def clip(self, key: str, lines: int = 1) -> Iterator[ClipContext]:
+        """클립 범위 - 안에서 난 시도/대기는 이 클립에 귀속, 끝나면 clip 이벤트"""
+        context = ClipContext(key, lines)
+        stack = self._stack()
+        stack.append(context)
+        try:
+            yield context
+        finally:
+            stack.pop()
+            self.emit(
+                "clip",
+                clip=context.key,
+                lines=context.lines,
+                outcome=context.outcome,
+                model=context.model,
+                models=context.models,
+                attempts=context.attempts,
+                wall_ms=round((time.monotonic() - context.started) * 1000, 1),
+                # 마지막 시도 뒤의 대기 (예: 모든 키 주차 후 포기)
+                sleep_ms={k: round(v * 1000, 1) for k, v in context.pending_sleep.items() if v > 0},
+            )
+
+    def add_sleep(self, seconds: float, kind: str) -> None:
+        """다음 시도 전에 쉰 시간 (요청 간격 rate_limit / 429 backoff / 서킷 breaker)"""
+        context = self.current()
+        if context is None or seconds <= 0:
+            if seconds > 0:
+                self.emit("sleep", kind=kind, ms=round(seconds * 1000, 1))
+            return
+        context.pending_sleep[kind] = context.pending_sleep.get(kind, 0.0) + seconds
+
+    def attempt(
+        self,
+        model: str,
+        key: Optional[str],
+        status: str,
+        latency: float,
+        http_status: Optional[int] = None,
+        pcm_bytes: int = 0,
+        input_chars: int = 0,
+    ) -> None:
+        """HTTP 시도 하나 기록"""
+        context = self.current()
+        sleep = {}
+        retry = 0
+        clip = None
+        if context is not None:
+            sleep = {k: round(v * 1000, 1) for k, v in context.pending_sleep.items() if v > 0}
+            context.pending_sleep = {}
+            retry = context.attempts
+            context.attempts += 1
+            if not context.models or context.models[-1] != model:
+                context.models.append(model)
+            clip = context.key
+        self.emit(
+            "attempt",
+            clip=clip,
+            model=model,
+            key=key,
+            status=status,
+            http_status=http_status,
+            retry=retry,
+            latency_ms=round(latency * 1000, 1),
+            bytes=pcm_bytes,
+            audio_sec=round(pcm_bytes / PCM_BYTES_PER_SEC, 3),
+            input_chars=input_chars,
+            sleep_ms=sleep,
+        )
+
+
+def make_run_id() -> str:
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+
+def load_events(path: Path) -> List[Dict[str, Any]]:
+    events = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                events.append(json.loads(line))
+    return events
+
+def select_run(events: List[Dict[str, Any]], run_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """실행 ID 하나의 이벤트만 (run_id 가 없으면 마지막으로 시작한 실행)"""
+    if run_id is None:
+        starts = [e for e in events if e["type"] == "run" and e.get("phase") == "start"]
+        if starts:
+            run_id = starts[-1]["run"]
+        elif events:
+            run_id = events[-1]["run"]
+    return [e for e in events if e.get("run") == run_id]
+
+# ============================================================
+# 리포트
+# ============================================================
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """선형 보간 백분위 (값 없으면 None)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return round(ordered[low] + (ordered[high] - ordered[low]) * (rank - low), 1)
+
+def estimate_cost(model: str, input_chars: int, audio_sec: float) -> float:
+    """성공한 시도 하나의 추정 비용 (USD)"""
+    price = PRICING.get(model)
+    if price is None:
+        return 0.0
+    input_tokens = input_chars / CHARS_PER_INPUT_TOKEN
+    output_tokens = audio_sec * AUDIO_TOKENS_PER_SEC
+    return (input_tokens * price["input"] + output_tokens * price["output"]) / 1_000_000
+
+def build_report(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """이벤트 -> 리포트 (클립당/비율 지표 위주, 실행 간 비교용)"""
+    runs = [e for e in events if e["type"] == "run"]
+    attempts = [e for e in events if e["type"] == "attempt"]
+    clips = [e for e in events if e["type"] == "clip"]
+    start = next((e for e in runs if e.get("phase") == "start"), None)
+    end = next((e for e in reversed(runs) if e.get("phase") == "end"), None)
+    wall_sec = (end["ts"] - start["ts"]) if start and end else None
+
+    # 클립 수는 줄 기준 (배치 요청 하나 = 여러 줄)
+    ok_lines = sum(c["lines"] for c in clips if c["outcome"] == "ok")
+    cached_lines = sum(c["lines"] for c in clips if c["outcome"] == "cached")
+    failed_lines = sum(c["lines"] for c in clips if c["outcome"] == "failed")
+    generated = [c for c in clips if c["attempts"] > 0]
+
+    by_status: Dict[str, int] = {}
+    for a in attempts:
+        by_status[a["status"]] = by_status.get(a["status"], 0) + 1
+
+    latency: Dict[str, Dict[str, Any]] = {}
+    for model in sorted({a["model"] for a in attempts}):
+        values = [a["latency_ms"] for a in attempts if a["model"] == model]
+        ok_values = [a["latency_ms"] for a in attempts if a["model"] == model and a["status"] == "ok"]
+        latency[model] = {
+            "attempts": len(values),
+            **{f"p{p}": percentile(values, p) for p in PERCENTILES},
+            "ok": {"count": len(ok_values), **{f"p{p}": percentile(ok_values, p) for p in PERCENTILES}},
+        }
+
+    sleep_by_kind: Dict[str, float] = {}
+    for event in attempts + clips:
+        for kind, ms in event.get("sleep_ms", {}).items():
+            sleep_by_kind[kind] = sleep_by_kind.get(kind, 0.0) + ms
+    for event in events:
+        if event["type"] == "sleep":
+            sleep_by_kind[event["kind"]] = sleep_by_kind.get(event["kind"], 0.0) + event["ms"]
+    sleep_ms = sum(sleep_by_kind.values())
+    work_ms = sum(a["latency_ms"] for a in attempts)
+
+    # 폴백: 첫 모델로 시작해 다른 모델로 넘어간 클립 / 요청을 보낸 클립
+    first_models = [c["models"][0] for c in generated if c["models"]]
+    primary = max(set(first_models), key=first_models.count) if first_models else None
+    fallbacks = sum(1 for c in generated if len(c["models"]) > 1)
+    final_models: Dict[str, int] = {}
+    for c in clips:
+        if c["outcome"] == "ok" and c["model"]:
+            final_models[c["model"]] = final_models.get(c["model"], 0) + c["lines"]
+
+    ok_attempts = [a for a in attempts if a["status"] == "ok"]
+    audio_sec = sum(a["audio_sec"] for a in ok_attempts)
+    cost = sum(estimate_cost(a["model"], a["input_chars"], a["audio_sec"]) for a in ok_attempts)
+
+    return {
+        "version": REPORT_VERSION,
+        "run": start["run"] if start else (events[0]["run"] if events else None),
+        "settings": start.get("settings", {}) if start else {},
+        "wall_sec": round(wall_sec, 1) if wall_sec is not None else None,
+        "clips": {"ok": ok_lines, "cached": cached_lines, "failed": failed_lines},
+        "clips_per_hour": round(ok_lines / wall_sec * 3600, 1) if wall_sec else None,
+        "attempts": {"total": len(attempts), "by_status": dict(sorted(by_status.items()))},
+        "attempts_per_clip": round(len(attempts) / ok_lines, 2) if ok_lines else None,
+        "latency_ms": latency,
+        "time": {
+            "work_sec": round(work_ms / 1000, 1),
+            "sleep_sec": round(sleep_ms / 1000, 1),
+            "sleep_by_kind_sec": {k: round(v / 1000, 1) for k, v in sorted(sleep_by_kind.items())},
+            "sleep_share": round(sleep_ms / (sleep_ms + work_ms), 3) if sleep_ms + work_ms else None,
+        },
+        "fallback": {
+            "primary": primary,
+            "clips": fallbacks,
+            "rate": round(fallbacks / len(generated), 3) if generated else None,
+            "final_models": dict(sorted(final_models.items())),
+        },
+        "audio_sec": round(audio_sec, 1),
+        "cost_usd": {
+            "total": round(cost, 4),
+            "per_clip": round(cost / ok_lines, 5) if ok_lines else None,
+            "per_audio_min": round(cost / audio_sec * 60, 5) if audio_sec else None,
+        },
+    }
+
+def format_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> str:
+    """리포트 텍스트 (baseline 이 있으면 지표 옆에 변화량)"""
+
+    def metric(path: List[str], data: Optional[Dict[str, Any]]) -> Optional[float]:
+        for part in path:
+            if not isinstance(data, dict):
+                return None
+            data = data.get(part)
+        return data if isinstance(data, (int, float)) else None
+
+    def line(label: str, path: List[str], unit: str = "", digits: int = 1) -> str:
+        value = metric(path, report)
+        text = "-" if value is None else f"{value:.{digits}f}{unit}"
+        before = metric(path, baseline) if baseline else None
+        if before not in (None, 0) and value is not None:
+            text += f"  ({(value / before - 1) * 100:+.1f}% vs {before:.{digits}f}{unit})"
+        return f"{label:18s} {text}"
+
+    lines = [
+        f"실행: {report['run']}" + (f"  (비교: {baseline['run']})" if baseline else ""),
+        f"클립: 성공 {report['clips']['ok']}개 / 캐시 {report['clips']['cached']}개 / 실패 {report['clips']['failed']}개",
+        line("소요 시간", ["wall_sec"], "초"),
+        line("처리량", ["clips_per_hour"], " 클립/시간"),
+        line("클립당 시도", ["attempts_per_clip"], "회", 2),
+        line("대기 비율", ["time", "sleep_share"], "", 3),
+        line("작업 시간", ["time", "work_sec"], "초"),
+        line("대기 시간", ["time", "sleep_sec"], "초"),
+        line("폴백 비율", ["fallback", "rate"], "", 3),
+        line("클립당 비용", ["cost_usd", "per_clip"], " USD", 5),
+        line("총 비용", ["cost_usd", "total"], " USD", 4),
+        f"대기 내역: " + (", ".join(f"{k} {v:.1f}초" for k, v in report["time"]["sleep_by_kind_sec"].items()) or "없음"),
+        f"시도 상태: " + (", ".join(f"{k} {v}" for k, v in report["attempts"]["by_status"].items()) or "없음"),
+    ]
+    for model, info in report["latency_ms"].items():
+        lines.append(line(f"지연 p50 {model.split('-')[2]}", ["latency_ms", model, "ok", "p50"], "ms"))
+        lines.append(line(f"지연 p90 {model.split('-')[2]}", ["latency_ms", model, "ok", "p90"], "ms"))
+        lines.append(line(f"지연 p99 {model.split('-')[2]}", ["latency_ms", model, "ok", "p99"], "ms"))
+    return "\n".join(lines)
+
+# ============================================================
+# 메인
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="HearO TTS 텔레메트리 리포트")
+    sub = parser.add_subparsers(dest="command", required=True)
+    report_parser = sub.add_parser("report", help="JSONL 이벤트로 리포트 출력")
+    report_parser.add_argument("events", type=Path, help="리포트할 실행의 텔레메트리 JSONL")
+    report_parser.add_argument("--baseline", type=Path, help="비교 기준이 되는 이전 실행 JSONL")
+    report_parser.add_argument("--run", help="events 에서 리포트할 실행 ID (기본: 마지막으로 시작한 실행)")
+    report_parser.add_argument("--baseline-run", help="baseline 에서 사용할 실행 ID (기본: 마지막으로 시작한 실행)")
+    report_parser.add_argument("--json", type=Path, help="리포트 JSON 저장 경로")
+    args = parser.parse_args()
+
+    events = select_run(load_events(args.events), args.run)
+    if not events:
+        print(f"[ERROR] 실행 이벤트 없음: {args.events} (run={args.run})")
+        sys.exit(1)
+    report = build_report(events)
+    baseline = None
+    if args.baseline:
+        baseline_events = select_run(load_events(args.baseline), args.baseline_run)
+        if not baseline_events:
+            print(f"[ERROR] 실행 이벤트 없음: {args.baseline} (run={args.baseline_run})")
+            sys.exit(1)
+        baseline = build_report(baseline_events)
+    print(f"""
+============================================================
+HearO TTS 실행 리포트
+============================================================
+{format_report(report, baseline)}
+============================================================
+""")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"report": report, "baseline": baseline}, f, indent=2, ensure_ascii=False)
+        print(f"[SAVE] {args.json}")
+
+if __name__ == "__main__":
+    main()
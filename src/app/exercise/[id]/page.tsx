@@ -32,6 +32,7 @@ import {
 } from '@/components/exercise';
 import { sfxService } from '@/services/sfxService';
 import { ttsService } from '@/services/ttsService';
+import { loadResultCueIndex } from '@/services/prerenderedContentService';
 import { stop as stopHybridTTS } from '@/services/tts/hybridTTS';
 import { useBGM } from '@/contexts/BGMContext';
 import { storyService } from '@/services/storyService';
@@ -298,6 +299,8 @@ export default function ExercisePage({ params }: ExercisePageProps) {
   // 운동 설정 및 감지기 초기화
   useEffect(() => {
     setExercise(exerciseId);
+    // 완료 시 결과 큐 조회를 기다리지 않도록 사전 믹스 인덱스 미리 로드
+    loadResultCueIndex();
 
     const initializeDetector = () => {
       try {
@@ -529,14 +532,30 @@ export default function ExercisePage({ params }: ExercisePageProps) {
 
     // BGM 페이드아웃 (전역 Context 사용)
     fadeOutBGM(1500);
-    sfxService.playExerciseCompleteSFX();
     hapticService.exerciseComplete();
 
     setNpcDialogue(getPerformanceDialogue(currentWorldview, rating));
     setNpcEmotion(rating === 'perfect' ? 'happy' : rating === 'good' ? 'normal' : 'serious');
-    setShowNPCDialogue(true);
 
-    ttsService.playPrerenderedTTS(currentWorldview, exerciseId, rating);
+    // 결과 큐: TTS + 효과음 사전 믹스가 있으면 한 클립으로 재생하고 음성 시작에 맞춰 대사 표시,
+    // 없으면 효과음과 TTS 를 따로 재생
+    const playLayeredResult = () => {
+      sfxService.playExerciseCompleteSFX();
+      setShowNPCDialogue(true);
+      ttsService.playPrerenderedTTS(currentWorldview, exerciseId, rating);
+    };
+    const sfxSettings = sfxService.getSettings();
+    if (sfxSettings.sfxEnabled) {
+      ttsService
+        .playResultCue(currentWorldview, exerciseId, rating, sfxSettings.sfxVolume, {
+          onVoiceStart: () => setShowNPCDialogue(true),
+        })
+        .then((premixed) => {
+          if (!premixed) playLayeredResult();
+        });
+    } else {
+      playLayeredResult();
+    }
 
     try {
       // 스토리 진행 컨텍스트 구성
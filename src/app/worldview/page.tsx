@@ -12,12 +12,14 @@ import Link from 'next/link';
 import { motion } from 'framer-motion';
 import { WorldviewCarousel } from '@/components/worldview/WorldviewCarousel';
 import { useWorldStore } from '@/stores/useWorldStore';
+import { useServiceWorker } from '@/hooks/useServiceWorker';
 import type { WorldviewId } from '@/constants/worldviews';
 import { WORLDVIEWS } from '@/constants/worldviews';
 
 export default function WorldviewSelectPage() {
   const router = useRouter();
   const { setWorldview } = useWorldStore();
+  const { isReady: isSWReady, precacheWorldview } = useServiceWorker();
   const [selectedWorldview, setSelectedWorldview] = useState<WorldviewId | null>(null);
   const [isLoading, setIsLoading] = useState(false);
 
@@ -33,11 +35,16 @@ export default function WorldviewSelectPage() {
     // Zustand 스토어에 세계관 저장
     setWorldview(selectedWorldview);
 
+    // 선택한 세계관의 TTS/NPC/스토리 에셋을 백그라운드로 사전 캐싱 (바뀐 파일만)
+    if (isSWReady) {
+      precacheWorldview(selectedWorldview);
+    }
+
     // 운동 목록 페이지로 이동
     setTimeout(() => {
       router.push('/exercise');
     }, 500);
-  }, [selectedWorldview, router, setWorldview]);
+  }, [selectedWorldview, router, setWorldview, isSWReady, precacheWorldview]);
 
   const selectedWorld = selectedWorldview ? WORLDVIEWS[selectedWorldview] : null;
 
@@ -11,7 +11,8 @@ import React, { useState } from 'react';
 import Image from 'next/image';
 import { motion, AnimatePresence } from 'framer-motion';
 import type { WorldviewType } from '@/types/vrm';
-import { getMainNPC, getNPCImagePath, NPC_CHARACTERS, type NPCEmotion } from '@/constants/npcCharacters';
+import { getMainNPC, NPC_CHARACTERS, type NPCEmotion } from '@/constants/npcCharacters';
+import { useNPCImage } from '@/hooks/useNPCImage';
 import { usePhaseStore } from '@/stores/usePhaseStore';
 
 // 레이아웃 모드 타입
@@ -112,7 +113,7 @@ export function NPCLayer({
     ? (NPC_CHARACTERS[worldview]?.[npcId] || getMainNPC(worldview))
     : getMainNPC(worldview);
 
-  const imagePath = getNPCImagePath(worldview, npc.id, emotion);
+  const npcImage = useNPCImage(worldview, npc.id, emotion);
 
   // 레이아웃 모드에 따른 위치/크기 결정
   const layoutConfig = {
@@ -197,8 +198,11 @@ export function NPCLayer({
             </motion.div>
           )}
 
-          <Image
-            src={imagePath}
+          {npcImage.ready && <Image
+            src={npcImage.src}
+            loader={npcImage.loader}
+            placeholder={npcImage.placeholder ? 'blur' : 'empty'}
+            blurDataURL={npcImage.placeholder}
             alt={npc.name}
             fill
             sizes="(max-width: 768px) 50vw, 40vw"
@@ -210,11 +214,11 @@ export function NPCLayer({
             }}
             onLoad={() => setImageLoaded(true)}
             onError={() => {
-              console.warn(`[NPCLayer] Failed to load: ${imagePath}`);
+              console.warn(`[NPCLayer] Failed to load: ${npcImage.src}`);
               setImageLoaded(true);
             }}
             priority
-          />
+          />}
 
           {/* 캐릭터 하이라이트 효과 (idle animation) - Enhanced */}
           {imageLoaded && (
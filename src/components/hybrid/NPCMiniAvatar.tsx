@@ -13,7 +13,8 @@ import React, { useState, useEffect, useCallback, useRef, memo } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import Image from 'next/image';
 import type { WorldviewType } from '@/types/vrm';
-import { getMainNPC, getNPCImagePath, NPC_CHARACTERS, type NPCCharacter, type NPCEmotion } from '@/constants/npcCharacters';
+import { getMainNPC, NPC_CHARACTERS, type NPCCharacter, type NPCEmotion } from '@/constants/npcCharacters';
+import { useNPCImage, type UseNPCImageReturn } from '@/hooks/useNPCImage';
 
 // ============================================
 // Types
@@ -74,11 +75,11 @@ const positionStyles: Record<string, string> = {
 /** 아바타 이미지 */
 const AvatarImage = memo(function AvatarImage({
   npc,
-  imagePath,
+  image,
   isActive,
 }: {
   npc: NPCCharacter;
-  imagePath: string;
+  image: UseNPCImageReturn;
   isActive: boolean;
 }) {
   const [imgError, setImgError] = useState(false);
@@ -94,9 +95,20 @@ const AvatarImage = memo(function AvatarImage({
       animate={isActive ? { scale: [1, 1.05, 1] } : { scale: 1 }}
       transition={{ duration: 0.5, repeat: isActive ? Infinity : 0 }}
     >
-      {!imgError ? (
+      {imgError ? (
+        /* 폴백: NPC 이름 첫 글자 */
+        <div
+          className="absolute inset-0 flex items-center justify-center text-white font-bold text-xl"
+          style={{ background: npc.color }}
+        >
+          {npc.name.charAt(0)}
+        </div>
+      ) : image.ready ? (
         <Image
-          src={imagePath}
+          src={image.src}
+          loader={image.loader}
+          placeholder={image.placeholder ? 'blur' : 'empty'}
+          blurDataURL={image.placeholder}
           alt={npc.name}
           fill
           sizes="64px"
@@ -105,15 +117,7 @@ const AvatarImage = memo(function AvatarImage({
           onError={() => setImgError(true)}
           draggable={false}
         />
-      ) : (
-        /* 폴백: NPC 이름 첫 글자 */
-        <div
-          className="absolute inset-0 flex items-center justify-center text-white font-bold text-xl"
-          style={{ background: npc.color }}
-        >
-          {npc.name.charAt(0)}
-        </div>
-      )}
+      ) : null}
     </motion.div>
   );
 });
@@ -205,7 +209,7 @@ export function NPCMiniAvatar({
     : getMainNPC(worldview);
 
   const emotion = currentMessage?.emotion || message?.emotion || 'normal';
-  const imagePath = getNPCImagePath(worldview, npc.id, emotion);
+  const npcImage = useNPCImage(worldview, npc.id, emotion);
 
   // 메시지 자동 숨김 타이머
   useEffect(() => {
@@ -242,7 +246,7 @@ export function NPCMiniAvatar({
           >
             <AvatarImage
               npc={npc}
-              imagePath={imagePath}
+              image={npcImage}
               isActive={!!currentMessage}
             />
           </motion.div>
@@ -18,7 +18,8 @@ import React, { useState, useEffect, useRef, useCallback, useMemo, memo } from '
 import { motion, AnimatePresence } from 'framer-motion';
 import type { WorldviewType } from '@/types/vrm';
 import { usePhaseStore, useDialogue } from '@/stores/usePhaseStore';
-import { getMainNPC, getNPCImagePath, NPC_CHARACTERS, type NPCCharacter, type NPCEmotion } from '@/constants/npcCharacters';
+import { getMainNPC, NPC_CHARACTERS, type NPCCharacter, type NPCEmotion } from '@/constants/npcCharacters';
+import { useNPCImage } from '@/hooks/useNPCImage';
 import { speakVNDialogue, stop as stopHybridTTS } from '@/services/tts/hybridTTS';
 import { WORLDVIEW_COLORS } from '@/constants/themes';
 
@@ -70,7 +71,7 @@ const _NPCAvatar = memo(function _NPCAvatar({
   worldview: WorldviewType;
   isSpeaking: boolean;
 }) {
-  const imagePath = getNPCImagePath(worldview, npc.id, emotion);
+  const npcImage = useNPCImage(worldview, npc.id, emotion);
 
   return (
     <div className="relative flex-shrink-0">
@@ -78,15 +79,25 @@ const _NPCAvatar = memo(function _NPCAvatar({
         className="w-14 h-14 sm:w-16 sm:h-16 rounded-full overflow-hidden border-2 shadow-lg"
         style={{ borderColor: npc.color }}
       >
-        {/* eslint-disable-next-line @next/next/no-img-element */}
-        <img
-          src={imagePath}
-          alt={npc.name}
-          className="w-full h-full object-cover"
-          onError={(e) => {
-            (e.target as HTMLImageElement).src = '/images/logo-icon.png';
-          }}
-        />
+        {npcImage.ready && (
+          <picture>
+            {npcImage.avifSrcSet && <source type="image/avif" srcSet={npcImage.avifSrcSet} sizes="64px" />}
+            {npcImage.webpSrcSet && <source type="image/webp" srcSet={npcImage.webpSrcSet} sizes="64px" />}
+            {/* eslint-disable-next-line @next/next/no-img-element */}
+            <img
+              src={npcImage.fallbackSrc}
+              alt={npc.name}
+              className="w-full h-full object-cover"
+              style={npcImage.placeholder ? { backgroundImage: `url(${npcImage.placeholder})`, backgroundSize: 'cover' } : undefined}
+              onError={(e) => {
+                // <source> 변환본이 실패해도 로고로 폴백
+                const img = e.target as HTMLImageElement;
+                img.parentElement?.querySelectorAll('source').forEach((source) => source.remove());
+                img.src = '/images/logo-icon.png';
+              }}
+            />
+          </picture>
+        )}
       </div>
 
       {/* 말하는 중 인디케이터 */}
@@ -11,11 +11,11 @@ import { motion, AnimatePresence } from 'framer-motion';
 import type { WorldviewType } from '@/types/vrm';
 import {
   NPC_CHARACTERS,
-  getNPCImagePath,
   getMainNPC,
   type NPCCharacter,
   type NPCEmotion,
 } from '@/constants/npcCharacters';
+import { useNPCImage } from '@/hooks/useNPCImage';
 import { ttsService } from '@/services/ttsService';
 import type { PerformanceRating } from '@/types/exercise';
 
@@ -63,7 +63,7 @@ export function NPCDialogue({
     ? NPC_CHARACTERS[worldview][npcId] || getMainNPC(worldview)
     : getMainNPC(worldview);
 
-  const imagePath = getNPCImagePath(worldview, npc.id, emotion);
+  const npcImage = useNPCImage(worldview, npc.id, emotion);
 
   // 타이핑 효과
   useEffect(() => {
@@ -151,8 +151,11 @@ export function NPCDialogue({
             className="w-16 h-16 rounded-full overflow-hidden border-2"
             style={{ borderColor: npc.color }}
           >
-            <Image
-              src={imagePath}
+            {npcImage.ready && <Image
+              src={npcImage.src}
+              loader={npcImage.loader}
+              placeholder={npcImage.placeholder ? 'blur' : 'empty'}
+              blurDataURL={npcImage.placeholder}
               alt={npc.name}
               width={64}
               height={64}
@@ -161,7 +164,7 @@ export function NPCDialogue({
                 // 이미지 로드 실패 시 플레이스홀더
                 (e.target as HTMLImageElement).src = '/images/logo-icon.png';
               }}
-            />
+            />}
           </div>
 
           {/* 말하는 중 인디케이터 */}
@@ -249,7 +252,7 @@ export function NPCResultBanner({
       ? 'normal'
       : 'serious';
 
-  const imagePath = getNPCImagePath(worldview, npc.id, emotion);
+  const npcImage = useNPCImage(worldview, npc.id, emotion);
 
   // 기본 대사
   const defaultDialogues: Record<PerformanceRating, string[]> = {
@@ -297,8 +300,11 @@ export function NPCResultBanner({
         className="w-12 h-12 rounded-full overflow-hidden"
         style={{ backgroundColor: `${bgColor}30` }}
       >
-        <Image
-          src={imagePath}
+        {npcImage.ready && <Image
+          src={npcImage.src}
+          loader={npcImage.loader}
+          placeholder={npcImage.placeholder ? 'blur' : 'empty'}
+          blurDataURL={npcImage.placeholder}
           alt={npc.name}
           width={48}
           height={48}
@@ -306,7 +312,7 @@ export function NPCResultBanner({
           onError={(e) => {
             (e.target as HTMLImageElement).src = '/images/logo-icon.png';
           }}
-        />
+        />}
       </div>
 
       {/* 대사 */}
@@ -53,3 +53,7 @@ export { useTypingAnimation } from './useTypingAnimation';
 // 음성 인식 명령 훅
 export { useVoiceCommands } from './useVoiceCommands';
 export type { VoiceCommandType } from './useVoiceCommands';
+
+// NPC 이미지 변환본(WebP/AVIF) 선택 훅
+export { useNPCImage } from './useNPCImage';
+export type { UseNPCImageReturn } from './useNPCImage';
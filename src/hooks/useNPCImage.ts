@@ -0,0 +1,79 @@
+/**
+ * useNPCImage - NPC 이미지 변환본 선택 훅
+ *
+ * 기능:
+ * - npc/images.json (scripts/optimize_npc_images.py) 에 WebP/AVIF 변환본이 있으면
+ *   srcset / next/image loader / 블러 플레이스홀더 제공
+ * - 변환본이 없으면 원본 PNG 경로로 폴백
+ * - 매핑을 읽기 전에는 ready=false (원본을 먼저 받았다가 버리지 않도록)
+ */
+
+import { useEffect, useMemo, useState } from 'react';
+import type { ImageLoader } from 'next/image';
+import type { WorldviewType } from '@/types/vrm';
+import { getNPCImagePath, type NPCEmotion } from '@/constants/npcCharacters';
+import {
+  getNPCImageSources,
+  loadNPCImageMapping,
+  pickVariant,
+  toSrcSet,
+} from '@/services/prerenderedContentService';
+
+// ============================================
+// Types
+// ============================================
+
+export interface UseNPCImageReturn {
+  /** 매핑 조회 완료 여부 */
+  ready: boolean;
+  /** 기본 src (가장 큰 WebP 변환본, 없으면 원본) */
+  src: string;
+  /** 원본 이미지 경로 (로드 실패 시 폴백) */
+  fallbackSrc: string;
+  /** next/image 용 loader (변환본이 없으면 undefined) */
+  loader?: ImageLoader;
+  /** <img>/<source> 용 srcset */
+  webpSrcSet?: string;
+  avifSrcSet?: string;
+  /** 블러 플레이스홀더 data URI */
+  placeholder?: string;
+}
+
+// ============================================
+// Hook
+// ============================================
+
+export function useNPCImage(
+  worldview: WorldviewType,
+  npcId: string,
+  emotion: NPCEmotion = 'normal'
+): UseNPCImageReturn {
+  const fallbackSrc = getNPCImagePath(worldview, npcId, emotion);
+  const [loaded, setLoaded] = useState(() => getNPCImageSources(worldview, npcId, emotion) !== undefined);
+
+  useEffect(() => {
+    if (loaded) return;
+    let cancelled = false;
+    loadNPCImageMapping().then(() => {
+      if (!cancelled) setLoaded(true);
+    });
+    return () => {
+      cancelled = true;
+    };
+  }, [loaded]);
+
+  return useMemo<UseNPCImageReturn>(() => {
+    const sources = loaded ? getNPCImageSources(worldview, npcId, emotion) : undefined;
+    const webp = sources?.webp ?? [];
+    const avif = sources?.avif ?? [];
+    return {
+      ready: loaded,
+      src: webp.length ? webp[webp.length - 1].url : fallbackSrc,
+      fallbackSrc,
+      loader: webp.length ? ({ width }) => pickVariant(webp, width) : undefined,
+      webpSrcSet: webp.length ? toSrcSet(webp) : undefined,
+      avifSrcSet: avif.length ? toSrcSet(avif) : undefined,
+      placeholder: sources?.placeholder,
+    };
+  }, [loaded, worldview, npcId, emotion, fallbackSrc]);
+}
@@ -3,11 +3,12 @@
  *
  * 기능:
  * - SW 등록/업데이트
- * - 프리렌더링 파일 사전 캐싱
+ * - 프리렌더링 파일 사전 캐싱 (URL 목록 / 세계관 매니페스트)
  * - 캐시 상태 조회
  */
 
 import { useEffect, useState, useCallback } from 'react';
+import { getPlayableTTSFormats, resolveTTSClipUrl } from '@/services/prerenderedContentService';
 
 // ============================================
 // Types
@@ -21,6 +22,12 @@ interface ServiceWorkerState {
   error: string | null;
 }
 
+/** 세계관 사전 캐싱 시 받을 이미지 포맷 (next/image loader 가 쓰는 WebP) */
+const PRECACHE_IMAGE_FORMATS = ['webp'];
+
+/** NPC 아바타 표시 크기 (px) - 사전 캐싱할 이미지 너비 기준 */
+const PRECACHE_IMAGE_CSS_WIDTH = 64;
+
 interface PrecacheProgress {
   cached: number;
   failed: number;
@@ -168,6 +175,37 @@ export function useServiceWorker() {
     [state.isReady]
   );
 
+  /**
+   * 세계관 에셋 사전 캐싱 (이 브라우저가 쓰는 포맷/너비만, 해시 기준으로 바뀐 파일만)
+   */
+  const precacheWorldview = useCallback(
+    async (worldview: string) => {
+      const controller = navigator.serviceWorker?.controller;
+      if (!state.isReady || !controller) {
+        console.warn('[useServiceWorker] SW not ready');
+        return;
+      }
+
+      setPrecacheProgress({
+        cached: 0,
+        failed: 0,
+        total: 0,
+        inProgress: true,
+      });
+
+      const prefs = {
+        audio: await getPlayableTTSFormats(),
+        image: PRECACHE_IMAGE_FORMATS,
+        imageWidth: Math.round(PRECACHE_IMAGE_CSS_WIDTH * (window.devicePixelRatio || 1)),
+      };
+      controller.postMessage({
+        type: 'PRECACHE_WORLDVIEW',
+        payload: { worldview, prefs },
+      });
+    },
+    [state.isReady]
+  );
+
   /**
    * 프리렌더링 캐시 초기화
    */
@@ -180,19 +218,12 @@ export function useServiceWorker() {
   }, []);
 
   /**
-   * 세계관별 TTS 파일 URL 생성
+   * 세계관별 TTS 파일 URL 생성 (재생 가능한 압축본 우선, 없으면 WAV)
    */
   const getWorldviewTTSUrls = useCallback(
-    (worldview: string, exercises: string[], grades: string[] = ['perfect', 'good', 'normal']): string[] => {
-      const urls: string[] = [];
-
-      for (const exercise of exercises) {
-        for (const grade of grades) {
-          urls.push(`/assets/prerendered/tts/${worldview}/${exercise}_${grade}.wav`);
-        }
-      }
-
-      return urls;
+    (worldview: string, exercises: string[], grades: string[] = ['perfect', 'good', 'normal']): Promise<string[]> => {
+      const keys = exercises.flatMap((exercise) => grades.map((grade) => `${worldview}/${exercise}_${grade}`));
+      return Promise.all(keys.map(resolveTTSClipUrl));
     },
     []
   );
@@ -202,6 +233,7 @@ export function useServiceWorker() {
     precacheProgress,
     applyUpdate,
     precacheFiles,
+    precacheWorldview,
     clearPrerenderCache,
     getWorldviewTTSUrls,
   };
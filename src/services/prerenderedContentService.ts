@@ -6,8 +6,8 @@
  *
  * 기능:
  * - 에필로그 스토리 로드 (JSON)
- * - 에필로그 TTS 오디오 로드 (WAV)
- * - NPC 이미지 로드
+ * - 에필로그 TTS 오디오 로드 (Opus/AAC 압축본 우선, WAV 폴백)
+ * - NPC 이미지 로드 (WebP/AVIF 변환본 우선, 원본 폴백)
  */
 
 import type { WorldviewType } from '@/types/vrm';
@@ -97,6 +97,129 @@ export function getTTSAudioUrl(
   return audioPath;
 }
 
+/** TTS 압축 인코딩 매니페스트 (scripts/encode_tts_audio.py 생성) */
+interface TTSEncodingManifest {
+  formats: Record<string, { ext: string; mime: string; bitrate: string }>;
+  clips: Record<string, {
+    hash: string;
+    bytes: number;
+    variants: Record<string, { path: string; bitrate: string; bytes: number }>;
+  }>;
+}
+
+/** 선호 인코딩 순서 (브라우저가 재생 가능한 첫 포맷 사용) */
+const TTS_FORMAT_PREFERENCE = ['opus', 'aac'];
+
+let encodingManifestPromise: Promise<TTSEncodingManifest | null> | null = null;
+
+/**
+ * 인코딩 매니페스트 로드 (캐싱)
+ */
+function loadEncodingManifest(): Promise<TTSEncodingManifest | null> {
+  if (!encodingManifestPromise) {
+    encodingManifestPromise = fetch('/assets/prerendered/tts/encodings.json')
+      .then((response) => (response.ok ? response.json() : null))
+      .catch(() => null);
+  }
+  return encodingManifestPromise;
+}
+
+/**
+ * 이 브라우저가 재생할 수 있는 TTS 압축 포맷 (선호 순서, 인코딩 매니페스트 기준)
+ */
+export async function getPlayableTTSFormats(): Promise<string[]> {
+  if (typeof Audio === 'undefined') return [];
+  const manifest = await loadEncodingManifest();
+  if (!manifest) return [];
+
+  const probe = new Audio();
+  return TTS_FORMAT_PREFERENCE.filter((format) => {
+    const info = manifest.formats[format];
+    return !!info && probe.canPlayType(info.mime) !== '';
+  });
+}
+
+/**
+ * 클립 키(<세계관>/<운동>_<등급>)의 재생 URL - 재생 가능한 압축본이 있으면 압축본, 아니면 WAV
+ */
+export async function resolveTTSClipUrl(clipKey: string): Promise<string> {
+  const wavUrl = `/assets/prerendered/tts/${clipKey}.wav`;
+  const [manifest, playable] = await Promise.all([loadEncodingManifest(), getPlayableTTSFormats()]);
+  const clip = manifest?.clips[clipKey];
+  if (!clip) return wavUrl;
+
+  const format = playable.find((f) => clip.variants[f]);
+  return format ? `/assets/prerendered/tts/${clip.variants[format].path}` : wavUrl;
+}
+
+/**
+ * 재생에 사용할 TTS 오디오 URL (압축본이 있고 재생 가능하면 압축본, 아니면 WAV)
+ */
+export async function resolveTTSAudioUrl(
+  worldviewId: WorldviewType,
+  exerciseId: ExerciseType,
+  grade: PerformanceGrade
+): Promise<string | null> {
+  if (!getTTSAudioUrl(worldviewId, exerciseId, grade)) return null;
+  return resolveTTSClipUrl(`${worldviewId}/${exerciseId}_${grade}`);
+}
+
+/** 결과 화면 사전 믹스 인덱스 (scripts/premix_result_cues.py 생성) */
+interface ResultCueIndex {
+  sample_rate: number;
+  clips: Record<string, {
+    path: string;
+    fingerprint: string;
+    bytes: number;
+    duration: number;
+    voice_offset: number;
+  }>;
+}
+
+let resultCueIndex: ResultCueIndex | null | undefined;
+let resultCueIndexPromise: Promise<ResultCueIndex | null> | null = null;
+
+/**
+ * 결과 화면 사전 믹스 인덱스 로드 (캐싱) - 운동 시작 시 미리 호출해 완료 시점에 기다리지 않도록
+ */
+export function loadResultCueIndex(): Promise<ResultCueIndex | null> {
+  if (!resultCueIndexPromise) {
+    resultCueIndexPromise = fetch('/assets/prerendered/premix/index.json')
+      .then((response) => (response.ok ? response.json() : null))
+      .catch(() => null)
+      .then((index) => (resultCueIndex = index));
+  }
+  return resultCueIndexPromise;
+}
+
+/**
+ * 이미 로드된 인덱스에서 결과 화면 큐 조회 (동기)
+ * - undefined: 인덱스 로드 전 / null: 사전 믹스 없음
+ */
+export function getResultCue(
+  worldviewId: WorldviewType,
+  exerciseId: ExerciseType,
+  grade: PerformanceGrade
+): { url: string; voiceOffset: number } | null | undefined {
+  if (resultCueIndex === undefined) return undefined;
+  const clip = resultCueIndex?.clips[`${worldviewId}/${exerciseId}_${grade}`];
+  if (!clip) return null;
+  return { url: `/assets/prerendered/premix/${clip.path}`, voiceOffset: clip.voice_offset };
+}
+
+/**
+ * 결과 화면 큐 (TTS + 세계관 효과음을 미리 섞은 클립 하나)
+ * 사전 믹스가 있으면 URL과 음성 시작 시각(초, 립싱크 정렬용), 없으면 null
+ */
+export async function resolveResultCue(
+  worldviewId: WorldviewType,
+  exerciseId: ExerciseType,
+  grade: PerformanceGrade
+): Promise<{ url: string; voiceOffset: number } | null> {
+  await loadResultCueIndex();
+  return getResultCue(worldviewId, exerciseId, grade) ?? null;
+}
+
 /**
  * TTS 오디오 파일 존재 여부 확인 (비동기)
  */
@@ -131,36 +254,34 @@ export async function playEpilogueTTS(
   grade: PerformanceGrade,
   onComplete?: () => void
 ): Promise<boolean> {
+  // 파일이 없으면 onerror 와 play() 실패가 모두 오므로 완료 콜백은 한 번만
+  let completed = false;
+  const complete = () => {
+    if (completed) return;
+    completed = true;
+    onComplete?.();
+  };
+
   try {
     // 기존 재생 중지
     stopEpilogueTTS();
 
-    const audioUrl = getTTSAudioUrl(worldviewId, exerciseId, grade);
-    if (!audioUrl) {
+    // 오디오 URL (압축본 우선, WAV 폴백) - 별도 HEAD 확인 없이 재생 실패로 판단
+    const playbackUrl = await resolveTTSAudioUrl(worldviewId, exerciseId, grade);
+    if (!playbackUrl) {
       console.info('[PrerenderedContent] No TTS available, skipping');
-      onComplete?.();
+      complete();
       return false;
     }
 
-    // 파일 존재 확인
-    const exists = await checkTTSAudioExists(worldviewId, exerciseId, grade);
-    if (!exists) {
-      console.info('[PrerenderedContent] TTS file not found:', audioUrl);
-      onComplete?.();
-      return false;
-    }
-
-    // 오디오 재생
-    currentAudio = new Audio(audioUrl);
+    currentAudio = new Audio(playbackUrl);
     currentAudio.volume = 1.0;
 
-    currentAudio.onended = () => {
-      onComplete?.();
-    };
+    currentAudio.onended = complete;
 
     currentAudio.onerror = () => {
-      console.error('[PrerenderedContent] Audio playback error');
-      onComplete?.();
+      console.error('[PrerenderedContent] Audio playback error:', playbackUrl);
+      complete();
     };
 
     await currentAudio.play();
@@ -169,7 +290,7 @@ export async function playEpilogueTTS(
     return true;
   } catch (error) {
     console.error('[PrerenderedContent] Failed to play TTS:', error);
-    onComplete?.();
+    complete();
     return false;
   }
 }
@@ -220,6 +341,93 @@ export function getMentorNPCImageUrl(
   return getNPCImageUrl(worldviewId, mentor.id, emotion);
 }
 
+/** NPC 이미지 매핑 (scripts/optimize_npc_images.py 생성) */
+interface NPCImageMapping {
+  images: Record<string, {
+    source: string;
+    width: number;
+    height: number;
+    placeholder: string;
+    variants: Record<string, Array<{ width: number; height: number; path: string; bytes: number }>>;
+  }>;
+}
+
+/** 변환본이 있는 NPC 이미지 - 너비 오름차순 WebP/AVIF 목록과 블러 플레이스홀더 */
+export interface NPCImageSources {
+  width: number;
+  height: number;
+  placeholder: string;
+  webp: Array<{ width: number; url: string }>;
+  avif: Array<{ width: number; url: string }>;
+}
+
+let npcImageMapping: NPCImageMapping | null | undefined;
+let npcImageMappingPromise: Promise<NPCImageMapping | null> | null = null;
+
+/**
+ * NPC 이미지 매핑 로드 (캐싱)
+ */
+export function loadNPCImageMapping(): Promise<NPCImageMapping | null> {
+  if (!npcImageMappingPromise) {
+    npcImageMappingPromise = fetch('/assets/prerendered/npc/images.json')
+      .then((response) => (response.ok ? response.json() : null))
+      .catch(() => null)
+      .then((mapping) => (npcImageMapping = mapping));
+  }
+  return npcImageMappingPromise;
+}
+
+/**
+ * 이미 로드된 매핑에서 NPC 이미지 변환본 조회 (동기)
+ * - undefined: 매핑 로드 전 / null: 변환본 없음 -> 원본 사용
+ */
+export function getNPCImageSources(
+  worldviewId: WorldviewType,
+  npcId: string,
+  emotion: string = 'normal'
+): NPCImageSources | null | undefined {
+  if (npcImageMapping === undefined) return undefined;
+  const entry = npcImageMapping?.images[`${worldviewId}/${npcId}/${emotion}`];
+  if (!entry) return null;
+
+  const urls = (format: string) =>
+    (entry.variants[format] ?? [])
+      .map((v) => ({ width: v.width, url: `/assets/prerendered/npc/${v.path}` }))
+      .sort((a, b) => a.width - b.width);
+  const sources = { webp: urls('webp'), avif: urls('avif') };
+  if (!sources.webp.length && !sources.avif.length) return null;
+  return { width: entry.width, height: entry.height, placeholder: entry.placeholder, ...sources };
+}
+
+/**
+ * NPC 이미지 변환본 조회 (매핑이 없거나 변환 전 이미지면 null -> 원본 사용)
+ */
+export async function resolveNPCImage(
+  worldviewId: WorldviewType,
+  npcId: string,
+  emotion: string = 'normal'
+): Promise<NPCImageSources | null> {
+  await loadNPCImageMapping();
+  return getNPCImageSources(worldviewId, npcId, emotion) ?? null;
+}
+
+/**
+ * srcset 문자열 ("url 256w, url 512w")
+ */
+export function toSrcSet(variants: Array<{ width: number; url: string }>): string {
+  return variants.map((v) => `${v.url} ${v.width}w`).join(', ');
+}
+
+/**
+ * 요청 너비 이상인 가장 작은 변환본 (없으면 가장 큰 것) - next/image loader 용
+ */
+export function pickVariant(
+  variants: Array<{ width: number; url: string }>,
+  width: number
+): string {
+  return (variants.find((v) => v.width >= width) ?? variants[variants.length - 1]).url;
+}
+
 /**
  * 성과 등급에 따른 NPC 감정 결정
  */
@@ -376,6 +584,7 @@ export function gradeToEndingTier(grade: PerformanceGrade): EndingTier {
 const prerenderedContentService = {
   // TTS
   getTTSAudioUrl,
+  resolveTTSAudioUrl,
   checkTTSAudioExists,
   playEpilogueTTS,
   stopEpilogueTTS,
@@ -384,6 +593,7 @@ const prerenderedContentService = {
   // NPC 이미지
   getNPCImageUrl,
   getMentorNPCImageUrl,
+  resolveNPCImage,
   gradeToNPCEmotion,
 
   // 스토리
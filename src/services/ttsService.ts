@@ -8,6 +8,12 @@ import type { WorldviewType } from '@/types/vrm';
 
 const _logger = createLogger('TTSService');
 import type { ExerciseType, PerformanceRating } from '@/types/exercise';
+import { getResultCue, resolveTTSClipUrl } from '@/services/prerenderedContentService';
+
+// 사전 믹스는 기본 볼륨(TTS 1.0 / 효과음 0.7) 기준의 음성:효과음 비율로 섞여 있음
+const RESULT_CUE_SFX_RATIO = 0.7;
+// 설정된 효과음:음성 비율이 이만큼 벗어나면 사전 믹스 대신 따로 재생
+const RESULT_CUE_RATIO_TOLERANCE = 0.1;
 
 // TTS 상태
 interface TTSState {
@@ -40,11 +46,12 @@ class TTSService {
       return false;
     }
 
+    // 재생 가능한 압축본(Opus/AAC) 우선, 없으면 WAV
+    const url = await resolveTTSClipUrl(`${worldview}/${exercise}_${rating}`);
+
     // 기존 재생 중지
     this.stop();
 
-    const url = `/assets/prerendered/tts/${worldview}/${exercise}_${rating}.wav`;
-
     try {
       this.audioElement = new Audio(url);
       this.audioElement.volume = this.state.volume;
@@ -74,6 +81,55 @@ class TTSService {
     }
   }
 
+  /**
+   * 결과 화면 큐 재생 (TTS + 세계관 효과음 사전 믹스 클립)
+   * 다음 경우 false -> 호출 측이 효과음과 playPrerenderedTTS 를 따로 재생
+   * - 사전 믹스가 없거나 인덱스가 아직 로드되지 않음 (기다리지 않음, loadResultCueIndex 로 미리 로드)
+   * - TTS 가 꺼져 있거나 재생 속도가 1배가 아님
+   * - 효과음 볼륨이 믹스에 들어간 비율과 달라 한 클립으로는 두 볼륨 설정을 지킬 수 없음
+   * onVoiceStart 는 믹스 안에서 음성이 시작되는 시점(voice_offset)에 호출
+   */
+  async playResultCue(
+    worldview: WorldviewType,
+    exercise: ExerciseType,
+    rating: PerformanceRating,
+    sfxVolume: number,
+    callbacks: { onVoiceStart?: () => void; onComplete?: () => void } = {}
+  ): Promise<boolean> {
+    if (!this.state.enabled || this.state.rate !== 1) return false;
+    if (Math.abs(sfxVolume - this.state.volume * RESULT_CUE_SFX_RATIO) > RESULT_CUE_RATIO_TOLERANCE) return false;
+
+    const cue = getResultCue(worldview, exercise, rating);
+    if (!cue) return false;
+
+    // 기존 재생 중지
+    this.stop();
+
+    const audio = new Audio(cue.url);
+    audio.volume = this.state.volume;
+    audio.onended = () => {
+      this.isPlaying = false;
+      callbacks.onComplete?.();
+    };
+
+    try {
+      this.audioElement = audio;
+      this.isPlaying = true;
+      await audio.play();
+    } catch (error) {
+      console.warn(`Failed to play result cue: ${cue.url}`, error);
+      this.audioElement = null;
+      this.isPlaying = false;
+      return false;
+    }
+
+    setTimeout(() => {
+      // 그 사이 다른 재생으로 바뀌었으면 호출하지 않음
+      if (this.audioElement === audio) callbacks.onVoiceStart?.();
+    }, cue.voiceOffset * 1000);
+    return true;
+  }
+
   /**
    * Web Speech API로 텍스트 읽기
    */